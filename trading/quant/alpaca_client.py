@@ -1,38 +1,185 @@
-"""Alpaca API client using requests for direct control."""
+"""Alpaca API client using requests for direct control.
 
+Every request goes through one pooled ``requests.Session`` (``http_session``,
+shared with the dashboard API calls) and a token-bucket rate limiter matched
+to Alpaca's per-account request limit. Idempotent calls are retried with
+jittered exponential backoff, and list endpoints follow Alpaca's pagination,
+so callers always get complete results.
+"""
+
+import random
+import re
+import threading
+import time
 import requests
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Any
+from datetime import datetime, timedelta, timezone
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from telemetry import metrics
 import config
 
 logger = logging.getLogger(__name__)
 
+# The orders endpoint returns at most this many orders per request
+ORDERS_PAGE_LIMIT = 500
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'DELETE'}
+
+
+def parse_time(value: str) -> datetime:
+    """Parse an Alpaca RFC-3339 timestamp (nanosecond fractions and 'Z' included) as aware UTC."""
+    value = re.sub(r'(\.\d{6})\d+', r'\1', value.replace('Z', '+00:00'))
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def endpoint_name(url: str) -> str:
+    """Metric label for a request URL: its path after /v2, with order ids and symbols as placeholders."""
+    parts = urlsplit(url).path.split('/v2/', 1)[-1].strip('/').split('/')
+    if len(parts) == 2 and parts[0] in ('orders', 'positions'):
+        parts[1] = '{id}' if parts[0] == 'orders' else '{symbol}'
+    return '/'.join(parts)
+
+
+def build_session(pool_size: int = None) -> requests.Session:
+    """A requests session with a connection pool sized for concurrent callers."""
+    pool_size = pool_size or config.HTTP_POOL_SIZE
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per ``per`` seconds, bursting up to ``capacity``."""
+
+    def __init__(self, rate: float, per: float = 60.0, capacity: float = None):
+        self.rate = rate / per
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until one is available. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            # A negative balance is a reservation: wait until it is paid back
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+# Shared by every client (and, for the session, the dashboard API calls):
+# Alpaca's request limit is per account, not per client object
+http_session = build_session()
+account_rate_limiter = TokenBucket(config.ALPACA_RATE_LIMIT)
+
+
 class AlpacaClient:
     """Wrapper around Alpaca API using requests library."""
     
-    def __init__(self):
+    def __init__(self, session: requests.Session = None, rate_limiter: TokenBucket = None):
+        """
+        Args:
+            session: HTTP session (default: the shared ``http_session``)
+            rate_limiter: Request limiter (default: the shared ``account_rate_limiter``)
+        """
         self.base_url = config.ALPACA_BASE_URL
         self.data_url = config.ALPACA_DATA_URL
+        # Credentials go on each request, not the shared session
         self.headers = config.get_api_headers()
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.session = session or http_session
+        self.rate_limiter = rate_limiter or account_rate_limiter
+        self.max_retries = config.ALPACA_MAX_RETRIES
+        self.timeout = config.ALPACA_TIMEOUT
+        self.stats = {'requests': 0, 'retries': 0, 'throttled_seconds': 0.0}
+    
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Seconds to wait before a retry: Retry-After when given, else full-jitter exponential backoff."""
+        if response is not None and response.headers.get('Retry-After'):
+            try:
+                return float(response.headers['Retry-After'])
+            except ValueError:
+                pass
+        cap = min(config.ALPACA_BACKOFF_MAX, config.ALPACA_BACKOFF_BASE * 2 ** attempt)
+        return random.uniform(0, cap)
     
-    def _request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
-        """Make an API request with error handling."""
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """One HTTP request, counted by endpoint and status and timed in the telemetry registry."""
+        endpoint = endpoint_name(url)
+        status = 'error'
+        started = time.perf_counter()
         try:
             response = self.session.request(method, url, **kwargs)
-            response.raise_for_status()
-            
-            if response.content:
-                return response.json()
-            return {}
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
-            raise
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request error: {e}")
-            raise
+            status = str(response.status_code)
+            return response
+        finally:
+            metrics.counter(
+                'alpaca_requests_total', 'Alpaca API requests by endpoint and HTTP status (error: no response)',
+                ['method', 'endpoint', 'status']
+            ).inc(method=method, endpoint=endpoint, status=status)
+            metrics.histogram(
+                'alpaca_request_seconds', 'Alpaca API request latency', ['method', 'endpoint']
+            ).observe(time.perf_counter() - started, method=method, endpoint=endpoint)
+    
+    def _request(self, method: str, url: str, retry: Optional[bool] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Make a rate-limited API request with retries and error handling.
+        
+        GET, HEAD and DELETE are retried on connection errors, timeouts and
+        429/5xx responses. Other methods (order placement) are retried only
+        when the request was certainly not processed: a 429 or a failed
+        connect. Pass ``retry`` to override.
+        """
+        method = method.upper()
+        idempotent = method in IDEMPOTENT_METHODS if retry is None else retry
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs['headers'] = {**self.headers, **kwargs.get('headers', {})}
+        
+        attempt = 0
+        while True:
+            self.stats['throttled_seconds'] += self.rate_limiter.acquire()
+            self.stats['requests'] += 1
+            response = None
+            try:
+                response = self._send(method, url, **kwargs)
+                if response.status_code in RETRY_STATUSES and attempt < self.max_retries and (
+                    idempotent or response.status_code == 429
+                ):
+                    raise requests.exceptions.RetryError(f"HTTP {response.status_code}")
+                response.raise_for_status()
+                
+                if response.content:
+                    return response.json()
+                return {}
+            except requests.exceptions.HTTPError as e:
+                logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
+                raise
+            except requests.exceptions.RequestException as e:
+                # A retry status, or no response at all; never a bad body from a processed request
+                retriable = isinstance(e, requests.exceptions.RetryError) or (response is None and (
+                    idempotent or isinstance(e, requests.exceptions.ConnectTimeout)
+                ))
+                if not retriable or attempt >= self.max_retries:
+                    logger.error(f"Request error: {e}")
+                    raise
+                delay = self._backoff(attempt, response)
+                logger.warning(f"{method} {url} failed ({e}); retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+                self.stats['retries'] += 1
+                attempt += 1
+                time.sleep(delay)
     
     def get_account(self) -> Dict[str, Any]:
         """Get account information."""
@@ -54,16 +201,88 @@ class AlpacaClient:
                 return None
             raise
     
-    def get_orders(self, status: str = 'all', limit: int = 100) -> List[Dict[str, Any]]:
-        """Get orders with optional filtering."""
+    def get_orders(
+        self,
+        status: str = 'all',
+        limit: int = 100,
+        after: Optional[str] = None,
+        until: Optional[str] = None,
+        direction: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get orders with optional filtering.
+        
+        Limits above the endpoint's 500-order page size are served by
+        following pages, so ``limit`` is always honoured.
+        
+        Args:
+            status: 'open', 'closed' or 'all'
+            limit: Maximum orders returned
+            after: Only orders submitted after this ISO-8601 time (exclusive)
+            until: Only orders submitted until this ISO-8601 time (exclusive)
+            direction: 'asc' or 'desc' (default: 'desc', newest first)
+        """
+        if limit <= ORDERS_PAGE_LIMIT:
+            return self._orders_page(status, limit, after, until, direction)
+        return list(islice(self.iter_orders(status, after, until, direction=direction or 'desc'), limit))
+    
+    def _orders_page(
+        self,
+        status: str,
+        limit: int,
+        after: Optional[str] = None,
+        until: Optional[str] = None,
+        direction: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """One request to the orders endpoint."""
         url = f"{self.base_url}/orders"
         params = {'status': status, 'limit': limit}
+        if after:
+            params['after'] = after
+        if until:
+            params['until'] = until
+        if direction:
+            params['direction'] = direction
         return self._request('GET', url, params=params)
     
+    def iter_orders(
+        self,
+        status: str = 'all',
+        after: Optional[str] = None,
+        until: Optional[str] = None,
+        page_size: int = ORDERS_PAGE_LIMIT,
+        direction: str = 'asc'
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Every order submitted between ``after`` and ``until``, across as many pages as needed.
+        
+        Orders come oldest first (``direction='asc'``) or newest first. Each
+        page overlaps the previous one by a millisecond, so orders sharing a
+        submission time at a page boundary are not skipped; duplicates are
+        dropped by id.
+        """
+        seen = set()
+        while True:
+            page = self._orders_page(status, page_size, after, until, direction)
+            fresh = [order for order in page if order['id'] not in seen]
+            for order in fresh:
+                seen.add(order['id'])
+                yield order
+            if len(page) < page_size or not fresh:
+                return
+            last = parse_time(page[-1].get('submitted_at') or page[-1]['created_at'])
+            if direction == 'asc':
+                after = (last - timedelta(milliseconds=1)).isoformat()
+            else:
+                until = (last + timedelta(milliseconds=1)).isoformat()
+    
     def get_orders_by_client_prefix(self, prefix: str, status: str = 'all', limit: int = 500) -> List[Dict[str, Any]]:
-        """Get orders where client_order_id starts with prefix."""
-        all_orders = self.get_orders(status=status, limit=limit)
-        return [o for o in all_orders if o.get('client_order_id', '').startswith(prefix)]
+        """The newest ``limit`` orders whose client_order_id starts with prefix."""
+        matching = (
+            o for o in self.iter_orders(status=status, direction='desc')
+            if (o.get('client_order_id') or '').startswith(prefix)
+        )
+        return list(islice(matching, limit))
     
     def get_order(self, order_id: str) -> Dict[str, Any]:
         """Get a specific order by ID."""
@@ -131,9 +350,44 @@ class AlpacaClient:
         timeframe: str = '1Day',
         start: Optional[str] = None,
         end: Optional[str] = None,
-        limit: int = 1000
+        limit: int = 10000,
+        max_pages: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Get historical bars for symbols."""
+        """
+        Get historical bars for symbols.
+        
+        ``limit`` is the page size (the API caps it at 10,000 bars across all
+        symbols); ``next_page_token`` is followed until every bar in the range
+        has been fetched, or ``max_pages`` pages.
+        
+        Returns:
+            {'bars': {symbol: [bars]}, 'next_page_token': token if max_pages cut it short}
+        """
+        bars: Dict[str, List[Dict[str, Any]]] = {}
+        page_token = None
+        pages = 0
+        
+        while True:
+            page = self._bars_page(symbols, timeframe, start, end, limit, page_token)
+            for symbol, symbol_bars in (page.get('bars') or {}).items():
+                bars.setdefault(symbol, []).extend(symbol_bars)
+            page_token = page.get('next_page_token')
+            pages += 1
+            if not page_token or (max_pages and pages >= max_pages):
+                break
+        
+        return {'bars': bars, 'next_page_token': page_token}
+    
+    def _bars_page(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start: Optional[str],
+        end: Optional[str],
+        limit: int,
+        page_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """One request to the multi-symbol bars endpoint."""
         url = f"{self.data_url}/stocks/bars"
         
         params = {
@@ -147,6 +401,8 @@ class AlpacaClient:
             params['start'] = start
         if end:
             params['end'] = end
+        if page_token:
+            params['page_token'] = page_token
         
         return self._request('GET', url, params=params)
     
@@ -156,7 +412,7 @@ class AlpacaClient:
         timeframe: str = '1Day',
         start: Optional[str] = None,
         end: Optional[str] = None,
-        limit: int = 1000
+        limit: int = 10000
     ) -> List[Dict[str, Any]]:
         """Get historical bars for a single symbol."""
         data = self.get_historical_bars([symbol], timeframe, start, end, limit)
@@ -172,10 +428,18 @@ class AlpacaClient:
         account = self.get_account()
         return float(account.get('buying_power', 0))
     
+    def now(self) -> datetime:
+        """Current time (UTC). Replay clients return the simulated time."""
+        return datetime.now(timezone.utc)
+    
+    def get_clock(self) -> Dict[str, Any]:
+        """Get the market clock (is_open, next_open, next_close)."""
+        url = f"{self.base_url}/clock"
+        return self._request('GET', url)
+    
     def is_market_open(self) -> bool:
         """Check if the market is currently open."""
-        url = f"{self.base_url}/clock"
-        clock = self._request('GET', url)
+        clock = self.get_clock()
         return clock.get('is_open', False)
 
 # Global client instance
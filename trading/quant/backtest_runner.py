@@ -26,49 +26,14 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import config
 from alpaca_client import client
-from strategies.momentum import MomentumStrategy
-from strategies.mean_reversion import MeanReversionStrategy
-from strategies.sector_rotation import SectorRotationStrategy
-from strategies.value_dividend import ValueDividendStrategy
-from strategies.volatility_breakout import VolatilityBreakoutStrategy
+from strategies.registry import get_spec, list_strategies
 
 import pandas as pd
 import numpy as np
 
 # ── Strategy config ────────────────────────────────────────────────────────────
-
-STRATEGY_CONFIG = {
-    'momentum': {
-        'class': MomentumStrategy,
-        'name': 'Momentum Rider',
-        'symbols': ['AAPL', 'MSFT', 'GOOGL', 'NVDA', 'META', 'TSLA', 'AMZN', 'JPM', 'V', 'MA'],
-        'universe_key': False,
-    },
-    'mean_reversion': {
-        'class': MeanReversionStrategy,
-        'name': 'Contrarian',
-        'symbols': ['AAPL', 'MSFT', 'GOOGL', 'NVDA', 'META', 'TSLA', 'AMZN', 'JPM', 'V', 'MA'],
-        'universe_key': False,
-    },
-    'sector_rotation': {
-        'class': SectorRotationStrategy,
-        'name': 'Sector Rotator',
-        'symbols': ['XLK', 'XLF', 'XLE', 'XLV', 'XLI', 'XLP', 'XLU', 'XLY', 'XLC', 'XLRE', 'XLB'],
-        'universe_key': True,
-    },
-    'value_dividend': {
-        'class': ValueDividendStrategy,
-        'name': 'Dividend Hunter',
-        'symbols': ['VZ', 'T', 'KO', 'PEP', 'PG', 'JNJ', 'XOM', 'CVX', 'ABBV', 'PFE', 'IBM', 'MMM'],
-        'universe_key': True,
-    },
-    'volatility_breakout': {
-        'class': VolatilityBreakoutStrategy,
-        'name': 'Volatility Trader',
-        'symbols': ['TSLA', 'NVDA', 'AMD', 'COIN', 'MSTR', 'SQ', 'SHOP', 'ROKU', 'PLTR', 'SNAP'],
-        'universe_key': False,
-    },
-}
+# Strategies, their display names and backtest universes live in
+# strategies.registry.
 
 BENCHMARK_SYMBOL = 'SPY'
 COMMISSION = 1.0       # $ per trade
@@ -151,6 +116,26 @@ def run_backtest(
     trades:    List[Trade] = []
     portfolio_history = []
 
+    # Score every bar once up front; generate_signals is only re-run on the
+    # bars the series flags, to recover the signal's reason text.
+    # Cross-sectional strategies rank the whole universe, so they are scored
+    # and re-run over all symbols together.
+    cross_sectional = getattr(strategy, 'cross_sectional', False)
+    signal_series = {}
+    if cross_sectional:
+        try:
+            signal_series = strategy.generate_universe_signal_series(symbol_data)
+        except Exception as e:
+            sys.stderr.write(f"[runner] universe signal series error: {e}\n")
+    else:
+        for sym, df in symbol_data.items():
+            if not hasattr(strategy, 'generate_signal_series'):
+                break
+            try:
+                signal_series[sym] = strategy.generate_signal_series(df, symbol=sym)
+            except Exception as e:
+                sys.stderr.write(f"[runner] signal series error {sym}: {e}\n")
+
     for date_str in trading_dates:
         date_ts = pd.Timestamp(date_str)
 
@@ -163,21 +148,43 @@ def run_backtest(
 
         # ── Generate signals: pass full history UP TO (and including) today ─
         all_signals = []
-        for sym, df in symbol_data.items():
-            hist = df[df.index <= date_ts]
-            if hist.empty:
-                continue
-            try:
-                sigs = strategy.generate_signals(hist, symbol=sym)
-                all_signals.extend(sigs)
-            except TypeError:
+        if cross_sectional and signal_series:
+            histories, flagged = {}, set()
+            for sym, df in symbol_data.items():
+                bars = df.index.searchsorted(date_ts, side='right')
+                if bars == 0:
+                    continue
+                histories[sym] = df.iloc[:bars]
+                if sym in signal_series and signal_series[sym]['action'].iat[bars - 1] != 'hold':
+                    flagged.add(sym)
+            if flagged:
+                try:
+                    sigs = strategy.generate_universe_signals(histories)
+                    all_signals.extend(sig for sig in sigs if sig.symbol in flagged)
+                except Exception as e:
+                    sys.stderr.write(f"[runner] universe signal error {date_str}: {e}\n")
+        else:
+            for sym, df in symbol_data.items():
+                if sym in signal_series:
+                    bars = df.index.searchsorted(date_ts, side='right')
+                    if bars == 0 or signal_series[sym]['action'].iat[bars - 1] == 'hold':
+                        continue
+                    hist = df.iloc[:bars]
+                else:
+                    hist = df[df.index <= date_ts]
+                if hist.empty:
+                    continue
                 try:
-                    sigs = strategy.generate_signals(hist)
+                    sigs = strategy.generate_signals(hist, symbol=sym)
                     all_signals.extend(sigs)
-                except Exception:
-                    pass
-            except Exception as e:
-                sys.stderr.write(f"[runner] signal error {sym} {date_str}: {e}\n")
+                except TypeError:
+                    try:
+                        sigs = strategy.generate_signals(hist)
+                        all_signals.extend(sigs)
+                    except Exception:
+                        pass
+                except Exception as e:
+                    sys.stderr.write(f"[runner] signal error {sym} {date_str}: {e}\n")
 
         # ── Execute signals ─────────────────────────────────────────────────
         for sig in all_signals:
@@ -418,28 +425,27 @@ def serialize_trades(trades: List[Trade]):
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument('--strategy', required=True, choices=list(STRATEGY_CONFIG.keys()))
+    parser.add_argument('--strategy', required=True, choices=list_strategies())
     parser.add_argument('--start',    required=True)
     parser.add_argument('--end',      required=True)
     parser.add_argument('--capital',  type=float, default=10000.0)
     args = parser.parse_args()
 
-    cfg = STRATEGY_CONFIG[args.strategy]
+    spec = get_spec(args.strategy)
 
     try:
         # 1. Fetch data
-        all_symbols  = list(set(cfg['symbols'] + [BENCHMARK_SYMBOL]))
+        all_symbols  = list(set(spec.universe + [BENCHMARK_SYMBOL]))
         raw          = fetch_data(all_symbols, args.start, args.end)
         benchmark_df = raw.pop(BENCHMARK_SYMBOL, None)
-        strat_data   = {s: raw[s] for s in cfg['symbols'] if s in raw}
+        strat_data   = {s: raw[s] for s in spec.universe if s in raw}
 
         if len(strat_data) < 2:
             raise ValueError(f"Only {len(strat_data)} symbols loaded — check date range or API limits.")
 
         # 2. Init strategy
-        StratClass = cfg['class']
-        strategy   = StratClass({'universe': list(strat_data.keys())}) \
-                     if cfg['universe_key'] else StratClass()
+        strategy   = spec.create({'universe': list(strat_data.keys())}) \
+                     if spec.universe_key else spec.create()
 
         # 3. Run correct backtest
         result = run_backtest(strategy, strat_data, args.start, args.end, args.capital)
@@ -453,7 +459,7 @@ def main():
         output = {
             'success':        True,
             'strategy':       args.strategy,
-            'strategy_name':  cfg['name'],
+            'strategy_name':  spec.display_name,
             'start_date':     args.start,
             'end_date':       args.end,
             'initial_capital': args.capital,
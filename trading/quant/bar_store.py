@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Bar Store — local SQLite archive of historical OHLCV bars.
+
+Bars are stored in Alpaca's wire format (t, o, h, l, c, v) so they can be
+served back exactly as the data API returns them. The shadow replay client
+(replay.py) reads from here.
+
+Usage:
+    python3 bar_store.py --symbols AAPL MSFT --start 2024-01-01 --end 2024-06-30
+    python3 bar_store.py --info
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BAR_FIELDS = ['o', 'h', 'l', 'c', 'v']
+
+
+class BarStore:
+    """SQLite-backed store of historical bars keyed by symbol, timeframe and time."""
+
+    def __init__(self, path: str = None):
+        self.path = path or config.BAR_STORE_PATH
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Replay serves concurrent prefetch requests; callers serialize access
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS bars (
+                symbol TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                t TEXT NOT NULL,
+                o REAL, h REAL, l REAL, c REAL, v REAL,
+                PRIMARY KEY (symbol, timeframe, t)
+            )
+        """)
+        self.conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def write_bars(self, symbol: str, bars: List[Dict[str, Any]], timeframe: str = '1Day') -> int:
+        """
+        Insert or replace bars for a symbol.
+
+        Args:
+            symbol: Ticker symbol
+            bars: Alpaca-format bars (dicts with t, o, h, l, c, v)
+            timeframe: Bar timeframe, e.g. '1Day' or '5Min'
+
+        Returns:
+            Number of bars written
+        """
+        rows = [
+            (symbol, timeframe, _normalize_time(bar['t']),
+             *(float(bar[field]) for field in BAR_FIELDS))
+            for bar in bars
+        ]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO bars (symbol, timeframe, t, o, h, l, c, v) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        self.conn.commit()
+        return len(rows)
+
+    def write_frame(self, symbol: str, df: pd.DataFrame, timeframe: str = '1Day') -> int:
+        """Insert bars from a DataFrame with open/high/low/close/volume columns."""
+        bars = [
+            {'t': ts, 'o': row.open, 'h': row.high, 'l': row.low, 'c': row.close, 'v': row.volume}
+            for ts, row in zip(df.index, df.itertuples(index=False))
+        ]
+        return self.write_bars(symbol, bars, timeframe)
+
+    def get_bars(
+        self,
+        symbol: str,
+        timeframe: str = '1Day',
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Bars for a symbol in Alpaca format, oldest first."""
+        query = "SELECT t, o, h, l, c, v FROM bars WHERE symbol = ? AND timeframe = ?"
+        params = [symbol, timeframe]
+        if start:
+            query += " AND t >= ?"
+            params.append(_normalize_time(start))
+        if end:
+            query += " AND t <= ?"
+            params.append(_normalize_time(end))
+        query += " ORDER BY t"
+
+        return [
+            {'t': t, 'o': o, 'h': h, 'l': l, 'c': c, 'v': v}
+            for t, o, h, l, c, v in self.conn.execute(query, params)
+        ]
+
+    def load_frame(self, symbol: str, timeframe: str = '1Day') -> pd.DataFrame:
+        """All bars for a symbol as a DataFrame indexed by UTC timestamp."""
+        df = pd.read_sql_query(
+            "SELECT t, o, h, l, c, v FROM bars WHERE symbol = ? AND timeframe = ? ORDER BY t",
+            self.conn, params=(symbol, timeframe)
+        )
+        df.index = pd.to_datetime(df.pop('t'), utc=True)
+        df.index.name = 'timestamp'
+        return df
+
+    def load_panels(
+        self,
+        symbols: List[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        timeframe: str = '1Day'
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Bars for many symbols in one query, as dates x symbols panels.
+
+        Returns:
+            Dictionary mapping open/high/low/close/volume -> DataFrame indexed
+            by UTC timestamp with one column per symbol that has bars
+        """
+        query = (f"SELECT symbol, t, o, h, l, c, v FROM bars "
+                 f"WHERE timeframe = ? AND symbol IN ({','.join('?' * len(symbols))})")
+        params = [timeframe, *symbols]
+        if start:
+            query += " AND t >= ?"
+            params.append(_normalize_time(start))
+        if end:
+            query += " AND t <= ?"
+            params.append(_normalize_time(end))
+
+        df = pd.read_sql_query(query, self.conn, params=params)
+        df['t'] = pd.to_datetime(df['t'], format='%Y-%m-%dT%H:%M:%SZ', utc=True)
+        panels = {}
+        for field, name in zip(BAR_FIELDS, ('open', 'high', 'low', 'close', 'volume')):
+            panel = df.pivot(index='t', columns='symbol', values=field).astype(float)
+            panel.index.name = 'timestamp'
+            panel.columns.name = None
+            panels[name] = panel
+        return panels
+
+    def symbols(self, timeframe: str = '1Day') -> List[str]:
+        """Symbols with stored bars for a timeframe."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT symbol FROM bars WHERE timeframe = ? ORDER BY symbol", (timeframe,)
+        )
+        return [row[0] for row in rows]
+
+    def get_info(self) -> Dict[str, Any]:
+        """Bar counts and date ranges per symbol and timeframe."""
+        rows = self.conn.execute("""
+            SELECT symbol, timeframe, COUNT(*), MIN(t), MAX(t)
+            FROM bars GROUP BY symbol, timeframe ORDER BY symbol, timeframe
+        """)
+        return {
+            f"{symbol}:{timeframe}": {'bars': count, 'first': first, 'last': last}
+            for symbol, timeframe, count, first, last in rows
+        }
+
+    def download(
+        self,
+        client,
+        symbols: List[str],
+        start: str,
+        end: str,
+        timeframe: str = '1Day',
+        chunk_days: int = 365
+    ) -> Dict[str, int]:
+        """
+        Fetch bars from Alpaca and store them.
+
+        Requests one symbol at a time in ``chunk_days`` windows so each
+        request stays under the API's per-request bar limit.
+
+        Returns:
+            Dictionary mapping symbol -> bars written
+        """
+        written = {}
+        for symbol in symbols:
+            written[symbol] = 0
+            window_start = datetime.strptime(start, '%Y-%m-%d')
+            final = datetime.strptime(end, '%Y-%m-%d')
+            while window_start <= final:
+                window_end = min(window_start + timedelta(days=chunk_days - 1), final)
+                try:
+                    bars = client.get_bars_for_symbol(
+                        symbol, timeframe=timeframe,
+                        start=window_start.strftime('%Y-%m-%d'),
+                        end=window_end.strftime('%Y-%m-%d'),
+                        limit=10000
+                    )
+                    written[symbol] += self.write_bars(symbol, bars, timeframe)
+                except Exception as e:
+                    logger.warning(f"Error downloading {symbol} {window_start:%Y-%m-%d}: {e}")
+                window_start = window_end + timedelta(days=1)
+        return written
+
+
+def _normalize_time(value) -> str:
+    """ISO-8601 UTC string ('YYYY-MM-DDTHH:MM:SSZ') for any timestamp-like value."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return ts.tz_convert('UTC').strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Historical bar store')
+    parser.add_argument('--symbols', nargs='+', help='Symbols to download')
+    parser.add_argument('--start', help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end', help='End date (YYYY-MM-DD)')
+    parser.add_argument('--timeframe', default='1Day')
+    parser.add_argument('--db', default=None, help='Store path (default: config.BAR_STORE_PATH)')
+    parser.add_argument('--info', action='store_true', help='Show stored bar ranges')
+    args = parser.parse_args()
+
+    store = BarStore(args.db)
+
+    if args.info:
+        print(json.dumps(store.get_info(), indent=2))
+    elif args.symbols and args.start and args.end:
+        from alpaca_client import client
+        written = store.download(client, args.symbols, args.start, args.end, args.timeframe)
+        print(json.dumps(written, indent=2))
+    else:
+        parser.print_help()
+
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
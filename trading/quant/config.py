@@ -9,12 +9,40 @@ config_path = Path(__file__).parent.parent / "config" / ".env"
 if config_path.exists():
     load_dotenv(config_path)
 
+
+def _seconds_by_name(variable: str) -> dict:
+    """Parse a 'name=seconds,name=seconds' environment variable."""
+    budgets = {}
+    for item in os.getenv(variable, '').split(','):
+        if '=' in item:
+            name, seconds = item.split('=', 1)
+            budgets[name.strip()] = float(seconds)
+    return budgets
+
+
 # Alpaca Configuration
 ALPACA_API_KEY = os.getenv('ALPACA_API_KEY', '')
 ALPACA_SECRET_KEY = os.getenv('ALPACA_SECRET_KEY', '')
 ALPACA_BASE_URL = os.getenv('ALPACA_BASE_URL', 'https://paper-api.alpaca.markets/v2')
 ALPACA_DATA_URL = os.getenv('ALPACA_DATA_URL', 'https://data.alpaca.markets/v2')
 
+# Alpaca HTTP layer: requests per minute (Alpaca allows 200 per account),
+# retries for idempotent calls, backoff base/cap and timeout in seconds,
+# and the shared connection pool size
+ALPACA_RATE_LIMIT = int(os.getenv('ALPACA_RATE_LIMIT', '200'))
+ALPACA_MAX_RETRIES = int(os.getenv('ALPACA_MAX_RETRIES', '4'))
+ALPACA_BACKOFF_BASE = float(os.getenv('ALPACA_BACKOFF_BASE', '0.5'))
+ALPACA_BACKOFF_MAX = float(os.getenv('ALPACA_BACKOFF_MAX', '8'))
+ALPACA_TIMEOUT = float(os.getenv('ALPACA_TIMEOUT', '10'))
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '20'))
+
+# Cycle market-data prefetch (market_data.py): symbols per bars request
+# (25 symbols x 5 days of 5-minute bars fits one 10,000-bar page) and
+# requests in flight
+MARKET_DATA_PREFETCH = os.getenv('MARKET_DATA_PREFETCH', 'true').lower() == 'true'
+MARKET_DATA_BATCH_SIZE = int(os.getenv('MARKET_DATA_BATCH_SIZE', '25'))
+MARKET_DATA_CONCURRENCY = int(os.getenv('MARKET_DATA_CONCURRENCY', '8'))
+
 # Trading Parameters
 INITIAL_CAPITAL = float(os.getenv('INITIAL_CAPITAL', '10000'))
 MAX_POSITION_PCT = float(os.getenv('MAX_POSITION_PCT', '0.20'))
@@ -22,6 +50,9 @@ MAX_PORTFOLIO_PCT = float(os.getenv('MAX_PORTFOLIO_PCT', '0.80'))
 STOP_LOSS_PCT = float(os.getenv('STOP_LOSS_PCT', '0.05'))
 DAILY_LOSS_LIMIT_PCT = float(os.getenv('DAILY_LOSS_LIMIT_PCT', '0.03'))
 MAX_POSITIONS = int(os.getenv('MAX_POSITIONS', '10'))
+# Portfolio heat cap: total stop-loss risk (position value x stop distance)
+# as a fraction of portfolio value
+MAX_PORTFOLIO_HEAT = float(os.getenv('MAX_PORTFOLIO_HEAT', '0.06'))
 
 # Universe of symbols to trade
 DEFAULT_UNIVERSE = [
@@ -30,9 +61,101 @@ DEFAULT_UNIVERSE = [
     'DIS', 'BAC', 'XOM', 'PFE', 'KO'
 ]
 
+# Signal generation: 'serial', 'thread' or 'process' evaluation of the
+# strategy x symbol matrix, pool size (0 = executor default) and per-strategy
+# time budget in seconds (0 = unlimited). BUDGETS overrides the budget for
+# named strategies, e.g. 'momentum=2,sector_rotation=10'
+SIGNAL_EXECUTION_MODE = os.getenv('SIGNAL_EXECUTION_MODE', 'serial')
+SIGNAL_MAX_WORKERS = int(os.getenv('SIGNAL_MAX_WORKERS', '0'))
+SIGNAL_STRATEGY_BUDGET = float(os.getenv('SIGNAL_STRATEGY_BUDGET', '0'))
+SIGNAL_STRATEGY_BUDGETS = _seconds_by_name('SIGNAL_STRATEGY_BUDGETS')
+
 # Database Configuration
 DB_PATH = os.getenv('DB_PATH', '../server/data/trading.db')
 
+# Per-strategy position ledger (ledger.py)
+LEDGER_DB_PATH = os.getenv('LEDGER_DB_PATH', str(Path(__file__).parent.parent / 'server' / 'data' / 'trading.db'))
+
+# Equity snapshot history (equity_store.py): raw snapshots are kept RAW_DAYS,
+# then downsampled to hourly for HOURLY_DAYS, then to daily indefinitely
+EQUITY_SNAPSHOT_DB_PATH = os.getenv('EQUITY_SNAPSHOT_DB_PATH', str(Path(__file__).parent.parent / 'data' / 'equity_snapshots.db'))
+EQUITY_SNAPSHOT_RAW_DAYS = float(os.getenv('EQUITY_SNAPSHOT_RAW_DAYS', '7'))
+EQUITY_SNAPSHOT_HOURLY_DAYS = float(os.getenv('EQUITY_SNAPSHOT_HOURLY_DAYS', '90'))
+
+# Latest-quote cache (quote_cache.py) shared by executors, exit checks and
+# reports: quotes younger than TTL seconds are reused, in process and on disk
+QUOTE_CACHE_ENABLED = os.getenv('QUOTE_CACHE_ENABLED', 'true').lower() == 'true'
+QUOTE_CACHE_PATH = os.getenv('QUOTE_CACHE_PATH', str(Path(__file__).parent / 'data' / 'quotes.db'))
+QUOTE_CACHE_TTL_SECONDS = float(os.getenv('QUOTE_CACHE_TTL_SECONDS', '10'))
+
+# Cross-strategy order netting (netting.py): a cycle's opposing orders in a
+# symbol are crossed internally in the ledgers and only residuals are sent
+ORDER_NETTING_ENABLED = os.getenv('ORDER_NETTING_ENABLED', 'true').lower() == 'true'
+
+# Strategy isolation (isolation.py): a cycle's strategies run side by side on
+# their own threads; one still running TIMEOUT seconds after it started is
+# reported and skipped (0 = unlimited). TIMEOUTS overrides the budget by
+# strategy id, e.g. '3=300,5=60'. MAX_WORKERS caps the strategies running at
+# once (0 = all of them)
+STRATEGY_TIMEOUT = float(os.getenv('STRATEGY_TIMEOUT', '120'))
+STRATEGY_TIMEOUTS = {int(key): seconds for key, seconds in _seconds_by_name('STRATEGY_TIMEOUTS').items()}
+STRATEGY_MAX_WORKERS = int(os.getenv('STRATEGY_MAX_WORKERS', '0'))
+
+# Order submission (order_manager.py): orders in flight at once, fill polls
+# starting at POLL_INTERVAL seconds and doubling up to POLL_MAX_INTERVAL, and
+# seconds a cycle waits for fills before leaving orders open
+ORDER_MAX_WORKERS = int(os.getenv('ORDER_MAX_WORKERS', '8'))
+ORDER_POLL_INTERVAL = float(os.getenv('ORDER_POLL_INTERVAL', '0.5'))
+ORDER_POLL_MAX_INTERVAL = float(os.getenv('ORDER_POLL_MAX_INTERVAL', '4'))
+ORDER_FILL_TIMEOUT = float(os.getenv('ORDER_FILL_TIMEOUT', '30'))
+
+# Historical bar store used by shadow replay
+BAR_STORE_PATH = os.getenv('BAR_STORE_PATH', str(Path(__file__).parent / 'data' / 'bars.db'))
+
+# Full-market scanner (scanner.py): bars read from the bar store per chunk,
+# lookback, liquidity filters, candidates kept per scan, and how many fresh
+# candidates (at most MAX_AGE hours old) replace a hard-coded base universe
+SCANNER_ENABLED = os.getenv('SCANNER_ENABLED', 'true').lower() == 'true'
+SCANNER_CHUNK_SIZE = int(os.getenv('SCANNER_CHUNK_SIZE', '100'))
+SCANNER_LOOKBACK_DAYS = int(os.getenv('SCANNER_LOOKBACK_DAYS', '90'))
+SCANNER_MIN_PRICE = float(os.getenv('SCANNER_MIN_PRICE', '5'))
+SCANNER_MIN_DOLLAR_VOLUME = float(os.getenv('SCANNER_MIN_DOLLAR_VOLUME', '20000000'))
+SCANNER_TOP = int(os.getenv('SCANNER_TOP', '50'))
+SCANNER_CANDIDATES = int(os.getenv('SCANNER_CANDIDATES', '15'))
+SCANNER_MAX_AGE_HOURS = float(os.getenv('SCANNER_MAX_AGE_HOURS', '24'))
+
+# Market calendar (holidays, early closes) and strategy scheduler: intraday
+# schedules step every INTERVAL minutes; a run missed by at most GRACE minutes
+# (late tick, restart) still fires
+MARKET_CALENDAR_PATH = os.getenv('MARKET_CALENDAR_PATH', str(Path(__file__).parent / 'market_calendar.json'))
+SCHEDULER_INTERVAL_MINUTES = int(os.getenv('SCHEDULER_INTERVAL_MINUTES', '5'))
+SCHEDULER_GRACE_MINUTES = int(os.getenv('SCHEDULER_GRACE_MINUTES', '5'))
+
+# Overnight session precompute (scripts/precompute_session.py): days of daily
+# bars re-fetched for symbols already in the bar store (catching corrections)
+# and fetched for new ones
+PRECOMPUTE_REFRESH_DAYS = int(os.getenv('PRECOMPUTE_REFRESH_DAYS', '10'))
+PRECOMPUTE_HISTORY_DAYS = int(os.getenv('PRECOMPUTE_HISTORY_DAYS', '120'))
+
+# Persistent indicator state (indicator_state.py): executors advance EMA/RSI/
+# MACD/ATR and rolling-window state with new bars only; TAIL committed values
+# are kept per feature and CHECK_BARS committed bars are compared with each
+# download to detect corrections
+INDICATOR_STATE_ENABLED = os.getenv('INDICATOR_STATE_ENABLED', 'true').lower() == 'true'
+INDICATOR_STATE_PATH = os.getenv('INDICATOR_STATE_PATH', str(Path(__file__).parent / 'data' / 'indicator_state.db'))
+INDICATOR_STATE_TAIL = int(os.getenv('INDICATOR_STATE_TAIL', '5'))
+INDICATOR_STATE_CHECK_BARS = int(os.getenv('INDICATOR_STATE_CHECK_BARS', '3'))
+
+# Append-only signal journal (signals/journal.py)
+SIGNAL_JOURNAL_DIR = os.getenv('SIGNAL_JOURNAL_DIR', str(Path(__file__).parent / 'data' / 'signal_journal'))
+SIGNAL_JOURNAL_ENABLED = os.getenv('SIGNAL_JOURNAL_ENABLED', 'true').lower() == 'true'
+
+# Telemetry (telemetry.py): port of the local /metrics endpoint the runners
+# serve (0 = off), and a Prometheus textfile rewritten after every cycle for
+# node_exporter's textfile collector (empty = off)
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+METRICS_TEXTFILE = os.getenv('METRICS_TEXTFILE', '')
+
 # Logging Configuration
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 LOG_FILE = os.getenv('LOG_FILE', 'data/quant.log')
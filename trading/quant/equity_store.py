@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Equity Snapshot Store — append-only SQLite history of portfolio snapshots.
+
+Each snapshot (TradingExecutor.record_equity_snapshot) is one INSERT in a
+write-ahead-logged database, so recording costs the same however long the
+history is, and a crash mid-write leaves the previous snapshots intact.
+
+Retention is tiered. Raw snapshots older than RAW_DAYS are downsampled to
+one per hour, and hourly ones older than HOURLY_DAYS to one per day (kept
+indefinitely). A downsampled snapshot is the last one of its bucket (equity
+is a level, so that is its close) carrying every trade recorded in the
+bucket. Tiers cover disjoint time ranges, so a time-range query simply reads
+all of them in timestamp order.
+
+Table (equity_snapshots.db):
+    equity_snapshots  resolution ('raw', '1h', '1d'), ts, entry (JSON)
+
+Usage:
+    python3 equity_store.py --info
+    python3 equity_store.py --start 2026-02-01 --end 2026-02-28
+    python3 equity_store.py --import-json ../data/equity_snapshots.json
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Resolution -> (next resolution, length of the timestamp prefix naming a bucket of it)
+DOWNSAMPLE = {
+    'raw': ('1h', len('YYYY-MM-DDTHH')),
+    '1h': ('1d', len('YYYY-MM-DD')),
+}
+
+
+def _normalize_time(value) -> str:
+    """Sortable UTC timestamp ('YYYY-MM-DDTHH:MM:SS.ffffffZ'); naive values are taken as UTC."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _merge(first: Optional[Dict[str, Any]], second: Dict[str, Any]) -> Dict[str, Any]:
+    """One snapshot for two of a bucket: the later one, carrying the trades of both."""
+    if first is None:
+        return second
+    earlier, later = sorted((first, second), key=lambda entry: _normalize_time(entry['timestamp']))
+    trades = earlier.get('trades', []) + later.get('trades', [])
+    merged = dict(later)
+    if trades:
+        merged['trades'] = trades
+    return merged
+
+
+class EquitySnapshotStore:
+    """Append-only equity snapshots with tiered, downsampled retention."""
+
+    def __init__(self, path: str = None, raw_days: float = None, hourly_days: float = None):
+        """
+        Args:
+            path: SQLite database (default: config.EQUITY_SNAPSHOT_DB_PATH; ':memory:' for tests)
+            raw_days: Days raw snapshots are kept (default: config.EQUITY_SNAPSHOT_RAW_DAYS)
+            hourly_days: Days hourly snapshots are kept (default: config.EQUITY_SNAPSHOT_HOURLY_DAYS)
+        """
+        self.path = path or config.EQUITY_SNAPSHOT_DB_PATH
+        self.retention = {
+            'raw': timedelta(days=config.EQUITY_SNAPSHOT_RAW_DAYS if raw_days is None else raw_days),
+            '1h': timedelta(days=config.EQUITY_SNAPSHOT_HOURLY_DAYS if hourly_days is None else hourly_days),
+        }
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ':memory:':
+            # Appends go to the WAL; readers (the dashboard) never block them
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS equity_snapshots (
+                resolution TEXT NOT NULL,
+                ts TEXT NOT NULL,
+                entry TEXT NOT NULL,
+                PRIMARY KEY (resolution, ts)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_equity_snapshots_ts ON equity_snapshots (ts)")
+        self.conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def append(self, entry: Dict[str, Any], compact: bool = True) -> None:
+        """
+        Record one snapshot.
+
+        Args:
+            entry: Snapshot with an ISO ``timestamp`` (plus ``snapshots`` and
+                optionally ``trades``)
+            compact: Downsample snapshots that have aged out of their tier
+        """
+        ts = _normalize_time(entry['timestamp'])
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO equity_snapshots (resolution, ts, entry) VALUES ('raw', ?, ?)",
+                    (ts, json.dumps(entry))
+                )
+            if compact:
+                self.compact(ts)
+
+    def compact(self, now=None) -> Dict[str, int]:
+        """
+        Downsample raw snapshots older than the raw retention to hourly, and
+        hourly older than the hourly retention to daily.
+
+        Each tier moves in one transaction, so an interrupted compaction
+        leaves every snapshot in exactly one tier.
+
+        Returns:
+            Snapshots removed per source tier
+        """
+        now = datetime.fromisoformat(_normalize_time(now or datetime.now(timezone.utc)).replace('Z', '+00:00'))
+        removed = {}
+        with self._lock:
+            for resolution, (target, prefix) in DOWNSAMPLE.items():
+                cutoff = _normalize_time(now - self.retention[resolution])
+                # Whole buckets only: the bucket holding the cutoff waits until it has aged out entirely
+                cutoff = cutoff[:prefix]
+                rows = self.conn.execute(
+                    "SELECT ts, entry FROM equity_snapshots WHERE resolution = ? AND ts < ? ORDER BY ts",
+                    (resolution, cutoff)
+                ).fetchall()
+                removed[resolution] = len(rows)
+                if not rows:
+                    continue
+
+                buckets: Dict[str, Dict[str, Any]] = {}
+                for ts, entry in rows:
+                    buckets[ts[:prefix]] = _merge(buckets.get(ts[:prefix]), json.loads(entry))
+
+                with self.conn:
+                    self.conn.execute(
+                        "DELETE FROM equity_snapshots WHERE resolution = ? AND ts < ?", (resolution, cutoff)
+                    )
+                    for bucket, entry in buckets.items():
+                        # A bucket already downsampled (late or imported snapshots) is merged into
+                        existing = self.conn.execute(
+                            "SELECT ts, entry FROM equity_snapshots WHERE resolution = ? AND substr(ts, 1, ?) = ?",
+                            (target, prefix, bucket)
+                        ).fetchone()
+                        if existing:
+                            self.conn.execute(
+                                "DELETE FROM equity_snapshots WHERE resolution = ? AND ts = ?", (target, existing[0])
+                            )
+                            entry = _merge(json.loads(existing[1]), entry)
+                        self.conn.execute(
+                            "INSERT INTO equity_snapshots (resolution, ts, entry) VALUES (?, ?, ?)",
+                            (target, _normalize_time(entry['timestamp']), json.dumps(entry))
+                        )
+                logger.info(f"Downsampled {len(rows)} {resolution} equity snapshots to {len(buckets)} {target}")
+        return removed
+
+    def query(self, start=None, end=None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Snapshots with ``start <= timestamp <= end``, oldest first, at whatever
+        resolution each period is retained.
+
+        Args:
+            start: Range start (timestamp or ISO string; default: unbounded)
+            end: Range end (default: unbounded)
+            limit: Keep only the latest ``limit`` snapshots of the range
+        """
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(_normalize_time(start))
+        if end is not None:
+            clauses.append("ts <= ?")
+            params.append(_normalize_time(end))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT entry FROM equity_snapshots {where} ORDER BY ts DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Most recent snapshot, or None when the store is empty."""
+        rows = self.query(limit=1)
+        return rows[0] if rows else None
+
+    def import_json(self, path: str) -> int:
+        """
+        Import a legacy equity_snapshots.json list (then compact it into tiers).
+
+        Returns:
+            Snapshots imported
+        """
+        with open(path) as f:
+            entries = json.load(f)
+        if not isinstance(entries, list):
+            raise ValueError(f"{path} does not hold a list of snapshots")
+
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO equity_snapshots (resolution, ts, entry) VALUES ('raw', ?, ?)",
+                    [(_normalize_time(entry['timestamp']), json.dumps(entry)) for entry in entries]
+                )
+            self.compact()
+        return len(entries)
+
+    def get_info(self) -> Dict[str, Any]:
+        """Snapshot counts and time ranges per resolution."""
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT resolution, COUNT(*), MIN(ts), MAX(ts)
+                FROM equity_snapshots GROUP BY resolution ORDER BY MIN(ts)
+            """).fetchall()
+        return {
+            resolution: {'snapshots': count, 'first': first, 'last': last}
+            for resolution, count, first, last in rows
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Equity snapshot store')
+    parser.add_argument('--db', default=None, help='Store path (default: config.EQUITY_SNAPSHOT_DB_PATH)')
+    parser.add_argument('--start', help='Range start (ISO date or time)')
+    parser.add_argument('--end', help='Range end (ISO date or time)')
+    parser.add_argument('--limit', type=int, help='Latest N snapshots of the range')
+    parser.add_argument('--import-json', metavar='PATH', help='Import a legacy equity_snapshots.json')
+    parser.add_argument('--info', action='store_true', help='Show snapshot counts per tier')
+    args = parser.parse_args()
+
+    store = EquitySnapshotStore(args.db)
+
+    if args.import_json:
+        print(f"Imported {store.import_json(args.import_json)} snapshots")
+    elif args.info:
+        print(json.dumps(store.get_info(), indent=2))
+    else:
+        print(json.dumps(store.query(args.start, args.end, args.limit), indent=2))
+
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+Exit Engine — exit rules for every strategy's open positions in one pass.
+
+Positions of all strategies are stacked into one table. Indicators are
+computed once per held symbol, so a symbol held by two strategies costs one
+ATR/EMA/RSI lookup, and joined to the table. Each rule is then a vectorized
+comparison over every position. A position exits on the first rule that
+fires, in this order:
+
+    atr_stop      price < entry - stop_atr_multiple x ATR
+    pct_stop      price <= entry x (1 - stop_loss_pct)
+    trailing      price < highest close since entry - trailing_atr_multiple x ATR
+    atr_take      price >= entry + profit_take_atr_multiple x ATR
+    pct_take      price >= entry x (1 + profit_take_pct)
+    trend         price < EMA(trend_ema)
+    rsi           RSI(14) >= exit_rsi_min
+    max_hold      held for max_hold_days or more
+
+A rule whose parameter is not set for a strategy never fires for it. A
+position whose ATR (or trend EMA) its rules need is not available yet is
+not evaluated.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.features import FeatureCache, feature_cache
+
+ATR_PERIOD = 14
+RSI_PERIOD = 14
+
+# Rule -> (signal confidence, reason template)
+RULES = {
+    'atr_stop': (0.92, "{label}: {symbol} ${price:.2f} < stop ${level:.2f}"),
+    'pct_stop': (0.88, "{label}: {symbol} down {loss:.1f}% from entry"),
+    'trailing': (0.9, "{label}: {symbol} ${price:.2f} < trailing stop ${level:.2f}"),
+    'atr_take': (0.86, "{label}: {symbol} hit profit target ${level:.2f}"),
+    'pct_take': (0.82, "{label}: {symbol} up {gain:.1f}% from entry"),
+    'trend': (0.8, "{label}: {symbol} lost short-term trend, price ${price:.2f} < EMA{trend_ema} ${ema:.2f}"),
+    'rsi': (0.76, "{label}: {symbol} RSI {rsi:.1f} reached exit zone"),
+    'max_hold': (0.78, "{label}: {symbol} max hold period ({max_hold_days} days) reached"),
+}
+
+
+@dataclass
+class ExitRules:
+    """Exit parameters of one strategy (None disables a rule)."""
+    label: str
+    stop_atr_multiple: Optional[float] = None
+    stop_loss_pct: Optional[float] = None
+    trailing_atr_multiple: Optional[float] = None
+    profit_take_atr_multiple: Optional[float] = None
+    profit_take_pct: Optional[float] = None
+    trend_ema: Optional[int] = None
+    exit_rsi_min: Optional[float] = None
+    max_hold_days: Optional[int] = None
+
+    @property
+    def uses_atr(self) -> bool:
+        return any(value is not None for value in (
+            self.stop_atr_multiple, self.trailing_atr_multiple, self.profit_take_atr_multiple
+        ))
+
+
+def exit_rules(strategy: Dict[str, Any]) -> Optional[ExitRules]:
+    """Exit rules of a StrategyExecutor strategy config, or None when its exits come from its signals."""
+    if strategy['type'] == 'volatility_breakout':
+        return ExitRules(
+            'Volatility exit',
+            stop_atr_multiple=strategy['stop_atr_multiple'],
+            trailing_atr_multiple=strategy.get('trailing_atr_multiple'),
+            profit_take_atr_multiple=strategy['profit_take_atr_multiple'],
+            trend_ema=10,
+            max_hold_days=strategy['max_hold_days']
+        )
+    if strategy['type'] == 'value_dividends':
+        return ExitRules(
+            'Value exit',
+            profit_take_pct=strategy['profit_take_pct'],
+            stop_loss_pct=strategy['stop_loss_pct'],
+            trailing_atr_multiple=strategy.get('trailing_atr_multiple'),
+            exit_rsi_min=strategy['sell_rsi_min']
+        )
+    return None
+
+
+def _utc_timestamp(value) -> pd.Timestamp:
+    """Parse an order/position time as a UTC timestamp (naive values are taken as UTC)."""
+    ts = pd.Timestamp(value)
+    return ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+
+
+def _utc(values: pd.Series) -> pd.Series:
+    """Times as UTC timestamps (missing as NaT)."""
+    return pd.Series(
+        [pd.NaT if value is None else _utc_timestamp(value) for value in values],
+        index=values.index, dtype='datetime64[ns, UTC]'
+    )
+
+
+class ExitEngine:
+    """Vectorized exit rules over the open positions of many strategies."""
+
+    def __init__(self, rules: Dict[int, ExitRules], features: FeatureCache = None):
+        """
+        Args:
+            rules: strategy_id -> exit rules
+            features: Indicator cache (default: the shared feature cache)
+        """
+        self.rules = rules
+        self.features = features or feature_cache
+
+    def position_table(self, positions: Dict[int, Dict[str, Dict[str, Any]]]) -> pd.DataFrame:
+        """One row per (strategy, symbol) open position, with its strategy's rule parameters."""
+        rows = []
+        for strategy_id, held in positions.items():
+            rules = self.rules.get(strategy_id)
+            if rules is None:
+                continue
+            for symbol, position in held.items():
+                rows.append({
+                    'strategy_id': strategy_id,
+                    'symbol': symbol,
+                    'quantity': position['quantity'],
+                    'entry': position['avg_cost_basis'],
+                    'opened_at': position.get('last_buy_time') or position.get('updated_at'),
+                    **{field: getattr(rules, field) for field in ExitRules.__dataclass_fields__},
+                    'uses_atr': rules.uses_atr
+                })
+        table = pd.DataFrame(rows)
+        if not table.empty:
+            numeric = [field for field in ExitRules.__dataclass_fields__ if field != 'label']
+            table[numeric] = table[numeric].astype(float)
+        return table
+
+    def symbol_features(
+        self,
+        table: pd.DataFrame,
+        data: Dict[str, pd.DataFrame],
+        prices: Optional[Dict[str, float]] = None
+    ) -> pd.DataFrame:
+        """
+        Price, ATR, RSI and the trend EMAs each held symbol needs, computed
+        once per symbol however many strategies hold it.
+        """
+        periods = table.groupby('symbol')['trend_ema'].agg(lambda values: sorted(set(values.dropna())))
+        features = {}
+        for symbol, ema_periods in periods.items():
+            df = data.get(symbol)
+            if df is None or len(df) == 0:
+                continue
+            price = (prices or {}).get(symbol) or float(df['close'].iloc[-1])
+            row = {
+                'price': price,
+                'bars': len(df),
+                'atr': float(self.features.atr(symbol, df, ATR_PERIOD).iloc[-1]),
+                'rsi': float(self.features.rsi(symbol, df, RSI_PERIOD).iloc[-1])
+            }
+            for period in ema_periods:
+                row[f'ema_{int(period)}'] = float(self.features.ema(symbol, df, int(period)).iloc[-1])
+            features[symbol] = row
+        return pd.DataFrame.from_dict(features, orient='index')
+
+    def _highest_close(self, table: pd.DataFrame, data: Dict[str, pd.DataFrame]) -> pd.Series:
+        """Highest close since each position was opened (only for rows with a trailing stop)."""
+        highest = pd.Series(np.nan, index=table.index)
+        trailing = table[table['trailing_atr_multiple'].notna() & table['symbol'].isin(list(data))]
+        if trailing.empty:
+            return highest
+
+        closes = pd.DataFrame({symbol: data[symbol]['close'] for symbol in trailing['symbol'].unique()})
+        index = closes.index if closes.index.tz is None else closes.index.tz_convert('UTC').tz_localize(None)
+        opened = _utc(trailing['opened_at']).dt.tz_localize(None).dt.normalize().fillna(index[0])
+        values = closes[trailing['symbol']].to_numpy(dtype=float)
+        since_entry = index.to_numpy()[:, None] >= opened.to_numpy()[None, :]
+        with np.errstate(all='ignore'):
+            highest[trailing.index] = np.nanmax(np.where(since_entry, values, np.nan), axis=0)
+        return highest
+
+    def evaluate(
+        self,
+        positions: Dict[int, Dict[str, Dict[str, Any]]],
+        data: Dict[str, pd.DataFrame],
+        now,
+        prices: Optional[Dict[str, float]] = None
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Exit signals for every strategy's open positions.
+
+        Args:
+            positions: strategy_id -> {symbol: {quantity, avg_cost_basis, last_buy_time}}
+            data: Daily bars for the union of held symbols
+            now: Current time (for holding periods)
+            prices: Current prices (e.g. quote midpoints); the last close otherwise
+
+        Returns:
+            strategy_id -> sell signals, in each strategy's position order
+        """
+        exits: Dict[int, List[Dict[str, Any]]] = {strategy_id: [] for strategy_id in positions}
+        table = self.position_table(positions)
+        if table.empty:
+            return exits
+
+        features = self.symbol_features(table, data, prices)
+        if features.empty:
+            return exits
+        table = table[table['symbol'].isin(features.index)].reset_index(drop=True)
+        table = table.join(features, on='symbol')
+        ema = pd.Series(np.nan, index=table.index)
+        for column in [c for c in table.columns if c.startswith('ema_')]:
+            period = int(column.split('_')[1])
+            ema = ema.where(table['trend_ema'] != period, table[column])
+        table['ema'] = ema
+        table['highest'] = self._highest_close(table, data)
+
+        price, entry, atr = table['price'], table['entry'], table['atr']
+        opened = _utc(table['opened_at'])
+        days_held = (_utc_timestamp(now) - opened).dt.days.fillna(0)
+
+        table['level'] = np.nan
+        conditions = {
+            'atr_stop': price < entry - table['stop_atr_multiple'] * atr,
+            'pct_stop': (price - entry) / entry <= -table['stop_loss_pct'],
+            'trailing': price < table['highest'] - table['trailing_atr_multiple'] * atr,
+            'atr_take': price >= entry + table['profit_take_atr_multiple'] * atr,
+            'pct_take': (price - entry) / entry >= table['profit_take_pct'],
+            'trend': price < table['ema'],
+            'rsi': table['rsi'] >= table['exit_rsi_min'],
+            'max_hold': days_held >= table['max_hold_days'],
+        }
+        levels = {
+            'atr_stop': entry - table['stop_atr_multiple'] * atr,
+            'trailing': table['highest'] - table['trailing_atr_multiple'] * atr,
+            'atr_take': entry + table['profit_take_atr_multiple'] * atr,
+        }
+
+        # Positions whose ATR or trend EMA is not available yet are not evaluated
+        ready = ~(table['uses_atr'] & (atr.isna() | (table['bars'] <= ATR_PERIOD)))
+        ready &= ~(table['trend_ema'].notna() & table['ema'].isna())
+
+        rule = np.select(
+            [ready & condition.fillna(False).astype(bool) for condition in conditions.values()],
+            list(conditions), default=''
+        )
+        for name, level in levels.items():
+            table.loc[rule == name, 'level'] = level[rule == name]
+
+        for row, name in zip(table.itertuples(index=False), rule):
+            if not name:
+                continue
+            confidence, template = RULES[name]
+            exits[row.strategy_id].append({
+                'symbol': row.symbol,
+                'action': 'sell',
+                'price': row.price,
+                'reason': template.format(
+                    label=row.label, symbol=row.symbol, price=row.price, level=row.level,
+                    loss=abs(row.price - row.entry) / row.entry * 100,
+                    gain=(row.price - row.entry) / row.entry * 100,
+                    trend_ema=0 if pd.isna(row.trend_ema) else int(row.trend_ema), ema=row.ema,
+                    rsi=row.rsi, max_hold_days=0 if pd.isna(row.max_hold_days) else int(row.max_hold_days)
+                ),
+                'confidence': confidence
+            })
+        return exits
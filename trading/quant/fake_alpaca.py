@@ -0,0 +1,592 @@
+#!/usr/bin/env python3
+"""
+Fake Alpaca — a local HTTP stand-in for the Alpaca endpoints the executors use.
+
+FakeAlpacaServer serves the trading API (account, positions, orders, clock)
+and the market data API (bars, latest quotes) over real HTTP, backed by a
+ReplayAlpacaClient: bars and quotes come from a bar store at a simulated
+time, and orders fill at the simulated quote. Unlike replay, every call goes
+through AlpacaClient's full HTTP path (session pool, rate limiter, retries),
+so executor cycles can be timed under load. The server can add latency to
+every response, inject 5xx errors and 429 throttling, enforce a per-minute
+request limit, and hold fills back for a delay so orders are seen 'accepted'
+before they fill.
+
+load_test_trading_executor() drives TradingExecutor.run_strategy_execution
+against the server with its five strategies copied out to any number of
+strategies over hundreds of synthetic symbols, and reports cycle times,
+request counts, order latency and where the cycles' time went (the
+telemetry stage budget).
+
+Usage:
+    python3 fake_alpaca.py --strategies 50 --symbols 300 --cycles 5
+    python3 fake_alpaca.py --strategies 60 --latency 0.05 --jitter 0.05 --error-rate 0.02 --fill-delay 0.5
+    python3 fake_alpaca.py --serve --port 8765 --symbols 100   # base URL http://127.0.0.1:8765/v2
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import logging
+from collections import Counter, deque
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alpaca_client import AlpacaClient, TokenBucket, build_session
+from bar_store import BarStore
+from order_manager import TERMINAL_STATUSES
+from replay import MARKET_OPEN, MARKET_TZ, ReplayAlpacaClient
+from scheduler import StrategyScheduler
+from telemetry import metrics
+import config
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 5-minute bars in a regular session (09:30-16:00)
+SESSION_BARS = 78
+
+# The orders endpoint returns at most this many orders per request
+MAX_ORDERS_LIMIT = 500
+
+
+def _error(message: str, code: int) -> Dict[str, Any]:
+    """Alpaca's error body."""
+    return {'code': code, 'message': message}
+
+
+class FakeAlpacaServer:
+    """Threaded HTTP server answering Alpaca API requests from a ReplayAlpacaClient."""
+
+    def __init__(
+        self,
+        broker: ReplayAlpacaClient,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        rate_limit: int = None,
+        fill_delay: float = 0.0,
+        seed: int = None
+    ):
+        """
+        Args:
+            broker: Replay client holding the bars, the simulated clock and the account
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one; see ``url``)
+            latency: Seconds added to every response
+            jitter: Up to this many more seconds, drawn uniformly per response
+            error_rate: Fraction of requests answered 503 without being processed
+            throttle_rate: Fraction of requests answered 429 without being processed
+            rate_limit: Requests per rolling minute before answering 429, like
+                Alpaca's per-account limit (default: unlimited)
+            fill_delay: Seconds after submission an order is reported 'accepted'
+                with nothing filled (the account reflects the fill at once)
+            seed: Seed for latency jitter and injected errors
+        """
+        self.broker = broker
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.fill_delay = fill_delay
+        self.random = random.Random(seed)
+
+        # Trading state is read and changed one request at a time, like an
+        # order book; market data is served concurrently
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._accepted: Dict[str, float] = {}  # order id -> monotonic submission time
+        self._window: deque = deque()  # monotonic times of requests in the last minute
+        self.stats = {'requests': 0, 'injected_errors': 0, 'throttled': 0, 'orders': 0}
+        self.endpoints: Counter = Counter()
+
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Server root; the Alpaca base and data URLs are ``url + '/v2'``."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeAlpacaServer':
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-alpaca', daemon=True)
+        self._thread.start()
+        logger.info(f"Fake Alpaca serving at {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'FakeAlpacaServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ── Requests ──────────────────────────────────────────────────────────────
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, str],
+        body: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Answer one request.
+
+        Returns:
+            (status code, JSON payload or None for no body, extra headers)
+        """
+        parts = path.strip('/').split('/')
+        endpoint = list(parts)
+        if len(endpoint) == 3 and endpoint[1] in ('orders', 'positions'):
+            endpoint[2] = '{id}' if endpoint[1] == 'orders' else '{symbol}'
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            self.endpoints[f"{method} /{'/'.join(endpoint)}"] += 1
+
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        injected = self._inject()
+        if injected is not None:
+            return injected
+
+        try:
+            status, payload = self._route(method, parts, query, body or {})
+        except Exception as e:
+            logger.exception(f"Fake Alpaca failed on {method} {path}")
+            status, payload = 500, _error(str(e), 50000000)
+        return status, payload, {}
+
+    def _inject(self) -> Optional[Tuple[int, Any, Dict[str, str]]]:
+        """A rate-limit, throttle or error response standing in for the real one, if any."""
+        now = time.monotonic()
+        with self._stats_lock:
+            if self.rate_limit:
+                while self._window and now - self._window[0] >= 60:
+                    self._window.popleft()
+                if len(self._window) >= self.rate_limit:
+                    self.stats['throttled'] += 1
+                    retry_after = 60 - (now - self._window[0])
+                    return 429, _error('rate limit exceeded', 42910000), {'Retry-After': f"{retry_after:.3f}"}
+                self._window.append(now)
+
+            draw = self.random.random()
+            if draw < self.error_rate:
+                self.stats['injected_errors'] += 1
+                return 503, _error('service unavailable', 50300000), {}
+            if draw < self.error_rate + self.throttle_rate:
+                self.stats['throttled'] += 1
+                return 429, _error('too many requests', 42910000), {}
+        return None
+
+    def _route(self, method: str, parts: List[str], query: Dict[str, str], body: Dict[str, Any]) -> Tuple[int, Any]:
+        if parts[:1] != ['v2']:
+            return 404, _error('endpoint not found', 40400000)
+        resource = parts[1:]
+
+        # Market data (read-only, served concurrently)
+        if method == 'GET' and resource == ['stocks', 'bars']:
+            return 200, self.broker._bars_page(
+                _symbols(query), query.get('timeframe', '1Day'), query.get('start'), query.get('end'),
+                int(query.get('limit', 1000)), query.get('page_token')
+            )
+        if method == 'GET' and resource == ['stocks', 'quotes', 'latest']:
+            return 200, self.broker.get_latest_quotes(_symbols(query))
+        if method == 'GET' and resource == ['clock']:
+            return 200, self.broker.get_clock()
+
+        with self._lock:
+            if method == 'GET' and resource == ['account']:
+                return 200, self.broker.get_account()
+            if method == 'GET' and resource == ['positions']:
+                return 200, self.broker.get_positions()
+            if method == 'GET' and resource[:1] == ['positions'] and len(resource) == 2:
+                position = self.broker.get_position(resource[1])
+                if position is None:
+                    return 404, _error('position does not exist', 40410000)
+                return 200, position
+            if resource == ['orders']:
+                if method == 'GET':
+                    return self._list_orders(query)
+                if method == 'POST':
+                    return self._place_order(body)
+                if method == 'DELETE':
+                    return 207, self.broker.cancel_all_orders()
+            if resource[:1] == ['orders'] and len(resource) == 2:
+                try:
+                    order = self.broker.get_order(resource[1])
+                except KeyError:
+                    return 404, _error('order not found', 40410000)
+                if method == 'GET':
+                    return 200, self._view(order)
+                if method == 'DELETE':
+                    self.broker.cancel_order(resource[1])
+                    return 204, None
+        return 404, _error('endpoint not found', 40400000)
+
+    def _view(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """An order as reported now: still 'accepted' until its fill delay has passed."""
+        submitted = self._accepted.get(order['id'])
+        if submitted is None or order['status'] != 'filled' or time.monotonic() - submitted >= self.fill_delay:
+            return order
+        return {**order, 'status': 'accepted', 'filled_qty': '0', 'filled_avg_price': None, 'filled_at': None}
+
+    def _list_orders(self, query: Dict[str, str]) -> Tuple[int, Any]:
+        status = query.get('status', 'open')
+        if status not in ('open', 'closed', 'all'):
+            return 422, _error(f"invalid status: {status}", 40010000)
+        limit = min(int(query.get('limit', 50)), MAX_ORDERS_LIMIT)
+        orders = [
+            self._view(order) for order in self.broker._orders_page(
+                'all', len(self.broker.orders), query.get('after'), query.get('until'), query.get('direction')
+            )
+        ]
+        if status == 'open':
+            orders = [order for order in orders if order['status'] not in TERMINAL_STATUSES]
+        elif status == 'closed':
+            orders = [order for order in orders if order['status'] in TERMINAL_STATUSES]
+        return 200, orders[:limit]
+
+    def _place_order(self, body: Dict[str, Any]) -> Tuple[int, Any]:
+        try:
+            symbol, side, qty = body['symbol'], body['side'], float(body['qty'])
+        except (KeyError, TypeError, ValueError):
+            return 422, _error('symbol, side and qty are required', 40010000)
+        if side not in ('buy', 'sell') or qty <= 0:
+            return 422, _error(f"invalid order: {side} {qty}", 40010000)
+
+        limit_price, stop_price = body.get('limit_price'), body.get('stop_price')
+        try:
+            order = self.broker.place_order(
+                symbol, qty, side,
+                order_type=body.get('type', 'market'),
+                time_in_force=body.get('time_in_force', 'day'),
+                limit_price=None if limit_price is None else float(limit_price),
+                stop_price=None if stop_price is None else float(stop_price),
+                client_order_id=body.get('client_order_id')
+            )
+        except ValueError as e:
+            return 422, _error(str(e), 40010001)
+
+        if self.fill_delay > 0:
+            self._accepted[order['id']] = time.monotonic()
+        with self._stats_lock:
+            self.stats['orders'] += 1
+        return 200, self._view(order)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Requests served, by endpoint, and the errors and throttling injected."""
+        with self._stats_lock:
+            return {**self.stats, 'endpoints': dict(sorted(self.endpoints.items()))}
+
+
+def _symbols(query: Dict[str, str]) -> List[str]:
+    return [symbol for symbol in query.get('symbols', '').split(',') if symbol]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP/1.1 (keep-alive) JSON front end of a FakeAlpacaServer."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _serve(self, method: str) -> None:
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        body = None
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                body = None
+
+        status, payload, headers = self.server.fake.handle(method, url.path, query, body)
+        content = b'' if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        self._serve('GET')
+
+    def do_POST(self):
+        self._serve('POST')
+
+    def do_DELETE(self):
+        self._serve('DELETE')
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class FakeAlpacaClient(AlpacaClient):
+    """AlpacaClient making real HTTP requests to a FakeAlpacaServer, on the server's simulated clock."""
+
+    def __init__(self, server: FakeAlpacaServer, session=None, rate_limiter: TokenBucket = None):
+        """
+        Args:
+            server: Server to talk to
+            session: HTTP session (default: a new pooled session)
+            rate_limiter: Request limiter (default: a new one at config.ALPACA_RATE_LIMIT,
+                not the live client's)
+        """
+        super().__init__(
+            session=session or build_session(),
+            rate_limiter=rate_limiter or TokenBucket(config.ALPACA_RATE_LIMIT)
+        )
+        self.server = server
+        self.base_url = self.data_url = f"{server.url}/v2"
+
+    def now(self):
+        """The server's simulated time."""
+        return self.server.broker.now()
+
+
+# ── Synthetic market ──────────────────────────────────────────────────────────
+
+def synthetic_symbols(count: int) -> List[str]:
+    """``count`` tickers: SPY (the sector benchmark) and T001, T002, ..."""
+    return ['SPY'] + [f"T{i:03d}" for i in range(1, count)]
+
+
+def _ohlcv(close: np.ndarray, index: pd.DatetimeIndex, rng: np.random.RandomState) -> pd.DataFrame:
+    open_ = close * (1 + rng.normal(0, 0.003, len(close)))
+    wick = np.abs(rng.normal(0, 0.004, len(close)))
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + wick),
+        'low': np.minimum(open_, close) * (1 - wick),
+        'close': close,
+        'volume': rng.randint(100000, 5000000, len(close)).astype(float),
+    }, index=index)
+
+
+def synthetic_store(
+    symbols: List[str],
+    end,
+    sessions: int = 60,
+    intraday_sessions: int = 7,
+    seed: int = 0
+) -> BarStore:
+    """
+    In-memory bar store of random-walk bars for ``symbols``: daily bars for
+    the ``sessions`` weekdays up to ``end`` (stamped at midnight New York
+    time, like Alpaca) and 5-minute bars for the last ``intraday_sessions``.
+    Holidays are not skipped.
+    """
+    rng = np.random.RandomState(seed)
+    days = pd.bdate_range(end=pd.Timestamp(end).strftime('%Y-%m-%d'), periods=sessions)
+    daily_index = days.tz_localize(MARKET_TZ).tz_convert('UTC')
+    open_offset = pd.Timedelta(hours=MARKET_OPEN[0], minutes=MARKET_OPEN[1])
+    intraday_index = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + open_offset, periods=SESSION_BARS, freq='5min').tz_localize(MARKET_TZ).tz_convert('UTC')
+        for day in days[-intraday_sessions:]
+    ]))
+
+    store = BarStore(':memory:')
+    for symbol in symbols:
+        start_price = rng.uniform(20, 400)
+        daily = start_price * np.cumprod(1 + rng.normal(0.0005, 0.02, len(daily_index)))
+        intraday = daily[-intraday_sessions - 1] * np.cumprod(1 + rng.normal(0, 0.002, len(intraday_index)))
+        store.write_frame(symbol, _ohlcv(daily, daily_index, rng), '1Day')
+        store.write_frame(symbol, _ohlcv(intraday, intraday_index, rng), '5Min')
+    return store
+
+
+# ── Load test ─────────────────────────────────────────────────────────────────
+
+def scale_strategies(executor, count: int, symbols: List[str]) -> None:
+    """
+    Grow a TradingExecutor to ``count`` strategies, every one due each
+    scheduler interval.
+
+    Strategies beyond the configured ones copy them in turn under their own
+    ids and ledger slugs (so their fills are attributed separately), and the
+    base universes split ``symbols`` between them.
+    """
+    templates = sorted(executor.strategy_config)
+    base = {
+        strategy_id: (executor.strategy_config[strategy_id], executor.strategy_executor.strategies[strategy_id])
+        for strategy_id in templates
+    }
+    for strategy_id in range(1, count + 1):
+        schedule, strategy = base[templates[(strategy_id - 1) % len(templates)]]
+        executor.strategy_config[strategy_id] = {**schedule, 'execution_schedule': 'every_5min'}
+        if strategy_id not in base:
+            executor.strategy_executor.strategies[strategy_id] = {
+                **strategy, 'name': f"{strategy['name']} #{strategy_id}", 'slug': f"lt{strategy_id}"
+            }
+    executor.scheduler = StrategyScheduler(executor.strategy_config)
+
+    names = list(executor.base_universes)
+    for i, name in enumerate(names):
+        executor.base_universes[name] = symbols[i::len(names)]
+
+
+def _spread(values: List[float]) -> Dict[str, Optional[float]]:
+    values = sorted(values)
+    return {
+        'median': values[len(values) // 2] if values else None,
+        'max': values[-1] if values else None
+    }
+
+
+def load_test_trading_executor(
+    strategies: int = 50,
+    symbols: int = 300,
+    cycles: int = 3,
+    start: str = '2026-03-02T15:00:00Z',
+    step_minutes: int = 5,
+    rate_limit: int = None,
+    server_rate_limit: int = None,
+    seed: int = 0,
+    **server_options
+) -> Dict[str, Any]:
+    """
+    Run TradingExecutor.run_strategy_execution for ``cycles`` cycles,
+    ``step_minutes`` apart from ``start`` (a session time), against a fake
+    server over synthetic bars.
+
+    Args:
+        strategies: Strategies run each cycle (see scale_strategies)
+        symbols: Synthetic symbols split across the base universes
+        rate_limit: Client requests per minute (default: config.ALPACA_RATE_LIMIT)
+        server_rate_limit: Requests per minute the server accepts (default: unlimited)
+        seed: Seed for the bars and the server's injected errors
+        server_options: Other FakeAlpacaServer options (latency, jitter,
+            error_rate, throttle_rate, fill_delay)
+
+    Returns:
+        Per-cycle timings and request counts, throughput, seconds per stage
+        (from the telemetry registry, so cumulative over the process), order
+        latency, and the client's and server's request stats
+    """
+    scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+    sys.path.insert(0, os.path.abspath(scripts_dir))
+    from execute_trades import TradingExecutor
+
+    start = pd.Timestamp(start)
+    start = (start.tz_localize('UTC') if start.tzinfo is None else start.tz_convert('UTC')).to_pydatetime()
+    universe = synthetic_symbols(symbols)
+    broker = ReplayAlpacaClient(synthetic_store(universe, start, seed=seed))
+    broker.set_time(start)
+
+    history = []
+    with FakeAlpacaServer(broker, rate_limit=server_rate_limit, seed=seed, **server_options) as server:
+        client = FakeAlpacaClient(server, rate_limiter=TokenBucket(rate_limit or config.ALPACA_RATE_LIMIT))
+        executor = TradingExecutor(client=client, publish=False, data_source='alpaca')
+        scale_strategies(executor, strategies, universe)
+
+        for cycle in range(cycles):
+            moment = start + timedelta(minutes=step_minutes * cycle)
+            broker.set_time(moment)
+            requests_before = client.stats['requests']
+            started = time.perf_counter()
+            result = executor.run_strategy_execution()
+            elapsed = time.perf_counter() - started
+            history.append({
+                'time': moment.isoformat(),
+                'seconds': round(elapsed, 3),
+                'strategies_run': result.get('strategies_run', 0),
+                'trades': result.get('trades_executed', 0),
+                'requests': client.stats['requests'] - requests_before
+            })
+
+        server_stats = server.get_stats()
+
+    seconds = sum(cycle['seconds'] for cycle in history)
+    return {
+        'strategies': len(executor.strategy_config),
+        'symbols': len(universe),
+        'cycles': history,
+        'cycle_seconds': _spread([cycle['seconds'] for cycle in history]),
+        'strategies_per_second': round(sum(c['strategies_run'] for c in history) / seconds, 1) if seconds else None,
+        'stages': [row for row in metrics.stage_budget() if row['executor'] == 'trading'],
+        'orders': executor.strategy_executor.order_manager.get_stats(),
+        'client': dict(client.stats),
+        'server': server_stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake Alpaca server and executor load test')
+    parser.add_argument('--serve', action='store_true', help='Only run the server until interrupted')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--strategies', type=int, default=50)
+    parser.add_argument('--symbols', type=int, default=300)
+    parser.add_argument('--cycles', type=int, default=3)
+    parser.add_argument('--step', type=int, default=5, help='Minutes between cycles')
+    parser.add_argument('--start', default='2026-03-02T15:00:00Z', help='Simulated time of the first cycle')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many more seconds per response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered 503')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered 429')
+    parser.add_argument('--server-rate-limit', type=int, default=None, help='Server requests per minute')
+    parser.add_argument('--rate-limit', type=int, default=None, help='Client requests per minute')
+    parser.add_argument('--fill-delay', type=float, default=0.0, help='Seconds before orders report filled')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server_options = {
+        'latency': args.latency, 'jitter': args.jitter, 'error_rate': args.error_rate,
+        'throttle_rate': args.throttle_rate, 'fill_delay': args.fill_delay
+    }
+
+    if args.serve:
+        broker = ReplayAlpacaClient(synthetic_store(synthetic_symbols(args.symbols), args.start, seed=args.seed))
+        broker.set_time(args.start)
+        server = FakeAlpacaServer(broker, port=args.port, rate_limit=args.server_rate_limit,
+                                  seed=args.seed, **server_options)
+        print(f"Serving {args.symbols} symbols at {server.url}/v2 (simulated time {broker.now().isoformat()})")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.httpd.server_close()
+        return
+
+    if not args.verbose:
+        # The executors log every order and signal; keep the report readable
+        logging.disable(logging.INFO)
+    result = load_test_trading_executor(
+        args.strategies, args.symbols, args.cycles, args.start, args.step,
+        args.rate_limit, args.server_rate_limit, args.seed, **server_options
+    )
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == '__main__':
+    main()
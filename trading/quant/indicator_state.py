@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Indicator State — warm indicator state carried between executor runs.
+
+The executors recompute every indicator from the full downloaded history on
+each 5-minute tick although only one bar is new. The state store keeps, per
+symbol, bar interval and feature (EMA, RSI, MACD, ATR and the rolling
+windows behind SMA, Bollinger bands and rolling mean/std), the recursion
+state after the last completed bar, and advances it with the new bars only.
+State is persisted to SQLite so it survives PM2 restarts.
+
+The newest bar of a download may still be forming (the current 5-minute or
+daily bar), so it is never committed: it is evaluated provisionally from the
+committed state on every call. Before advancing, the last committed bars are
+compared with the download; a correction (or a gap in the history) triggers
+a full rebuild from the bars at hand.
+
+On an incremental update only the retained tail of each feature is known, so
+returned series are NaN before it. Live rules read the latest bars only;
+backtests use a FeatureCache without a state store.
+
+Usage:
+    python3 indicator_state.py --info
+    python3 indicator_state.py --clear AAPL
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+import config
+
+logger = logging.getLogger(__name__)
+
+CHECK_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def bar_interval(index: pd.Index) -> Optional[str]:
+    """Interval label of a bar index ('5Min', '1Day', ...), None for fewer than two bars."""
+    if len(index) < 2:
+        return None
+    recent = index[-10:]
+    seconds = (recent[1:] - recent[:-1]).min().total_seconds()
+    if seconds >= 20 * 3600:
+        return '1Day'
+    return f'{max(int(seconds // 60), 1)}Min'
+
+
+# Indicator recursions. Each spec rebuilds its state from a history (matching
+# utils.indicators on that history) and steps it by one bar, returning the
+# new state and the output values in the order of ``outputs``.
+
+class _Spec:
+    outputs: Optional[Tuple[str, ...]] = None  # None: the feature is a single Series
+
+    def warm(self, n: int) -> bool:
+        raise NotImplementedError
+
+    def rebuild(self, data: pd.DataFrame) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def step(self, state: Dict[str, Any], bar: Dict[str, float]) -> Tuple[Dict[str, Any], List[float]]:
+        raise NotImplementedError
+
+
+class _Ema(_Spec):
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+
+    def warm(self, n):
+        return n >= self.period
+
+    def rebuild(self, data):
+        return {'value': float(data['close'].ewm(span=self.period, adjust=False).mean().iloc[-1])}
+
+    def step(self, state, bar):
+        value = self.alpha * bar['close'] + (1 - self.alpha) * state['value']
+        return {'value': value}, [value]
+
+
+class _Rsi(_Spec):
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 1.0 / period
+
+    def warm(self, n):
+        return n >= self.period
+
+    def rebuild(self, data):
+        diff = data['close'].diff(1)
+        up = diff.where(diff > 0, 0.0).ewm(alpha=self.alpha, adjust=False).mean()
+        down = (-diff.where(diff < 0, 0.0)).ewm(alpha=self.alpha, adjust=False).mean()
+        return {'close': float(data['close'].iloc[-1]), 'up': float(up.iloc[-1]), 'down': float(down.iloc[-1])}
+
+    def step(self, state, bar):
+        diff = bar['close'] - state['close']
+        up = (1 - self.alpha) * state['up'] + self.alpha * max(diff, 0.0)
+        down = (1 - self.alpha) * state['down'] + self.alpha * max(-diff, 0.0)
+        rsi = 100.0 if down == 0 else 100 - 100 / (1 + up / down)
+        return {'close': bar['close'], 'up': up, 'down': down}, [rsi]
+
+
+class _Macd(_Spec):
+    outputs = ('macd', 'macd_signal', 'macd_histogram')
+
+    def __init__(self, fast: int, slow: int, signal: int):
+        self.fast, self.slow, self.signal = fast, slow, signal
+
+    def warm(self, n):
+        return n >= self.slow + self.signal - 1
+
+    def rebuild(self, data):
+        close = data['close']
+        fast = close.ewm(span=self.fast, adjust=False).mean()
+        slow = close.ewm(span=self.slow, adjust=False).mean()
+        macd = (fast - slow).where(close.expanding().count() >= self.slow)
+        signal = macd.ewm(span=self.signal, adjust=False).mean()
+        return {'fast': float(fast.iloc[-1]), 'slow': float(slow.iloc[-1]), 'signal': float(signal.iloc[-1])}
+
+    def step(self, state, bar):
+        close = bar['close']
+        fast = state['fast'] + 2.0 / (self.fast + 1) * (close - state['fast'])
+        slow = state['slow'] + 2.0 / (self.slow + 1) * (close - state['slow'])
+        macd = fast - slow
+        signal = state['signal'] + 2.0 / (self.signal + 1) * (macd - state['signal'])
+        return {'fast': fast, 'slow': slow, 'signal': signal}, [macd, signal, macd - signal]
+
+
+class _Atr(_Spec):
+    def __init__(self, period: int):
+        self.period = period
+
+    def warm(self, n):
+        return n >= self.period
+
+    def rebuild(self, data):
+        prev_close = data['close'].shift(1)
+        true_range = pd.concat([
+            data['high'] - data['low'], (data['high'] - prev_close).abs(), (data['low'] - prev_close).abs()
+        ], axis=1).max(axis=1).values
+        atr = true_range[:self.period].mean()
+        for value in true_range[self.period:]:
+            atr = (atr * (self.period - 1) + value) / self.period
+        return {'close': float(data['close'].iloc[-1]), 'atr': float(atr)}
+
+    def step(self, state, bar):
+        prev_close = state['close']
+        true_range = max(bar['high'] - bar['low'], abs(bar['high'] - prev_close), abs(bar['low'] - prev_close))
+        atr = (state['atr'] * (self.period - 1) + true_range) / self.period
+        return {'close': bar['close'], 'atr': atr}, [atr]
+
+
+class _Rolling(_Spec):
+    """Rolling mean / std / Bollinger bands over the last ``period`` values of a column."""
+
+    def __init__(self, kind: str, column: str, period: int, std_dev: float = 2.0):
+        self.kind, self.column, self.period, self.std_dev = kind, column, period, std_dev
+        if kind == 'bollinger':
+            self.outputs = ('upper', 'middle', 'lower')
+
+    def warm(self, n):
+        return n >= self.period
+
+    def rebuild(self, data):
+        return {'window': [float(v) for v in data[self.column].values[-self.period:]]}
+
+    def step(self, state, bar):
+        window = state['window'][1:] + [bar[self.column]]
+        values = np.array(window)
+        mean = values.mean()
+        if self.kind == 'mean':
+            return {'window': window}, [mean]
+        if self.kind == 'std':
+            return {'window': window}, [values.std(ddof=1)]
+        band = self.std_dev * values.std(ddof=0)
+        return {'window': window}, [mean + band, mean, mean - band]
+
+
+def make_spec(key: Hashable) -> Optional[_Spec]:
+    """Recursion for a FeatureCache key, or None when the feature has no incremental form."""
+    if not isinstance(key, tuple) or not key:
+        return None
+    name, params = key[0], key[1:]
+    if name == 'ema':
+        return _Ema(*params)
+    if name == 'rsi':
+        return _Rsi(*params)
+    if name == 'macd':
+        return _Macd(*params)
+    if name == 'atr':
+        return _Atr(*params)
+    if name == 'sma':
+        return _Rolling('mean', 'close', *params)
+    if name == 'rolling_mean':
+        return _Rolling('mean', *params)
+    if name == 'rolling_std':
+        return _Rolling('std', *params)
+    if name == 'bollinger':
+        return _Rolling('bollinger', 'close', *params)
+    return None
+
+
+def _bar(row: Tuple, columns: List[str]) -> Dict[str, float]:
+    return {column: float(value) for column, value in zip(columns, row)}
+
+
+def _stamp(ts: pd.Timestamp) -> str:
+    return (ts.tz_convert('UTC') if ts.tzinfo is not None else ts).isoformat()
+
+
+def _positions(index: pd.DatetimeIndex, stamps: List[str]) -> np.ndarray:
+    """Positions of stored timestamps in ``index`` (-1 where absent)."""
+    stamps = pd.DatetimeIndex(stamps)
+    if index.tz is not None and stamps.tz is not None:
+        stamps = stamps.tz_convert(index.tz)
+    elif (index.tz is None) != (stamps.tz is None):
+        return np.full(len(stamps), -1)
+    return index.get_indexer(stamps)
+
+
+def _check_row(ts: pd.Timestamp, bar: Dict[str, float]) -> List:
+    return [_stamp(ts)] + [bar.get(field) for field in CHECK_FIELDS]
+
+
+class IndicatorStateStore:
+    """Persistent per-symbol indicator state, advanced with new bars only."""
+
+    def __init__(self, path: str = None, tail: int = None, check_bars: int = None):
+        """
+        Args:
+            path: SQLite path (default: config.INDICATOR_STATE_PATH; ':memory:' for tests)
+            tail: Committed output values kept per feature (default: config.INDICATOR_STATE_TAIL)
+            check_bars: Committed bars compared with each download (default: config.INDICATOR_STATE_CHECK_BARS)
+        """
+        self.path = path or config.INDICATOR_STATE_PATH
+        self.tail = tail or config.INDICATOR_STATE_TAIL
+        self.check_bars = check_bars or config.INDICATOR_STATE_CHECK_BARS
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS indicator_state (
+                symbol TEXT NOT NULL,
+                interval TEXT NOT NULL,
+                state TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (symbol, interval)
+            )
+        """)
+        self.conn.commit()
+        self._records: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._dirty = set()
+        self._specs: Dict[Hashable, Optional[_Spec]] = {}
+        self._lock = threading.RLock()
+        self.stats = {'advanced': 0, 'rebuilt': 0, 'corrected': 0}
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def supports(self, key: Hashable) -> bool:
+        """Whether a FeatureCache key has an incremental form."""
+        if key not in self._specs:
+            self._specs[key] = make_spec(key)
+        return self._specs[key] is not None
+
+    def _record(self, symbol: str, interval: str) -> Dict[str, Any]:
+        record_key = (symbol, interval)
+        if record_key not in self._records:
+            row = self.conn.execute(
+                "SELECT state FROM indicator_state WHERE symbol = ? AND interval = ?", record_key
+            ).fetchone()
+            self._records[record_key] = json.loads(row[0]) if row else {}
+        return self._records[record_key]
+
+    def get(
+        self,
+        symbol: str,
+        data: pd.DataFrame,
+        key: Hashable,
+        compute: Callable[[pd.DataFrame], Any]
+    ) -> Any:
+        """
+        Feature value for ``data``, advancing the stored state instead of recomputing.
+
+        Args:
+            symbol: Symbol the bars belong to
+            data: OHLCV bars, oldest first; the last bar may still be forming
+            key: FeatureCache key, e.g. ('rsi', 14)
+            compute: Full computation, used when the state has to be rebuilt
+
+        Returns:
+            The feature in the shape ``compute`` returns (Series or dict of Series)
+        """
+        interval = bar_interval(data.index)
+        if interval is None or not self.supports(key):
+            return compute(data)
+
+        spec = self._specs[key]
+        feature = json.dumps(list(key))
+        columns = [field for field in CHECK_FIELDS if field in data.columns]
+        committed = len(data) - 1
+
+        with self._lock:
+            record = self._record(symbol, interval)
+            entry = record.get(feature)
+            start = self._resume_position(entry, data, symbol, key) if entry else None
+
+            if start is None:
+                return self._rebuild(symbol, interval, record, feature, spec, data, compute)
+
+            state, tail = entry['state'], entry['tail']
+            rows = list(data[columns].iloc[start:].itertuples(index=False, name=None))
+            for position, row in zip(range(start, committed), rows):
+                bar = _bar(row, columns)
+                state, values = spec.step(state, bar)
+                tail.append([_stamp(data.index[position]), values])
+                entry['check'].append(_check_row(data.index[position], bar))
+            _, provisional = spec.step(state, _bar(rows[-1], columns))
+
+            if start < committed:
+                entry['state'] = state
+                entry['last_ts'] = _stamp(data.index[committed - 1])
+                entry['tail'] = tail[-self.tail:]
+                entry['check'] = entry['check'][-self.check_bars:]
+                self._dirty.add((symbol, interval))
+            self.stats['advanced'] += 1
+
+        return self._series(data, spec, entry['tail'], provisional)
+
+    def _resume_position(self, entry: Dict[str, Any], data: pd.DataFrame, symbol: str, key: Hashable) -> Optional[int]:
+        """Position of the first uncommitted bar, or None when the state cannot be advanced."""
+        index = data.index
+        last = _positions(index, [entry['last_ts']])[0]
+        if last < 0 or last >= len(index) - 1:
+            return None  # history moved past the state, or the committed bar is now the newest
+
+        positions = _positions(index, [row[0] for row in entry['check']])
+        if (positions < 0).any():
+            return None
+        for row, position in zip(entry['check'], positions):
+            current = [float(data[field].iloc[position]) if field in data else None for field in CHECK_FIELDS]
+            for old, new in zip(row[1:], current):
+                if (old is None) != (new is None) or (
+                        old is not None and not np.isclose(old, new, rtol=1e-9, equal_nan=True)):
+                    logger.info(f"Bars for {symbol} corrected at {row[0]}, rebuilding {key}")
+                    self.stats['corrected'] += 1
+                    return None
+
+        return last + 1
+
+    def _rebuild(self, symbol, interval, record, feature, spec, data, compute):
+        """Full computation; commits the state through the second-to-last bar when warm."""
+        value = compute(data)
+        self.stats['rebuilt'] += 1
+        committed = data.iloc[:-1]
+        if not spec.warm(len(committed)):
+            record.pop(feature, None)
+            return value
+
+        outputs = [value] if spec.outputs is None else [value[name] for name in spec.outputs]
+        tail_index = committed.index[-self.tail:]
+        tail = [
+            [_stamp(ts), [float(series.iloc[position]) for series in outputs]]
+            for position, ts in zip(range(len(committed) - len(tail_index), len(committed)), tail_index)
+        ]
+        check = [
+            _check_row(ts, {field: float(committed[field].iloc[position]) for field in CHECK_FIELDS if field in committed})
+            for position, ts in zip(range(len(committed) - self.check_bars, len(committed)),
+                                    committed.index[-self.check_bars:])
+            if position >= 0
+        ]
+        record[feature] = {
+            'last_ts': _stamp(committed.index[-1]),
+            'state': spec.rebuild(committed),
+            'tail': tail,
+            'check': check,
+        }
+        self._dirty.add((symbol, interval))
+        return value
+
+    def _series(self, data: pd.DataFrame, spec: _Spec, tail: List, provisional: List[float]):
+        """Outputs aligned with ``data``: the committed tail and the provisional last bar."""
+        values = np.full((len(data), len(provisional)), np.nan)
+        positions = _positions(data.index, [ts for ts, _ in tail])
+        for position, (_, row) in zip(positions, tail):
+            if position >= 0:
+                values[position] = row
+        values[-1] = provisional
+
+        if spec.outputs is None:
+            return pd.Series(values[:, 0], index=data.index)
+        return {name: pd.Series(values[:, i], index=data.index) for i, name in enumerate(spec.outputs)}
+
+    def save(self) -> int:
+        """Persist states changed since the last save. Returns the number of rows written."""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            updated_at = datetime.now(timezone.utc).isoformat()
+            rows = [
+                (symbol, interval, json.dumps(self._records[(symbol, interval)]), updated_at)
+                for symbol, interval in sorted(self._dirty)
+            ]
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO indicator_state (symbol, interval, state, updated_at) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+            self._dirty.clear()
+            return len(rows)
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """Drop the state of one symbol (or all), forcing a rebuild."""
+        with self._lock, self.conn:
+            if symbol is None:
+                self.conn.execute("DELETE FROM indicator_state")
+                self._records.clear()
+                self._dirty.clear()
+            else:
+                self.conn.execute("DELETE FROM indicator_state WHERE symbol = ?", (symbol,))
+                for record_key in [k for k in self._records if k[0] == symbol]:
+                    self._records.pop(record_key)
+                    self._dirty.discard(record_key)
+
+    def get_info(self) -> Dict[str, Any]:
+        """Stored symbols per interval, last update and run statistics."""
+        rows = self.conn.execute(
+            "SELECT interval, COUNT(*), MAX(updated_at) FROM indicator_state GROUP BY interval ORDER BY interval"
+        )
+        return {
+            'intervals': {interval: {'symbols': count, 'updated_at': updated_at} for interval, count, updated_at in rows},
+            'stats': dict(self.stats),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Persistent indicator state')
+    parser.add_argument('--db', default=None, help='State path (default: config.INDICATOR_STATE_PATH)')
+    parser.add_argument('--info', action='store_true', help='Print stored symbols per interval')
+    parser.add_argument('--clear', nargs='?', const='*', metavar='SYMBOL', help='Drop state (all symbols if omitted)')
+    args = parser.parse_args()
+
+    store = IndicatorStateStore(args.db)
+
+    if args.clear:
+        store.clear(None if args.clear == '*' else args.clear.upper())
+    print(json.dumps(store.get_info(), indent=2))
+
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""
+Strategy Isolation — run a cycle's strategies side by side, each within a time budget.
+
+Strategies used to run one after another, so a slow data call in one delayed
+every strategy after it, and a hang could overrun the next 5-minute tick.
+run_isolated() runs each strategy on its own thread, within its own time
+budget counted from when it starts. An exception is reported for that
+strategy alone, and a strategy still running when its budget expires is
+reported as timed out and skipped. Its thread cannot be stopped, so it is
+flagged instead: cancelled() turns true on that thread, and executors check
+it before placing an order, so a strategy that overran never trades late.
+A skipped strategy no longer counts against max_workers, so a hung strategy
+cannot hold back the ones queued behind it.
+
+Executors queue each finished strategy's orders after the run, in strategy
+order, so a cycle nets and sends the same orders as a sequential run.
+Account positions that strategies check and claim while they run are
+shared through a RiskView, whose check-and-update is atomic; the claims of
+a strategy whose trades are dropped are released.
+
+Usage:
+    outcomes = run_isolated({
+        strategy_id: partial(executor.execute_strategy, strategy_id)
+        for strategy_id in executor.strategies
+    }, timeout=config.STRATEGY_TIMEOUT, timeouts=config.STRATEGY_TIMEOUTS)
+    for strategy_id, outcome in outcomes.items():
+        print(strategy_id, outcome.status, outcome.seconds)
+"""
+
+import time
+import queue
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def cancelled() -> bool:
+    """True on the thread of a strategy that overran its budget (and was skipped)."""
+    flag = getattr(_local, 'cancelled', None)
+    return flag is not None and flag.is_set()
+
+
+@dataclass
+class StrategyOutcome:
+    """How one strategy's run ended: 'ok', 'error' or 'timed_out' (seconds: from its start)."""
+    status: str
+    value: Any = None
+    error: Optional[str] = None
+    seconds: Optional[float] = None
+
+    @property
+    def success(self) -> bool:
+        return self.status == 'ok'
+
+
+def _run_flagged(
+    key: Hashable, task: Callable[[], Any], flag: threading.Event, results: "queue.Queue"
+) -> None:
+    _local.cancelled = flag
+    try:
+        results.put((key, task(), None))
+    except Exception as e:
+        results.put((key, None, e))
+    finally:
+        _local.cancelled = None
+
+
+def run_isolated(
+    tasks: Dict[Hashable, Callable[[], Any]],
+    timeout: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    timeouts: Optional[Dict[Hashable, float]] = None
+) -> Dict[Hashable, StrategyOutcome]:
+    """
+    Run tasks concurrently, each on its own thread.
+
+    Each task's budget runs from when it starts, so with fewer workers than
+    tasks, queued tasks do not lose time waiting. A task still running when
+    its budget expires is flagged (see cancelled()) and abandoned, and its
+    worker slot goes to the next queued task.
+
+    Args:
+        tasks: key -> callable taking no arguments
+        timeout: Seconds each task may take (None or 0: unlimited)
+        max_workers: Tasks running at once (None or 0: all of them)
+        timeouts: key -> seconds, overriding ``timeout`` for that task
+
+    Returns:
+        key -> StrategyOutcome, in the order of ``tasks``
+    """
+    if not tasks:
+        return {}
+
+    timeouts = timeouts or {}
+    limit = max_workers or len(tasks)
+    queued = list(tasks)
+    running: Dict[Hashable, Tuple[float, threading.Event]] = {}
+    results: "queue.Queue" = queue.Queue()
+    outcomes = {}
+
+    while queued or running:
+        while queued and len(running) < limit:
+            key = queued.pop(0)
+            flag = threading.Event()
+            running[key] = (time.perf_counter(), flag)
+            threading.Thread(
+                target=_run_flagged, args=(key, tasks[key], flag, results), name=f"strategy-{key}", daemon=True
+            ).start()
+
+        deadlines = {}
+        for key, (started, _) in running.items():
+            budget = timeouts.get(key, timeout)
+            if budget:
+                deadlines[key] = started + budget
+        wait = None if not deadlines else max(0.0, min(deadlines.values()) - time.perf_counter())
+
+        try:
+            key, value, error = results.get(timeout=wait)
+        except queue.Empty:
+            pass
+        else:
+            # Results of tasks already abandoned are dropped
+            if key in running:
+                started, _ = running.pop(key)
+                seconds = time.perf_counter() - started
+                if error is None:
+                    outcomes[key] = StrategyOutcome('ok', value, seconds=seconds)
+                else:
+                    logger.error(f"Strategy {key} failed: {error}")
+                    outcomes[key] = StrategyOutcome('error', error=str(error), seconds=seconds)
+
+        now = time.perf_counter()
+        for key, deadline in deadlines.items():
+            if key in running and now >= deadline:
+                started, flag = running.pop(key)
+                flag.set()
+                budget = timeouts.get(key, timeout)
+                logger.warning(f"Strategy {key} exceeded its {budget}s budget and was skipped")
+                outcomes[key] = StrategyOutcome(
+                    'timed_out', error=f"exceeded the {budget}s budget", seconds=now - started
+                )
+
+    return {key: outcomes[key] for key in tasks}
+
+
+class RiskView:
+    """
+    Account positions shared by strategies running at once.
+
+    Strategies claim a symbol before ordering it: open() records a buy only
+    if the symbol is not held, and close() takes a held position for a sell.
+    Each claim is one atomic check-and-update, so two strategies cannot both
+    buy a symbol neither held, or both sell the same position.
+
+    Claims made with an ``owner`` are remembered, so release(owner) can roll
+    back the claims of a strategy whose trades were dropped (it timed out or
+    failed); the owner's later claims are refused.
+    """
+
+    def __init__(self, positions: Dict[str, Dict[str, Any]] = None):
+        self._positions = dict(positions or {})
+        self._lock = threading.Lock()
+        self._claims: Dict[Hashable, List[Tuple[str, str, Dict[str, Any]]]] = {}
+        self._released = set()
+
+    def __contains__(self, symbol: str) -> bool:
+        with self._lock:
+            return symbol in self._positions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._positions)
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._positions.get(symbol)
+
+    def open(self, symbol: str, position: Dict[str, Any], owner: Hashable = None) -> bool:
+        """Claim a buy: record the position, unless the symbol is already held."""
+        with self._lock:
+            if symbol in self._positions or owner in self._released:
+                return False
+            self._positions[symbol] = position
+            if owner is not None:
+                self._claims.setdefault(owner, []).append(('open', symbol, position))
+            return True
+
+    def close(self, symbol: str, owner: Hashable = None) -> Optional[Dict[str, Any]]:
+        """Claim a sell: remove and return the held position (None when not held)."""
+        with self._lock:
+            if owner in self._released:
+                return None
+            position = self._positions.pop(symbol, None)
+            if owner is not None and position is not None:
+                self._claims.setdefault(owner, []).append(('close', symbol, position))
+            return position
+
+    def release(self, owner: Hashable) -> int:
+        """
+        Roll back an owner's claims, newest first, and refuse its later ones.
+
+        A buy is undone only while the symbol still holds the claimed position,
+        and a sell only while the symbol is not held again.
+
+        Returns:
+            Number of claims rolled back
+        """
+        with self._lock:
+            self._released.add(owner)
+            undone = 0
+            for action, symbol, position in reversed(self._claims.pop(owner, [])):
+                if action == 'open' and self._positions.get(symbol) is position:
+                    del self._positions[symbol]
+                    undone += 1
+                elif action == 'close' and symbol not in self._positions:
+                    self._positions[symbol] = position
+                    undone += 1
+            return undone
+
+    def positions(self) -> Dict[str, Dict[str, Any]]:
+        """Copy of the current positions."""
+        with self._lock:
+            return dict(self._positions)
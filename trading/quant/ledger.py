@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Position Ledger — persisted per-strategy positions, cost basis and cash.
+
+Each strategy's ledger is updated from new fills only: every sync records how
+far it has read the order history (synced_through, the query time less an
+overlap) and the next sync asks Alpaca only for orders submitted after it.
+A sync therefore costs O(new orders) however long the strategy has been
+trading, and whether or not it has filled anything lately. Applied fills are
+recorded by order id, so overlapping queries and re-syncs never apply a fill
+twice. Orders crossed between strategies (netting.py) are recorded as
+internal fills, kept across rebuilds.
+
+Tables (in trading.db):
+    strategy_ledger            strategy_id, slug, initial_capital, cash, synced_through, last_fill_at, last_order_id
+    strategy_ledger_positions  strategy_id, symbol, quantity, total_cost, last_buy_time
+    strategy_ledger_fills      order_id, strategy_id, symbol, side, quantity, price, filled_at
+
+Usage:
+    python3 ledger.py --status
+    python3 ledger.py --rebuild 2
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alpaca_client import parse_time
+import config
+
+logger = logging.getLogger(__name__)
+
+# Orders are queried by submission time but applied by fill time; day orders
+# fill (or expire) within a session, so re-reading one day before the last
+# sync catches any order submitted earlier but filled after it.
+SYNC_OVERLAP = timedelta(days=1)
+
+# Positions smaller than this are treated as closed
+MIN_QUANTITY = 0.001
+
+
+class PositionLedger:
+    """Incrementally maintained per-strategy ledger backed by SQLite."""
+
+    def __init__(self, client, db_path: str = None):
+        """
+        Args:
+            client: Alpaca client the fills are read from
+            db_path: SQLite database (default: trading.db next to the server; ':memory:' for replay)
+        """
+        self.alpaca = client
+        self.db_path = db_path or config.LEDGER_DB_PATH
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection, opened (and the tables created) on first use."""
+        if self._conn is None:
+            if self.db_path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS strategy_ledger (
+                    strategy_id INTEGER PRIMARY KEY,
+                    slug TEXT NOT NULL,
+                    initial_capital REAL NOT NULL,
+                    cash REAL NOT NULL,
+                    synced_through TEXT,
+                    last_fill_at TEXT,
+                    last_order_id TEXT,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE TABLE IF NOT EXISTS strategy_ledger_positions (
+                    strategy_id INTEGER NOT NULL,
+                    symbol TEXT NOT NULL,
+                    quantity REAL NOT NULL,
+                    total_cost REAL NOT NULL,
+                    last_buy_time TEXT,
+                    PRIMARY KEY (strategy_id, symbol)
+                );
+                CREATE TABLE IF NOT EXISTS strategy_ledger_fills (
+                    order_id TEXT PRIMARY KEY,
+                    strategy_id INTEGER NOT NULL,
+                    client_order_id TEXT,
+                    symbol TEXT NOT NULL,
+                    side TEXT NOT NULL,
+                    quantity REAL NOT NULL,
+                    price REAL NOT NULL,
+                    filled_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_ledger_fills_strategy
+                    ON strategy_ledger_fills (strategy_id, filled_at);
+            """)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(strategy_ledger)")}
+            if 'synced_through' not in columns:
+                # Older ledgers read the full history once, then sync incrementally
+                self._conn.execute("ALTER TABLE strategy_ledger ADD COLUMN synced_through TEXT")
+            self._conn.commit()
+        return self._conn
+
+    def close(self):
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _ensure_ledger(self, strategy_id: int, slug: str, initial_capital: float) -> Tuple[float, Optional[str]]:
+        """(cash, synced_through) for a strategy, creating its ledger at initial capital."""
+        row = self.conn.execute(
+            "SELECT cash, synced_through FROM strategy_ledger WHERE strategy_id = ?", (strategy_id,)
+        ).fetchone()
+        if row:
+            return row[0], row[1]
+
+        self.conn.execute(
+            "INSERT INTO strategy_ledger (strategy_id, slug, initial_capital, cash) VALUES (?, ?, ?, ?)",
+            (strategy_id, slug, initial_capital, initial_capital)
+        )
+        self.conn.commit()
+        return initial_capital, None
+
+    def sync(self, strategy_id: int, slug: str, initial_capital: float) -> int:
+        """
+        Apply fills for a strategy's orders that the ledger has not seen yet.
+
+        Args:
+            strategy_id: Strategy ID
+            slug: client_order_id prefix of the strategy's orders
+            initial_capital: Starting cash for a new ledger
+
+        Returns:
+            Number of fills applied
+        """
+        with self._lock:
+            _, after = self._ensure_ledger(strategy_id, slug, initial_capital)
+            synced_through = self._sync_mark()
+            orders = self.alpaca.iter_orders(status='closed', after=after)
+            applied = self._apply(strategy_id, self._unseen_fills(orders, slug))
+            self._set_synced_through([strategy_id], synced_through)
+            return applied
+
+    def sync_all(self, strategies: Dict[int, Tuple[str, float]]) -> Dict[int, int]:
+        """
+        Apply new fills for several strategies from one order query (read from
+        the oldest sync among them).
+
+        Args:
+            strategies: strategy_id -> (slug, initial_capital)
+
+        Returns:
+            strategy_id -> number of fills applied
+        """
+        with self._lock:
+            marks = [
+                self._ensure_ledger(strategy_id, slug, initial_capital)[1]
+                for strategy_id, (slug, initial_capital) in strategies.items()
+            ]
+            after = None
+            if marks and all(marks):
+                after = min(marks, key=parse_time)
+
+            synced_through = self._sync_mark()
+            orders = list(self.alpaca.iter_orders(status='closed', after=after))
+            applied = {
+                strategy_id: self._apply(strategy_id, self._unseen_fills(orders, slug))
+                for strategy_id, (slug, _) in strategies.items()
+            }
+            self._set_synced_through(list(strategies), synced_through)
+            return applied
+
+    def _sync_mark(self) -> str:
+        """Where the next sync may start reading, for a query made now."""
+        return (self.alpaca.now() - SYNC_OVERLAP).isoformat()
+
+    def _set_synced_through(self, strategy_ids: List[int], synced_through: str) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE strategy_ledger SET synced_through = ? WHERE strategy_id = ?",
+                [(synced_through, strategy_id) for strategy_id in strategy_ids]
+            )
+
+    def _unseen_fills(self, orders: Iterable[Dict[str, Any]], slug: str) -> List[Dict[str, Any]]:
+        """A strategy's filled orders not yet in the ledger, oldest fill first."""
+        prefix = f"{slug}-"
+        fills = [
+            order for order in orders
+            if (order.get('client_order_id') or '').startswith(prefix)
+            and float(order.get('filled_qty') or 0) > 0
+            and order.get('filled_avg_price')
+        ]
+        if not fills:
+            return []
+
+        known = set()
+        ids = [order['id'] for order in fills]
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            known.update(row[0] for row in self.conn.execute(
+                f"SELECT order_id FROM strategy_ledger_fills WHERE order_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            ))
+        return sorted(
+            (order for order in fills if order['id'] not in known),
+            key=lambda order: parse_time(order.get('filled_at') or order.get('created_at'))
+        )
+
+    def _apply(self, strategy_id: int, orders: List[Dict[str, Any]]) -> int:
+        """Apply filled orders, oldest first, in one transaction."""
+        if not orders:
+            return 0
+
+        conn = self.conn
+        cash, last_fill_at = conn.execute(
+            "SELECT cash, last_fill_at FROM strategy_ledger WHERE strategy_id = ?", (strategy_id,)
+        ).fetchone()
+        positions = {
+            symbol: {'quantity': quantity, 'total_cost': total_cost, 'last_buy_time': last_buy_time}
+            for symbol, quantity, total_cost, last_buy_time in conn.execute(
+                "SELECT symbol, quantity, total_cost, last_buy_time FROM strategy_ledger_positions "
+                "WHERE strategy_id = ?", (strategy_id,)
+            )
+        }
+
+        last_order_id = None
+        with conn:
+            for order in orders:
+                symbol = order['symbol']
+                side = order['side']
+                qty = float(order['filled_qty'])
+                fill_price = float(order['filled_avg_price'])
+                filled_at = order.get('filled_at') or order.get('created_at')
+                cost = qty * fill_price
+
+                pos = positions.setdefault(symbol, {'quantity': 0.0, 'total_cost': 0.0, 'last_buy_time': None})
+                if side == 'buy':
+                    pos['quantity'] += qty
+                    pos['total_cost'] += cost
+                    pos['last_buy_time'] = filled_at
+                    cash -= cost
+                elif side == 'sell':
+                    if pos['quantity'] > 0:
+                        # Reduce cost basis proportionally for the shares sold
+                        pos['total_cost'] -= (qty / pos['quantity']) * pos['total_cost']
+                    pos['quantity'] -= qty
+                    cash += cost
+
+                if parse_time(filled_at) < parse_time(last_fill_at or filled_at):
+                    logger.warning(f"Ledger {strategy_id}: fill {order['id']} at {filled_at} is older "
+                                   f"than the high-water mark {last_fill_at}")
+                else:
+                    last_fill_at, last_order_id = filled_at, order['id']
+
+                conn.execute(
+                    "INSERT INTO strategy_ledger_fills "
+                    "(order_id, strategy_id, client_order_id, symbol, side, quantity, price, filled_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (order['id'], strategy_id, order.get('client_order_id'), symbol, side, qty, fill_price, filled_at)
+                )
+
+            for symbol, pos in positions.items():
+                conn.execute(
+                    "INSERT OR REPLACE INTO strategy_ledger_positions "
+                    "(strategy_id, symbol, quantity, total_cost, last_buy_time) VALUES (?, ?, ?, ?, ?)",
+                    (strategy_id, symbol, pos['quantity'], pos['total_cost'], pos['last_buy_time'])
+                )
+            conn.execute(
+                "UPDATE strategy_ledger SET cash = ?, last_fill_at = ?, "
+                "last_order_id = COALESCE(?, last_order_id), updated_at = CURRENT_TIMESTAMP "
+                "WHERE strategy_id = ?",
+                (cash, last_fill_at, last_order_id, strategy_id)
+            )
+
+        logger.debug(f"Ledger {strategy_id}: applied {len(orders)} fills, cash=${cash:.2f}")
+        return len(orders)
+
+    def record_internal_fills(
+        self,
+        strategy_id: int,
+        slug: str,
+        initial_capital: float,
+        fills: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Apply fills that never reached the broker (orders crossed against
+        another strategy's, see netting.py).
+
+        Args:
+            fills: Fills in Alpaca order format (id, client_order_id, symbol,
+                side, filled_qty, filled_avg_price, filled_at); ids must start
+                with the strategy slug and contain '-cross-'
+
+        Returns:
+            Number of fills applied
+        """
+        with self._lock:
+            self._ensure_ledger(strategy_id, slug, initial_capital)
+            return self._apply(strategy_id, fills)
+
+    def _internal_fills(self, strategy_id: int) -> List[Dict[str, Any]]:
+        """A strategy's recorded internal (crossed) fills, in Alpaca order format."""
+        rows = self.conn.execute(
+            "SELECT order_id, client_order_id, symbol, side, quantity, price, filled_at "
+            "FROM strategy_ledger_fills WHERE strategy_id = ? AND order_id LIKE '%-cross-%'",
+            (strategy_id,)
+        )
+        return [
+            {'id': order_id, 'client_order_id': client_order_id, 'symbol': symbol, 'side': side,
+             'filled_qty': quantity, 'filled_avg_price': price, 'filled_at': filled_at}
+            for order_id, client_order_id, symbol, side, quantity, price, filled_at in rows
+        ]
+
+    def get_state(
+        self,
+        strategy_id: int,
+        slug: str,
+        initial_capital: float,
+        sync: bool = True
+    ) -> Tuple[Dict[str, Dict[str, Any]], float]:
+        """
+        Open positions and available cash for a strategy.
+
+        Returns:
+            (positions, cash) where positions maps symbol ->
+            {quantity, avg_cost_basis, last_buy_time}
+        """
+        with self._lock:
+            if sync:
+                self.sync(strategy_id, slug, initial_capital)
+            cash, _ = self._ensure_ledger(strategy_id, slug, initial_capital)
+            rows = self.conn.execute(
+                "SELECT symbol, quantity, total_cost, last_buy_time FROM strategy_ledger_positions "
+                "WHERE strategy_id = ? AND quantity > ? ORDER BY symbol",
+                (strategy_id, MIN_QUANTITY)
+            ).fetchall()
+
+        positions = {
+            symbol: {
+                'quantity': quantity,
+                'avg_cost_basis': total_cost / quantity,
+                'last_buy_time': last_buy_time
+            }
+            for symbol, quantity, total_cost, last_buy_time in rows
+        }
+        return positions, cash
+
+    def versions(self) -> Dict[int, Tuple[int, str, float]]:
+        """
+        (fill count, updated_at, cash) per strategy, from one query.
+
+        Changes whenever fills are applied or a ledger is rebuilt, whichever
+        process or caller does it, so readers can cache ledger state against it.
+        """
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT l.strategy_id, l.updated_at, l.cash,
+                       (SELECT COUNT(*) FROM strategy_ledger_fills f WHERE f.strategy_id = l.strategy_id)
+                FROM strategy_ledger l
+            """).fetchall()
+        return {strategy_id: (fills, updated_at, cash) for strategy_id, updated_at, cash, fills in rows}
+
+    def rebuild(self, strategy_id: int, slug: str, initial_capital: float) -> int:
+        """
+        Discard a strategy's ledger and replay its full order history, with
+        its internal fills (which Alpaca has no record of). Returns fills applied.
+        """
+        with self._lock:
+            internal = self._internal_fills(strategy_id)
+            with self.conn:
+                for table in ('strategy_ledger', 'strategy_ledger_positions', 'strategy_ledger_fills'):
+                    self.conn.execute(f"DELETE FROM {table} WHERE strategy_id = ?", (strategy_id,))
+            self._ensure_ledger(strategy_id, slug, initial_capital)
+            synced_through = self._sync_mark()
+            orders = self._unseen_fills(self.alpaca.iter_orders(status='closed', after=None), slug)
+            applied = self._apply(strategy_id, sorted(
+                orders + internal, key=lambda order: parse_time(order.get('filled_at') or order.get('created_at'))
+            ))
+            self._set_synced_through([strategy_id], synced_through)
+            return applied
+
+    def get_info(self) -> Dict[str, Any]:
+        """Cash, sync position, last fill and fill count per strategy."""
+        rows = self.conn.execute("""
+            SELECT l.strategy_id, l.slug, l.cash, l.synced_through, l.last_fill_at, l.last_order_id,
+                   (SELECT COUNT(*) FROM strategy_ledger_fills f WHERE f.strategy_id = l.strategy_id)
+            FROM strategy_ledger l ORDER BY l.strategy_id
+        """)
+        return {
+            strategy_id: {
+                'slug': slug, 'cash': round(cash, 2), 'synced_through': synced_through,
+                'last_fill_at': last_fill_at, 'last_order_id': last_order_id, 'fills': fills
+            }
+            for strategy_id, slug, cash, synced_through, last_fill_at, last_order_id, fills in rows
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-strategy position ledger')
+    parser.add_argument('--db', default=None, help='Database path (default: config.LEDGER_DB_PATH)')
+    parser.add_argument('--status', action='store_true', help='Sync every strategy and show its ledger')
+    parser.add_argument('--rebuild', type=int, metavar='STRATEGY_ID', help='Rebuild a strategy from full history')
+    args = parser.parse_args()
+
+    from alpaca_client import client
+    from strategy_executor import StrategyExecutor
+
+    executor = StrategyExecutor()
+    ledger = PositionLedger(client, args.db)
+
+    if args.rebuild:
+        strategy = executor.strategies[args.rebuild]
+        applied = ledger.rebuild(args.rebuild, strategy['slug'], strategy['initial_capital'])
+        print(f"Rebuilt {strategy['name']}: {applied} fills")
+    elif args.status:
+        for strategy_id, strategy in executor.strategies.items():
+            ledger.sync(strategy_id, strategy['slug'], strategy['initial_capital'])
+        print(json.dumps(ledger.get_info(), indent=2))
+    else:
+        parser.print_help()
+
+    ledger.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -14,16 +14,9 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import config
 from alpaca_client import client
-from signals.generator import signal_generator
 from backtesting.engine import BacktestEngine
 from backtesting.metrics import generate_performance_report
-from strategies.momentum import MomentumStrategy
-from strategies.mean_reversion import MeanReversionStrategy
-from strategies.sector_rotation import SectorRotationStrategy
-from strategies.value_dividend import ValueDividendStrategy
-from strategies.volatility_breakout import VolatilityBreakoutStrategy
-from strategies.sector_rotation import SectorRotationStrategy
-from strategies.value_dividend import ValueDividendStrategy
+from strategies.registry import create_strategy, list_strategies
 from utils.risk import risk_manager
 
 # Configure logging
@@ -176,6 +169,7 @@ def cmd_run(args):
             portfolio_value = config.INITIAL_CAPITAL
         
         # Get market data
+        from signals.generator import signal_generator
         universe = signal_generator.get_universe()
         data = get_market_data(universe, days=100)  # Last 100 days
         
@@ -238,22 +232,14 @@ def cmd_backtest(args):
     logger.info(f"Starting backtest for {args.strategy} strategy")
     
     # Initialize strategy
-    if args.strategy == 'momentum':
-        strategy = MomentumStrategy()
-    elif args.strategy == 'mean_reversion':
-        strategy = MeanReversionStrategy()
-    elif args.strategy == 'volatility_breakout':
-        strategy = VolatilityBreakoutStrategy()
-    elif args.strategy == 'sector_rotation':
-        strategy = SectorRotationStrategy()
-    elif args.strategy == 'value_dividend':
-        strategy = ValueDividendStrategy()
-    else:
+    try:
+        strategy = create_strategy(args.strategy)
+    except KeyError:
         logger.error(f"Unknown strategy: {args.strategy}")
         return
     
     # Get historical data
-    symbols = [args.symbol] if args.symbol else signal_generator.get_universe()
+    symbols = [args.symbol] if args.symbol else config.DEFAULT_UNIVERSE
     data = get_market_data(symbols, days=args.days)
     
     if not data:
@@ -370,6 +356,7 @@ def cmd_signals(args):
     logger.info("Generating current trading signals...")
     
     # Get market data
+    from signals.generator import signal_generator
     universe = signal_generator.get_universe()
     data = get_market_data(universe, days=100)
     
@@ -439,7 +426,7 @@ Examples:
     # Backtest command
     backtest_parser = subparsers.add_parser('backtest', help='Run strategy backtest')
     backtest_parser.add_argument('--strategy', required=True,
-                                choices=['momentum', 'mean_reversion', 'sentiment', 'sector_rotation', 'value_dividend'],
+                                choices=list_strategies(),
                                 help='Strategy to backtest')
     backtest_parser.add_argument('--symbol', help='Single symbol to test (default: all)')
     backtest_parser.add_argument('--days', type=int, default=365,
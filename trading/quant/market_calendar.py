@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Market Calendar — regular sessions from a local calendar file.
+
+Sessions are weekdays minus the listed holidays, 09:30-16:00 New York time
+with the listed early closes at 13:00, all in the exchange timezone (so DST
+is handled by zoneinfo rather than a fixed UTC offset). The schedulers use
+it instead of asking the /clock endpoint whether the market is open.
+
+Dates after ``valid_through`` fall back to plain weekdays with a warning;
+extend market_calendar.json when the exchange publishes the next year.
+
+Usage:
+    python3 market_calendar.py                     # next session
+    python3 market_calendar.py --sessions 2026-11-23 2026-11-30
+"""
+
+import argparse
+import json
+import os
+import sys
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+
+logger = logging.getLogger(__name__)
+
+Session = Tuple[datetime, datetime]
+
+
+def parse_time_of_day(value: str) -> time:
+    hour, minute = map(int, value.split(':'))
+    return time(hour, minute)
+
+
+class MarketCalendar:
+    """Exchange sessions (open/close as timezone-aware datetimes) from a JSON calendar."""
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: Calendar file (default: config.MARKET_CALENDAR_PATH)
+        """
+        self.path = path or config.MARKET_CALENDAR_PATH
+        with open(self.path) as f:
+            calendar = json.load(f)
+
+        self.tz = ZoneInfo(calendar['timezone'])
+        self.open_time = parse_time_of_day(calendar['open'])
+        self.close_time = parse_time_of_day(calendar['close'])
+        self.early_close_time = parse_time_of_day(calendar['early_close'])
+        self.valid_from = date.fromisoformat(calendar['valid_from'])
+        self.valid_through = date.fromisoformat(calendar['valid_through'])
+        self.holidays: Dict[date, str] = {
+            date.fromisoformat(day): name for day, name in calendar['holidays'].items()
+        }
+        self.early_closes: Dict[date, str] = {
+            date.fromisoformat(day): name for day, name in calendar['early_closes'].items()
+        }
+        self._warned = False
+
+    def is_session_day(self, day: date) -> bool:
+        """True when the exchange trades on ``day``."""
+        if not self.valid_from <= day <= self.valid_through and not self._warned:
+            logger.warning(f"{day} is outside the market calendar ({self.valid_from} to {self.valid_through}); "
+                           f"assuming a regular weekday session")
+            self._warned = True
+        return day.weekday() < 5 and day not in self.holidays
+
+    def session(self, day: date) -> Optional[Session]:
+        """(open, close) of the session on ``day``, or None on weekends and holidays."""
+        if not self.is_session_day(day):
+            return None
+        close_time = self.early_close_time if day in self.early_closes else self.close_time
+        return (
+            datetime.combine(day, self.open_time, tzinfo=self.tz),
+            datetime.combine(day, close_time, tzinfo=self.tz)
+        )
+
+    def local_date(self, when: datetime) -> date:
+        """Exchange-local date of a timestamp (naive values are taken as UTC)."""
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return when.astimezone(self.tz).date()
+
+    def is_open(self, when: datetime) -> bool:
+        """True during a regular session."""
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        session = self.session(self.local_date(when))
+        return session is not None and session[0] <= when < session[1]
+
+    def next_session(self, when: datetime) -> Session:
+        """The session in progress at ``when``, or the next one to open."""
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        day = self.local_date(when)
+        while True:
+            session = self.session(day)
+            if session is not None and when < session[1]:
+                return session
+            day += timedelta(days=1)
+
+    def sessions(self, start: date, end: date) -> List[Session]:
+        """Sessions from ``start`` through ``end`` inclusive."""
+        result = []
+        day = start
+        while day <= end:
+            session = self.session(day)
+            if session is not None:
+                result.append(session)
+            day += timedelta(days=1)
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Market calendar')
+    parser.add_argument('--calendar', default=None, help='Calendar file (default: config.MARKET_CALENDAR_PATH)')
+    parser.add_argument('--sessions', nargs=2, metavar=('START', 'END'), help='List sessions between two dates')
+    args = parser.parse_args()
+
+    calendar = MarketCalendar(args.calendar)
+
+    if args.sessions:
+        sessions = calendar.sessions(date.fromisoformat(args.sessions[0]), date.fromisoformat(args.sessions[1]))
+    else:
+        sessions = [calendar.next_session(datetime.now(timezone.utc))]
+    print(json.dumps([{'open': o.isoformat(), 'close': c.isoformat()} for o, c in sessions], indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Cycle Market Data — one concurrent fetch stage per execution cycle.
+
+The executors used to fetch bars strategy by strategy (universe selection,
+market data, exit checks), one blocking request after another. A cycle now
+declares everything its strategies will read up front; the union of symbols
+per timeframe is fetched in symbol batches on an asyncio event loop, all
+batches in flight at once, and each strategy's reads are served from memory.
+A cycle therefore costs roughly its slowest batch rather than the sum of every
+request. Reads the stage does not cover fall back to a direct fetch.
+
+Usage:
+    cycle_data = CycleMarketData(lambda s, tf, d: fetch_alpaca_bars(client, s, tf, d),
+                                 now=client.now())
+    cycle_data.request_bars(['AAPL', 'MSFT'], '1Day', 60)
+    cycle_data.request_bars(['AAPL'], '5Min', 5)
+    cycle_data.prefetch()
+    frames = cycle_data.get_bars(['AAPL'], '1Day', 30)   # None when not covered
+
+    snapshot = MarketSnapshot(frames, now=client.now())
+    snapshot.scores(30)   # momentum, RSI, ATR, volume trend ... per symbol
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+from utils.panel import (
+    build_panel, panel_atr, panel_momentum, panel_sma, panel_sma_rsi,
+    panel_volatility, panel_volume_trend
+)
+
+logger = logging.getLogger(__name__)
+
+BAR_FIELDS = {'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close', 'v': 'volume'}
+
+# fetch_bars(symbols, timeframe, days) -> {symbol: lowercase OHLCV frame}
+BarFetcher = Callable[[List[str], str, int], Dict[str, pd.DataFrame]]
+# fetch_quotes(symbols) -> {symbol: Alpaca quote dict}
+QuoteFetcher = Callable[[List[str]], Dict[str, Dict[str, Any]]]
+
+
+def bars_to_frames(bars: Dict[str, List[Dict[str, Any]]]) -> Dict[str, pd.DataFrame]:
+    """Alpaca bars ({symbol: [bars]}) as lowercase OHLCV frames indexed by bar time."""
+    frames = {}
+    for symbol, symbol_bars in bars.items():
+        if not symbol_bars:
+            continue
+        df = pd.DataFrame(symbol_bars)
+        df.index = pd.to_datetime(df.pop('t'))
+        df.index.name = 'timestamp'
+        frames[symbol] = df[list(BAR_FIELDS)].rename(columns=BAR_FIELDS)
+    return frames
+
+
+def lookback_start(now: datetime, days: int) -> str:
+    """Start date of a ``days`` lookback, as the executors pass it to Alpaca."""
+    return (now - timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+def fetch_alpaca_bars(client, symbols: List[str], timeframe: str, days: int) -> Dict[str, pd.DataFrame]:
+    """Bars for the last ``days`` calendar days from an Alpaca client."""
+    now = client.now()
+    bars = client.get_historical_bars(
+        symbols=symbols,
+        timeframe=timeframe,
+        start=lookback_start(now, days),
+        end=now.strftime('%Y-%m-%d'),
+        limit=10000
+    ).get('bars', {})
+    return bars_to_frames(bars)
+
+
+def _batches(symbols: List[str], size: int) -> List[List[str]]:
+    return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+
+class CycleMarketData:
+    """Bars and quotes for one execution cycle, fetched concurrently and served from memory."""
+
+    def __init__(
+        self,
+        fetch_bars: BarFetcher,
+        fetch_quotes: Optional[QuoteFetcher] = None,
+        now: Optional[datetime] = None,
+        batch_size: int = None,
+        max_concurrency: int = None
+    ):
+        """
+        Args:
+            fetch_bars: Blocking fetch of one symbol batch
+            fetch_quotes: Blocking fetch of latest quotes for one symbol batch
+            now: Cycle time, used to cut shorter lookbacks out of the prefetched range
+            batch_size: Symbols per request (default: config.MARKET_DATA_BATCH_SIZE)
+            max_concurrency: Requests in flight (default: config.MARKET_DATA_CONCURRENCY)
+        """
+        self.fetch_bars = fetch_bars
+        self.fetch_quotes = fetch_quotes
+        self.now = now or datetime.now()
+        self.batch_size = batch_size or config.MARKET_DATA_BATCH_SIZE
+        self.max_concurrency = max_concurrency or config.MARKET_DATA_CONCURRENCY
+
+        # timeframe -> (symbols, longest lookback in days)
+        self._bar_requests: Dict[str, Tuple[set, int]] = {}
+        self._quote_requests: set = set()
+
+        # timeframe -> days fetched, symbols fetched (with or without data), frames
+        self._days: Dict[str, int] = {}
+        self._covered: Dict[str, set] = {}
+        self._frames: Dict[str, Dict[str, pd.DataFrame]] = {}
+        self._quotes_covered: set = set()
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self.stats = {'requests': 0, 'failed': 0, 'symbols': 0, 'seconds': 0.0}
+
+    def request_bars(self, symbols: List[str], timeframe: str, days: int):
+        """Declare bars a strategy will read this cycle."""
+        requested, longest = self._bar_requests.get(timeframe, (set(), 0))
+        requested.update(symbols)
+        self._bar_requests[timeframe] = (requested, max(longest, days))
+
+    def request_quotes(self, symbols: List[str]):
+        """Declare latest quotes a strategy will read this cycle."""
+        self._quote_requests.update(symbols)
+
+    def _jobs(self) -> List[Tuple[str, Any, List[str], Optional[int]]]:
+        """(kind, key, symbols, days) per request: the union per timeframe, in symbol batches."""
+        jobs = []
+        for timeframe, (symbols, days) in sorted(self._bar_requests.items()):
+            if self._days.get(timeframe, 0) >= days:
+                symbols = symbols - self._covered[timeframe]
+            for batch in _batches(sorted(symbols), self.batch_size):
+                jobs.append(('bars', timeframe, batch, days))
+        if self.fetch_quotes is not None:
+            for batch in _batches(sorted(self._quote_requests - self._quotes_covered), self.batch_size):
+                jobs.append(('quotes', None, batch, None))
+        return jobs
+
+    def _run_job(self, job) -> Any:
+        kind, timeframe, symbols, days = job
+        if kind == 'bars':
+            return self.fetch_bars(symbols, timeframe, days)
+        return self.fetch_quotes(symbols)
+
+    async def prefetch_async(self) -> Dict[str, Any]:
+        """Fetch every declared batch concurrently; see prefetch()."""
+        jobs = self._jobs()
+        if not jobs:
+            return self.stats
+
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(jobs)),
+                                thread_name_prefix='market-data') as pool:
+            results = await asyncio.gather(
+                *(loop.run_in_executor(pool, self._run_job, job) for job in jobs),
+                return_exceptions=True
+            )
+
+        for job, result in zip(jobs, results):
+            kind, timeframe, symbols, days = job
+            self.stats['requests'] += 1
+            if isinstance(result, Exception):
+                self.stats['failed'] += 1
+                logger.warning(f"Prefetch of {len(symbols)} {timeframe or 'quote'} symbols failed: {result}")
+                continue
+            self.stats['symbols'] += len(symbols)
+            if kind == 'bars':
+                if self._days.get(timeframe, 0) < days:
+                    # A longer lookback replaces the shorter one
+                    self._days[timeframe] = days
+                    self._covered[timeframe] = set()
+                    self._frames[timeframe] = {}
+                self._covered[timeframe].update(symbols)
+                self._frames[timeframe].update(result)
+            else:
+                self._quotes_covered.update(symbols)
+                self._quotes.update(result)
+
+        self.stats['seconds'] += time.monotonic() - started
+        logger.info(f"Prefetched {self.stats['symbols']} symbols in {self.stats['requests']} "
+                    f"requests ({self.stats['failed']} failed) in {self.stats['seconds']:.2f}s")
+        return self.stats
+
+    def prefetch(self) -> Dict[str, Any]:
+        """
+        Fetch the union of declared bars and quotes, all batches concurrently.
+
+        Failed batches are logged and left uncovered, so reads of those
+        symbols fall back to a direct fetch.
+
+        Returns:
+            {'requests', 'failed', 'symbols', 'seconds'}
+        """
+        return asyncio.run(self.prefetch_async())
+
+    def covers(self, symbols: List[str], timeframe: str, days: int) -> bool:
+        """True when get_bars() can serve the read from memory."""
+        return self._days.get(timeframe, 0) >= days and set(symbols) <= self._covered[timeframe]
+
+    def get_bars(self, symbols: List[str], timeframe: str, days: int) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Bars for the last ``days`` days, cut from the prefetched range.
+
+        Returns:
+            {symbol: frame} (symbols without data are absent, as with a direct
+            fetch), or None when the read is not covered
+        """
+        if not self.covers(symbols, timeframe, days):
+            return None
+
+        frames = self._frames[timeframe]
+        if days == self._days[timeframe]:
+            return {symbol: frames[symbol] for symbol in symbols if symbol in frames}
+
+        start = pd.Timestamp(lookback_start(self.now, days))
+        result = {}
+        for symbol in symbols:
+            if symbol not in frames:
+                continue
+            df = frames[symbol]
+            cutoff = start if df.index.tz is None else start.tz_localize('UTC')
+            df = df[df.index >= cutoff]
+            if not df.empty:
+                result[symbol] = df
+        return result
+
+    def get_quotes(self, symbols: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Latest quotes by symbol, or None when the read is not covered."""
+        if not set(symbols) <= self._quotes_covered:
+            return None
+        return {symbol: self._quotes[symbol] for symbol in symbols if symbol in self._quotes}
+
+
+class MarketSnapshot:
+    """
+    Daily bars for a union universe as dates x symbols panels, scored for
+    every symbol in one vectorized pass per lookback.
+
+    Universe selectors read their indicators from ``scores()`` instead of
+    downloading and looping over their own symbols. ``cache_keys`` records the
+    cache period (see TradingExecutor.get_cache_key) of each strategy when the
+    snapshot was taken, so a strategy reuses it until its period rolls over.
+    """
+
+    FIELDS = ('high', 'low', 'close', 'volume')
+    # A symbol whose latest bar is more than this many bars behind the newest
+    # in the snapshot (a halt, a delisting) is not scored
+    STALE_BARS = 5
+
+    def __init__(
+        self,
+        market_data: Dict[str, pd.DataFrame],
+        now: Optional[datetime] = None,
+        cache_keys: Optional[Dict[str, str]] = None,
+        universe: Optional[List[str]] = None
+    ):
+        """
+        Args:
+            market_data: Per-symbol lowercase OHLCV frames
+            now: Snapshot time, lookbacks are cut back from it
+            cache_keys: Strategy name -> cache key the snapshot is valid for
+            universe: Symbols the snapshot was taken for, with or without data
+                (default: the symbols in ``market_data``)
+        """
+        self.now = now or datetime.now()
+        self.cache_keys = cache_keys or {}
+        self.panels = {field: build_panel(market_data, field) for field in self.FIELDS}
+        self.universe = list(universe) if universe is not None else list(market_data)
+        self._scores: Dict[int, pd.DataFrame] = {}
+
+    @classmethod
+    def from_panels(
+        cls,
+        panels: Dict[str, pd.DataFrame],
+        now: Optional[datetime] = None,
+        cache_keys: Optional[Dict[str, str]] = None
+    ) -> 'MarketSnapshot':
+        """Snapshot over existing dates x symbols panels (e.g. BarStore.load_panels)."""
+        snapshot = cls({}, now=now, cache_keys=cache_keys)
+        snapshot.panels = {field: panels[field] for field in cls.FIELDS}
+        snapshot.universe = list(snapshot.panels['close'].columns)
+        return snapshot
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.panels['close'].columns)
+
+    def is_valid_for(self, strategy_name: str, cache_key: str) -> bool:
+        """True while the strategy's cache period is the one the snapshot was taken in."""
+        return self.cache_keys.get(strategy_name) == cache_key
+
+    def window(self, days: int) -> Dict[str, pd.DataFrame]:
+        """Panels restricted to the last ``days`` calendar days."""
+        close = self.panels['close']
+        if close.empty:
+            return self.panels
+        start = pd.Timestamp(lookback_start(self.now, days))
+        if close.index.tz is not None:
+            start = start.tz_localize('UTC')
+        rows = close.index >= start
+        return {field: panel.loc[rows] for field, panel in self.panels.items()}
+
+    def scores(self, days: int) -> pd.DataFrame:
+        """
+        Latest indicators of every symbol over a ``days`` lookback.
+
+        Columns:
+            bars, volume_bars  non-missing closes / volumes in the lookback
+            momentum           close vs. the close 19 bars earlier (the 20-bar window)
+            volume_trend       last 5 vs. prior 15 bars' mean volume
+            rsi                14-bar simple-average RSI (50 when undefined)
+            sma_50             50-bar simple moving average
+            volatility         annualized 20-bar volatility of daily returns
+            atr_pct            14-bar ATR as a percentage of the close
+            atr_expansion      14-bar ATR relative to the 50-bar ATR
+            prior_volume       previous bar's volume
+            avg_volume_20d     mean volume of the 20 bars before the last one
+            dollar_volume      mean close x volume of the last 20 bars
+            close              latest close
+
+        Each symbol is scored at its own latest bar, so one missing the newest
+        bar (a halt, a late print, a thinly traded ETF) is scored on its
+        previous one, up to STALE_BARS bars back; staler symbols score NaN.
+        """
+        if days in self._scores:
+            return self._scores[days]
+
+        panels = self.window(days)
+        close, volume = panels['close'], panels['volume']
+        if close.empty:
+            return pd.DataFrame()
+
+        # Row of each symbol's latest close
+        valid = close.notna().to_numpy()
+        last_row = len(close) - 1 - valid[::-1].argmax(axis=0)
+        stale = ~valid.any(axis=0) | (len(close) - 1 - last_row > self.STALE_BARS)
+        columns = np.arange(close.shape[1])
+
+        def latest(panel: pd.DataFrame) -> pd.Series:
+            values = panel.to_numpy(dtype=float)[last_row, columns]
+            values[stale] = np.nan
+            return pd.Series(values, index=close.columns)
+
+        prior_volume = volume.shift(1)
+        atr = latest(panel_atr(panels['high'], panels['low'], close, 14))
+        latest_close = latest(close)
+        # Neutral RSI while there is too little history, NaN for stale symbols
+        rsi = latest(panel_sma_rsi(close, 14))
+        rsi = rsi.where(stale | rsi.notna(), 50.0)
+        scores = pd.DataFrame({
+            'bars': close.notna().sum(),
+            'volume_bars': volume.notna().sum(),
+            'momentum': latest(panel_momentum(close, 19)),
+            'volume_trend': latest(panel_volume_trend(volume, 5, 20)),
+            'rsi': rsi,
+            'sma_50': latest(panel_sma(close, 50)),
+            'volatility': latest(panel_volatility(close, 20)) * np.sqrt(252),
+            'atr_pct': atr / latest_close * 100,
+            'atr_expansion': atr / latest(panel_atr(panels['high'], panels['low'], close, 50)),
+            'prior_volume': latest(prior_volume),
+            'avg_volume_20d': latest(prior_volume.rolling(window=20, min_periods=1).mean()),
+            'dollar_volume': latest(panel_sma(close * volume, 20)),
+            'close': latest_close
+        })
+        self._scores[days] = scores
+        return scores
@@ -0,0 +1,223 @@
+"""
+Order Netting — offset strategies' opposing orders before they reach the broker.
+
+In one cycle, one strategy may buy a symbol another is selling. Instead of
+sending both orders, executors queue every intended order with an
+OrderNetter and submit them together at the end of the cycle. Per symbol,
+buy and sell quantities are matched in queue order and crossed internally
+at the current quote midpoint. Each crossed leg is recorded as a fill in its
+strategy's position ledger and never sent to Alpaca. Only the residual
+quantity is sent, still as the owning strategy's order (its client_order_id
+carries the strategy slug), so broker fills are attributed as before.
+
+Example: Momentum Hunter buys 30 AAPL while Mean Reversion sells 50. The 30
+shares cross internally and one 20-share sell is sent for Mean Reversion.
+"""
+
+import time
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IntendedOrder:
+    """An order a strategy wants this cycle, and what became of it."""
+    strategy_id: int
+    symbol: str
+    side: str
+    quantity: int
+    price: float
+    reason: str = ''
+    crossed: int = 0  # Shares filled internally against other strategies
+    order: Optional[Dict[str, Any]] = None  # Broker order for the residual
+    error: Optional[str] = None
+    signal_at: float = field(default_factory=time.monotonic)
+    latency: Optional[Dict[str, Optional[float]]] = None  # See order_manager.ManagedOrder.latency
+
+    @property
+    def residual(self) -> int:
+        """Shares still to be sent to the broker."""
+        return self.quantity - self.crossed
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class OrderNetter:
+    """Queue of one cycle's orders, netted per symbol before submission."""
+
+    def __init__(
+        self,
+        strategies: Dict[int, Dict[str, Any]],
+        ledger,
+        place: Callable[[List[IntendedOrder]], None],
+        clock: Callable,
+        prices: Callable[[List[str]], Dict[str, float]] = None,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            strategies: strategy_id -> config with 'slug' and 'initial_capital'
+            ledger: PositionLedger crossed fills are recorded in
+            place: Sends the orders' residuals to the broker, setting each
+                order's broker ``order`` (or its ``error``)
+            clock: Current time (datetime) for crossed fills
+            prices: Cross prices (quote midpoints) for symbols; without one the
+                matched orders' average reference price is used
+            enabled: Cross opposing orders; when False every order is sent in
+                full (still together, at submission)
+        """
+        self.strategies = strategies
+        self.ledger = ledger
+        self.place = place
+        self.clock = clock
+        self.prices = prices
+        self.enabled = enabled
+        self.orders: List[IntendedOrder] = []
+        self.stats = {'intended': 0, 'submitted': 0, 'failed': 0, 'crossed_shares': 0}
+
+    def add(
+        self,
+        strategy_id: int,
+        symbol: str,
+        side: str,
+        quantity: int,
+        price: float,
+        reason: str = '',
+        signal_at: float = None
+    ) -> IntendedOrder:
+        """Queue an order for this cycle's submission (``signal_at``: monotonic time of its signal, default now)."""
+        order = IntendedOrder(strategy_id, symbol, side, int(quantity), float(price), reason)
+        if signal_at is not None:
+            order.signal_at = signal_at
+        self.orders.append(order)
+        return order
+
+    def net(self) -> List[Tuple[IntendedOrder, IntendedOrder, int]]:
+        """
+        Match queued buys against sells of the same symbol, in queue order.
+
+        Sets each order's ``crossed`` quantity.
+
+        Returns:
+            (buy, sell, shares) for every matched pair
+        """
+        if not self.enabled:
+            return []
+
+        sides = defaultdict(lambda: {'buy': [], 'sell': []})
+        for order in self.orders:
+            if order.side in ('buy', 'sell') and order.quantity > 0:
+                sides[order.symbol][order.side].append(order)
+
+        matches = []
+        for symbol, queued in sides.items():
+            buys, sells = list(queued['buy']), list(queued['sell'])
+            while buys and sells:
+                buy, sell = buys[0], sells[0]
+                shares = min(buy.residual, sell.residual)
+                buy.crossed += shares
+                sell.crossed += shares
+                matches.append((buy, sell, shares))
+                if buy.residual == 0:
+                    buys.pop(0)
+                if sell.residual == 0:
+                    sells.pop(0)
+        return matches
+
+    def _cross_prices(self, matches: List[Tuple[IntendedOrder, IntendedOrder, int]]) -> Dict[str, float]:
+        symbols = sorted({buy.symbol for buy, _, _ in matches})
+        prices = {}
+        if self.prices is not None and symbols:
+            try:
+                prices = {symbol: price for symbol, price in self.prices(symbols).items() if price}
+            except Exception as e:
+                logger.warning(f"No quotes for crossed orders, using reference prices: {e}")
+        for buy, sell, _ in matches:
+            prices.setdefault(buy.symbol, (buy.price + sell.price) / 2)
+        return prices
+
+    def _record_crosses(self, matches: List[Tuple[IntendedOrder, IntendedOrder, int]]) -> None:
+        """Record crossed shares as ledger fills, one per strategy, symbol and side."""
+        prices = self._cross_prices(matches)
+        now = self.clock()
+        crossed: Dict[Tuple[int, str, str], int] = defaultdict(int)
+        for buy, sell, shares in matches:
+            crossed[(buy.strategy_id, buy.symbol, 'buy')] += shares
+            crossed[(sell.strategy_id, sell.symbol, 'sell')] += shares
+
+        fills = defaultdict(list)
+        for (strategy_id, symbol, side), shares in crossed.items():
+            slug = self.strategies[strategy_id]['slug']
+            client_order_id = f"{slug}-{symbol}-{int(now.timestamp())}-cross-{side}"
+            fills[strategy_id].append({
+                'id': client_order_id,
+                'client_order_id': client_order_id,
+                'symbol': symbol,
+                'side': side,
+                'filled_qty': shares,
+                'filled_avg_price': prices[symbol],
+                'filled_at': now.isoformat()
+            })
+
+        for strategy_id, strategy_fills in fills.items():
+            strategy = self.strategies[strategy_id]
+            self.ledger.record_internal_fills(
+                strategy_id, strategy['slug'], strategy['initial_capital'], strategy_fills
+            )
+        for fill in (fill for strategy_fills in fills.values() for fill in strategy_fills):
+            logger.info(f"Crossed internally: {fill['client_order_id']} {fill['side']} "
+                        f"{fill['filled_qty']} {fill['symbol']} @ ${fill['filled_avg_price']:.2f}")
+
+    def submit(self) -> List[IntendedOrder]:
+        """
+        Net the queued orders, record the crosses, send the residuals, and
+        empty the queue.
+
+        When the crosses cannot be recorded, nothing is crossed and every
+        order is sent in full.
+
+        Returns:
+            The queued orders with their crossed quantity, broker order and error
+        """
+        matches = self.net()
+        orders, self.orders = self.orders, []
+        self.stats['intended'] += len(orders)
+        if matches:
+            try:
+                self._record_crosses(matches)
+                self.stats['crossed_shares'] += sum(shares for _, _, shares in matches)
+            except Exception as e:
+                logger.error(f"Could not record crossed orders, sending them in full: {e}")
+                for order in orders:
+                    order.crossed = 0
+
+        residuals = [order for order in orders if order.residual > 0]
+        if residuals:
+            try:
+                self.place(residuals)
+            except Exception as e:
+                logger.error(f"Could not send netted orders: {e}")
+                for order in residuals:
+                    order.error = order.error or str(e)
+        for order in residuals:
+            if order.order is None and order.error is None:
+                order.error = 'order not placed'
+            if order.error is None:
+                self.stats['submitted'] += 1
+            else:
+                self.stats['failed'] += 1
+                logger.error(f"Netted order failed: {order.side} {order.residual} {order.symbol} "
+                             f"for strategy {order.strategy_id}: {order.error}")
+        return orders
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Orders intended and sent so far, and the broker orders netting saved."""
+        stats = dict(self.stats)
+        stats['orders_saved'] = stats['intended'] - stats['submitted'] - stats['failed']
+        return stats
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Order Manager — concurrent order submission and fill tracking.
+
+A cycle's orders are submitted together by a bounded thread pool, so
+submitting N orders takes about N / max_workers round trips instead of N.
+Every order carries an idempotent client_order_id (strategy slug, symbol,
+cycle time and side). When a submission fails without a clear answer, the
+manager looks the id up before retrying, so an order Alpaca accepted is
+never placed twice.
+
+Fills are then tracked by polling with backoff. Each round is one orders
+request covering every pending order, so tracking costs rounds, not
+requests per order. Every order records its latency from signal to
+submission to fill.
+
+Usage:
+    python3 order_manager.py --recent 20     # latency of the newest orders
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alpaca_client import parse_time
+import config
+
+logger = logging.getLogger(__name__)
+
+# Order statuses after which Alpaca no longer changes an order
+TERMINAL_STATUSES = {'filled', 'canceled', 'expired', 'rejected', 'replaced', 'done_for_day'}
+
+# Terminal statuses of orders that were not (fully) executed
+FAILED_STATUSES = {'canceled', 'expired', 'rejected'}
+
+# Recent orders kept for latency statistics
+HISTORY_SIZE = 1000
+
+
+def client_order_id(slug: str, symbol: str, side: str, cycle_time) -> str:
+    """Idempotent id of a strategy's order in one cycle (the slug prefix attributes its fills)."""
+    return f"{slug}-{symbol}-{int(cycle_time.timestamp())}-{side}"
+
+
+@dataclass
+class ManagedOrder:
+    """One submitted order, its latest broker state and its timings (monotonic seconds)."""
+    strategy_id: int
+    symbol: str
+    side: str
+    quantity: float
+    client_order_id: str
+    reason: str = ''
+    signal_at: float = field(default_factory=time.monotonic)
+    submitted_at: Optional[float] = None
+    filled_at: Optional[float] = None
+    order: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        if self.error is not None and self.order is None:
+            return 'failed'
+        return (self.order or {}).get('status', 'pending')
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES or self.status == 'failed'
+
+    def latency(self) -> Dict[str, Optional[float]]:
+        """Seconds from signal to submission, submission to fill, and signal to fill."""
+        def span(start, end):
+            return None if start is None or end is None else round(end - start, 6)
+        return {
+            'signal_to_submit': span(self.signal_at, self.submitted_at),
+            'submit_to_fill': span(self.submitted_at, self.filled_at),
+            'signal_to_fill': span(self.signal_at, self.filled_at)
+        }
+
+
+class OrderManager:
+    """Submits a cycle's orders concurrently and follows them until they fill."""
+
+    def __init__(
+        self,
+        client,
+        max_workers: int = None,
+        poll_interval: float = None,
+        poll_max_interval: float = None,
+        fill_timeout: float = None,
+        clock: Callable[[], float] = None,
+        sleep: Callable[[float], None] = None
+    ):
+        """
+        Args:
+            client: Alpaca client orders are placed with
+            max_workers: Orders in flight at once (default: config.ORDER_MAX_WORKERS)
+            poll_interval: First wait between fill polls, doubled each round
+                (default: config.ORDER_POLL_INTERVAL)
+            poll_max_interval: Longest wait between polls (default: config.ORDER_POLL_MAX_INTERVAL)
+            fill_timeout: Seconds orders are tracked before returning with
+                them still open (default: config.ORDER_FILL_TIMEOUT)
+            clock: Monotonic seconds for timings (default: time.monotonic)
+            sleep: Wait between polls (default: time.sleep)
+        """
+        self.alpaca = client
+        self.max_workers = max_workers or config.ORDER_MAX_WORKERS
+        self.poll_interval = config.ORDER_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.poll_max_interval = config.ORDER_POLL_MAX_INTERVAL if poll_max_interval is None else poll_max_interval
+        self.fill_timeout = config.ORDER_FILL_TIMEOUT if fill_timeout is None else fill_timeout
+        self.clock = clock or time.monotonic
+        self.sleep = sleep or time.sleep
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self._lock = threading.Lock()
+        self.stats = {'submitted': 0, 'failed': 0, 'recovered': 0, 'polls': 0}
+
+    def _observe(self, managed: ManagedOrder, order: Dict[str, Any]) -> None:
+        """Take a broker state of the order, timing the fill when first seen."""
+        managed.order = order
+        if order.get('status') == 'filled' and managed.filled_at is None:
+            managed.filled_at = self.clock()
+        elif order.get('status') in FAILED_STATUSES:
+            managed.error = f"order {order['status']}"
+
+    def _find(self, managed: ManagedOrder) -> Optional[Dict[str, Any]]:
+        """The broker's order with this client_order_id, if it was accepted."""
+        after = (self.alpaca.now() - timedelta(days=1)).isoformat()
+        for order in self.alpaca.get_orders(status='all', limit=500, after=after):
+            if order.get('client_order_id') == managed.client_order_id:
+                return order
+        return None
+
+    def _submit_one(self, managed: ManagedOrder, attempts: int = 2) -> ManagedOrder:
+        for attempt in range(attempts):
+            try:
+                order = self.alpaca.place_order(
+                    symbol=managed.symbol,
+                    qty=managed.quantity,
+                    side=managed.side,
+                    order_type='market',
+                    time_in_force='day',
+                    client_order_id=managed.client_order_id
+                )
+            except Exception as e:
+                # The request may have reached Alpaca; its id says whether it did
+                try:
+                    order = self._find(managed)
+                except Exception as lookup_error:
+                    logger.warning(f"Could not look up {managed.client_order_id}: {lookup_error}")
+                    order = None
+                if order is None:
+                    managed.error = str(e)
+                    continue
+                with self._lock:
+                    self.stats['recovered'] += 1
+                logger.info(f"Order {managed.client_order_id} was accepted despite: {e}")
+            managed.error = None
+            managed.submitted_at = self.clock()
+            self._observe(managed, order)
+            logger.info(f"Order placed: {managed.client_order_id} {managed.side} {managed.quantity} "
+                        f"{managed.symbol} — {managed.reason}")
+            break
+
+        with self._lock:
+            self.stats['failed' if managed.submitted_at is None else 'submitted'] += 1
+        if managed.submitted_at is None:
+            logger.error(f"Order failed: {managed.client_order_id}: {managed.error}")
+        return managed
+
+    def submit(self, orders: List[ManagedOrder]) -> List[ManagedOrder]:
+        """Place orders concurrently, at most max_workers at a time."""
+        if not orders:
+            return orders
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(orders)),
+                                thread_name_prefix='orders') as pool:
+            list(pool.map(self._submit_one, orders))
+        with self._lock:
+            self.history.extend(orders)
+        return orders
+
+    def track(self, orders: List[ManagedOrder], timeout: float = None) -> List[ManagedOrder]:
+        """
+        Poll until every submitted order is filled or otherwise final, or the
+        timeout passes (orders still open are left as they are).
+
+        Each round reads all orders submitted since the earliest pending one
+        in one request; an order missing from it is fetched by id.
+        """
+        timeout = self.fill_timeout if timeout is None else timeout
+        deadline = self.clock() + timeout
+        interval = self.poll_interval
+        while True:
+            pending = [managed for managed in orders if managed.order is not None and not managed.done]
+            if not pending:
+                return orders
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                logger.warning(f"{len(pending)} orders still open after {timeout:.0f}s")
+                return orders
+            self.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.poll_max_interval)
+
+            with self._lock:
+                self.stats['polls'] += 1
+            try:
+                earliest = min(parse_time(m.order.get('submitted_at') or m.order['created_at']) for m in pending)
+                latest = {
+                    order['id']: order for order in self.alpaca.get_orders(
+                        status='all', limit=500, after=(earliest - timedelta(seconds=1)).isoformat()
+                    )
+                }
+                for managed in pending:
+                    order = latest.get(managed.order['id']) or self.alpaca.get_order(managed.order['id'])
+                    self._observe(managed, order)
+            except Exception as e:
+                logger.warning(f"Order status poll failed: {e}")
+
+    def execute(self, orders: List[ManagedOrder], timeout: float = None) -> List[ManagedOrder]:
+        """Submit orders concurrently, then track them to their fills."""
+        return self.track(self.submit(orders), timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters, and the median and worst latencies of the orders handled so far."""
+        with self._lock:
+            stats = dict(self.stats)
+            latencies = [managed.latency() for managed in self.history]
+        for key in ('signal_to_submit', 'submit_to_fill', 'signal_to_fill'):
+            values = sorted(latency[key] for latency in latencies if latency[key] is not None)
+            stats[key] = {
+                'median': values[len(values) // 2] if values else None,
+                'max': values[-1] if values else None
+            }
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Order status and fill latency')
+    parser.add_argument('--recent', type=int, default=20, help='Newest orders to show')
+    args = parser.parse_args()
+
+    from alpaca_client import client
+    rows = []
+    for order in client.get_orders(status='all', limit=args.recent):
+        submitted = order.get('submitted_at')
+        filled = order.get('filled_at')
+        rows.append({
+            'client_order_id': order.get('client_order_id'),
+            'symbol': order.get('symbol'),
+            'side': order.get('side'),
+            'status': order.get('status'),
+            'submit_to_fill': (parse_time(filled) - parse_time(submitted)).total_seconds()
+            if submitted and filled else None
+        })
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == '__main__':
+    main()
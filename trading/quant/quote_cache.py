@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Quote Cache — latest quotes shared within a TTL, in process and on disk.
+
+Executors, exit checks and reports ask the cache for quotes instead of
+calling the quotes endpoint themselves. A lookup serves every symbol quoted
+less than ``ttl`` seconds ago from memory, then from the on-disk cache
+(so a report run right after an execution cycle reuses that cycle's quotes),
+and fetches all remaining symbols in one ``get_latest_quotes`` request.
+Concurrent lookups share one request at a time, so symbols fetched while a
+caller waited are not fetched again.
+
+Table (quotes.db):
+    quotes  symbol, quote (JSON, Alpaca format), fetched_at (epoch seconds)
+
+Usage:
+    python3 quote_cache.py AAPL MSFT       # quotes (cached within the TTL)
+    python3 quote_cache.py --info
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# fetch(symbols) -> {symbol: Alpaca quote dict}; symbols without a quote are omitted
+QuoteFetcher = Callable[[List[str]], Dict[str, Dict[str, Any]]]
+
+
+def quote_price(quote: Dict[str, Any]) -> float:
+    """Bid-ask midpoint of an Alpaca quote, or whichever side is quoted (0 when neither)."""
+    bid = quote.get('bp', 0)
+    ask = quote.get('ap', 0)
+    if bid > 0 and ask > 0:
+        return (bid + ask) / 2
+    return quote.get('bp', quote.get('ap', 0))
+
+
+class QuoteCache:
+    """Latest quotes by symbol with a TTL, batched misses and hit-rate counters."""
+
+    def __init__(
+        self,
+        fetch: QuoteFetcher,
+        path: str = None,
+        ttl: float = None,
+        clock: Callable[[], float] = None
+    ):
+        """
+        Args:
+            fetch: One request for the latest quotes of a symbol batch
+            path: On-disk cache shared between processes (default:
+                config.QUOTE_CACHE_PATH; ':memory:' keeps it in process)
+            ttl: Seconds a quote is served from the cache (default: config.QUOTE_CACHE_TTL_SECONDS)
+            clock: Current time in epoch seconds (default: time.time; replay
+                passes its simulated clock)
+        """
+        self.fetch = fetch
+        self.path = path or config.QUOTE_CACHE_PATH
+        self.ttl = config.QUOTE_CACHE_TTL_SECONDS if ttl is None else ttl
+        self.clock = clock or time.time
+        self._entries: Dict[str, tuple] = {}  # symbol -> (quote, fetched_at)
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'requests': 0}
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection, opened (and the table created) on first use."""
+        if self._conn is None:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            if self.path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS quotes (
+                    symbol TEXT PRIMARY KEY,
+                    quote TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def _fresh(self, symbols: Iterable[str], now: float) -> Dict[str, Dict[str, Any]]:
+        """Quotes held in memory that are younger than the TTL."""
+        fresh = {}
+        with self._lock:
+            for symbol in symbols:
+                entry = self._entries.get(symbol)
+                if entry is not None and now - entry[1] < self.ttl:
+                    fresh[symbol] = entry[0]
+        return fresh
+
+    def _load(self, symbols: List[str], now: float) -> Dict[str, Dict[str, Any]]:
+        """Quotes other processes cached on disk within the TTL (also kept in memory)."""
+        loaded = {}
+        for i in range(0, len(symbols), 500):
+            chunk = symbols[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT symbol, quote, fetched_at FROM quotes "
+                f"WHERE symbol IN ({','.join('?' * len(chunk))}) AND fetched_at > ? AND fetched_at <= ?",
+                (*chunk, now - self.ttl, now)
+            ).fetchall()
+            with self._lock:
+                for symbol, quote, fetched_at in rows:
+                    loaded[symbol] = json.loads(quote)
+                    self._entries[symbol] = (loaded[symbol], fetched_at)
+        return loaded
+
+    def _store(self, quotes: Dict[str, Dict[str, Any]], now: float) -> None:
+        with self._lock:
+            for symbol, quote in quotes.items():
+                self._entries[symbol] = (quote, now)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO quotes (symbol, quote, fetched_at) VALUES (?, ?, ?)",
+                [(symbol, json.dumps(quote), now) for symbol, quote in quotes.items()]
+            )
+
+    def get(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Latest quotes for symbols, fetching every uncached one in a single request.
+
+        Returns:
+            {symbol: Alpaca quote dict}; symbols the API has no quote for are omitted
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        now = self.clock()
+        quotes = self._fresh(symbols, now)
+        hits = len(quotes)
+
+        missing = [symbol for symbol in symbols if symbol not in quotes]
+        if missing:
+            with self._fetch_lock:
+                # Another caller may have fetched some of them while this one waited
+                waited = self._fresh(missing, now)
+                quotes.update(waited)
+                hits += len(waited)
+                missing = [symbol for symbol in missing if symbol not in waited]
+
+                loaded = self._load(missing, now) if missing else {}
+                quotes.update(loaded)
+                missing = [symbol for symbol in missing if symbol not in loaded]
+
+                if missing:
+                    fetched = self.fetch(missing)
+                    self._store(fetched, now)
+                    quotes.update(fetched)
+
+            with self._lock:
+                self.stats['disk_hits'] += len(loaded)
+                self.stats['misses'] += len(missing)
+                self.stats['requests'] += 1 if missing else 0
+
+        with self._lock:
+            self.stats['hits'] += hits
+        return {symbol: quotes[symbol] for symbol in symbols if symbol in quotes}
+
+    def get_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Quote midpoints for symbols (see ``get``)."""
+        return {symbol: quote_price(quote) for symbol, quote in self.get(symbols).items() if quote}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lookup counters and the hit rate (memory and disk hits over all symbol lookups)."""
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Drop every cached quote, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+        with self.conn:
+            self.conn.execute("DELETE FROM quotes")
+
+    def get_info(self) -> Dict[str, Any]:
+        """Quotes cached on disk, how many are within the TTL, and this process's counters."""
+        count, fresh = self.conn.execute(
+            "SELECT COUNT(*), SUM(fetched_at > ?) FROM quotes", (self.clock() - self.ttl,)
+        ).fetchone()
+        return {'cached': count, 'fresh': fresh or 0, 'ttl': self.ttl, 'stats': self.get_stats()}
+
+
+def _fetch_live(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    from alpaca_client import client
+    return client.get_latest_quotes(symbols).get('quotes', {})
+
+
+# Global quote cache instance (live Alpaca quotes)
+quote_cache = QuoteCache(_fetch_live)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latest-quote cache')
+    parser.add_argument('symbols', nargs='*', help='Symbols to quote')
+    parser.add_argument('--info', action='store_true', help='Show cache contents and counters')
+    args = parser.parse_args()
+
+    if args.symbols:
+        print(json.dumps(quote_cache.get([s.upper() for s in args.symbols]), indent=2))
+    if args.info or not args.symbols:
+        print(json.dumps(quote_cache.get_info(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+"""
+Shadow Replay — run the live executors against stored history.
+
+ReplayAlpacaClient stands in for AlpacaClient: it serves bars, quotes and the
+market clock from the bar store at a simulated time, and fills orders
+instantly at the simulated quote. StrategyExecutor and TradingExecutor run
+unchanged on top of it (including the position ledger's fill sync and the
+exit checks), with publishing to the dashboard switched off.
+
+Usage:
+    python3 replay.py --start 2024-01-01 --end 2024-06-30
+    python3 replay.py --start 2024-01-01 --end 2024-06-30 --strategy 3 --time 15:45
+    python3 replay.py --start 2024-01-01 --end 2024-01-31 --executor trading --step 5
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alpaca_client import AlpacaClient, parse_time
+from bar_store import BarStore
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN = (9, 30)
+MARKET_CLOSE = (16, 0)
+
+
+def bar_times(index: pd.DatetimeIndex, timeframe: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    When each bar of a timeframe opens and closes, as naive UTC datetime64 arrays.
+
+    Alpaca stamps bars at their start. An intraday bar ('5Min', '1Hour')
+    spans its timeframe; a daily or longer bar is stamped at midnight New York
+    time and trades from the first session's open to the last session's close.
+    """
+    index = pd.DatetimeIndex(index)
+    index = index.tz_localize('UTC') if index.tz is None else index.tz_convert('UTC')
+    amount, unit = re.fullmatch(r'(\d*)([A-Za-z]+)', timeframe).groups()
+    amount = int(amount or 1)
+
+    if unit in ('Min', 'T', 'Hour', 'H'):
+        step = pd.Timedelta(minutes=amount) if unit in ('Min', 'T') else pd.Timedelta(hours=amount)
+        opens, closes = index, index + step
+    else:
+        step = {'Day': pd.DateOffset(days=amount), 'D': pd.DateOffset(days=amount),
+                'Week': pd.DateOffset(weeks=amount), 'W': pd.DateOffset(weeks=amount),
+                'Month': pd.DateOffset(months=amount), 'M': pd.DateOffset(months=amount)}[unit]
+        first_day = index.tz_convert(MARKET_TZ).tz_localize(None).normalize()
+        last_day = first_day + step - pd.Timedelta(days=1)
+        opens = (first_day + pd.Timedelta(hours=MARKET_OPEN[0], minutes=MARKET_OPEN[1])).tz_localize(MARKET_TZ)
+        closes = (last_day + pd.Timedelta(hours=MARKET_CLOSE[0], minutes=MARKET_CLOSE[1])).tz_localize(MARKET_TZ)
+
+    return opens.tz_convert('UTC').tz_localize(None).values, closes.tz_convert('UTC').tz_localize(None).values
+
+
+class ReplayAlpacaClient(AlpacaClient):
+    """
+    AlpacaClient stand-in backed by a BarStore and a simulated clock.
+
+    A bar is visible only once it has closed at the simulated time: an
+    intraday bar at its start plus the timeframe, a daily bar at that day's
+    session close. Bars are stamped at their start (daily bars at midnight New
+    York time), so the bar in progress, with its close, high and volume, stays
+    hidden and the executors cannot see the future. Market orders fill
+    immediately at the latest known price, adjusted by ``slippage``: the open
+    of the bar in progress once it has opened, otherwise the previous close.
+    """
+
+    def __init__(
+        self,
+        store: BarStore,
+        initial_cash: float = 100000.0,
+        slippage: float = 0.0,
+        spread: float = 0.0,
+        quote_timeframe: str = '1Day'
+    ):
+        # No session or credentials: every request is served locally.
+        self.store = store
+        self.initial_cash = float(initial_cash)
+        self.slippage = slippage
+        self.spread = spread
+        self.quote_timeframe = quote_timeframe
+
+        self._now: Optional[datetime] = None
+        self._frames: Dict[tuple, Dict[str, np.ndarray]] = {}
+        self._frames_lock = threading.Lock()
+        self.cash = float(initial_cash)
+        self.holdings: Dict[str, Dict[str, float]] = {}  # symbol -> {qty, cost}
+        self.orders: List[Dict[str, Any]] = []
+        self._client_order_ids = set()
+        self._orders_lock = threading.Lock()  # Orders may be placed concurrently
+
+    # ── Clock ─────────────────────────────────────────────────────────────────
+
+    def set_time(self, when) -> None:
+        """Move the simulated clock (naive values are taken as UTC)."""
+        ts = pd.Timestamp(when)
+        ts = ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+        self._now = ts.to_pydatetime()
+
+    def now(self) -> datetime:
+        """Simulated current time (UTC)."""
+        if self._now is None:
+            raise RuntimeError("Replay clock not set; call set_time() first")
+        return self._now
+
+    def get_clock(self) -> Dict[str, Any]:
+        """Market clock at the simulated time (regular session, weekdays)."""
+        local = self.now().astimezone(MARKET_TZ)
+        open_time = local.replace(hour=MARKET_OPEN[0], minute=MARKET_OPEN[1], second=0, microsecond=0)
+        close_time = local.replace(hour=MARKET_CLOSE[0], minute=MARKET_CLOSE[1], second=0, microsecond=0)
+        is_open = local.weekday() < 5 and open_time <= local < close_time
+
+        next_open = open_time if local < open_time else open_time + timedelta(days=1)
+        while next_open.weekday() >= 5:
+            next_open += timedelta(days=1)
+        next_close = close_time if local < close_time else close_time + timedelta(days=1)
+        while next_close.weekday() >= 5:
+            next_close += timedelta(days=1)
+
+        return {
+            'timestamp': local.isoformat(),
+            'is_open': is_open,
+            'next_open': next_open.isoformat(),
+            'next_close': next_close.isoformat()
+        }
+
+    # ── Market data ───────────────────────────────────────────────────────────
+
+    def _frame(self, symbol: str, timeframe: str) -> Optional[Dict[str, np.ndarray]]:
+        """Stored bars for a symbol as column arrays, loaded once."""
+        key = (symbol, timeframe)
+        if key not in self._frames:
+            with self._frames_lock:
+                if key not in self._frames:
+                    df = self.store.load_frame(symbol, timeframe)
+                    self._frames[key] = None if df.empty else {
+                        'index': df.index.values,
+                        't': df.index.strftime('%Y-%m-%dT%H:%M:%SZ').values,
+                        **dict(zip(('opens', 'closes'), bar_times(df.index, timeframe))),
+                        **{field: df[field].values for field in ('o', 'h', 'l', 'c', 'v')}
+                    }
+        return self._frames[key]
+
+    def _visible(self, frame: Dict[str, np.ndarray], start=None, end=None) -> slice:
+        """Row range of a frame's bars starting between start and end that have closed by now."""
+        now = pd.Timestamp(self.now()).tz_convert('UTC').tz_localize(None).to_datetime64()
+        hi = np.searchsorted(frame['closes'], now, side='right')
+        if end:
+            end_ts = pd.Timestamp(end)
+            end_ts = end_ts.tz_localize('UTC') if end_ts.tzinfo is None else end_ts
+            if len(str(end)) == 10:
+                # Date-only end covers the whole day
+                end_ts += timedelta(days=1) - timedelta(microseconds=1)
+            end_ts = end_ts.tz_convert('UTC').tz_localize(None).to_datetime64()
+            hi = min(hi, np.searchsorted(frame['index'], end_ts, side='right'))
+
+        lo = 0
+        if start:
+            start_ts = pd.Timestamp(start)
+            start_ts = start_ts.tz_convert('UTC').tz_localize(None) if start_ts.tzinfo else start_ts
+            lo = np.searchsorted(frame['index'], start_ts.to_datetime64(), side='left')
+        return slice(lo, max(lo, hi))
+
+    def _bars_page(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start: Optional[str],
+        end: Optional[str],
+        limit: int,
+        page_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        One page of stored bars visible at the simulated time.
+
+        Like Alpaca, ``limit`` caps the bars per page across all symbols
+        (ordered by symbol, then time) and ``next_page_token`` resumes after
+        the last bar served.
+        """
+        bars = {}
+        skip = int(page_token or 0)
+        remaining = limit
+        served = skip
+        for symbol in sorted(symbols):
+            frame = self._frame(symbol, timeframe)
+            if frame is None:
+                continue
+            rows = self._visible(frame, start, end)
+            available = rows.stop - rows.start
+            if skip >= available:
+                skip -= available
+                continue
+            if remaining <= 0:
+                return {'bars': bars, 'next_page_token': str(served)}
+            lo = rows.start + skip
+            hi = min(rows.stop, lo + remaining)
+            skip = 0
+            bars[symbol] = [
+                {'t': t, 'o': float(o), 'h': float(h), 'l': float(l), 'c': float(c), 'v': float(v)}
+                for t, o, h, l, c, v in zip(
+                    frame['t'][lo:hi], frame['o'][lo:hi], frame['h'][lo:hi],
+                    frame['l'][lo:hi], frame['c'][lo:hi], frame['v'][lo:hi]
+                )
+            ]
+            remaining -= hi - lo
+            served += hi - lo
+            if hi < rows.stop:
+                return {'bars': bars, 'next_page_token': str(served)}
+
+        return {'bars': bars, 'next_page_token': None}
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        """Latest price known at the simulated time: the open of the bar in progress, else the last close."""
+        frame = self._frame(symbol, self.quote_timeframe)
+        if frame is None:
+            return None
+        now = pd.Timestamp(self.now()).tz_convert('UTC').tz_localize(None).to_datetime64()
+        opened = np.searchsorted(frame['opens'], now, side='right')
+        closed = self._visible(frame).stop
+        if opened > closed:
+            return float(frame['o'][opened - 1])
+        if closed == 0:
+            return None
+        return float(frame['c'][closed - 1])
+
+    def get_latest_quotes(self, symbols: List[str]) -> Dict[str, Any]:
+        """Quotes around the latest visible close."""
+        quotes = {}
+        for symbol in symbols:
+            price = self.last_price(symbol)
+            if price is None:
+                continue
+            quotes[symbol] = {
+                'bp': price * (1 - self.spread / 2),
+                'ap': price * (1 + self.spread / 2),
+                't': self.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+            }
+        return {'quotes': quotes}
+
+    # ── Trading ───────────────────────────────────────────────────────────────
+
+    def place_order(
+        self,
+        symbol: str,
+        qty: float,
+        side: str,
+        order_type: str = 'market',
+        time_in_force: str = 'day',
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+        client_order_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Fill at the simulated price; limit orders fill only if marketable."""
+        with self._orders_lock:
+            if client_order_id is not None and client_order_id in self._client_order_ids:
+                raise ValueError(f"client_order_id must be unique: {client_order_id}")
+
+            price = self.last_price(symbol)
+            if price is None:
+                raise ValueError(f"No replay price for {symbol} at {self.now().isoformat()}")
+
+            qty = float(qty)
+            fill_price = price * (1 + self.slippage if side == 'buy' else 1 - self.slippage)
+            marketable = order_type == 'market' or limit_price is None or (
+                fill_price <= limit_price if side == 'buy' else fill_price >= limit_price
+            )
+            # Distinct fill times keep same-second orders in sequence
+            timestamp = (self.now() + timedelta(microseconds=len(self.orders))).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+            order = {
+                'id': f"replay-{len(self.orders) + 1}",
+                'client_order_id': client_order_id or f"replay-{len(self.orders) + 1}",
+                'symbol': symbol,
+                'side': side,
+                'type': order_type,
+                'time_in_force': time_in_force,
+                'qty': str(qty),
+                'limit_price': None if limit_price is None else str(limit_price),
+                'stop_price': None if stop_price is None else str(stop_price),
+                'created_at': timestamp,
+                'submitted_at': timestamp,
+                'status': 'filled' if marketable else 'new',
+                'filled_qty': str(qty) if marketable else '0',
+                'filled_avg_price': str(fill_price) if marketable else None,
+                'filled_at': timestamp if marketable else None
+            }
+            if marketable:
+                self._apply_fill(symbol, side, qty, fill_price)
+
+            self.orders.append(order)
+            self._client_order_ids.add(order['client_order_id'])
+            logger.debug(f"Replay {side} {qty} {symbol} @ {fill_price:.2f} ({order['status']})")
+            return dict(order)
+
+    def _apply_fill(self, symbol: str, side: str, qty: float, price: float) -> None:
+        holding = self.holdings.setdefault(symbol, {'qty': 0.0, 'cost': 0.0})
+        if side == 'buy':
+            holding['qty'] += qty
+            holding['cost'] += qty * price
+            self.cash -= qty * price
+        else:
+            if holding['qty'] > 0:
+                holding['cost'] -= min(qty / holding['qty'], 1.0) * holding['cost']
+            holding['qty'] -= qty
+            self.cash += qty * price
+        if abs(holding['qty']) < 1e-9:
+            del self.holdings[symbol]
+
+    def _orders_page(
+        self,
+        status: str,
+        limit: int,
+        after: Optional[str] = None,
+        until: Optional[str] = None,
+        direction: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Orders newest first (or oldest first with direction='asc'), truncated to ``limit`` like the Alpaca endpoint."""
+        if status == 'open':
+            orders = [o for o in self.orders if o['status'] == 'new']
+        elif status == 'closed':
+            orders = [o for o in self.orders if o['status'] != 'new']
+        elif status == 'all':
+            orders = self.orders
+        else:
+            orders = [o for o in self.orders if o['status'] == status]
+        if after:
+            after = parse_time(after)
+            orders = [o for o in orders if parse_time(o['submitted_at']) > after]
+        if until:
+            until = parse_time(until)
+            orders = [o for o in orders if parse_time(o['submitted_at']) < until]
+        if direction != 'asc':
+            orders = list(reversed(orders))
+        return [dict(o) for o in orders][:limit]
+
+    def get_order(self, order_id: str) -> Dict[str, Any]:
+        """Get a specific order by ID."""
+        for order in self.orders:
+            if order['id'] == order_id:
+                return dict(order)
+        raise KeyError(order_id)
+
+    def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        """Cancel an open order."""
+        for order in self.orders:
+            if order['id'] == order_id and order['status'] == 'new':
+                order['status'] = 'canceled'
+        return {}
+
+    def cancel_all_orders(self) -> List[Dict[str, Any]]:
+        """Cancel all open orders."""
+        cancelled = []
+        for order in self.orders:
+            if order['status'] == 'new':
+                order['status'] = 'canceled'
+                cancelled.append({'id': order['id'], 'status': 200})
+        return cancelled
+
+    def get_positions(self) -> List[Dict[str, Any]]:
+        """Aggregate positions marked at the latest visible close."""
+        positions = []
+        for symbol, holding in self.holdings.items():
+            price = self.last_price(symbol) or 0.0
+            avg_entry = holding['cost'] / holding['qty'] if holding['qty'] else 0.0
+            market_value = holding['qty'] * price
+            positions.append({
+                'symbol': symbol,
+                'qty': str(holding['qty']),
+                'side': 'long' if holding['qty'] > 0 else 'short',
+                'avg_entry_price': str(avg_entry),
+                'current_price': str(price),
+                'market_value': str(market_value),
+                'unrealized_pl': str(market_value - holding['cost'])
+            })
+        return positions
+
+    def get_position(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get position for a specific symbol."""
+        for position in self.get_positions():
+            if position['symbol'] == symbol:
+                return position
+        return None
+
+    def get_account(self) -> Dict[str, Any]:
+        """Account balances at the simulated time."""
+        long_value = sum(float(p['market_value']) for p in self.get_positions())
+        equity = self.cash + long_value
+        return {
+            'cash': str(self.cash),
+            'portfolio_value': str(equity),
+            'equity': str(equity),
+            'buying_power': str(max(self.cash, 0.0)),
+            'status': 'ACTIVE'
+        }
+
+    def _request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+        raise RuntimeError(f"Replay client cannot make network requests ({method} {url})")
+
+
+# ── Replay drivers ─────────────────────────────────────────────────────────────
+
+def trading_sessions(store: BarStore, start: str, end: str, symbols: List[str] = None) -> List[pd.Timestamp]:
+    """Dates (exchange-local) with at least one stored daily bar between start and end."""
+    dates = set()
+    for symbol in symbols or store.symbols('1Day'):
+        for bar in store.get_bars(symbol, '1Day'):
+            day = pd.Timestamp(bar['t']).tz_convert(MARKET_TZ).normalize().tz_localize(None)
+            dates.add(day)
+    lo, hi = pd.Timestamp(start), pd.Timestamp(end)
+    return sorted(d for d in dates if lo <= d <= hi)
+
+
+def session_time(day: pd.Timestamp, at: str) -> datetime:
+    """UTC datetime of an exchange-local HH:MM on a session date."""
+    hour, minute = map(int, at.split(':'))
+    local = datetime(day.year, day.month, day.day, hour, minute, tzinfo=MARKET_TZ)
+    return local.astimezone(timezone.utc)
+
+
+def replay_strategy_executor(
+    store: BarStore,
+    start: str,
+    end: str,
+    strategy_ids: List[int] = None,
+    at: str = '15:45',
+    initial_cash: float = 100000.0,
+    slippage: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Run StrategyExecutor.execute_strategy once per session at ``at`` (ET).
+
+    Returns:
+        Per-session results, per-strategy final state and the replay speed
+    """
+    from strategy_executor import StrategyExecutor
+
+    client = ReplayAlpacaClient(store, initial_cash=initial_cash, slippage=slippage)
+    executor = StrategyExecutor(client=client, publish=False)
+    strategy_ids = strategy_ids or list(executor.strategies.keys())
+
+    sessions = trading_sessions(store, start, end)
+    history = []
+    started = time.perf_counter()
+
+    for day in sessions:
+        client.set_time(session_time(day, at))
+        results = {sid: executor.execute_strategy(sid) for sid in strategy_ids}
+        history.append({
+            'date': day.strftime('%Y-%m-%d'),
+            'trades': sum(r.get('trades_executed', 0) for r in results.values()),
+            'errors': [sid for sid, r in results.items() if not r.get('success')]
+        })
+
+    elapsed = time.perf_counter() - started
+    return {
+        'sessions': len(sessions),
+        'history': history,
+        'strategies': {
+            sid: _strategy_summary(executor, client, sid) for sid in strategy_ids
+        },
+        'orders': len(client.orders),
+        'elapsed_seconds': round(elapsed, 3),
+        'speedup': _speedup(sessions, elapsed)
+    }
+
+
+def replay_trading_executor(
+    store: BarStore,
+    start: str,
+    end: str,
+    step_minutes: int = 5,
+    initial_cash: float = 100000.0,
+    slippage: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Run TradingExecutor.run_strategy_execution every ``step_minutes`` through
+    each session, with market data served from the bar store.
+    """
+    scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+    sys.path.insert(0, os.path.abspath(scripts_dir))
+    from execute_trades import TradingExecutor
+
+    client = ReplayAlpacaClient(store, initial_cash=initial_cash, slippage=slippage)
+    executor = TradingExecutor(client=client, publish=False, data_source='alpaca')
+
+    sessions = trading_sessions(store, start, end)
+    open_at = f"{MARKET_OPEN[0]:02d}:{MARKET_OPEN[1]:02d}"
+    history = []
+    started = time.perf_counter()
+
+    for day in sessions:
+        moment = session_time(day, open_at)
+        close = moment + timedelta(hours=6, minutes=30)
+        while moment < close:
+            client.set_time(moment)
+            result = executor.run_strategy_execution()
+            if result.get('trades_executed'):
+                history.append({
+                    'time': moment.isoformat(),
+                    'trades': result['trades_executed']
+                })
+            moment += timedelta(minutes=step_minutes)
+
+    elapsed = time.perf_counter() - started
+    return {
+        'sessions': len(sessions),
+        'history': history,
+        'account': client.get_account(),
+        'orders': len(client.orders),
+        'elapsed_seconds': round(elapsed, 3),
+        'speedup': _speedup(sessions, elapsed)
+    }
+
+
+def _strategy_summary(executor, client: ReplayAlpacaClient, strategy_id: int) -> Dict[str, Any]:
+    positions, cash = executor.get_strategy_state(strategy_id)
+    positions_value = sum(
+        pos['quantity'] * (client.last_price(symbol) or pos['avg_cost_basis'])
+        for symbol, pos in positions.items()
+    )
+    initial = float(executor.strategies[strategy_id]['initial_capital'])
+    return {
+        'name': executor.strategies[strategy_id]['name'],
+        'cash': round(cash, 2),
+        'positions': sorted(positions),
+        'equity': round(cash + positions_value, 2),
+        'return_pct': round((cash + positions_value - initial) / initial * 100, 2)
+    }
+
+
+def _speedup(sessions: List[pd.Timestamp], elapsed: float) -> Optional[float]:
+    """Simulated wall-clock span divided by replay time."""
+    if not sessions or elapsed <= 0:
+        return None
+    simulated = (sessions[-1] - sessions[0] + pd.Timedelta(days=1)).total_seconds()
+    return round(simulated / elapsed, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shadow replay of the live executors')
+    parser.add_argument('--start', required=True)
+    parser.add_argument('--end', required=True)
+    parser.add_argument('--executor', choices=['strategy', 'trading'], default='strategy')
+    parser.add_argument('--strategy', type=int, action='append', help='Strategy ID (repeatable)')
+    parser.add_argument('--time', default='15:45', help='Session time (ET) for the strategy executor')
+    parser.add_argument('--step', type=int, default=5, help='Minutes between trading executor runs')
+    parser.add_argument('--capital', type=float, default=100000.0)
+    parser.add_argument('--slippage', type=float, default=0.0)
+    parser.add_argument('--db', default=None, help='Bar store path (default: config.BAR_STORE_PATH)')
+    args = parser.parse_args()
+
+    store = BarStore(args.db)
+    if args.executor == 'strategy':
+        result = replay_strategy_executor(
+            store, args.start, args.end, args.strategy, args.time, args.capital, args.slippage
+        )
+    else:
+        result = replay_trading_executor(
+            store, args.start, args.end, args.step, args.capital, args.slippage
+        )
+    result.pop('history')
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Universe Scanner — rank a full-market candidate set for dynamic universes.
+
+The executors' dynamic universes start from short hard-coded lists. The
+scanner instead scores every daily symbol in the bar store (or a list such as
+the S&P 500): bars are read in chunks as dates x symbols panels, scored with
+the panel indicators behind MarketSnapshot, filtered for liquidity and ranked
+per scan. The ranked candidates are written to the ``scanner_candidates``
+table, where TradingExecutor picks them up as the base universe of the
+matching strategy. Run it before the 09:45 selection (bars must be current
+in the bar store).
+
+The ``precomputed_universes`` table holds dynamic universes selected ahead of
+a session (scripts/precompute_session.py), keyed by TradingExecutor cache key.
+
+Scans:
+    momentum        20-bar momentum plus 0.3 x volume trend (momentum-hunter)
+    mean_reversion  distance of RSI from 50 when below 35 or above 68 (mean-reversion)
+    atr_expansion   14-bar ATR relative to the 50-bar ATR (volatility-breakout)
+
+Usage:
+    python3 scanner.py --scan                          # every daily symbol in the bar store
+    python3 scanner.py --scan --symbols-file sp500.txt
+    python3 scanner.py --show momentum
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from bar_store import BarStore
+from market_data import MarketSnapshot, lookback_start
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def momentum_scores(metrics: pd.DataFrame) -> pd.Series:
+    """20-bar momentum plus 0.3 x volume trend, as the momentum-hunter selector scores it."""
+    metrics = metrics[metrics['bars'] >= 20]
+    volume_trend = metrics['volume_trend'].where(
+        (metrics['volume_bars'] >= 20) & np.isfinite(metrics['volume_trend']), 0
+    )
+    return metrics['momentum'] + 0.3 * volume_trend
+
+
+def mean_reversion_scores(metrics: pd.DataFrame) -> pd.Series:
+    """Distance of RSI from 50 for symbols outside the 35-68 band."""
+    rsi = metrics.loc[metrics['bars'] >= 30, 'rsi']
+    rsi = rsi[(rsi < 35) | (rsi > 68)]
+    return (rsi - 50).abs()
+
+
+def atr_expansion_scores(metrics: pd.DataFrame) -> pd.Series:
+    """14-bar ATR relative to the 50-bar ATR."""
+    return metrics.loc[metrics['bars'] >= 50, 'atr_expansion']
+
+
+def _utc(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+
+
+SCANS: Dict[str, Callable[[pd.DataFrame], pd.Series]] = {
+    'momentum': momentum_scores,
+    'mean_reversion': mean_reversion_scores,
+    'atr_expansion': atr_expansion_scores
+}
+
+
+class UniverseScanner:
+    """Scores bar-store symbols in chunks and caches the ranked candidates."""
+
+    def __init__(self, store: BarStore = None):
+        """
+        Args:
+            store: Bar store to scan and hold the candidate table (default: config.BAR_STORE_PATH)
+        """
+        self.store = store or BarStore()
+        self.conn = self.store.conn
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS scanner_candidates (
+                kind TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                score REAL NOT NULL,
+                close REAL,
+                dollar_volume REAL,
+                scanned_at TEXT NOT NULL,
+                PRIMARY KEY (kind, rank)
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS precomputed_universes (
+                cache_key TEXT PRIMARY KEY,
+                symbols TEXT NOT NULL,
+                computed_at TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def score_chunk(self, symbols: List[str], now: datetime, days: int = None) -> pd.DataFrame:
+        """Snapshot scores (see MarketSnapshot.scores) for one chunk of symbols."""
+        days = days or config.SCANNER_LOOKBACK_DAYS
+        panels = self.store.load_panels(symbols, start=lookback_start(now, days), end=now)
+        return MarketSnapshot.from_panels(panels, now=now).scores(days)
+
+    def scan(
+        self,
+        symbols: Optional[List[str]] = None,
+        now: Optional[datetime] = None,
+        top: int = None
+    ) -> Dict[str, Any]:
+        """
+        Score, filter and rank ``symbols`` and replace the cached candidates.
+
+        Args:
+            symbols: Candidate set (default: every daily symbol in the bar store)
+            now: Scan time; only bars up to it are read (default: current UTC time)
+            top: Candidates kept per scan (default: config.SCANNER_TOP)
+
+        Returns:
+            {'symbols', 'liquid', 'seconds', 'candidates': {scan: [symbols]}}
+        """
+        started = time.perf_counter()
+        now = now or datetime.now(timezone.utc)
+        top = top or config.SCANNER_TOP
+        symbols = symbols or self.store.symbols('1Day')
+
+        chunk_size = config.SCANNER_CHUNK_SIZE
+        chunks = [self.score_chunk(symbols[i:i + chunk_size], now) for i in range(0, len(symbols), chunk_size)]
+        chunks = [chunk for chunk in chunks if not chunk.empty]
+        if not chunks:
+            logger.warning("Scanner found no bars to score")
+            return {'symbols': len(symbols), 'liquid': 0, 'seconds': 0.0, 'candidates': {}}
+
+        metrics = pd.concat(chunks)
+        liquid = metrics[(metrics['close'] >= config.SCANNER_MIN_PRICE) &
+                         (metrics['dollar_volume'] >= config.SCANNER_MIN_DOLLAR_VOLUME)]
+
+        scanned_at = _utc(now).isoformat()
+        candidates = {}
+        with self.conn:
+            for kind, score in SCANS.items():
+                ranked = score(liquid).dropna().sort_values(ascending=False, kind='stable').head(top)
+                self.conn.execute("DELETE FROM scanner_candidates WHERE kind = ?", (kind,))
+                self.conn.executemany(
+                    "INSERT INTO scanner_candidates "
+                    "(kind, rank, symbol, score, close, dollar_volume, scanned_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (kind, rank, symbol, float(value), float(liquid.at[symbol, 'close']),
+                         float(liquid.at[symbol, 'dollar_volume']), scanned_at)
+                        for rank, (symbol, value) in enumerate(ranked.items(), start=1)
+                    ]
+                )
+                candidates[kind] = list(ranked.index)
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Scanned {len(symbols)} symbols ({len(liquid)} liquid) in {elapsed:.2f}s")
+        return {
+            'symbols': len(symbols),
+            'liquid': len(liquid),
+            'seconds': round(elapsed, 3),
+            'candidates': candidates
+        }
+
+    def get_candidates(
+        self,
+        kind: str,
+        limit: Optional[int] = None,
+        max_age: Optional[timedelta] = None,
+        now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Ranked symbols of the latest scan, best first.
+
+        Args:
+            kind: Scan name (see SCANS)
+            limit: Number of symbols (default: all kept)
+            max_age: Ignore a scan older than this (relative to ``now``)
+            now: Reference time for ``max_age`` (default: current UTC time)
+
+        Returns:
+            Symbols, or an empty list when there is no (fresh) scan
+        """
+        rows = self.conn.execute(
+            "SELECT symbol, scanned_at FROM scanner_candidates WHERE kind = ? ORDER BY rank",
+            (kind,)
+        ).fetchall()
+        if not rows:
+            return []
+
+        if max_age is not None:
+            if _utc(now or datetime.now(timezone.utc)) - _utc(rows[0][1]) > max_age:
+                return []
+
+        symbols = [symbol for symbol, _ in rows]
+        return symbols[:limit] if limit else symbols
+
+    def save_universes(self, universes: Dict[str, List[str]], computed_at: Optional[datetime] = None) -> None:
+        """Store dynamic universes selected ahead of time, keyed by TradingExecutor cache key."""
+        computed_at = _utc(computed_at or datetime.now(timezone.utc)).isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO precomputed_universes (cache_key, symbols, computed_at) VALUES (?, ?, ?)",
+                [(cache_key, json.dumps(symbols), computed_at) for cache_key, symbols in universes.items()]
+            )
+
+    def get_universe(self, cache_key: str) -> Optional[List[str]]:
+        """Precomputed universe for a cache key, or None."""
+        row = self.conn.execute(
+            "SELECT symbols FROM precomputed_universes WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_info(self) -> Dict[str, Any]:
+        """Scan time and candidate count per scan."""
+        rows = self.conn.execute(
+            "SELECT kind, MAX(scanned_at), COUNT(*) FROM scanner_candidates GROUP BY kind ORDER BY kind"
+        )
+        return {kind: {'scanned_at': scanned_at, 'candidates': count} for kind, scanned_at, count in rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full-market universe scanner')
+    parser.add_argument('--db', default=None, help='Bar store path (default: config.BAR_STORE_PATH)')
+    parser.add_argument('--scan', action='store_true', help='Scan and replace the cached candidates')
+    parser.add_argument('--symbols-file', help='File with one symbol per line (default: every stored symbol)')
+    parser.add_argument('--top', type=int, default=None, help='Candidates kept per scan')
+    parser.add_argument('--show', choices=sorted(SCANS), help='Print the cached candidates of a scan')
+    args = parser.parse_args()
+
+    scanner = UniverseScanner(BarStore(args.db))
+
+    if args.scan:
+        symbols = None
+        if args.symbols_file:
+            with open(args.symbols_file) as f:
+                symbols = [line.strip().upper() for line in f if line.strip()]
+        print(json.dumps(scanner.scan(symbols, top=args.top), indent=2))
+    elif args.show:
+        print(json.dumps(scanner.get_candidates(args.show), indent=2))
+    else:
+        print(json.dumps(scanner.get_info(), indent=2))
+
+    scanner.store.close()
+
+
+if __name__ == '__main__':
+    main()
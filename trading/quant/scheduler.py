@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Strategy Scheduler — exact run times from the market calendar.
+
+Each strategy's ``execution_schedule`` is parsed once into the run times of
+a session (in exchange time, so DST and early closes are exact), and the
+scheduler keeps the next pending run per strategy. ``due(now)`` returns the
+strategies whose pending run has come and moves them to their next run, so
+a run is never repeated, and one missed by at most ``grace_minutes`` (a late
+cron tick or a restart) still fires. Loops sleep until ``next_event()``
+instead of polling.
+
+Schedules (TradingExecutor.strategy_config keys):
+    daily        execution_time on every session
+    weekly       execution_day at execution_time (the next session of that
+                 week when the day is a holiday)
+    every_30min  :00 and :30 from the open until the close
+    anything else, e.g. every_5min: every ``interval_minutes`` from the open
+
+Usage:
+    python3 scheduler.py        # next run of each TradingExecutor schedule
+"""
+
+import json
+import os
+import sys
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Hashable, Iterable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from market_calendar import MarketCalendar, Session, parse_time_of_day
+import config
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def _utc(when: datetime) -> datetime:
+    return when.replace(tzinfo=timezone.utc) if when.tzinfo is None else when
+
+
+class StrategyScheduler:
+    """Next-run bookkeeping for a set of strategy schedules."""
+
+    def __init__(
+        self,
+        schedules: Dict[Hashable, Dict[str, str]],
+        calendar: MarketCalendar = None,
+        interval_minutes: int = None,
+        grace_minutes: int = None
+    ):
+        """
+        Args:
+            schedules: Key -> schedule dict with ``execution_schedule`` and, as
+                needed, ``execution_time`` / ``execution_day``
+            calendar: Market calendar (default: config.MARKET_CALENDAR_PATH)
+            interval_minutes: Step of intraday schedules (default: config.SCHEDULER_INTERVAL_MINUTES)
+            grace_minutes: How late a run may still fire (default: config.SCHEDULER_GRACE_MINUTES)
+        """
+        self.calendar = calendar or MarketCalendar()
+        self.interval = timedelta(minutes=interval_minutes or config.SCHEDULER_INTERVAL_MINUTES)
+        self.grace = timedelta(minutes=config.SCHEDULER_GRACE_MINUTES if grace_minutes is None else grace_minutes)
+        self.schedules = dict(schedules)
+        self._next: Dict[Hashable, datetime] = {}
+        self._run_times: Dict[tuple, List[datetime]] = {}
+
+    def run_times(self, key: Hashable, session: Session) -> List[datetime]:
+        """Run times of a strategy within one session, in exchange time."""
+        open_at, close_at = session
+        cache_key = (key, open_at.date())
+        if cache_key in self._run_times:
+            return self._run_times[cache_key]
+
+        schedule = self.schedules[key]
+        kind = schedule.get('execution_schedule')
+        if kind in ('daily', 'weekly'):
+            day = open_at.date()
+            at = datetime.combine(day, parse_time_of_day(schedule.get('execution_time', '09:45')), tzinfo=open_at.tzinfo)
+            runs = [at] if open_at <= at < close_at else []
+            if kind == 'weekly' and day != self._weekly_day(day, schedule.get('execution_day', 'Monday')):
+                runs = []
+        else:
+            step = timedelta(minutes=30) if kind == 'every_30min' else self.interval
+            runs = []
+            at = open_at
+            while at < close_at:
+                runs.append(at)
+                at += step
+
+        self._run_times[cache_key] = runs
+        return runs
+
+    def _weekly_day(self, day: date, execution_day: str) -> Optional[date]:
+        """Session day of a weekly run in the week of ``day``: the first session on or after the weekday."""
+        target = day - timedelta(days=day.weekday()) + timedelta(days=WEEKDAYS.index(execution_day))
+        while target.weekday() < 5:
+            if self.calendar.is_session_day(target):
+                return target
+            target += timedelta(days=1)
+        return None
+
+    def next_run(self, key: Hashable, after: datetime) -> datetime:
+        """First run of a strategy strictly after ``after``."""
+        after = _utc(after)
+        when = after
+        for _ in range(400):
+            session = self.calendar.next_session(when)
+            for run in self.run_times(key, session):
+                if run > after:
+                    return run
+            when = session[1]
+        raise ValueError(f"No run scheduled for {key} within 400 sessions of {after}")
+
+    def _pending(self, key: Hashable, now: datetime) -> datetime:
+        pending = self._next.get(key)
+        if pending is None or pending <= now - self.grace:
+            pending = self.next_run(key, now - self.grace)
+        return pending
+
+    def is_due(self, key: Hashable, now: datetime) -> bool:
+        """True when the strategy's pending run has come (does not consume it)."""
+        return self._pending(key, _utc(now)) <= _utc(now)
+
+    def due(self, now: datetime, keys: Iterable[Hashable] = None) -> List[Hashable]:
+        """
+        Strategies to run at ``now``; each is moved on to its next run.
+
+        Args:
+            now: Current time
+            keys: Strategies to consider (default: all)
+        """
+        now = _utc(now)
+        due = []
+        for key in (self.schedules if keys is None else keys):
+            pending = self._pending(key, now)
+            if pending <= now:
+                due.append(key)
+                pending = self.next_run(key, now)
+            self._next[key] = pending
+        return due
+
+    def next_event(self, now: datetime) -> datetime:
+        """Earliest pending run across all strategies."""
+        now = _utc(now)
+        for key in self.schedules:
+            self._next[key] = self._pending(key, now)
+        return min(self._next[key] for key in self.schedules)
+
+
+def main():
+    scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+    sys.path.insert(0, os.path.abspath(scripts_dir))
+    from execute_trades import TradingExecutor
+
+    executor = TradingExecutor(publish=False)
+    now = datetime.now(timezone.utc)
+    print(json.dumps({
+        config_['name']: executor.scheduler.next_run(strategy_id, now).isoformat()
+        for strategy_id, config_ in executor.strategy_config.items()
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
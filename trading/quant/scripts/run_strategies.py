@@ -2,19 +2,27 @@
 """
 PM2 entry point: runs all strategies every 5 minutes during market hours.
 Direction B: Real Alpaca paper trading execution.
+
+Run times come from the market calendar (holidays, early closes and DST
+included), and the runner sleeps until the next one instead of polling.
 """
 
 import os
 import sys
 import time
-import schedule
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Add the parent directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from strategy_executor import StrategyExecutor
+from scheduler import StrategyScheduler
+from telemetry import metrics
+import config
+
+# Longest single sleep; the next run is re-evaluated on waking
+MAX_SLEEP_SECONDS = 3600
 
 # Configure logging
 logging.basicConfig(
@@ -28,15 +36,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 def run_strategies():
-    """Execute all strategies if market is open."""
+    """Execute all strategies (called at scheduled run times, i.e. while the market is open)."""
     try:
         executor = StrategyExecutor()
         
-        # Check if market is open
-        if not executor.alpaca.is_market_open():
-            logger.info("Market is closed, skipping strategy execution")
-            return
-        
         logger.info("Market is open, executing all strategies...")
         result = executor.run_all_strategies()
         
@@ -52,18 +55,25 @@ def run_strategies():
 def main():
     """Main entry point for PM2 process."""
     logger.info("Strategy Runner started (Direction B: Real Alpaca execution)")
+    if config.METRICS_PORT:
+        metrics.serve()
     
-    # Schedule strategy execution every 5 minutes
-    schedule.every(5).minutes.do(run_strategies)
+    # Every 5 minutes (config.SCHEDULER_INTERVAL_MINUTES) from the open to the close
+    scheduler = StrategyScheduler({'strategies': {'execution_schedule': 'every_5min'}})
     
-    # Run once on startup (if market is open)
-    run_strategies()
-    
-    # Main loop
+    # Main loop: run when due (a run missed by up to the grace, e.g. on
+    # startup mid-interval, still fires), then sleep until the next run
     while True:
         try:
-            schedule.run_pending()
-            time.sleep(30)  # Check every 30 seconds
+            now = datetime.now(timezone.utc)
+            if scheduler.due(now):
+                run_strategies()
+                continue
+            
+            next_run = scheduler.next_event(now)
+            wait = (next_run - now).total_seconds()
+            logger.info(f"Next run at {next_run.isoformat()} ({wait / 60:.1f} min)")
+            time.sleep(min(max(wait, 0), MAX_SLEEP_SECONDS))
         except KeyboardInterrupt:
             logger.info("Strategy Runner shutting down...")
             break
@@ -72,4 +82,4 @@ def main():
             time.sleep(60)  # Wait a minute before retrying
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
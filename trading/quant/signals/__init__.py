@@ -1,9 +1,12 @@
 """Signals package."""
 
 from .generator import SignalAggregator, SignalGenerator, signal_generator
+from .journal import SignalJournal, signal_journal
 
 __all__ = [
     'SignalAggregator',
     'SignalGenerator',
-    'signal_generator'
+    'signal_generator',
+    'SignalJournal',
+    'signal_journal'
 ]
\ No newline at end of file
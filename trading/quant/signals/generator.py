@@ -1,36 +1,109 @@
 """Signal aggregation and generation system."""
 
+import inspect
+import time
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from concurrent.futures import (
+    FIRST_COMPLETED, BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+)
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 from datetime import datetime
 
 from strategies.base import Strategy, Signal
-from strategies.momentum import MomentumStrategy
-from strategies.mean_reversion import MeanReversionStrategy
-from strategies.volatility_breakout import VolatilityBreakoutStrategy
-from strategies.sector_rotation import SectorRotationStrategy
-from strategies.value_dividend import ValueDividendStrategy
+from strategies.registry import iter_specs
+from signals.journal import SignalJournal, signal_journal
 from utils.risk import RiskManager
 import config
 
 logger = logging.getLogger(__name__)
 
+EXECUTION_MODES = ('serial', 'thread', 'process')
+
+# How often a pooled run checks which strategies have started, while any has a budget
+_POLL_SECONDS = 0.05
+
+
+def _evaluate_task(
+    strategy: Strategy,
+    accepts_symbol: bool,
+    data: Dict[str, pd.DataFrame],
+    symbol: Optional[str]
+) -> Tuple[List[Signal], float]:
+    """
+    Run one strategy on one symbol (or on the whole universe when symbol is None).
+
+    Returns:
+        (signals, elapsed seconds)
+    """
+    started = time.perf_counter()
+    if symbol is None:
+        signals = strategy.generate_universe_signals(data)
+    elif accepts_symbol:
+        signals = strategy.generate_signals(data[symbol], symbol=symbol)
+    else:
+        signals = strategy.generate_signals(data[symbol])
+    return signals, time.perf_counter() - started
+
+
+
 class SignalAggregator:
-    """Aggregates signals from multiple strategies and applies filters."""
+    """
+    Aggregates signals from multiple strategies and applies filters.
+    
+    Strategies are evaluated as a strategy x symbol matrix of tasks, either
+    in-line ('serial') or on a thread or process pool. Results are always
+    combined in strategy-then-universe order, so the output does not depend
+    on which task finishes first.
+    
+    The pool is created on the first pooled run and kept for the aggregator's
+    lifetime, so cycles do not pay for starting workers; call close() to stop it.
+    """
     
-    def __init__(self, risk_manager: Optional[RiskManager] = None):
+    def __init__(
+        self,
+        risk_manager: Optional[RiskManager] = None,
+        execution_mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        strategy_time_budget: Optional[float] = None,
+        strategy_time_budgets: Optional[Dict[str, float]] = None,
+        journal: Optional[SignalJournal] = None
+    ):
+        """
+        Args:
+            risk_manager: Risk manager used by the risk filters
+            execution_mode: 'serial', 'thread' or 'process' (default: config.SIGNAL_EXECUTION_MODE)
+            max_workers: Pool size (default: config.SIGNAL_MAX_WORKERS, or the executor default)
+            strategy_time_budget: Seconds each strategy may spend per cycle; tasks still
+                unfinished after that are dropped (default: config.SIGNAL_STRATEGY_BUDGET)
+            strategy_time_budgets: Budgets for named strategies, overriding
+                strategy_time_budget (default: config.SIGNAL_STRATEGY_BUDGETS)
+            journal: Signal journal that records every strategy's raw signals (default: none)
+        """
         self.strategies = {}
         self.risk_manager = risk_manager or RiskManager()
         self.universe = config.DEFAULT_UNIVERSE
+        self.execution_mode = execution_mode or config.SIGNAL_EXECUTION_MODE
+        self.max_workers = max_workers or config.SIGNAL_MAX_WORKERS or None
+        self.strategy_time_budget = strategy_time_budget or config.SIGNAL_STRATEGY_BUDGET or None
+        self.strategy_time_budgets = dict(config.SIGNAL_STRATEGY_BUDGETS)
+        self.strategy_time_budgets.update(strategy_time_budgets or {})
+        self.last_run_stats: Dict[str, Any] = {}
+        self.journal = journal
+        self._pool: Optional[Executor] = None
+        
+        if self.execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"execution_mode must be one of {EXECUTION_MODES}, got {self.execution_mode!r}")
         
     def add_strategy(self, name: str, strategy: Strategy, weight: float = 1.0) -> None:
         """Add a strategy to the aggregator."""
         self.strategies[name] = {
             'strategy': strategy,
             'weight': weight,
-            'enabled': True
+            'enabled': True,
+            'accepts_symbol': 'symbol' in inspect.signature(strategy.generate_signals).parameters,
+            'cross_sectional': getattr(strategy, 'cross_sectional', False)
         }
         logger.info(f"Added strategy: {name} with weight {weight}")
     
@@ -53,6 +126,16 @@ class SignalAggregator:
             self.strategies[name]['weight'] = weight
             logger.info(f"Set weight for {name}: {weight}")
     
+    def time_budget(self, name: str) -> Optional[float]:
+        """Seconds a strategy may spend per cycle (None: unlimited)."""
+        return self.strategy_time_budgets.get(name, self.strategy_time_budget) or None
+    
+    def close(self) -> None:
+        """Stop the worker pool (a later pooled run starts a new one)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+    
     def generate_signals(self, data: Dict[str, pd.DataFrame]) -> List[Signal]:
         """
         Generate aggregated signals from all active strategies.
@@ -63,44 +146,36 @@ class SignalAggregator:
         Returns:
             List of aggregated and filtered signals
         """
-        all_signals = []
-        strategy_signals = {}
+        # Shared, read-only view of the universe's data
+        universe_data = {
+            symbol: data[symbol] for symbol in self.universe
+            if symbol in data and not data[symbol].empty
+        }
+        tasks = self._build_tasks(universe_data)
         
-        # Generate signals from each strategy
-        for strategy_name, strategy_info in self.strategies.items():
-            if not strategy_info['enabled']:
-                continue
-            
-            strategy = strategy_info['strategy']
+        started = time.perf_counter()
+        if self.execution_mode == 'serial' or len(tasks) <= 1:
+            results = self._run_serial(tasks, universe_data)
+        else:
+            results = self._run_pooled(tasks, universe_data)
+        wall_time = time.perf_counter() - started
+        
+        all_signals = []
+        for index, (strategy_name, symbol) in enumerate(tasks):
+            signals = results[index][0]
+            strategy_info = self.strategies[strategy_name]
             
-            try:
-                # Generate signals for each symbol
-                for symbol in self.universe:
-                    if symbol in data and not data[symbol].empty:
-                        # Check if strategy supports symbol parameter
-                        import inspect
-                        sig = inspect.signature(strategy.generate_signals)
-                        if 'symbol' in sig.parameters:
-                            symbol_signals = strategy.generate_signals(data[symbol], symbol=symbol)
-                        else:
-                            symbol_signals = strategy.generate_signals(data[symbol])
-                        
-                        # Add strategy metadata
-                        for signal in symbol_signals:
-                            signal.strategy_name = strategy_name
-                            signal.strategy_weight = strategy_info['weight']
-                        
-                        all_signals.extend(symbol_signals)
-                        
-                        if strategy_name not in strategy_signals:
-                            strategy_signals[strategy_name] = []
-                        strategy_signals[strategy_name].extend(symbol_signals)
-                
-                logger.debug(f"Generated {len(strategy_signals.get(strategy_name, []))} signals from {strategy_name}")
-                
-            except Exception as e:
-                logger.error(f"Error generating signals from {strategy_name}: {e}")
-                continue
+            # Add strategy metadata
+            for signal in signals:
+                signal.strategy_name = strategy_name
+                signal.strategy_weight = strategy_info['weight']
+            all_signals.extend(signals)
+        
+        self.last_run_stats = self._timing_stats(tasks, results, wall_time)
+        
+        if self.journal is not None:
+            self.journal.record(all_signals, source='aggregator')
+            self.journal.flush()
         
         # Aggregate signals by symbol
         aggregated_signals = self._aggregate_signals_by_symbol(all_signals)
@@ -111,6 +186,178 @@ class SignalAggregator:
         logger.info(f"Generated {len(filtered_signals)} final signals from {len(all_signals)} raw signals")
         return filtered_signals
     
+    def _build_tasks(self, universe_data: Dict[str, pd.DataFrame]) -> List[Tuple[str, Optional[str]]]:
+        """(strategy, symbol) tasks in deterministic order; symbol None means the whole universe."""
+        tasks = []
+        for strategy_name, strategy_info in self.strategies.items():
+            if not strategy_info['enabled'] or not universe_data:
+                continue
+            if strategy_info['cross_sectional']:
+                tasks.append((strategy_name, None))
+            else:
+                tasks.extend((strategy_name, symbol) for symbol in universe_data)
+        return tasks
+    
+    def _run_serial(
+        self, tasks: List[Tuple[str, Optional[str]]], universe_data: Dict[str, pd.DataFrame]
+    ) -> Dict[int, Tuple[List[Signal], Optional[float], str]]:
+        """Evaluate tasks in-line; a strategy over budget skips its remaining symbols."""
+        results = {}
+        spent = {}
+        
+        for index, (strategy_name, symbol) in enumerate(tasks):
+            strategy_info = self.strategies[strategy_name]
+            budget = self.time_budget(strategy_name)
+            if budget and spent.get(strategy_name, 0.0) >= budget:
+                results[index] = ([], None, 'timed_out')
+                continue
+            
+            started = time.perf_counter()
+            try:
+                signals, elapsed = _evaluate_task(
+                    strategy_info['strategy'], strategy_info['accepts_symbol'], universe_data, symbol
+                )
+                results[index] = (signals, elapsed, 'ok')
+            except Exception as e:
+                elapsed = time.perf_counter() - started
+                logger.error(f"Error generating signals from {strategy_name} for {symbol or 'universe'}: {e}")
+                results[index] = ([], elapsed, 'error')
+            spent[strategy_name] = spent.get(strategy_name, 0.0) + elapsed
+        
+        return results
+    
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.execution_mode == 'process':
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='signals')
+        return self._pool
+    
+    def _submit(self, strategy_name: str, symbol: Optional[str], universe_data: Dict[str, pd.DataFrame]):
+        strategy_info = self.strategies[strategy_name]
+        data = universe_data
+        if self.execution_mode == 'process' and symbol is not None:
+            # Only the symbol's own bars are pickled for the worker
+            data = {symbol: universe_data[symbol]}
+        args = (_evaluate_task, strategy_info['strategy'], strategy_info['accepts_symbol'], data, symbol)
+        try:
+            return self._get_pool().submit(*args)
+        except BrokenExecutor:
+            # A worker died (e.g. killed by the OS); replace the pool
+            self.close()
+            return self._get_pool().submit(*args)
+    
+    def _run_pooled(
+        self, tasks: List[Tuple[str, Optional[str]]], universe_data: Dict[str, pd.DataFrame]
+    ) -> Dict[int, Tuple[List[Signal], Optional[float], str]]:
+        """
+        Evaluate tasks on the thread or process pool.
+        
+        Each strategy's budget runs from when a worker picks up its first task,
+        so a strategy queued behind others does not lose time waiting. Once it
+        is spent, the strategy's unfinished tasks are cancelled and their
+        results dropped.
+        """
+        futures = {
+            self._submit(strategy_name, symbol, universe_data): index
+            for index, (strategy_name, symbol) in enumerate(tasks)
+        }
+        budgets = {strategy_name: self.time_budget(strategy_name) for strategy_name, _ in tasks}
+        started: Dict[str, float] = {}
+        results = {}
+        pending = set(futures)
+        
+        while pending:
+            polled = time.perf_counter()
+            for future in pending:
+                strategy_name = tasks[futures[future]][0]
+                if strategy_name not in started and future.running():
+                    started[strategy_name] = polled
+            
+            budgeted = {tasks[futures[future]][0] for future in pending} & {n for n, b in budgets.items() if b}
+            timeout = None
+            if budgeted:
+                timeout = _POLL_SECONDS
+                for strategy_name in budgeted & set(started):
+                    timeout = min(timeout, max(0.0, started[strategy_name] + budgets[strategy_name] - polled))
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                index = futures[future]
+                strategy_name, symbol = tasks[index]
+                # Finished since the last poll, so it started no earlier than that
+                started.setdefault(strategy_name, polled)
+                try:
+                    signals, elapsed = future.result()
+                    results[index] = (signals, elapsed, 'ok')
+                except Exception as e:
+                    logger.error(f"Error generating signals from {strategy_name} for {symbol or 'universe'}: {e}")
+                    results[index] = ([], None, 'error')
+            
+            now = time.perf_counter()
+            expired = {
+                strategy_name for strategy_name, at in started.items()
+                if budgets[strategy_name] and now >= at + budgets[strategy_name]
+            }
+            for future in [future for future in pending if tasks[futures[future]][0] in expired]:
+                future.cancel()
+                results[futures[future]] = ([], None, 'timed_out')
+                pending.discard(future)
+        
+        return results
+    
+    def _timing_stats(
+        self,
+        tasks: List[Tuple[str, Optional[str]]],
+        results: Dict[int, Tuple[List[Signal], Optional[float], str]],
+        wall_time: float
+    ) -> Dict[str, Any]:
+        """Per-task and per-strategy timings for the last cycle."""
+        task_timings = []
+        per_strategy = {}
+        
+        for index, (strategy_name, symbol) in enumerate(tasks):
+            signals, elapsed, status = results[index]
+            task_timings.append({
+                'strategy': strategy_name,
+                'symbol': symbol,
+                'seconds': elapsed,
+                'signals': len(signals),
+                'status': status
+            })
+            
+            stats = per_strategy.setdefault(strategy_name, {
+                'tasks': 0, 'signals': 0, 'errors': 0, 'timed_out': 0,
+                'total_seconds': 0.0, 'max_seconds': 0.0
+            })
+            stats['tasks'] += 1
+            stats['signals'] += len(signals)
+            stats['errors'] += status == 'error'
+            stats['timed_out'] += status == 'timed_out'
+            if elapsed is not None:
+                stats['total_seconds'] += elapsed
+                stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+        
+        for name, stats in per_strategy.items():
+            timed = stats['tasks'] - stats['timed_out']
+            stats['mean_seconds'] = stats['total_seconds'] / timed if timed else 0.0
+            if stats['timed_out']:
+                logger.warning(f"{name}: {stats['timed_out']} of {stats['tasks']} tasks exceeded "
+                               f"the {self.time_budget(name)}s budget")
+        
+        return {
+            'mode': self.execution_mode,
+            'wall_seconds': wall_time,
+            'tasks': len(tasks),
+            'strategies': per_strategy,
+            'task_timings': task_timings
+        }
+    
+    def get_timing_stats(self) -> Dict[str, Any]:
+        """Timing statistics from the last generate_signals call."""
+        return self.last_run_stats
+    
     def _aggregate_signals_by_symbol(self, signals: List[Signal]) -> List[Signal]:
         """Aggregate multiple signals for the same symbol."""
         symbol_signals = {}
@@ -172,41 +419,32 @@ class SignalAggregator:
         return aggregated
     
     def _apply_risk_filters(self, signals: List[Signal]) -> List[Signal]:
-        """Apply risk management filters to signals."""
+        """Apply risk management filters to signals, checked together as one order batch."""
         filtered_signals = []
         
         # Sort by confidence (highest first)
         signals.sort(key=lambda s: s.confidence, reverse=True)
         
-        for signal in signals:
-            # Check daily loss limit
-            can_trade_loss, loss_reason = self.risk_manager.check_daily_loss_limit()
-            if not can_trade_loss:
-                logger.info(f"Skipping {signal.symbol} {signal.action}: {loss_reason}")
-                continue
-            
-            # Calculate position size
-            position_size = self.risk_manager.calculate_position_size(
-                signal.symbol, signal.price, method='fixed_fractional'
-            )
-            
-            # Check position limits
-            can_trade_position, position_reason = self.risk_manager.check_position_limits(
-                signal.symbol, position_size, signal.price
-            )
-            
-            if not can_trade_position:
-                logger.info(f"Skipping {signal.symbol} {signal.action}: {position_reason}")
-                continue
-            
-            # Apply confidence threshold
-            min_confidence = 0.3  # Minimum 30% confidence
-            if signal.confidence < min_confidence:
+        # Size and check every signal in one pass (see RiskManager.check_orders)
+        min_confidence = 0.3  # Minimum 30% confidence
+        check = self.risk_manager.check_orders(
+            [signal.symbol for signal in signals],
+            [signal.price for signal in signals],
+            [signal.confidence for signal in signals],
+            sides=[signal.action for signal in signals],
+            min_confidence=min_confidence
+        )
+        
+        for signal, quantity, reason in zip(signals, check.quantities, check.reasons):
+            if reason == 'low_confidence':
                 logger.debug(f"Skipping {signal.symbol} {signal.action}: low confidence {signal.confidence:.2f}")
                 continue
+            if reason:
+                logger.info(f"Skipping {signal.symbol} {signal.action}: {reason}")
+                continue
             
             # Set calculated position size
-            signal.quantity = position_size
+            signal.quantity = int(quantity)
             filtered_signals.append(signal)
         
         # Limit total number of signals to prevent over-diversification
@@ -247,71 +485,34 @@ class SignalGenerator:
     """Main signal generation system with pre-configured strategies."""
     
     def __init__(self):
-        self.aggregator = SignalAggregator()
+        self.aggregator = SignalAggregator(journal=signal_journal if config.SIGNAL_JOURNAL_ENABLED else None)
         self._initialize_default_strategies()
     
     def _initialize_default_strategies(self):
-        """Initialize all 5 virtual strategy portfolios with their specific configurations."""
-        
-        # 1. Momentum Hunter - Momentum/trend following
-        momentum_config = {
-            'rsi_period': 14,
-            'macd_fast': 12,
-            'macd_slow': 26,
-            'macd_signal': 9,
-            'ema_fast': 20,
-            'ema_slow': 50,
-            'buy_threshold': 2,
-            'sell_threshold': -2
-        }
-        momentum_strategy = MomentumStrategy(momentum_config)
-        self.aggregator.add_strategy('momentum-hunter', momentum_strategy, weight=1.0)
-        
-        # 2. Mean Reversion
-        mean_rev_config = {
-            'bb_period': 20,
-            'bb_std': 2.0,
-            'zscore_period': 20,
-            'zscore_buy_threshold': -2.0,
-            'zscore_sell_threshold': 2.0
-        }
-        mean_rev_strategy = MeanReversionStrategy(mean_rev_config)
-        self.aggregator.add_strategy('mean-reversion', mean_rev_strategy, weight=1.0)
-        
-        # 3. Sector Rotator - Sector rotation strategy
-        sector_config = {
-            'lookback_period': 60,
-            'momentum_threshold': 0.05,
-            'max_positions': 3,
-            'position_size': 0.33
-        }
-        sector_strategy = SectorRotationStrategy(sector_config)
-        self.aggregator.add_strategy('sector-rotator', sector_strategy, weight=1.0)
-        
-        # 4. Value Dividends - Value + dividends strategy
-        value_config = {
-            'rsi_oversold': 35,
-            'rsi_overbought': 65,
-            'position_size': 0.12,
-            'max_positions': 8,
-            'volatility_threshold': 0.02
-        }
-        value_strategy = ValueDividendStrategy(value_config)
-        self.aggregator.add_strategy('value-dividends', value_strategy, weight=1.0)
-        
-        # 5. Volatility Breakout — ATR expansion + volume spike + price breakout
-        volatility_config = {
-            'breakout_period': 20,
-            'volume_factor': 1.5,
-            'atr_threshold': 1.2,
-            'min_volume': 1000000,
-            'stop_loss': -0.08,
-            'take_profit': 0.15
-        }
-        volatility_strategy = VolatilityBreakoutStrategy(volatility_config)
-        self.aggregator.add_strategy('volatility-breakout', volatility_strategy, weight=1.0)
+        """Initialize a virtual portfolio for every registered strategy that declares one."""
+        for spec in iter_specs():
+            if not spec.portfolio:
+                continue
+            
+            try:
+                strategy = spec.create(dict(spec.config))
+            except Exception as e:
+                logger.error(f"Could not initialize {spec.portfolio} ({spec.name}): {e}")
+                continue
+            
+            self.aggregator.add_strategy(spec.portfolio, strategy, weight=1.0)
         
-        logger.info("Initialized all 5 virtual strategy portfolios")
+        logger.info(f"Initialized {len(self.aggregator.strategies)} virtual strategy portfolios")
+    
+    def time_budget(self, name: str) -> Optional[float]:
+        """Seconds a strategy may spend per cycle (None: unlimited)."""
+        return self.strategy_time_budgets.get(name, self.strategy_time_budget) or None
+    
+    def close(self) -> None:
+        """Stop the worker pool (a later pooled run starts a new one)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
     
     def generate_signals(self, data: Dict[str, pd.DataFrame]) -> List[Signal]:
         """Generate signals using the aggregator."""
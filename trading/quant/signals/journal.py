@@ -0,0 +1,455 @@
+"""Append-only signal journal.
+
+Every signal the engine produces (SignalAggregator, StrategyExecutor and
+TradingExecutor) can be recorded here instead of only being logged as text.
+Signals are buffered in memory and flushed as immutable columnar segments:
+
+- numeric columns (time, confidence, price, quantity) are stored as raw
+  numpy arrays;
+- symbol, strategy and source are dictionary-encoded;
+- reason and reasoning text is stored as one UTF-8 blob plus offsets.
+
+``index.jsonl`` records each segment's time range and row count, so a
+time-range query only opens the segments it overlaps and a month of signals
+loads as a handful of array reads.
+
+Usage:
+    python3 -m signals.journal --start 2025-01-01 --end 2025-01-31 --symbol AAPL
+    python3 -m signals.journal --info
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import config
+from strategies.base import Signal
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ('hold', 'buy', 'sell')
+_ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+_NAT = np.iinfo(np.int64).min
+_TEXT_COLUMNS = ('reason', 'reasoning')
+_DICT_COLUMNS = ('symbol', 'strategy', 'source')
+
+
+def _to_ns(value) -> int:
+    """Nanoseconds since the epoch (UTC) for a timestamp-like value; naive values are taken as UTC."""
+    if value is None:
+        return _NAT
+    ts = pd.Timestamp(value)
+    if ts is pd.NaT:
+        return _NAT
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return int(ts.value)
+
+
+def _encode_text(values: List[str]) -> Dict[str, np.ndarray]:
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return {'blob': np.frombuffer(b''.join(encoded), dtype=np.uint8), 'offsets': offsets}
+
+
+def _decode_text(blob: np.ndarray, offsets: np.ndarray, rows: np.ndarray) -> List[str]:
+    raw = blob.tobytes()
+    return [raw[offsets[i]:offsets[i + 1]].decode('utf-8') for i in rows]
+
+
+def _encode_dict(values: List[str]) -> Dict[str, np.ndarray]:
+    names, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    return {'names': names, 'codes': codes.astype(np.int32)}
+
+
+class SignalJournal:
+    """Append-only columnar journal of trading signals with a time-range index."""
+
+    def __init__(self, path: str = None, flush_rows: int = 10000):
+        """
+        Args:
+            path: Journal directory (default: config.SIGNAL_JOURNAL_DIR)
+            flush_rows: Buffered rows that trigger an automatic flush
+        """
+        self.path = path or config.SIGNAL_JOURNAL_DIR
+        self.flush_rows = flush_rows
+        self._lock = threading.Lock()
+        self._buffer: List[Dict[str, Any]] = []
+        self._sequence = 0
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.path, 'index.jsonl')
+
+    @contextmanager
+    def _index_lock(self):
+        """
+        Exclusive lock on the index across processes.
+
+        A separate lock file is used because compaction replaces index.jsonl.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, 'index.lock'), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        signals: Iterable[Any],
+        source: str,
+        strategy: Optional[str] = None,
+        timestamp=None
+    ) -> int:
+        """
+        Buffer signals for the journal.
+
+        Args:
+            signals: Signal objects or executor signal dicts (symbol, action,
+                price, reason, confidence)
+            source: Producer, e.g. 'aggregator', 'strategy_executor'
+            strategy: Strategy name; defaults to each signal's ``strategy_name``
+            timestamp: When the signals were produced (default: now, UTC)
+
+        Returns:
+            Number of signals buffered
+        """
+        ts = _to_ns(timestamp if timestamp is not None else pd.Timestamp.now(tz='UTC'))
+        rows = []
+        for signal in signals:
+            get = signal.get if isinstance(signal, dict) else signal.__dict__.get
+            reasoning = get('reasoning')
+            rows.append({
+                'ts': ts,
+                'bar_ts': _to_ns(get('timestamp')),
+                'symbol': str(get('symbol')),
+                'action': _ACTION_CODES.get(get('action'), 0),
+                'confidence': float(get('confidence') or 0.0),
+                'price': float(get('price') or 0.0),
+                'quantity': int(get('quantity') or 0),
+                'strategy': strategy or get('strategy_name') or '',
+                'source': source,
+                'reason': get('reason') or '',
+                'reasoning': json.dumps(reasoning, default=str) if reasoning else ''
+            })
+
+        with self._lock:
+            self._buffer.extend(rows)
+            should_flush = len(self._buffer) >= self.flush_rows
+        if should_flush:
+            self.flush()
+        return len(rows)
+
+    def flush(self) -> Optional[str]:
+        """Write buffered signals as a new segment. Returns the segment file name, if any."""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            if not rows:
+                return None
+            rows.sort(key=lambda row: row['ts'])
+            try:
+                entry = self._write_segment(rows)
+                with self._index_lock(), open(self.index_path, 'a') as f:
+                    f.write(json.dumps(entry) + '\n')
+            except Exception as e:
+                logger.error(f"Error writing signal journal segment: {e}")
+                self._buffer = rows + self._buffer
+                return None
+            return entry['segment']
+
+    def _write_segment(self, rows: List[Dict[str, Any]], name: str = None) -> Dict[str, Any]:
+        """Write sorted rows to a segment file and return its index entry."""
+        os.makedirs(os.path.join(self.path, 'segments'), exist_ok=True)
+
+        ts = np.array([row['ts'] for row in rows], dtype=np.int64)
+        if name is None:
+            self._sequence += 1
+            name = f"{ts[0]}-{os.getpid()}-{self._sequence}.npz"
+        arrays = {
+            'ts': ts,
+            'bar_ts': np.array([row['bar_ts'] for row in rows], dtype=np.int64),
+            'action': np.array([row['action'] for row in rows], dtype=np.int8),
+            'confidence': np.array([row['confidence'] for row in rows], dtype=np.float64),
+            'price': np.array([row['price'] for row in rows], dtype=np.float64),
+            'quantity': np.array([row['quantity'] for row in rows], dtype=np.int64),
+        }
+        for column in _DICT_COLUMNS:
+            encoded = _encode_dict([row[column] for row in rows])
+            arrays[f'{column}_names'] = encoded['names']
+            arrays[f'{column}_codes'] = encoded['codes']
+        for column in _TEXT_COLUMNS:
+            encoded = _encode_text([row[column] for row in rows])
+            arrays[f'{column}_blob'] = encoded['blob']
+            arrays[f'{column}_offsets'] = encoded['offsets']
+
+        final = os.path.join(self.path, 'segments', name)
+        temp = final + '.tmp'
+        with open(temp, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temp, final)
+
+        return {'segment': name, 'start': int(ts[0]), 'end': int(ts[-1]), 'rows': len(rows)}
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _read_index(self) -> List[Dict[str, Any]]:
+        """Index entries, oldest first. Other processes may append, so it is always re-read."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path) as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return sorted(entries, key=lambda entry: entry['start'])
+
+    def segments(self, start=None, end=None) -> List[Dict[str, Any]]:
+        """Index entries of the segments overlapping [start, end]."""
+        lo = _to_ns(start) if start is not None else None
+        hi = _to_ns(end) if end is not None else None
+        return [
+            entry for entry in self._read_index()
+            if (lo is None or entry['end'] >= lo) and (hi is None or entry['start'] <= hi)
+        ]
+
+    def get_info(self) -> Dict[str, Any]:
+        """Segment count, row count and time range of the journal."""
+        index = self.segments()
+        return {
+            'path': self.path,
+            'segments': len(index),
+            'rows': sum(entry['rows'] for entry in index),
+            'buffered': len(self._buffer),
+            'first': pd.Timestamp(min(e['start'] for e in index), tz='UTC').isoformat() if index else None,
+            'last': pd.Timestamp(max(e['end'] for e in index), tz='UTC').isoformat() if index else None
+        }
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def load(
+        self,
+        start=None,
+        end=None,
+        symbols: Optional[List[str]] = None,
+        strategies: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        include_text: bool = True
+    ) -> pd.DataFrame:
+        """
+        Journaled signals in [start, end] as a DataFrame, oldest first.
+
+        Buffered signals that have not been flushed are not included.
+
+        Args:
+            start, end: Inclusive time range (naive values are taken as UTC)
+            symbols, strategies, sources: Optional filters
+            include_text: Decode the reason/reasoning columns (skip for speed)
+
+        Returns:
+            DataFrame with columns timestamp, bar_timestamp, symbol, action,
+            confidence, price, quantity, strategy, source and, with
+            include_text, reason and reasoning
+        """
+        lo = _to_ns(start) if start is not None else None
+        hi = _to_ns(end) if end is not None else None
+        filters = {'symbol': symbols, 'strategy': strategies, 'source': sources}
+
+        frames = []
+        for entry in self.segments(start, end):
+            with np.load(os.path.join(self.path, 'segments', entry['segment'])) as segment:
+                ts = segment['ts']
+                mask = np.ones(len(ts), dtype=bool)
+                if lo is not None:
+                    mask &= ts >= lo
+                if hi is not None:
+                    mask &= ts <= hi
+
+                columns = {}
+                for column in _DICT_COLUMNS:
+                    names = segment[f'{column}_names']
+                    codes = segment[f'{column}_codes']
+                    if filters[column] is not None:
+                        mask &= np.isin(names, list(filters[column]))[codes]
+                    columns[column] = (names, codes)
+
+                rows = np.flatnonzero(mask)
+                if len(rows) == 0:
+                    continue
+
+                frame = {
+                    'timestamp': ts[rows],
+                    'bar_timestamp': segment['bar_ts'][rows],
+                    'action': segment['action'][rows],
+                    'confidence': segment['confidence'][rows],
+                    'price': segment['price'][rows],
+                    'quantity': segment['quantity'][rows],
+                }
+                for column, (names, codes) in columns.items():
+                    frame[column] = names[codes[rows]]
+                if include_text:
+                    for column in _TEXT_COLUMNS:
+                        frame[column] = _decode_text(
+                            segment[f'{column}_blob'], segment[f'{column}_offsets'], rows
+                        )
+                frames.append(frame)
+
+        text_columns = list(_TEXT_COLUMNS) if include_text else []
+        ordered = ['timestamp', 'bar_timestamp', 'symbol', 'action', 'confidence', 'price',
+                   'quantity', 'strategy', 'source'] + text_columns
+        if not frames:
+            return pd.DataFrame(columns=ordered)
+
+        merged = {
+            column: np.concatenate([frame[column] for frame in frames])
+            if column not in text_columns else [text for frame in frames for text in frame[column]]
+            for column in ordered
+        }
+        merged['timestamp'] = pd.to_datetime(merged['timestamp'], utc=True)
+        merged['bar_timestamp'] = pd.to_datetime(merged['bar_timestamp'], utc=True)  # _NAT -> NaT
+        merged['action'] = pd.Categorical.from_codes(merged['action'], categories=list(ACTIONS))
+        df = pd.DataFrame(merged, columns=ordered)
+        return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+    def replay(self, start=None, end=None, **filters) -> Iterator[Signal]:
+        """
+        Journaled signals in [start, end] as Signal objects, oldest first.
+
+        Each signal carries ``strategy_name``, ``source`` and
+        ``journal_timestamp`` (when it was produced) attributes; ``timestamp``
+        is the bar time the strategy saw.
+        """
+        df = self.load(start, end, **filters)
+        for row in df.itertuples(index=False):
+            signal = Signal(
+                symbol=row.symbol,
+                action=row.action,
+                confidence=float(row.confidence),
+                price=float(row.price),
+                quantity=int(row.quantity),
+                reason=row.reason,
+                timestamp=row.bar_timestamp if row.bar_timestamp is not pd.NaT else row.timestamp,
+                reasoning=json.loads(row.reasoning) if row.reasoning else None
+            )
+            signal.strategy_name = row.strategy
+            signal.source = row.source
+            signal.journal_timestamp = row.timestamp
+            yield signal
+
+    def compact(self, before=None) -> int:
+        """
+        Merge segments into one segment per UTC day.
+
+        Only days entirely before ``before`` (default: today, UTC) are merged,
+        so segments still being appended to are left alone. The index is
+        locked while compacting, so segments other processes flush meanwhile
+        wait and are appended to the new index.
+
+        Returns:
+            Number of segments removed
+        """
+        cutoff_ns = _to_ns(pd.Timestamp(before if before is not None else pd.Timestamp.now(tz='UTC')).normalize())
+
+        with self._lock, self._index_lock():
+            index = self._read_index()
+            days: Dict[str, List[Dict[str, Any]]] = {}
+            for entry in index:
+                if entry['end'] < cutoff_ns:
+                    day = pd.Timestamp(entry['start'], tz='UTC').strftime('%Y%m%d')
+                    days.setdefault(day, []).append(entry)
+
+            merged = [entries for entries in days.values() if len(entries) > 1]
+            if not merged:
+                return 0
+
+            replaced = set()
+            new_entries = []
+            for entries in merged:
+                rows = []
+                for entry in entries:
+                    rows.extend(self._read_rows(entry['segment']))
+                rows.sort(key=lambda row: row['ts'])
+                day = pd.Timestamp(entries[0]['start'], tz='UTC').strftime('%Y%m%d')
+                self._sequence += 1
+                new_entries.append(self._write_segment(rows, name=f"day-{day}-{self._sequence}.npz"))
+                replaced.update(entry['segment'] for entry in entries)
+
+            new_index = sorted(
+                [entry for entry in index if entry['segment'] not in replaced] + new_entries,
+                key=lambda entry: entry['start']
+            )
+            temp = self.index_path + '.tmp'
+            with open(temp, 'w') as f:
+                f.writelines(json.dumps(entry) + '\n' for entry in new_index)
+            os.replace(temp, self.index_path)
+
+            for segment in replaced:
+                os.remove(os.path.join(self.path, 'segments', segment))
+
+        return len(replaced) - len(new_entries)
+
+    def _read_rows(self, segment_name: str) -> List[Dict[str, Any]]:
+        """Decode a segment back into journal rows (used by compaction)."""
+        with np.load(os.path.join(self.path, 'segments', segment_name)) as segment:
+            n = len(segment['ts'])
+            all_rows = np.arange(n)
+            decoded = {
+                column: segment[f'{column}_names'][segment[f'{column}_codes']].tolist()
+                for column in _DICT_COLUMNS
+            }
+            for column in _TEXT_COLUMNS:
+                decoded[column] = _decode_text(segment[f'{column}_blob'], segment[f'{column}_offsets'], all_rows)
+            numeric = {
+                column: segment[column].tolist()
+                for column in ('ts', 'bar_ts', 'action', 'confidence', 'price', 'quantity')
+            }
+        return [
+            {column: values[i] for column, values in {**numeric, **decoded}.items()}
+            for i in range(n)
+        ]
+
+
+# Global journal instance
+signal_journal = SignalJournal()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Signal journal')
+    parser.add_argument('--path', default=None, help='Journal directory (default: config.SIGNAL_JOURNAL_DIR)')
+    parser.add_argument('--start', help='Start time (ISO-8601, UTC)')
+    parser.add_argument('--end', help='End time (ISO-8601, UTC)')
+    parser.add_argument('--symbol', nargs='+', help='Only these symbols')
+    parser.add_argument('--strategy', nargs='+', help='Only these strategies')
+    parser.add_argument('--info', action='store_true', help='Show journal size and time range')
+    parser.add_argument('--compact', action='store_true', help='Merge completed days into one segment each')
+    args = parser.parse_args()
+
+    journal = SignalJournal(args.path)
+
+    if args.info:
+        print(json.dumps(journal.get_info(), indent=2))
+    elif args.compact:
+        print(f"Removed {journal.compact()} segments")
+    else:
+        df = journal.load(args.start, args.end, symbols=args.symbol, strategies=args.strategy)
+        with pd.option_context('display.max_rows', 200, 'display.width', 200):
+            print(df.drop(columns=['reasoning']))
+
+
+if __name__ == '__main__':
+    main()
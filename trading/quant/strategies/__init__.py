@@ -1,11 +1,21 @@
-"""Trading strategies package."""
+"""Trading strategies package.
+
+Strategy modules are imported on first attribute access so that importing the
+package (or ``strategies.registry``) does not pull in every strategy and its
+indicator dependencies.
+"""
+
+import importlib
 
 from .base import Strategy, Signal
-from .momentum import MomentumStrategy
-from .mean_reversion import MeanReversionStrategy
-from .volatility_breakout import VolatilityBreakoutStrategy
-from .sector_rotation import SectorRotationStrategy
-from .value_dividend import ValueDividendStrategy
+
+_LAZY_CLASSES = {
+    'MomentumStrategy': '.momentum',
+    'MeanReversionStrategy': '.mean_reversion',
+    'VolatilityBreakoutStrategy': '.volatility_breakout',
+    'SectorRotationStrategy': '.sector_rotation',
+    'ValueDividendStrategy': '.value_dividend',
+}
 
 __all__ = [
     'Strategy',
@@ -15,4 +25,17 @@ __all__ = [
     'VolatilityBreakoutStrategy',
     'SectorRotationStrategy',
     'ValueDividendStrategy'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        module = importlib.import_module(_LAZY_CLASSES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
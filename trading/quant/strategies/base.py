@@ -1,10 +1,15 @@
 """Abstract base class for trading strategies."""
 
+import inspect
+import logging
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 @dataclass
 class Signal:
     """Trading signal generated by a strategy."""
@@ -26,6 +31,8 @@ class Strategy(ABC):
     
     name: str = "Base Strategy"
     description: str = "Abstract base strategy"
+    # True when a symbol's signal depends on the rest of the universe
+    cross_sectional: bool = False
     
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
@@ -45,6 +52,94 @@ class Strategy(ABC):
         """
         pass
     
+    def generate_signal_series(self, data: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
+        """
+        Generate per-bar signals for a whole history.
+        
+        Row ``i`` holds the action and confidence that ``generate_signals``
+        returns when called with ``data.iloc[:i + 1]``. This default replays
+        the per-bar method bar by bar; strategies override it with a
+        vectorized implementation.
+        
+        Args:
+            data: DataFrame with OHLCV data, indexed by timestamp
+            symbol: Symbol the data belongs to
+        
+        Returns:
+            DataFrame indexed like ``data`` with columns
+            action ('buy', 'sell', 'hold'), confidence and price
+        """
+        accepts_symbol = 'symbol' in inspect.signature(self.generate_signals).parameters
+        actions = np.full(len(data), 'hold', dtype=object)
+        confidences = np.zeros(len(data))
+        
+        for i in range(len(data)):
+            history = data.iloc[:i + 1]
+            if accepts_symbol:
+                signals = self.generate_signals(history, symbol=symbol)
+            else:
+                signals = self.generate_signals(history)
+            
+            for signal in signals:
+                if signal.action != 'hold':
+                    actions[i] = signal.action
+                    confidences[i] = signal.confidence
+                    break
+        
+        return pd.DataFrame({
+            'action': actions,
+            'confidence': confidences,
+            'price': data['close'].astype(float).values
+        }, index=data.index)
+    
+    def generate_universe_signals(self, market_data: Dict[str, pd.DataFrame]) -> List[Signal]:
+        """
+        Generate signals for every symbol in a universe.
+        
+        Per-symbol strategies just call ``generate_signals`` for each symbol;
+        cross-sectional strategies override this to compare symbols. A symbol
+        whose data raises is logged and skipped, so it cannot discard the
+        signals of the rest of the universe.
+        
+        Args:
+            market_data: Dictionary mapping symbol -> OHLCV DataFrame
+        
+        Returns:
+            List of Signal objects
+        """
+        accepts_symbol = 'symbol' in inspect.signature(self.generate_signals).parameters
+        signals = []
+        for symbol, data in market_data.items():
+            try:
+                if accepts_symbol:
+                    signals.extend(self.generate_signals(data, symbol=symbol))
+                else:
+                    signals.extend(self.generate_signals(data))
+            except Exception as e:
+                logger.warning(f"Error calculating {self.name} signals for {symbol}: {e}")
+                continue
+        return signals
+    
+    def generate_universe_signal_series(
+        self, market_data: Dict[str, pd.DataFrame]
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Per-bar signal frames for every symbol in a universe.
+        
+        Row ``i`` of a symbol's frame matches ``generate_universe_signals``
+        called with each symbol's bars up to that row's timestamp.
+        
+        Args:
+            market_data: Dictionary mapping symbol -> OHLCV DataFrame
+        
+        Returns:
+            Dictionary mapping symbol -> generate_signal_series frame
+        """
+        return {
+            symbol: self.generate_signal_series(data, symbol=symbol)
+            for symbol, data in market_data.items()
+        }
+    
     @abstractmethod
     def get_parameters(self) -> Dict[str, Any]:
         """
@@ -109,6 +204,35 @@ class Strategy(ABC):
         shares = int(risk_amount / signal.price)
         return max(1, shares)  # Minimum 1 share
     
+    def _signal_frame(
+        self,
+        data: pd.DataFrame,
+        buy: pd.Series,
+        sell: pd.Series,
+        buy_confidence: pd.Series,
+        sell_confidence: pd.Series
+    ) -> pd.DataFrame:
+        """Assemble a ``generate_signal_series`` frame from boolean masks (buy wins ties)."""
+        buy = np.asarray(buy, dtype=bool)
+        sell = np.asarray(sell, dtype=bool) & ~buy
+        
+        action = np.where(buy, 'buy', np.where(sell, 'sell', 'hold')).astype(object)
+        confidence = np.where(
+            buy, np.asarray(buy_confidence, dtype=float),
+            np.where(sell, np.asarray(sell_confidence, dtype=float), 0.0)
+        )
+        
+        return pd.DataFrame({
+            'action': action,
+            'confidence': confidence,
+            'price': data['close'].astype(float).values
+        }, index=data.index)
+    
+    @staticmethod
+    def _bars_available(data: pd.DataFrame) -> np.ndarray:
+        """Number of bars a per-bar call would see at each row (1-based)."""
+        return np.arange(1, len(data) + 1)
+    
     def _format_signal_reason(self, indicators: Dict[str, float], action: str) -> str:
         """Format a human-readable reason for the signal."""
         reasons = []
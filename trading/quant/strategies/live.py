@@ -0,0 +1,530 @@
+"""Strategies traded by the live executors.
+
+These encode the rules ``StrategyExecutor`` trades on Alpaca (Momentum Hunter,
+Mean Reversion, Sector Rotator, Value & Dividends, Volatility Breakout).
+Each rule is evaluated column-wise over the whole history, so the same code
+produces the live signal (last bar) and the backtest series (every bar).
+Indicators come from the shared feature cache, so strategies that trade the
+same symbol share work within a run.
+"""
+
+import logging
+import pandas as pd
+import numpy as np
+from abc import abstractmethod
+from typing import Dict, List, Any, Optional
+from .base import Strategy, Signal
+from utils.features import FeatureCache, feature_cache
+
+logger = logging.getLogger(__name__)
+
+
+class LiveStrategy(Strategy):
+    """
+    Base for live strategies whose rules are evaluated as columns.
+
+    Subclasses implement ``_evaluate`` returning a frame with boolean ``buy`` /
+    ``sell`` columns, ``buy_confidence`` / ``sell_confidence`` and whatever
+    indicator columns ``_build_reason`` needs.
+    """
+
+    min_bars: int = 20
+
+    def __init__(self, config: Dict[str, Any] = None, features: FeatureCache = None):
+        self.features = features or feature_cache
+        super().__init__(config)
+
+    def validate_config(self, config: Dict[str, Any]) -> bool:
+        """Validate configuration parameters."""
+        for key in self.required_keys():
+            if key not in config:
+                raise ValueError(f"Missing required parameter: {key}")
+        return True
+
+    def required_keys(self) -> List[str]:
+        """Config keys the rules read."""
+        return []
+
+    def get_parameters(self) -> Dict[str, Any]:
+        """Get strategy parameters and their descriptions."""
+        return {key: f"{key} (default: {value})" for key, value in self.config.items()
+                if key in self.required_keys()}
+
+    def generate_signals(self, data: pd.DataFrame, symbol: str = None) -> List[Signal]:
+        """Evaluate the rules on the latest bar."""
+        if len(data) < self.min_bars:
+            return []
+
+        frame = self._evaluate(data, symbol)
+        latest = frame.iloc[-1]
+
+        if latest['buy']:
+            action, confidence = 'buy', latest['buy_confidence']
+        elif latest['sell']:
+            action, confidence = 'sell', latest['sell_confidence']
+        else:
+            return []
+
+        return [Signal(
+            symbol=symbol or 'UNKNOWN',
+            action=action,
+            confidence=float(confidence),
+            price=float(data['close'].iloc[-1]),
+            reason=self._build_reason(symbol, latest, action),
+            timestamp=data.index[-1] if hasattr(data.index[-1], 'timestamp') else pd.Timestamp.now()
+        )]
+
+    def generate_signal_series(self, data: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
+        """Vectorized equivalent of calling generate_signals on every prefix of data."""
+        enough = self._bars_available(data) >= self.min_bars
+        if not enough.any():
+            return self._signal_frame(data, enough, enough, 0.0, 0.0)
+
+        frame = self._evaluate(data, symbol)
+        return self._signal_frame(
+            data,
+            enough & frame['buy'].values,
+            enough & frame['sell'].values,
+            frame['buy_confidence'],
+            frame['sell_confidence']
+        )
+
+    @abstractmethod
+    def _evaluate(self, data: pd.DataFrame, symbol: Optional[str]) -> pd.DataFrame:
+        """Evaluate the rules on every bar of data."""
+        pass
+
+    @abstractmethod
+    def _build_reason(self, symbol: Optional[str], row: pd.Series, action: str) -> str:
+        """Describe why the rules fired on a row of the ``_evaluate`` frame."""
+        pass
+
+
+class MomentumHunterStrategy(LiveStrategy):
+    """
+    Refined momentum logic:
+    Buy only when trend, relative strength, and MACD expansion all align.
+    Sell faster when momentum fades instead of waiting for a full breakdown.
+    """
+
+    name = "Momentum Hunter"
+    description = "Trend + RSI + expanding MACD histogram, fast exits on fading momentum"
+    min_bars = 50
+
+    def __init__(self, config: Dict[str, Any] = None, features: FeatureCache = None):
+        default_config = {
+            'min_trend_strength': 0.012,
+            'buy_rsi_min': 55,
+            'sell_rsi_floor': 45,
+            'min_macd_hist_pct': 0.0015
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config, features)
+
+    def required_keys(self) -> List[str]:
+        return ['min_trend_strength', 'buy_rsi_min', 'sell_rsi_floor', 'min_macd_hist_pct']
+
+    def _evaluate(self, data: pd.DataFrame, symbol: Optional[str]) -> pd.DataFrame:
+        cfg = self.config
+        price = data['close']
+        ema20 = self.features.ema(symbol, data, 20)
+        ema50 = self.features.ema(symbol, data, 50)
+        rsi = self.features.rsi(symbol, data, 14)
+        macd_hist = self.features.macd(symbol, data)['macd_histogram']
+        macd_hist_prev = macd_hist.shift(1)
+
+        ready = ema20.notna() & ema50.notna() & rsi.notna() & macd_hist.notna() & macd_hist_prev.notna()
+        trend_strength = (price / ema20) - 1
+        macd_expanding = (macd_hist > macd_hist_prev) & (macd_hist_prev > 0)
+
+        buy = ready & (
+            (price > ema20) & (ema20 > ema50) &
+            (rsi >= cfg['buy_rsi_min']) &
+            (trend_strength >= cfg['min_trend_strength']) &
+            (macd_hist >= cfg['min_macd_hist_pct'] * price) &
+            macd_expanding
+        )
+        sell = ready & ~buy & ((price < ema20) | (rsi <= cfg['sell_rsi_floor']) | (macd_hist < 0))
+
+        return pd.DataFrame({
+            'close': price,
+            'ema20': ema20,
+            'ema50': ema50,
+            'rsi': rsi,
+            'macd_histogram': macd_hist,
+            'buy': buy,
+            'sell': sell,
+            'buy_confidence': np.minimum(
+                1.0, 0.45 + trend_strength * 10 + (rsi - cfg['buy_rsi_min']).clip(lower=0) / 25
+            ),
+            'sell_confidence': 0.82,
+        }, index=data.index)
+
+    def _build_reason(self, symbol: Optional[str], row: pd.Series, action: str) -> str:
+        price, ema20, rsi = row['close'], row['ema20'], row['rsi']
+        if action == 'buy':
+            return (
+                f"Momentum buy: {symbol} trend confirmed, price ${price:.2f} above EMA20 ${ema20:.2f} and EMA50 ${row['ema50']:.2f}, "
+                f"RSI {rsi:.1f}, MACD histogram expanding"
+            )
+
+        reasons = []
+        if price < ema20:
+            reasons.append(f"price ${price:.2f} < EMA20 ${ema20:.2f}")
+        if rsi <= self.config['sell_rsi_floor']:
+            reasons.append(f"RSI {rsi:.1f} <= {self.config['sell_rsi_floor']}")
+        if row['macd_histogram'] < 0:
+            reasons.append("MACD histogram turned negative")
+        return f"Momentum sell: {'; '.join(reasons)}"
+
+
+class LiveMeanReversionStrategy(LiveStrategy):
+    """
+    Refined mean reversion logic:
+    Only buy real washouts, and exit earlier once the bounce materializes.
+    """
+
+    name = "Mean Reversion"
+    description = "Bollinger washout + z-score + RSI entries, exits on recovery to the mean"
+    min_bars = 30
+
+    def __init__(self, config: Dict[str, Any] = None, features: FeatureCache = None):
+        default_config = {
+            'buy_zscore_threshold': -2.35,
+            'buy_rsi_max': 32,
+            'exit_zscore_threshold': -0.25
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config, features)
+
+    def required_keys(self) -> List[str]:
+        return ['buy_zscore_threshold', 'buy_rsi_max', 'exit_zscore_threshold']
+
+    def _evaluate(self, data: pd.DataFrame, symbol: Optional[str]) -> pd.DataFrame:
+        cfg = self.config
+        price = data['close']
+        bb = self.features.bollinger(symbol, data, 20, 2)
+        sma20 = self.features.sma(symbol, data, 20)
+        rsi = self.features.rsi(symbol, data, 14)
+        close_std = self.features.rolling_std(symbol, data, 'close', 20)
+        z_score = (price - sma20) / close_std
+
+        ready = (bb['lower'].notna() & bb['upper'].notna() & sma20.notna() &
+                 z_score.notna() & rsi.notna())
+        buy = ready & (
+            (price < bb['lower']) &
+            (z_score <= cfg['buy_zscore_threshold']) &
+            (rsi <= cfg['buy_rsi_max'])
+        )
+        sell = ready & ~buy & (
+            (z_score >= cfg['exit_zscore_threshold']) | (price >= sma20) | (price >= bb['upper'])
+        )
+
+        return pd.DataFrame({
+            'close': price,
+            'bb_lower': bb['lower'],
+            'bb_upper': bb['upper'],
+            'sma20': sma20,
+            'z_score': z_score,
+            'rsi': rsi,
+            'buy': buy,
+            'sell': sell,
+            'buy_confidence': np.minimum(1.0, 0.5 + z_score.abs() / 5),
+            'sell_confidence': 0.8,
+        }, index=data.index)
+
+    def _build_reason(self, symbol: Optional[str], row: pd.Series, action: str) -> str:
+        price, z_score = row['close'], row['z_score']
+        if action == 'buy':
+            return (
+                f"Mean reversion buy: {symbol} washed out, price ${price:.2f} below lower band ${row['bb_lower']:.2f}, "
+                f"Z-score {z_score:.2f}, RSI {row['rsi']:.1f}"
+            )
+
+        reasons = []
+        if z_score >= self.config['exit_zscore_threshold']:
+            reasons.append(f"Z-score recovered to {z_score:.2f}")
+        if price >= row['sma20']:
+            reasons.append(f"price ${price:.2f} >= SMA20 ${row['sma20']:.2f}")
+        if price >= row['bb_upper']:
+            reasons.append(f"price ${price:.2f} >= BB upper ${row['bb_upper']:.2f}")
+        return f"Mean reversion sell: {'; '.join(reasons)}"
+
+
+class ValueDividendsStrategy(LiveStrategy):
+    """
+    Refined value logic:
+    Be pickier on entries and recycle capital earlier instead of waiting for huge moves.
+    """
+
+    name = "Value & Dividends"
+    description = "Oversold RSI below the 20-day mean, exits on RSI strength"
+    min_bars = 20
+
+    def __init__(self, config: Dict[str, Any] = None, features: FeatureCache = None):
+        default_config = {
+            'buy_rsi_max': 35,
+            'sell_rsi_min': 67
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config, features)
+
+    def required_keys(self) -> List[str]:
+        return ['buy_rsi_max', 'sell_rsi_min']
+
+    def _evaluate(self, data: pd.DataFrame, symbol: Optional[str]) -> pd.DataFrame:
+        cfg = self.config
+        price = data['close']
+        rsi = self.features.rsi(symbol, data, 14)
+        sma20 = self.features.sma(symbol, data, 20)
+
+        ready = rsi.notna() & sma20.notna()
+        buy = ready & (rsi <= cfg['buy_rsi_max']) & (price <= sma20 * 0.99)
+        sell = ready & ~buy & (rsi >= cfg['sell_rsi_min'])
+
+        return pd.DataFrame({
+            'close': price,
+            'rsi': rsi,
+            'buy': buy,
+            'sell': sell,
+            'buy_confidence': ((cfg['buy_rsi_max'] - rsi) / 20 + 0.35).clip(lower=0.0, upper=1.0),
+            'sell_confidence': np.minimum(1.0, 0.6 + (rsi - cfg['sell_rsi_min']) / 20),
+        }, index=data.index)
+
+    def _build_reason(self, symbol: Optional[str], row: pd.Series, action: str) -> str:
+        if action == 'buy':
+            return f"Value buy: {symbol} oversold with RSI {row['rsi']:.1f} and price below 20-day mean"
+        return f"Value sell: {symbol} RSI {row['rsi']:.1f} >= {self.config['sell_rsi_min']}"
+
+
+class LiveVolatilityBreakoutStrategy(LiveStrategy):
+    """
+    Refined breakout logic:
+    Trigger sooner on valid expansion, but use tighter exits and fewer simultaneous names.
+
+    Entries only; exits depend on the position and are handled by the executor.
+    """
+
+    name = "Volatility Breakout"
+    description = "ATR breakout over the prior high on a volume surge, above SMA20"
+    min_bars = 20
+
+    def __init__(self, config: Dict[str, Any] = None, features: FeatureCache = None):
+        default_config = {
+            'breakout_atr_multiple': 1.0,
+            'volume_multiple': 1.5
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config, features)
+
+    def required_keys(self) -> List[str]:
+        return ['breakout_atr_multiple', 'volume_multiple']
+
+    def _evaluate(self, data: pd.DataFrame, symbol: Optional[str]) -> pd.DataFrame:
+        cfg = self.config
+        price = data['close']
+        atr = self.features.atr(symbol, data, 14)
+        avg_volume = self.features.rolling_mean(symbol, data, 'volume', 20)
+        sma20 = self.features.sma(symbol, data, 20)
+
+        breakout_threshold = data['high'].shift(1) + cfg['breakout_atr_multiple'] * atr
+        volume_threshold = cfg['volume_multiple'] * avg_volume
+
+        ready = atr.notna() & avg_volume.notna() & sma20.notna()
+        buy = ready & (price > breakout_threshold) & (data['volume'] > volume_threshold) & (price > sma20)
+
+        return pd.DataFrame({
+            'close': price,
+            'volume': data['volume'],
+            'breakout_threshold': breakout_threshold,
+            'volume_threshold': volume_threshold,
+            'buy': buy,
+            'sell': False,
+            'buy_confidence': np.minimum(1.0, 0.45 + (price / breakout_threshold - 1) * 12),
+            'sell_confidence': 0.0,
+        }, index=data.index)
+
+    def _build_reason(self, symbol: Optional[str], row: pd.Series, action: str) -> str:
+        return (
+            f"Volatility buy: {symbol} cleared breakout ${row['breakout_threshold']:.2f}, "
+            f"volume {row['volume']:,.0f} > {row['volume_threshold']:,.0f}, "
+            f"trend above SMA20"
+        )
+
+
+class SectorRotatorStrategy(LiveStrategy):
+    """
+    Refined sector rotation logic:
+    Concentrate only in the strongest sectors and avoid weak/noisy leadership.
+
+    Cross-sectional: a symbol's signal depends on how its 20-day momentum ranks
+    against the rest of the universe, so use ``generate_universe_signals``.
+    """
+
+    name = "Sector Rotator"
+    description = "Hold the top-N sectors by 20-day momentum, rotate out of laggards"
+    min_bars = 25
+    cross_sectional = True
+
+    def __init__(self, config: Dict[str, Any] = None, features: FeatureCache = None):
+        default_config = {
+            'min_momentum_pct': 1.0,
+            'top_n': 2,
+            'rebalance_buffer_pct': 0.75
+        }
+        if config:
+            default_config.update(config)
+        super().__init__(default_config, features)
+
+    def required_keys(self) -> List[str]:
+        return ['min_momentum_pct', 'top_n', 'rebalance_buffer_pct']
+
+    def _momentum(self, symbol: Optional[str], data: pd.DataFrame) -> pd.Series:
+        """20-day momentum in percent."""
+        def compute(d):
+            past = d['close'].shift(20)
+            return (d['close'] - past) / past * 100
+        return self.features.get(symbol, data, ('momentum_pct', 20), compute)
+
+    def _evaluate(self, data: pd.DataFrame, symbol: Optional[str]) -> pd.DataFrame:
+        """Rules for a single-symbol universe."""
+        series = self.generate_signal_series(data, symbol)
+        return pd.DataFrame({
+            'momentum': self._momentum(symbol, data),
+            'buy': series['action'] == 'buy',
+            'sell': series['action'] == 'sell',
+            'buy_confidence': series['confidence'],
+            'sell_confidence': series['confidence'],
+        }, index=data.index)
+
+    def _build_reason(self, symbol: Optional[str], row: pd.Series, action: str) -> str:
+        if action == 'buy':
+            return f"Sector rotation buy: {symbol} leadership confirmed at {row['momentum']:.2f}% 20-day momentum"
+        return f"Sector rotation sell: {symbol} momentum {row['momentum']:.2f}% no longer strong enough"
+
+    def generate_signals(self, data: pd.DataFrame, symbol: str = None) -> List[Signal]:
+        """Rank a single symbol on its own (prefer generate_universe_signals)."""
+        return self.generate_universe_signals({symbol or 'UNKNOWN': data})
+
+    def generate_signal_series(self, data: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
+        """Per-bar series for a single-symbol universe."""
+        return self.generate_universe_signal_series({symbol or 'UNKNOWN': data})[symbol or 'UNKNOWN']
+
+    def generate_universe_signals(self, market_data: Dict[str, pd.DataFrame]) -> List[Signal]:
+        """Rank the universe on the latest bar and emit rotation signals."""
+        cfg = self.config
+        top_n = cfg['top_n']
+
+        sector_momentum = {}
+        for symbol, data in market_data.items():
+            if len(data) < self.min_bars:
+                continue
+            try:
+                sector_momentum[symbol] = {
+                    'momentum': float(self._momentum(symbol, data).iloc[-1]),
+                    'price': data['close'].iloc[-1],
+                    'timestamp': data.index[-1]
+                }
+            except Exception as e:
+                logger.warning(f"Error calculating {self.name} signals for {symbol}: {e}")
+                continue
+
+        if not sector_momentum:
+            return []
+
+        sorted_sectors = sorted(sector_momentum.items(), key=lambda x: x[1]['momentum'], reverse=True)
+        leaders = [s[0] for s in sorted_sectors[:top_n] if s[1]['momentum'] >= cfg['min_momentum_pct']]
+        leader_cutoff = sorted_sectors[top_n - 1][1]['momentum'] if len(sorted_sectors) >= top_n else None
+
+        signals = []
+        for symbol, point in sector_momentum.items():
+            price = point['price']
+            momentum = point['momentum']
+            timestamp = point['timestamp'] if hasattr(point['timestamp'], 'timestamp') else pd.Timestamp.now()
+
+            if symbol in leaders:
+                signals.append(Signal(
+                    symbol=symbol,
+                    action='buy',
+                    confidence=min(0.95, 0.55 + max(momentum, 0) / 15),
+                    price=float(price),
+                    reason=self._build_reason(symbol, point, 'buy'),
+                    timestamp=timestamp
+                ))
+            else:
+                weak_vs_leaders = leader_cutoff is not None and momentum < (leader_cutoff - cfg['rebalance_buffer_pct'])
+                if momentum < cfg['min_momentum_pct'] or weak_vs_leaders:
+                    signals.append(Signal(
+                        symbol=symbol,
+                        action='sell',
+                        confidence=0.72,
+                        price=float(price),
+                        reason=self._build_reason(symbol, point, 'sell'),
+                        timestamp=timestamp
+                    ))
+
+        return signals
+
+    def generate_universe_signal_series(
+        self, market_data: Dict[str, pd.DataFrame]
+    ) -> Dict[str, pd.DataFrame]:
+        """Rank the universe on every date at once."""
+        cfg = self.config
+        top_n = cfg['top_n']
+
+        # A symbol without a bar on some date is still ranked on its last bar,
+        # as it would be in a live call, hence the forward fill.
+        momentum = {}
+        for symbol, data in market_data.items():
+            series = self._momentum(symbol, data)
+            momentum[symbol] = series.where(self._bars_available(data) >= self.min_bars)
+        if not momentum:
+            return {}
+        panel = pd.DataFrame(momentum).sort_index()
+        listed = pd.DataFrame({
+            symbol: pd.Series(True, index=data.index) for symbol, data in market_data.items()
+        }).reindex(panel.index).ffill().fillna(False).astype(bool)
+        panel = panel.ffill().where(listed)
+
+        values = panel.to_numpy(dtype=float)
+        valid = listed.to_numpy() & ~np.isnan(values)
+        order = np.argsort(np.where(valid, -values, np.inf), axis=1, kind='stable')
+        ranks = np.empty(values.shape)
+        ranks[np.arange(values.shape[0])[:, None], order] = np.arange(1, values.shape[1] + 1)
+        ranks[~valid] = np.nan
+
+        counts = valid.sum(axis=1)
+        cutoff_col = order[:, min(top_n, values.shape[1]) - 1]
+        cutoff = np.where(counts >= top_n, values[np.arange(values.shape[0]), cutoff_col], np.nan)
+        cutoff = pd.Series(cutoff, index=panel.index)
+
+        ranks = pd.DataFrame(ranks, index=panel.index, columns=panel.columns)
+        leader = (ranks <= top_n) & (panel >= cfg['min_momentum_pct'])
+        weak = panel.lt(cutoff - cfg['rebalance_buffer_pct'], axis=0) & cutoff.notna().values[:, None]
+        sell = ranks.notna() & ~leader & ((panel < cfg['min_momentum_pct']) | weak)
+
+        result = {}
+        for symbol, data in market_data.items():
+            symbol_momentum = panel[symbol].reindex(data.index)
+            result[symbol] = self._signal_frame(
+                data,
+                leader[symbol].reindex(data.index).values,
+                sell[symbol].reindex(data.index).values,
+                np.minimum(0.95, 0.55 + symbol_momentum.clip(lower=0) / 15),
+                0.72
+            )
+        return result
+
+
+# Executor strategy type -> live strategy class
+LIVE_STRATEGY_TYPES = {
+    'momentum_hunter': MomentumHunterStrategy,
+    'mean_reversion': LiveMeanReversionStrategy,
+    'sector_rotator': SectorRotatorStrategy,
+    'value_dividends': ValueDividendsStrategy,
+    'volatility_breakout': LiveVolatilityBreakoutStrategy,
+}
@@ -80,13 +80,70 @@ class MeanReversionStrategy(Strategy):
         """Generate mean reversion trading signals."""
         signals = []
         
-        # Need enough data for indicators
-        min_periods = max(self.config['bb_period'], self.config['rsi_period'])
+        if len(data) < self._min_periods() + 10:  # Add buffer
+            return signals
+        
+        data = self._add_indicators(data)
         
-        if len(data) < min_periods + 10:  # Add buffer
+        # Use provided symbol or try to determine it from data
+        if symbol:
+            symbol_name = symbol
+        elif 'symbol' in data.columns:
+            symbol_name = data['symbol'].iloc[0]
+        else:
+            symbol_name = 'UNKNOWN'
+            
+        if len(data) < 2:
             return signals
         
-        # Calculate indicators
+        latest = data.iloc[-1]
+        
+        # Apply filters
+        if not self._passes_filters(latest):
+            return signals
+        
+        # Determine signal
+        signal = self._evaluate_mean_reversion_signal(symbol_name, latest, data)
+        
+        if signal:
+            signals.append(signal)
+        
+        return signals
+    
+    def generate_signal_series(self, data: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
+        """Vectorized equivalent of calling generate_signals on every prefix of data."""
+        enough = self._bars_available(data) >= max(self._min_periods() + 10, 2)
+        
+        data = self._add_indicators(data)
+        close = data['close']
+        rsi = data['rsi']
+        bb_position = data['bb_position']
+        
+        # Same checks as _passes_filters, one column at a time
+        passes = ~(data['volume'] < self.config.get('min_volume', 0))
+        if self.config.get('volatility_filter', False):
+            passes &= ~(data['volatility'] < self.config.get('min_volatility', 0))
+        passes &= rsi.notna() & bb_position.notna()
+        
+        active = enough & passes.values
+        buy = active & ((close < data['bb_lower']) & (rsi < self.config['rsi_oversold'])).values
+        sell = active & ((close > data['bb_upper']) & (rsi > self.config['rsi_overbought'])).values
+        
+        oversold = self.config['rsi_oversold']
+        overbought = self.config['rsi_overbought']
+        buy_strength = ((oversold - rsi) / oversold + (1.0 - bb_position).clip(lower=0)) / 2
+        sell_strength = ((rsi - overbought) / (100 - overbought) + (bb_position - 1.0).clip(lower=0)) / 2
+        buy_confidence = np.minimum(0.4 + buy_strength, 1.0)
+        sell_confidence = np.minimum(0.4 + sell_strength, 1.0)
+        
+        return self._signal_frame(data, buy, sell, buy_confidence, sell_confidence)
+    
+    def _min_periods(self) -> int:
+        """Bars needed before the slowest indicator is defined."""
+        return max(self.config['bb_period'], self.config['rsi_period'])
+    
+    def _add_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Return a copy of data with indicator columns added."""
         data = data.copy()
         
         # Bollinger Bands
@@ -112,30 +169,7 @@ class MeanReversionStrategy(Strategy):
         if self.config.get('volatility_filter', False):
             data['volatility'] = data['close'].pct_change().rolling(5).std() * np.sqrt(252)
         
-        # Use provided symbol or try to determine it from data
-        if symbol:
-            symbol_name = symbol
-        elif 'symbol' in data.columns:
-            symbol_name = data['symbol'].iloc[0]
-        else:
-            symbol_name = 'UNKNOWN'
-            
-        if len(data) < 2:
-            return signals
-        
-        latest = data.iloc[-1]
-        
-        # Apply filters
-        if not self._passes_filters(latest):
-            return signals
-        
-        # Determine signal
-        signal = self._evaluate_mean_reversion_signal(symbol_name, latest, data)
-        
-        if signal:
-            signals.append(signal)
-        
-        return signals
+        return data
     
     def _calculate_zscore(self, prices: pd.Series, period: int) -> pd.Series:
         """Calculate rolling Z-score of prices."""
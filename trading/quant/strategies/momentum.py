@@ -87,36 +87,10 @@ class MomentumStrategy(Strategy):
         """Generate momentum-based trading signals."""
         signals = []
         
-        # Need enough data for indicators
-        min_periods = max(
-            self.config['rsi_period'],
-            self.config['macd_slow'] + self.config['macd_signal'],
-            self.config['ema_slow']
-        )
-        
-        if len(data) < min_periods + 10:  # Add buffer
+        if len(data) < self._min_periods() + 10:  # Add buffer
             return signals
         
-        # Calculate indicators
-        data = data.copy()
-        data['rsi'] = calculate_rsi(data['close'], period=self.config['rsi_period'])
-        
-        macd_data = calculate_macd(
-            data['close'], 
-            fast=self.config['macd_fast'],
-            slow=self.config['macd_slow'],
-            signal=self.config['macd_signal']
-        )
-        data['macd'] = macd_data['macd']
-        data['macd_signal'] = macd_data['macd_signal']
-        data['macd_histogram'] = macd_data['macd_histogram']
-        
-        data['ema_fast'] = calculate_ema(data['close'], period=self.config['ema_fast'])
-        data['ema_slow'] = calculate_ema(data['close'], period=self.config['ema_slow'])
-        
-        # Calculate composite scores
-        data['momentum_score'] = self._calculate_momentum_score(data)
-        
+        data = self._add_indicators(data)
         # Use provided symbol or try to determine it from data
         if symbol:
             symbol_name = symbol
@@ -192,6 +166,54 @@ class MomentumStrategy(Strategy):
         
         return signals
     
+    def generate_signal_series(self, data: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
+        """Vectorized equivalent of calling generate_signals on every prefix of data."""
+        enough = self._bars_available(data) >= max(self._min_periods() + 10, 2)
+        
+        data = self._add_indicators(data)
+        score = data['momentum_score']
+        previous_score = score.shift(1)
+        volume_ok = ~(data['volume'] < self.config.get('min_volume', 0))
+        
+        active = enough & volume_ok.values
+        buy = active & ((score >= self.config['buy_threshold']) &
+                        (previous_score < self.config['buy_threshold'])).values
+        sell = active & ((score <= self.config['sell_threshold']) &
+                         (previous_score > self.config['sell_threshold'])).values
+        confidence = score.abs() / 3.0
+        
+        return self._signal_frame(data, buy, sell, confidence, confidence)
+    
+    def _min_periods(self) -> int:
+        """Bars needed before the slowest indicator is defined."""
+        return max(
+            self.config['rsi_period'],
+            self.config['macd_slow'] + self.config['macd_signal'],
+            self.config['ema_slow']
+        )
+    
+    def _add_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Return a copy of data with indicator and score columns added."""
+        data = data.copy()
+        data['rsi'] = calculate_rsi(data['close'], period=self.config['rsi_period'])
+        
+        macd_data = calculate_macd(
+            data['close'], 
+            fast=self.config['macd_fast'],
+            slow=self.config['macd_slow'],
+            signal=self.config['macd_signal']
+        )
+        data['macd'] = macd_data['macd']
+        data['macd_signal'] = macd_data['macd_signal']
+        data['macd_histogram'] = macd_data['macd_histogram']
+        
+        data['ema_fast'] = calculate_ema(data['close'], period=self.config['ema_fast'])
+        data['ema_slow'] = calculate_ema(data['close'], period=self.config['ema_slow'])
+        
+        # Calculate composite scores
+        data['momentum_score'] = self._calculate_momentum_score(data)
+        return data
+    
     def _calculate_momentum_score(self, data: pd.DataFrame) -> pd.Series:
         """Calculate composite momentum score."""
         score = pd.Series(0.0, index=data.index)
@@ -0,0 +1,283 @@
+"""Strategy registry with lazy imports and entry-point discovery.
+
+Strategies register by name with a ``'module:Class'`` import path and their
+metadata (display name, universe, timeframe, portfolio config). The module is
+only imported the first time the strategy class is needed, so listing
+strategies or running a single one does not pay for importing all of them.
+
+Third-party packages can add strategies through the ``quant.strategies``
+entry-point group::
+
+    [project.entry-points."quant.strategies"]
+    pairs = "my_package.pairs:PairsStrategy"
+"""
+
+import importlib
+import logging
+from dataclasses import dataclass, field
+from importlib.metadata import entry_points
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = 'quant.strategies'
+
+
+@dataclass
+class StrategySpec:
+    """Registered strategy and its metadata."""
+    name: str
+    target: str  # 'module:Class'
+    display_name: str = ""
+    universe: List[str] = field(default_factory=list)
+    timeframe: str = '1Day'
+    description: str = ""
+    portfolio: Optional[str] = None  # SignalGenerator portfolio name
+    config: Dict[str, Any] = field(default_factory=dict)  # portfolio config
+    universe_key: bool = False  # pass the universe in the strategy config
+    _cls: Optional[type] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not self.display_name:
+            self.display_name = self.name.replace('_', ' ').title()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the strategy module has been imported."""
+        return self._cls is not None
+
+    def load(self) -> type:
+        """Import and return the strategy class."""
+        if self._cls is None:
+            module_name, _, attr = self.target.partition(':')
+            if not attr:
+                raise ValueError(f"Strategy target must be 'module:Class', got {self.target!r}")
+            module = importlib.import_module(module_name)
+            self._cls = getattr(module, attr)
+        return self._cls
+
+    def create(self, config: Dict[str, Any] = None):
+        """Instantiate the strategy with an optional config override."""
+        return self.load()(config)
+
+
+_registry: Dict[str, StrategySpec] = {}
+_entry_points_loaded = False
+
+
+def register_strategy(name: str, target: Union[str, type], **metadata) -> StrategySpec:
+    """
+    Register a strategy under ``name``.
+
+    Args:
+        name: Registry key, e.g. 'momentum'
+        target: 'module:Class' import path, or the class itself
+        **metadata: StrategySpec fields (display_name, universe, timeframe, ...)
+
+    Returns:
+        The registered StrategySpec
+    """
+    if isinstance(target, str):
+        spec = StrategySpec(name=name, target=target, **metadata)
+    else:
+        spec = StrategySpec(
+            name=name, target=f"{target.__module__}:{target.__qualname__}", **metadata
+        )
+        spec._cls = target
+
+    if name in _registry:
+        logger.debug(f"Replacing registered strategy {name}")
+    _registry[name] = spec
+    return spec
+
+
+def unregister_strategy(name: str) -> None:
+    """Remove a strategy from the registry."""
+    _registry.pop(name, None)
+
+
+def discover_entry_points(group: str = ENTRY_POINT_GROUP) -> List[str]:
+    """
+    Register strategies advertised by installed packages.
+
+    Entry points are recorded without importing them; names already registered
+    are left alone.
+
+    Returns:
+        Names of newly registered strategies
+    """
+    added = []
+    try:
+        found = entry_points(group=group)
+    except Exception as e:
+        logger.warning(f"Could not read entry points for {group}: {e}")
+        return added
+
+    for ep in found:
+        if ep.name in _registry:
+            continue
+        register_strategy(ep.name, ep.value)
+        added.append(ep.name)
+
+    return added
+
+
+def _ensure_discovered() -> None:
+    global _entry_points_loaded
+    if not _entry_points_loaded:
+        _entry_points_loaded = True
+        discover_entry_points()
+
+
+def get_spec(name: str) -> StrategySpec:
+    """Look up a registered strategy, raising KeyError if unknown."""
+    if name not in _registry:
+        _ensure_discovered()
+    try:
+        return _registry[name]
+    except KeyError:
+        raise KeyError(f"Unknown strategy: {name}. Available: {', '.join(list_strategies())}")
+
+
+def list_strategies() -> List[str]:
+    """Names of all registered strategies, in registration order."""
+    _ensure_discovered()
+    return list(_registry.keys())
+
+
+def iter_specs() -> List[StrategySpec]:
+    """All registered strategy specs, in registration order."""
+    _ensure_discovered()
+    return list(_registry.values())
+
+
+def load_strategy(name: str) -> type:
+    """Import and return the class registered under ``name``."""
+    return get_spec(name).load()
+
+
+def create_strategy(name: str, config: Dict[str, Any] = None):
+    """Instantiate the strategy registered under ``name``."""
+    return get_spec(name).create(config)
+
+
+# Built-in strategies. Universes are the backtest universes; configs are the
+# virtual portfolio settings used by SignalGenerator.
+
+register_strategy(
+    'momentum', 'strategies.momentum:MomentumStrategy',
+    display_name='Momentum Rider',
+    universe=['AAPL', 'MSFT', 'GOOGL', 'NVDA', 'META', 'TSLA', 'AMZN', 'JPM', 'V', 'MA'],
+    description='Trend following using RSI, MACD, and EMA crossover',
+    portfolio='momentum-hunter',
+    config={
+        'rsi_period': 14,
+        'macd_fast': 12,
+        'macd_slow': 26,
+        'macd_signal': 9,
+        'ema_fast': 20,
+        'ema_slow': 50,
+        'buy_threshold': 2,
+        'sell_threshold': -2
+    },
+)
+
+register_strategy(
+    'mean_reversion', 'strategies.mean_reversion:MeanReversionStrategy',
+    display_name='Contrarian',
+    universe=['AAPL', 'MSFT', 'GOOGL', 'NVDA', 'META', 'TSLA', 'AMZN', 'JPM', 'V', 'MA'],
+    description='Mean reversion using Bollinger Bands and RSI',
+    portfolio='mean-reversion',
+    config={
+        'bb_period': 20,
+        'bb_std': 2.0,
+        'zscore_period': 20,
+        'zscore_buy_threshold': -2.0,
+        'zscore_sell_threshold': 2.0
+    },
+)
+
+register_strategy(
+    'sector_rotation', 'strategies.sector_rotation:SectorRotationStrategy',
+    display_name='Sector Rotator',
+    universe=['XLK', 'XLF', 'XLE', 'XLV', 'XLI', 'XLP', 'XLU', 'XLY', 'XLC', 'XLRE', 'XLB'],
+    description='Rotates between sector ETFs on relative momentum',
+    portfolio='sector-rotator',
+    config={
+        'lookback_period': 60,
+        'momentum_threshold': 0.05,
+        'max_positions': 3,
+        'position_size': 0.33
+    },
+    universe_key=True,
+)
+
+register_strategy(
+    'value_dividend', 'strategies.value_dividend:ValueDividendStrategy',
+    display_name='Dividend Hunter',
+    universe=['VZ', 'T', 'KO', 'PEP', 'PG', 'JNJ', 'XOM', 'CVX', 'ABBV', 'PFE', 'IBM', 'MMM'],
+    description='Value investing in dividend stocks with mean reversion timing',
+    portfolio='value-dividends',
+    config={
+        'rsi_oversold': 35,
+        'rsi_overbought': 65,
+        'position_size': 0.12,
+        'max_positions': 8,
+        'volatility_threshold': 0.02
+    },
+    universe_key=True,
+)
+
+register_strategy(
+    'volatility_breakout', 'strategies.volatility_breakout:VolatilityBreakoutStrategy',
+    display_name='Volatility Trader',
+    universe=['TSLA', 'NVDA', 'AMD', 'COIN', 'MSTR', 'SQ', 'SHOP', 'ROKU', 'PLTR', 'SNAP'],
+    description='Breakout trading on volume spikes and ATR expansion',
+    portfolio='volatility-breakout',
+    config={
+        'breakout_period': 20,
+        'volume_factor': 1.5,
+        'atr_threshold': 1.2,
+        'min_volume': 1000000,
+        'stop_loss': -0.08,
+        'take_profit': 0.15
+    },
+)
+
+# Strategies traded by the live executor (StrategyExecutor). Universes are the
+# live universes; configs come from the executor's strategy definitions.
+
+register_strategy(
+    'live_momentum_hunter', 'strategies.live:MomentumHunterStrategy',
+    display_name='Momentum Hunter',
+    universe=['AAPL', 'MSFT', 'GOOGL', 'NVDA', 'META', 'TSLA', 'AMZN', 'JPM', 'V', 'MA'],
+    description='Trend + RSI + expanding MACD histogram, fast exits on fading momentum',
+)
+
+register_strategy(
+    'live_mean_reversion', 'strategies.live:LiveMeanReversionStrategy',
+    display_name='Mean Reversion',
+    universe=['AAPL', 'MSFT', 'GOOGL', 'NVDA', 'META', 'TSLA', 'AMZN', 'JPM', 'V', 'MA'],
+    description='Bollinger washout + z-score + RSI entries, exits on recovery to the mean',
+)
+
+register_strategy(
+    'live_sector_rotator', 'strategies.live:SectorRotatorStrategy',
+    display_name='Sector Rotator',
+    universe=['XLK', 'XLF', 'XLE', 'XLV', 'XLI', 'XLP', 'XLU', 'XLY', 'XLC', 'XLRE', 'XLB'],
+    description='Hold the top-N sectors by 20-day momentum, rotate out of laggards',
+)
+
+register_strategy(
+    'live_value_dividends', 'strategies.live:ValueDividendsStrategy',
+    display_name='Value & Dividends',
+    universe=['VZ', 'T', 'KO', 'PEP', 'PG', 'JNJ', 'XOM', 'CVX', 'ABBV', 'PFE', 'IBM', 'MMM'],
+    description='Oversold RSI below the 20-day mean, exits on RSI strength',
+)
+
+register_strategy(
+    'live_volatility_breakout', 'strategies.live:LiveVolatilityBreakoutStrategy',
+    display_name='Volatility Breakout',
+    universe=['TSLA', 'NVDA', 'AMD', 'COIN', 'MSTR', 'SQ', 'SHOP', 'ROKU', 'PLTR', 'SNAP'],
+    description='ATR breakout over the prior high on a volume surge, above SMA20',
+)
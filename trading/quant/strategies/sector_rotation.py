@@ -5,6 +5,9 @@ import numpy as np
 from typing import Dict, List, Any
 from .base import Strategy, Signal
 from utils.indicators import calculate_momentum, calculate_sma, calculate_rsi
+from utils.panel import (
+    build_panel, bars_seen, panel_momentum, panel_sma, panel_rsi, rank_panel
+)
 
 class SectorRotationStrategy(Strategy):
     """
@@ -100,20 +103,7 @@ class SectorRotationStrategy(Strategy):
         if symbol_name not in self.config['universe']:
             return signals
         
-        data = data.copy()
-        
-        # Calculate indicators
-        data['momentum'] = calculate_momentum(
-            data['close'], 
-            period=self.config['lookback_period']
-        )
-        data['sma_20'] = calculate_sma(data['close'], 20)
-        data['sma_50'] = calculate_sma(data['close'], 50)
-        data['rsi'] = calculate_rsi(data['close'], 14)
-        
-        # Calculate relative strength (vs benchmark - would need benchmark data in real implementation)
-        # For now, use absolute momentum as proxy
-        data['relative_strength'] = data['momentum']
+        data = self._add_indicators(data)
         
         latest = data.iloc[-1]
         
@@ -156,6 +146,58 @@ class SectorRotationStrategy(Strategy):
         
         return signals
     
+    def generate_signal_series(self, data: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
+        """Vectorized equivalent of calling generate_signals on every prefix of data."""
+        if symbol:
+            symbol_name = symbol
+        elif 'symbol' in data.columns and len(data):
+            symbol_name = data['symbol'].iloc[0]
+        else:
+            symbol_name = 'UNKNOWN'
+        
+        enough = self._bars_available(data) >= self.config['lookback_period'] + 20
+        if symbol_name not in self.config['universe']:
+            enough[:] = False
+        
+        data = self._add_indicators(data)
+        close = data['close']
+        momentum = data['momentum']
+        threshold = self.config['momentum_threshold']
+        
+        active = enough & (~(data['volume'] < self.config.get('min_volume', 0))).values
+        buy = active & (
+            (momentum > threshold) &
+            (close > data['sma_20']) & (data['sma_20'] > data['sma_50']) &
+            (data['rsi'] < 70)
+        ).values
+        sell = active & (
+            (momentum < -threshold) |
+            ((close < data['sma_20']) & (data['rsi'] > self.config['rsi_overbought']))
+        ).values
+        
+        buy_confidence = np.fmin(0.9, momentum.abs() * 2)
+        sell_confidence = np.fmin(0.8, momentum.abs() * 2)
+        
+        return self._signal_frame(data, buy, sell, buy_confidence, sell_confidence)
+    
+    def _add_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Return a copy of data with momentum, trend and RSI columns added."""
+        data = data.copy()
+        
+        # Calculate indicators
+        data['momentum'] = calculate_momentum(
+            data['close'], 
+            period=self.config['lookback_period']
+        )
+        data['sma_20'] = calculate_sma(data['close'], 20)
+        data['sma_50'] = calculate_sma(data['close'], 50)
+        data['rsi'] = calculate_rsi(data['close'], 14)
+        
+        # Calculate relative strength (vs benchmark - would need benchmark data in real implementation)
+        # For now, use absolute momentum as proxy
+        data['relative_strength'] = data['momentum']
+        return data
+    
     def rank_sectors(self, market_data: Dict[str, pd.DataFrame]) -> List[tuple]:
         """
         Rank sectors by relative momentum strength.
@@ -214,4 +256,43 @@ class SectorRotationStrategy(Strategy):
             else:
                 reasons.append(f"{indicator}: {value}")
         
-        return f"{action.upper()} - {', '.join(reasons)}"
\ No newline at end of file
+        return f"{action.upper()} - {', '.join(reasons)}"
+    
+    def score_panel(self, market_data) -> pd.DataFrame:
+        """
+        Compute the rank_sectors composite score for every symbol on every date.
+        
+        Args:
+            market_data: Dictionary mapping symbol -> OHLCV DataFrame, or a
+                dates x symbols close panel
+            
+        Returns:
+            Dates x symbols score panel, NaN outside the universe or before a
+            symbol has enough history
+        """
+        close = market_data if isinstance(market_data, pd.DataFrame) else build_panel(market_data)
+        close = close[[symbol for symbol in close.columns if symbol in self.config['universe']]]
+        
+        momentum = panel_momentum(close, self.config['lookback_period'])
+        trend_score = np.where(panel_sma(close, 20) > panel_sma(close, 50), 1, -1)
+        
+        rsi = panel_rsi(close, 14)
+        rsi_score = np.where((rsi > 30) & (rsi < 70), 0.5, np.where(rsi > 70, 0.2, 0.8))
+        
+        scores = momentum * trend_score * rsi_score
+        return scores.where(bars_seen(close) >= self.config['lookback_period'] + 10)
+    
+    def rank_sectors_panel(self, market_data, membership: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Rank sectors against each other on every date.
+        
+        Args:
+            market_data: Dictionary mapping symbol -> OHLCV DataFrame, or a
+                dates x symbols close panel
+            membership: Optional point-in-time universe mask (see
+                utils.panel.membership_mask)
+            
+        Returns:
+            Dates x symbols panel of 1-based ranks, NaN where not ranked
+        """
+        return rank_panel(self.score_panel(market_data), membership)
@@ -5,6 +5,9 @@ import numpy as np
 from typing import Dict, List, Any
 from .base import Strategy, Signal
 from utils.indicators import calculate_rsi, calculate_sma, calculate_bollinger_bands
+from utils.panel import (
+    build_panel, bars_seen, panel_sma, panel_rsi, panel_volatility, rank_panel
+)
 
 class ValueDividendStrategy(Strategy):
     """
@@ -111,26 +114,7 @@ class ValueDividendStrategy(Strategy):
         if symbol_name not in self.config['universe']:
             return signals
         
-        data = data.copy()
-        
-        # Calculate indicators
-        data['rsi'] = calculate_rsi(data['close'], 14)
-        data['sma'] = calculate_sma(data['close'], self.config['sma_period'])
-        
-        bb_data = calculate_bollinger_bands(
-            data['close'],
-            period=self.config['bollinger_period'],
-            std_dev=self.config['bollinger_std']
-        )
-        data['bb_upper'] = bb_data['upper']
-        data['bb_middle'] = bb_data['middle']
-        data['bb_lower'] = bb_data['lower']
-        
-        # Calculate volatility (rolling standard deviation)
-        data['volatility'] = data['close'].pct_change().rolling(20).std()
-        
-        # Calculate quality score (simplified - in real implementation would use fundamental data)
-        data['quality_score'] = self._calculate_quality_score(data)
+        data = self._add_indicators(data)
         
         latest = data.iloc[-1]
         
@@ -189,6 +173,69 @@ class ValueDividendStrategy(Strategy):
         
         return signals
     
+    def generate_signal_series(self, data: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
+        """Vectorized equivalent of calling generate_signals on every prefix of data."""
+        if symbol:
+            symbol_name = symbol
+        elif 'symbol' in data.columns and len(data):
+            symbol_name = data['symbol'].iloc[0]
+        else:
+            symbol_name = 'UNKNOWN'
+        
+        min_bars = max(self.config['bollinger_period'], self.config['sma_period']) + 20
+        enough = self._bars_available(data) >= min_bars
+        if symbol_name not in self.config['universe']:
+            enough[:] = False
+        
+        data = self._add_indicators(data)
+        close = data['close']
+        rsi = data['rsi']
+        oversold = self.config['rsi_oversold']
+        overbought = self.config['rsi_overbought']
+        
+        passes = (
+            ~(data['volume'] < self.config.get('min_volume', 0)) &
+            ~(data['volatility'] > self.config['volatility_threshold']) &
+            ~(data['quality_score'] < self.config['quality_score_min'])
+        )
+        broke_support = close < data['sma']
+        
+        active = enough & passes.values
+        buy = active & ((rsi < oversold) & (close < data['bb_lower']) & (close > data['sma'])).values
+        sell = active & (((rsi > overbought) & (close > data['bb_upper'])) | broke_support).values
+        
+        buy_confidence = np.fmin(0.9, 0.6 + (oversold - rsi) / oversold)
+        sell_confidence = np.where(
+            broke_support, 0.8,
+            np.fmin(0.7, 0.5 + (rsi - overbought) / (100 - overbought))
+        )
+        
+        return self._signal_frame(data, buy, sell, buy_confidence, sell_confidence)
+    
+    def _add_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Return a copy of data with indicator and quality columns added."""
+        data = data.copy()
+        
+        # Calculate indicators
+        data['rsi'] = calculate_rsi(data['close'], 14)
+        data['sma'] = calculate_sma(data['close'], self.config['sma_period'])
+        
+        bb_data = calculate_bollinger_bands(
+            data['close'],
+            period=self.config['bollinger_period'],
+            std_dev=self.config['bollinger_std']
+        )
+        data['bb_upper'] = bb_data['upper']
+        data['bb_middle'] = bb_data['middle']
+        data['bb_lower'] = bb_data['lower']
+        
+        # Calculate volatility (rolling standard deviation)
+        data['volatility'] = data['close'].pct_change().rolling(20).std()
+        
+        # Calculate quality score (simplified - in real implementation would use fundamental data)
+        data['quality_score'] = self._calculate_quality_score(data)
+        return data
+    
     def _calculate_quality_score(self, data: pd.DataFrame) -> pd.Series:
         """
         Calculate a simplified quality score based on price action.
@@ -199,20 +246,25 @@ class ValueDividendStrategy(Strategy):
         - Return on equity
         - Earnings consistency
         """
+        return self._quality_from_close(data['close'])
+    
+    @staticmethod
+    def _quality_from_close(close):
+        """Quality score from a close Series, or a dates x symbols close panel."""
         # Simplified quality score based on price stability and trend
-        returns = data['close'].pct_change()
+        returns = close.pct_change()
         
         # Score components:
         # 1. Low volatility (stability)
         volatility_score = 1 - np.minimum(returns.rolling(60).std() * np.sqrt(252), 0.5) / 0.5
         
         # 2. Positive long-term trend
-        long_term_return = (data['close'] / data['close'].shift(252)).fillna(1) - 1
+        long_term_return = (close / close.shift(252)).fillna(1) - 1
         trend_score = np.minimum(np.maximum(long_term_return, -0.2), 0.2) / 0.2 * 0.5 + 0.5
         
         # 3. Consistent performance (low drawdowns)
-        rolling_max = data['close'].rolling(252).max()
-        drawdown = (data['close'] - rolling_max) / rolling_max
+        rolling_max = close.rolling(252).max()
+        drawdown = (close - rolling_max) / rolling_max
         consistency_score = 1 + np.maximum(drawdown, -0.3) / 0.3
         
         # Composite score
@@ -266,6 +318,49 @@ class ValueDividendStrategy(Strategy):
         rankings.sort(key=lambda x: x[1], reverse=True)
         return rankings
     
+    def score_panel(self, market_data) -> pd.DataFrame:
+        """
+        Compute the rank_value_stocks score for every symbol on every date.
+        
+        Args:
+            market_data: Dictionary mapping symbol -> OHLCV DataFrame, or a
+                dates x symbols close panel
+            
+        Returns:
+            Dates x symbols score panel, NaN outside the universe or before a
+            symbol has enough history
+        """
+        close = market_data if isinstance(market_data, pd.DataFrame) else build_panel(market_data)
+        close = close[[symbol for symbol in close.columns if symbol in self.config['universe']]]
+        
+        rsi_score = (100 - panel_rsi(close, 14)) / 100
+        quality_score = self._quality_from_close(close)
+        
+        sma_50 = panel_sma(close, 50)
+        price_discount = np.fmax(0, (sma_50 - close) / sma_50)
+        
+        volatility = panel_volatility(close, 20)
+        vol_score = np.fmax(0, 1 - volatility / self.config['volatility_threshold'])
+        
+        scores = (rsi_score * 0.3 + quality_score * 0.4 +
+                  price_discount * 0.2 + vol_score * 0.1)
+        return scores.where(bars_seen(close) >= 60)
+    
+    def rank_value_panel(self, market_data, membership: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Rank value stocks against each other on every date.
+        
+        Args:
+            market_data: Dictionary mapping symbol -> OHLCV DataFrame, or a
+                dates x symbols close panel
+            membership: Optional point-in-time universe mask (see
+                utils.panel.membership_mask)
+            
+        Returns:
+            Dates x symbols panel of 1-based ranks, NaN where not ranked
+        """
+        return rank_panel(self.score_panel(market_data), membership)
+    
     def _build_signal_reason(self, row: pd.Series, action: str) -> str:
         """Build human-readable reason for the signal."""
         bb_position = "Lower" if row['close'] < row['bb_lower'] else (
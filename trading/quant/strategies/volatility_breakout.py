@@ -70,44 +70,11 @@ class VolatilityBreakoutStrategy(Strategy):
     def generate_signals(self, data: pd.DataFrame, symbol: str = None) -> List[Signal]:
         signals = []
 
-        min_periods = max(
-            self.config['breakout_period'],
-            self.config['volume_avg_period'],
-            self.config['atr_period'] + self.config['atr_avg_period']
-        ) + 5
-
-        if len(data) < min_periods:
+        if len(data) < self._min_periods():
             return signals
 
-        data = data.copy()
-
-        # --- ATR (Average True Range) ---
-        high = data['high']
-        low = data['low']
-        close = data['close']
-        prev_close = close.shift(1)
-
-        tr = pd.concat([
-            high - low,
-            (high - prev_close).abs(),
-            (low - prev_close).abs()
-        ], axis=1).max(axis=1)
-
-        atr = tr.rolling(self.config['atr_period']).mean()
-        atr_avg = atr.rolling(self.config['atr_avg_period']).mean()
-
-        data['atr'] = atr
-        data['atr_avg'] = atr_avg
-        data['atr_expanding'] = atr > (self.config['atr_threshold'] * atr_avg)
-
-        # --- N-day breakout levels (use shift(1) to avoid lookahead) ---
-        n = self.config['breakout_period']
-        data['n_day_high'] = high.shift(1).rolling(n).max()
-        data['n_day_low'] = low.shift(1).rolling(n).min()
-
-        # --- Volume spike ---
-        vol_avg = data['volume'].rolling(self.config['volume_avg_period']).mean()
-        data['volume_spike'] = data['volume'] > (self.config['volume_factor'] * vol_avg)
+        data = self._add_indicators(data)
+        vol_avg = data['volume_avg']
 
         # --- Symbol ---
         if symbol:
@@ -179,3 +146,76 @@ class VolatilityBreakoutStrategy(Strategy):
             ))
 
         return signals
+
+    def generate_signal_series(self, data: pd.DataFrame, symbol: str = None) -> pd.DataFrame:
+        """Vectorized equivalent of calling generate_signals on every prefix of data."""
+        enough = self._bars_available(data) >= self._min_periods()
+
+        data = self._add_indicators(data)
+        close = data['close']
+        atr = data['atr']
+
+        ready = (
+            ~(data['volume'] < self.config['min_volume']) &
+            data['n_day_high'].notna() & atr.notna() &
+            ~(atr / close < self.config['min_atr_pct'])
+        )
+        confirmed = data['volume_spike'] & data['atr_expanding']
+
+        active = enough & ready.values
+        buy = active & ((close > data['n_day_high']) & confirmed).values
+        sell = active & ((close < data['n_day_low']) & confirmed).values
+
+        vol_ratio = data['volume'] / data['volume_avg'].fillna(1)
+        atr_ratio = atr / data['atr_avg'].fillna(1)
+        breakout_pct = (close - data['n_day_high']) / data['n_day_high']
+        breakdown_pct = (data['n_day_low'] - close) / data['n_day_low']
+        buy_confidence = np.minimum(
+            0.5 + breakout_pct * 5 + (vol_ratio - 1) * 0.1 + (atr_ratio - 1) * 0.1, 1.0
+        )
+        sell_confidence = np.minimum(0.5 + breakdown_pct * 5 + (vol_ratio - 1) * 0.1, 1.0)
+
+        return self._signal_frame(data, buy, sell, buy_confidence, sell_confidence)
+
+    def _min_periods(self) -> int:
+        """Bars needed before breakout levels and ATR averages are defined."""
+        return max(
+            self.config['breakout_period'],
+            self.config['volume_avg_period'],
+            self.config['atr_period'] + self.config['atr_avg_period']
+        ) + 5
+
+    def _add_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Return a copy of data with ATR, breakout and volume columns added."""
+        data = data.copy()
+
+        # --- ATR (Average True Range) ---
+        high = data['high']
+        low = data['low']
+        close = data['close']
+        prev_close = close.shift(1)
+
+        tr = pd.concat([
+            high - low,
+            (high - prev_close).abs(),
+            (low - prev_close).abs()
+        ], axis=1).max(axis=1)
+
+        atr = tr.rolling(self.config['atr_period']).mean()
+        atr_avg = atr.rolling(self.config['atr_avg_period']).mean()
+
+        data['atr'] = atr
+        data['atr_avg'] = atr_avg
+        data['atr_expanding'] = atr > (self.config['atr_threshold'] * atr_avg)
+
+        # --- N-day breakout levels (use shift(1) to avoid lookahead) ---
+        n = self.config['breakout_period']
+        data['n_day_high'] = high.shift(1).rolling(n).max()
+        data['n_day_low'] = low.shift(1).rolling(n).min()
+
+        # --- Volume spike ---
+        vol_avg = data['volume'].rolling(self.config['volume_avg_period']).mean()
+        data['volume_avg'] = vol_avg
+        data['volume_spike'] = data['volume'] > (self.config['volume_factor'] * vol_avg)
+
+        return data
@@ -13,22 +13,37 @@ Executes the following strategies with real Alpaca market data:
 import os
 import sys
 import json
+import time
 import logging
 import sqlite3
+import threading
 import requests
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Dict, List, Optional, Any, Tuple
-import ta
 
 # Add the project root to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from alpaca_client import client
+from alpaca_client import client as alpaca_client, http_session
+from strategies.registry import create_strategy
+from utils.features import FeatureCache, feature_cache
+from signals.journal import signal_journal
+from ledger import PositionLedger
+from market_data import CycleMarketData, fetch_alpaca_bars
+from indicator_state import IndicatorStateStore
+from exits import ExitEngine, exit_rules
+from netting import OrderNetter
+from order_manager import ManagedOrder, OrderManager, client_order_id
+from quote_cache import QuoteCache, quote_cache as shared_quote_cache, quote_price
+from isolation import StrategyOutcome, cancelled, run_isolated
+from telemetry import metrics
 import config
 
 # Configure logging
+os.makedirs(os.path.dirname(os.path.abspath(config.LOG_FILE)), exist_ok=True)
 logging.basicConfig(
     level=getattr(logging, config.LOG_LEVEL),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -39,12 +54,63 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
 class StrategyExecutor:
     """Main strategy execution engine."""
     
-    def __init__(self):
-        self.alpaca = client
+    def __init__(
+        self,
+        client=None,
+        publish: bool = True,
+        journal=None,
+        ledger: PositionLedger = None,
+        indicator_state: IndicatorStateStore = None,
+        quote_cache: QuoteCache = None,
+        order_manager: OrderManager = None
+    ):
+        """
+        Args:
+            client: Alpaca client (defaults to the live client; replay passes a ReplayAlpacaClient)
+            publish: Publish prices and snapshots to the dashboard API
+            journal: Signal journal (defaults to the global journal when publishing
+                and config.SIGNAL_JOURNAL_ENABLED)
+            ledger: Position ledger (defaults to the trading.db ledger when publishing,
+                otherwise an in-memory one)
+            indicator_state: Persistent indicator state advanced between runs (defaults
+                to the config.INDICATOR_STATE_PATH store when publishing and
+                config.INDICATOR_STATE_ENABLED; otherwise indicators come from the
+                shared feature cache)
+            quote_cache: Latest-quote cache (defaults to the shared on-disk cache
+                when publishing and config.QUOTE_CACHE_ENABLED, otherwise an
+                in-memory one on the client's clock)
+            order_manager: Concurrent order submission and fill tracking for
+                each run's orders (defaults to one on ``client``)
+        """
+        self.alpaca = client or alpaca_client
+        self.publish = publish
+        if journal is None and publish and config.SIGNAL_JOURNAL_ENABLED:
+            journal = signal_journal
+        self.journal = journal
         self.db_path = os.path.join(os.path.dirname(__file__), '../server/data/trading.db')
+        self.ledger = ledger or PositionLedger(self.alpaca, config.LEDGER_DB_PATH if publish else ':memory:')
+        if indicator_state is None and publish and config.INDICATOR_STATE_ENABLED:
+            indicator_state = IndicatorStateStore()
+        self.indicator_state = indicator_state
+        self.features = FeatureCache(state=indicator_state) if indicator_state is not None else feature_cache
+        if quote_cache is None:
+            if publish and config.QUOTE_CACHE_ENABLED and client is None:
+                quote_cache = shared_quote_cache
+            else:
+                quote_cache = QuoteCache(
+                    lambda symbols: self.alpaca.get_latest_quotes(symbols).get('quotes', {}),
+                    path=':memory:', clock=lambda: self.alpaca.now().timestamp()
+                )
+        self.quote_cache = quote_cache
+        self.order_manager = order_manager or OrderManager(self.alpaca)
+        
+        # Ledger state per strategy, re-read only when its ledger version changes
+        self._equity_states: Dict[int, Tuple[Dict[str, Dict], float]] = {}
+        self._equity_versions: Dict[int, Tuple] = {}
         self.api_base = "https://api.gary-yong.com/api/v1"
         self.api_fallback = "http://localhost:3005/api/v1"
         
@@ -108,20 +174,52 @@ class StrategyExecutor:
                 'breakout_atr_multiple': 1.0,
                 'volume_multiple': 1.5,
                 'stop_atr_multiple': 0.8,
+                'trailing_atr_multiple': 1.2,
                 'max_hold_days': 3,
                 'profit_take_atr_multiple': 1.8
             }
         }
         
+        # Live strategy instances by type, created on first use
+        self._live_strategies = {}
+        self._live_lock = threading.Lock()
+        
+        # Bars and quotes prefetched for the current run (see prefetch_market_data)
+        self.cycle_data: Optional[CycleMarketData] = None
+        
+        # Exit rules of the strategies whose exits are evaluated by the engine,
+        # and this run's exits for all of them (see run_all_strategies)
+        rules = {}
+        for strategy_id, strategy in self.strategies.items():
+            if exit_rules(strategy) is not None:
+                rules[strategy_id] = exit_rules(strategy)
+        self.exit_engine = ExitEngine(rules, self.features)
+        self.cycle_exits: Optional[Dict[int, List[Dict]]] = None
+        
+        # Orders queued during run_all_strategies, then netted and sent together
+        # (placed one at a time otherwise). While the strategies run side by
+        # side, each one's orders are held apart and queued after the run, in
+        # strategy order
+        self.netter: Optional[OrderNetter] = None
+        self._held_orders: Optional[Dict[int, List[Tuple]]] = None
+        
     def _get_sp500_top20(self):
         """Get top 20 S&P 500 stocks by market cap."""
         return ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'META', 'TSLA', 'BRK.B', 
                 'UNH', 'JNJ', 'V', 'XOM', 'WMT', 'JPM', 'PG', 'MA', 'HD', 'CVX', 'ABBV', 'PFE']
     
     def get_historical_data(self, symbols: List[str], days: int = 60) -> Dict[str, pd.DataFrame]:
-        """Fetch historical data for symbols."""
-        end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        """Fetch historical data for symbols (from the prefetched run data when it covers them)."""
+        if self.cycle_data is not None:
+            frames = self.cycle_data.get_bars(symbols, '1Day', days)
+            if frames is not None:
+                for symbol in set(symbols) - set(frames):
+                    logger.warning(f"No data available for {symbol}")
+                return frames
+        
+        now = self.alpaca.now()
+        end_date = now.strftime('%Y-%m-%d')
+        start_date = (now - timedelta(days=days)).strftime('%Y-%m-%d')
         
         try:
             data = self.alpaca.get_historical_bars(
@@ -150,36 +248,25 @@ class StrategyExecutor:
             return {}
     
     def get_latest_prices(self, symbols: List[str]) -> Dict[str, float]:
-        """Get latest prices for symbols."""
+        """Get latest prices (quote midpoints) for symbols."""
         try:
-            quotes = self.alpaca.get_latest_quotes(symbols)
-            prices = {}
-            for symbol in symbols:
-                quote = quotes.get('quotes', {}).get(symbol, {})
-                if quote:
-                    # Use bid-ask midpoint
-                    bid = quote.get('bp', 0)
-                    ask = quote.get('ap', 0)
-                    if bid > 0 and ask > 0:
-                        prices[symbol] = (bid + ask) / 2
-                    else:
-                        prices[symbol] = quote.get('bp', quote.get('ap', 0))
-            return prices
+            quotes = self.cycle_data.get_quotes(symbols) if self.cycle_data is not None else None
+            if quotes is None:
+                quotes = self.quote_cache.get(symbols)
+            return {symbol: quote_price(quote) for symbol, quote in quotes.items() if quote}
         except Exception as e:
             logger.error(f"Error fetching latest prices: {e}")
             return {}
     
     def place_real_order(self, strategy_id: int, symbol: str, side: str, qty: int, price: float, reason: str) -> Tuple[bool, Optional[Dict]]:
         """Place a real Alpaca order with strategy prefix in client_order_id."""
-        import time
-        
         if strategy_id not in self.strategies:
             logger.error(f"Unknown strategy ID: {strategy_id}")
             return False, None
         
         strategy = self.strategies[strategy_id]
         strategy_slug = strategy['slug']
-        client_order_id = f"{strategy_slug}-{symbol}-{int(time.time())}"
+        client_order_id = f"{strategy_slug}-{symbol}-{int(self.alpaca.now().timestamp())}"
         
         try:
             result = self.alpaca.place_order(
@@ -196,6 +283,51 @@ class StrategyExecutor:
             logger.error(f"Order failed for {strategy['name']}: {e}")
             return False, None
     
+    def order_netter(self, place=None) -> OrderNetter:
+        """
+        Order netter crossing strategies' opposing orders in this executor's ledger.
+        
+        Args:
+            place: Sends the orders' residuals (default: place_orders)
+        """
+        return OrderNetter(
+            self.strategies, self.ledger, place or self.place_orders,
+            clock=self.alpaca.now, prices=self.get_latest_prices, enabled=config.ORDER_NETTING_ENABLED
+        )
+    
+    def place_orders(self, orders) -> None:
+        """
+        Send the residuals of a run's (netted) orders concurrently and track
+        them to their fills, setting each order's broker state, error and latency.
+        """
+        now = self.alpaca.now()
+        managed = [
+            ManagedOrder(
+                order.strategy_id, order.symbol, order.side, order.residual,
+                client_order_id(self.strategies[order.strategy_id]['slug'], order.symbol, order.side, now),
+                order.reason, signal_at=order.signal_at
+            )
+            for order in orders
+        ]
+        self.order_manager.execute(managed)
+        for order, result in zip(orders, managed):
+            order.order, order.error, order.latency = result.order, result.error, result.latency()
+    
+    def submit_order(self, strategy_id: int, symbol: str, side: str, qty: int, price: float, reason: str) -> Tuple[bool, Optional[Dict]]:
+        """Place an order, or queue it with the cycle's netter when one is running."""
+        if cancelled():
+            logger.warning(f"{self.strategies[strategy_id]['name']} overran its budget, "
+                           f"dropping {side} {qty} {symbol}")
+            return False, None
+        if self._held_orders is not None:
+            self._held_orders[strategy_id].append((symbol, side, qty, price, reason, time.monotonic()))
+            return True, None
+        if self.netter is not None:
+            self.netter.add(strategy_id, symbol, side, qty, price, reason)
+            return True, None
+        with metrics.stage('orders', 'strategy', self.strategies[strategy_id]['type']):
+            return self.place_real_order(strategy_id, symbol, side, qty, price, reason)
+    
     def get_alpaca_positions_for_strategy(self, strategy_id: int) -> Dict[str, Dict]:
         """Get current Alpaca positions for a specific strategy based on order history."""
         positions, _ = self.get_strategy_state(strategy_id)
@@ -203,11 +335,13 @@ class StrategyExecutor:
 
     def get_strategy_state(self, strategy_id: int):
         """
-        Replay all filled orders chronologically to compute:
-          - open positions  (dict: symbol -> {quantity, avg_cost_basis})
-          - available_cash  (initial_capital ± all cash flows from buys/sells)
+        Open positions and available cash from the strategy's position ledger.
+
+        The ledger is synced from fills since its high-water mark, so this
+        costs O(new orders) rather than replaying the full order history.
 
-        Returns (positions, available_cash).
+        Returns (positions, available_cash), where positions maps
+        symbol -> {quantity, avg_cost_basis, last_buy_time, updated_at}.
 
         No-margin guarantee: available_cash reflects realized gains correctly,
         so future buy sizing can be capped to this value.
@@ -216,49 +350,13 @@ class StrategyExecutor:
             return {}, 0.0
 
         strategy = self.strategies[strategy_id]
-        strategy_slug = strategy['slug']
         initial_capital = float(strategy['initial_capital'])
 
         try:
-            orders = self.alpaca.get_orders_by_client_prefix(strategy_slug, status='filled')
-            # Sort oldest-first so cash flows are applied in the right order
-            orders = sorted(orders, key=lambda o: o.get('filled_at') or o.get('created_at') or '')
-
-            raw = {}        # symbol -> {quantity, total_cost}
-            cash = initial_capital
-
-            for order in orders:
-                symbol     = order.get('symbol')
-                side       = order.get('side')
-                qty        = float(order.get('filled_qty', 0))
-                fill_price = float(order.get('filled_avg_price', 0))
-                cost       = qty * fill_price
-
-                if symbol not in raw:
-                    raw[symbol] = {'quantity': 0, 'total_cost': 0}
-
-                if side == 'buy':
-                    raw[symbol]['quantity']   += qty
-                    raw[symbol]['total_cost'] += cost
-                    cash -= cost
-                elif side == 'sell':
-                    prev_qty = raw[symbol]['quantity']
-                    if prev_qty > 0:
-                        # Reduce cost basis proportionally for the shares sold
-                        raw[symbol]['total_cost'] -= (qty / prev_qty) * raw[symbol]['total_cost']
-                    raw[symbol]['quantity'] -= qty
-                    cash += cost
-
-            # Build final positions (filter fully-sold symbols)
-            positions = {}
-            for symbol, pos in raw.items():
-                if pos['quantity'] > 0.001:
-                    avg_cost = pos['total_cost'] / pos['quantity']
-                    positions[symbol] = {
-                        'quantity':      pos['quantity'],
-                        'avg_cost_basis': avg_cost,
-                        'updated_at':    datetime.now().isoformat()
-                    }
+            positions, cash = self.ledger.get_state(strategy_id, strategy['slug'], initial_capital)
+            updated_at = self.alpaca.now().isoformat()
+            for pos in positions.values():
+                pos['updated_at'] = updated_at
 
             logger.debug(f"Strategy {strategy['name']}: available_cash=${cash:.2f}, "
                          f"positions={list(positions.keys())}")
@@ -268,6 +366,55 @@ class StrategyExecutor:
             logger.error(f"Error computing strategy state for {strategy_id}: {e}")
             return {}, initial_capital
     
+    def get_strategy_equity(self) -> Dict[int, Dict[str, float]]:
+        """
+        Each strategy's equity: ledger cash plus positions marked to market.
+        
+        All ledgers are synced from one order query, and only strategies whose
+        ledger version changed since the previous call are re-read, whoever
+        applied the fills (this sync, get_strategy_state, netting or another
+        process). The union of held symbols is marked with one batched quote
+        request; a symbol without a quote is carried at its cost basis.
+        
+        Returns:
+            strategy_id -> {value, cash, positions_value, unrealized_pl, positions}
+        """
+        self.ledger.sync_all({
+            strategy_id: (strategy['slug'], float(strategy['initial_capital']))
+            for strategy_id, strategy in self.strategies.items()
+        })
+        versions = self.ledger.versions()
+        for strategy_id, strategy in self.strategies.items():
+            version = versions.get(strategy_id)
+            if strategy_id not in self._equity_states or self._equity_versions.get(strategy_id) != version:
+                self._equity_states[strategy_id] = self.ledger.get_state(
+                    strategy_id, strategy['slug'], float(strategy['initial_capital']), sync=False
+                )
+                self._equity_versions[strategy_id] = version
+        
+        held = sorted({symbol for positions, _ in self._equity_states.values() for symbol in positions})
+        prices = self.get_latest_prices(held) if held else {}
+        missing = [symbol for symbol in held if not prices.get(symbol)]
+        if missing:
+            logger.warning(f"No quotes for {missing}; marking at cost basis")
+        
+        equity = {}
+        for strategy_id, (positions, cash) in self._equity_states.items():
+            positions_value = 0.0
+            cost = 0.0
+            for symbol, pos in positions.items():
+                price = prices.get(symbol) or pos['avg_cost_basis']
+                positions_value += pos['quantity'] * price
+                cost += pos['quantity'] * pos['avg_cost_basis']
+            equity[strategy_id] = {
+                'value': cash + positions_value,
+                'cash': cash,
+                'positions_value': positions_value,
+                'unrealized_pl': positions_value - cost,
+                'positions': len(positions)
+            }
+        return equity
+    
     def execute_trade_via_api(self, strategy_id: int, symbol: str, side: str, quantity: int, price: float, reason: str) -> bool:
         """Execute a virtual trade via the trading server API."""
         trade_data = {
@@ -282,7 +429,7 @@ class StrategyExecutor:
         for api_url in [self.api_base, self.api_fallback]:
             try:
                 url = f"{api_url}/dashboard/strategies/{strategy_id}/trade"
-                response = requests.post(url, json=trade_data, timeout=10)
+                response = http_session.post(url, json=trade_data, timeout=10)
                 if response.status_code == 200:
                     logger.info(f"Trade executed via API: {side} {quantity} {symbol} @ ${price:.2f}")
                     return True
@@ -378,7 +525,7 @@ class StrategyExecutor:
         for api_url in [self.api_base, self.api_fallback]:
             try:
                 url = f"{api_url}/dashboard/strategies/{strategy_id}/update-prices"
-                response = requests.post(url, json={"prices": prices}, timeout=10)
+                response = http_session.post(url, json={"prices": prices}, timeout=10)
                 if response.status_code == 200:
                     return True
             except requests.exceptions.RequestException:
@@ -390,7 +537,7 @@ class StrategyExecutor:
         for api_url in [self.api_base, self.api_fallback]:
             try:
                 url = f"{api_url}/dashboard/strategies/{strategy_id}/snapshot"
-                response = requests.post(url, timeout=10)
+                response = http_session.post(url, timeout=10)
                 if response.status_code == 200:
                     return True
             except requests.exceptions.RequestException:
@@ -401,444 +548,88 @@ class StrategyExecutor:
         """Get current positions for a strategy from Alpaca."""
         return self.get_alpaca_positions_for_strategy(strategy_id)
     
-    def momentum_hunter_signals(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
-        """
-        Refined momentum logic:
-        Buy only when trend, relative strength, and MACD expansion all align.
-        Sell faster when momentum fades instead of waiting for a full breakdown.
-        """
-        signals = []
-        cfg = next(s for s in self.strategies.values() if s['type'] == 'momentum_hunter')
-        
-        for symbol, df in data.items():
-            if len(df) < 50:
-                continue
-            
-            try:
-                df['ema20'] = ta.trend.EMAIndicator(df['close'], window=20).ema_indicator()
-                df['ema50'] = ta.trend.EMAIndicator(df['close'], window=50).ema_indicator()
-                df['rsi'] = ta.momentum.RSIIndicator(df['close'], window=14).rsi()
-                macd = ta.trend.MACD(df['close'])
-                df['macd_histogram'] = macd.macd_diff()
-                df['macd_hist_prev'] = df['macd_histogram'].shift(1)
-                
-                latest = df.iloc[-1]
-                price = latest['close']
-                ema20 = latest['ema20']
-                ema50 = latest['ema50']
-                rsi = latest['rsi']
-                macd_hist = latest['macd_histogram']
-                macd_hist_prev = latest['macd_hist_prev']
-                
-                if any(pd.isna(v) for v in [ema20, ema50, rsi, macd_hist, macd_hist_prev]):
-                    continue
-                
-                trend_strength = (price / ema20) - 1
-                ema_stack = ema20 > ema50
-                macd_expanding = macd_hist > macd_hist_prev > 0
-                
-                if (
-                    price > ema20 > ema50 and
-                    ema_stack and
-                    rsi >= cfg['buy_rsi_min'] and
-                    trend_strength >= cfg['min_trend_strength'] and
-                    macd_hist >= cfg['min_macd_hist_pct'] * price and
-                    macd_expanding
-                ):
-                    reason = (
-                        f"Momentum buy: {symbol} trend confirmed, price ${price:.2f} above EMA20 ${ema20:.2f} and EMA50 ${ema50:.2f}, "
-                        f"RSI {rsi:.1f}, MACD histogram expanding"
-                    )
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'buy',
-                        'price': price,
-                        'reason': reason,
-                        'confidence': min(1.0, 0.45 + trend_strength * 10 + max(0, rsi - cfg['buy_rsi_min']) / 25)
-                    })
-                elif price < ema20 or rsi <= cfg['sell_rsi_floor'] or macd_hist < 0:
-                    reasons = []
-                    if price < ema20:
-                        reasons.append(f"price ${price:.2f} < EMA20 ${ema20:.2f}")
-                    if rsi <= cfg['sell_rsi_floor']:
-                        reasons.append(f"RSI {rsi:.1f} <= {cfg['sell_rsi_floor']}")
-                    if macd_hist < 0:
-                        reasons.append("MACD histogram turned negative")
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'sell',
-                        'price': price,
-                        'reason': f"Momentum sell: {'; '.join(reasons)}",
-                        'confidence': 0.82
-                    })
-            except Exception as e:
-                logger.warning(f"Error calculating momentum signals for {symbol}: {e}")
-                continue
+    def _live_strategy(self, strategy_type: str):
+        """Live strategy instance for a strategy type, configured from self.strategies."""
+        with self._live_lock:
+            if strategy_type not in self._live_strategies:
+                cfg = next(s for s in self.strategies.values() if s['type'] == strategy_type)
+                strategy = create_strategy(f"live_{strategy_type}", cfg)
+                strategy.features = self.features
+                self._live_strategies[strategy_type] = strategy
+            return self._live_strategies[strategy_type]
+    
+    def run_live_strategy(self, strategy_type: str, data: Dict[str, pd.DataFrame]) -> List[Dict]:
+        """Run a live strategy over the universe and return executor signal dicts."""
+        try:
+            signals = self._live_strategy(strategy_type).generate_universe_signals(data)
+        except Exception as e:
+            logger.warning(f"Error calculating {strategy_type} signals: {e}")
+            return []
         
-        return signals
+        return [{
+            'symbol': signal.symbol,
+            'action': signal.action,
+            'price': signal.price,
+            'reason': signal.reason,
+            'confidence': signal.confidence
+        } for signal in signals]
+    
+    def momentum_hunter_signals(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
+        """Momentum Hunter signals (see strategies.live.MomentumHunterStrategy)."""
+        return self.run_live_strategy('momentum_hunter', data)
     
     def mean_reversion_signals(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
-        """
-        Refined mean reversion logic:
-        Only buy real washouts, and exit earlier once the bounce materializes.
-        """
-        signals = []
-        cfg = next(s for s in self.strategies.values() if s['type'] == 'mean_reversion')
-        
-        for symbol, df in data.items():
-            if len(df) < 30:
-                continue
-            
-            try:
-                bb = ta.volatility.BollingerBands(df['close'], window=20, window_dev=2)
-                df['bb_lower'] = bb.bollinger_lband()
-                df['bb_upper'] = bb.bollinger_hband()
-                df['sma20'] = ta.trend.SMAIndicator(df['close'], window=20).sma_indicator()
-                df['rsi'] = ta.momentum.RSIIndicator(df['close'], window=14).rsi()
-                df['close_std'] = df['close'].rolling(window=20).std()
-                df['z_score'] = (df['close'] - df['sma20']) / df['close_std']
-                
-                latest = df.iloc[-1]
-                price = latest['close']
-                bb_lower = latest['bb_lower']
-                bb_upper = latest['bb_upper']
-                sma20 = latest['sma20']
-                z_score = latest['z_score']
-                rsi = latest['rsi']
-                
-                if any(pd.isna(v) for v in [bb_lower, bb_upper, sma20, z_score, rsi]):
-                    continue
-                
-                if price < bb_lower and z_score <= cfg['buy_zscore_threshold'] and rsi <= cfg['buy_rsi_max']:
-                    reason = (
-                        f"Mean reversion buy: {symbol} washed out, price ${price:.2f} below lower band ${bb_lower:.2f}, "
-                        f"Z-score {z_score:.2f}, RSI {rsi:.1f}"
-                    )
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'buy',
-                        'price': price,
-                        'reason': reason,
-                        'confidence': min(1.0, 0.5 + abs(z_score) / 5)
-                    })
-                elif z_score >= cfg['exit_zscore_threshold'] or price >= sma20 or price >= bb_upper:
-                    reasons = []
-                    if z_score >= cfg['exit_zscore_threshold']:
-                        reasons.append(f"Z-score recovered to {z_score:.2f}")
-                    if price >= sma20:
-                        reasons.append(f"price ${price:.2f} >= SMA20 ${sma20:.2f}")
-                    if price >= bb_upper:
-                        reasons.append(f"price ${price:.2f} >= BB upper ${bb_upper:.2f}")
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'sell',
-                        'price': price,
-                        'reason': f"Mean reversion sell: {'; '.join(reasons)}",
-                        'confidence': 0.8
-                    })
-            except Exception as e:
-                logger.warning(f"Error calculating mean reversion signals for {symbol}: {e}")
-                continue
-        
-        return signals
+        """Mean Reversion signals (see strategies.live.LiveMeanReversionStrategy)."""
+        return self.run_live_strategy('mean_reversion', data)
     
     def sector_rotator_signals(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
-        """
-        Refined sector rotation logic:
-        Concentrate only in the strongest 2 sectors and avoid weak/noisy leadership.
-        """
-        signals = []
-        cfg = next(s for s in self.strategies.values() if s['type'] == 'sector_rotator')
-        
-        sector_momentum = {}
-        for symbol, df in data.items():
-            if len(df) < 25:
-                continue
-            
-            try:
-                current_price = df['close'].iloc[-1]
-                price_20_days_ago = df['close'].iloc[-21]
-                momentum = (current_price - price_20_days_ago) / price_20_days_ago * 100
-                sector_momentum[symbol] = {
-                    'momentum': momentum,
-                    'price': current_price
-                }
-            except Exception as e:
-                logger.warning(f"Error calculating momentum for {symbol}: {e}")
-                continue
-        
-        if not sector_momentum:
-            return signals
-        
-        sorted_sectors = sorted(sector_momentum.items(), key=lambda x: x[1]['momentum'], reverse=True)
-        leaders = [s[0] for s in sorted_sectors[:cfg['top_n']] if s[1]['momentum'] >= cfg['min_momentum_pct']]
-        leader_cutoff = sorted_sectors[cfg['top_n'] - 1][1]['momentum'] if len(sorted_sectors) >= cfg['top_n'] else None
-        
-        for symbol, data_point in sector_momentum.items():
-            price = data_point['price']
-            momentum = data_point['momentum']
-            
-            if symbol in leaders:
-                reason = f"Sector rotation buy: {symbol} leadership confirmed at {momentum:.2f}% 20-day momentum"
-                signals.append({
-                    'symbol': symbol,
-                    'action': 'buy',
-                    'price': price,
-                    'reason': reason,
-                    'confidence': min(0.95, 0.55 + max(momentum, 0) / 15)
-                })
-            else:
-                weak_vs_leaders = leader_cutoff is not None and momentum < (leader_cutoff - cfg['rebalance_buffer_pct'])
-                if momentum < cfg['min_momentum_pct'] or weak_vs_leaders:
-                    reason = f"Sector rotation sell: {symbol} momentum {momentum:.2f}% no longer strong enough"
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'sell',
-                        'price': price,
-                        'reason': reason,
-                        'confidence': 0.72
-                    })
-        
-        return signals
+        """Sector Rotator signals (see strategies.live.SectorRotatorStrategy)."""
+        return self.run_live_strategy('sector_rotator', data)
     
     def value_dividends_signals(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
-        """
-        Refined value logic:
-        Be pickier on entries and recycle capital earlier instead of waiting for huge moves.
-        """
-        signals = []
-        cfg = next(s for s in self.strategies.values() if s['type'] == 'value_dividends')
-        
-        for symbol, df in data.items():
-            if len(df) < 20:
-                continue
-            
-            try:
-                df['rsi'] = ta.momentum.RSIIndicator(df['close'], window=14).rsi()
-                df['sma20'] = ta.trend.SMAIndicator(df['close'], window=20).sma_indicator()
-                
-                latest = df.iloc[-1]
-                price = latest['close']
-                rsi = latest['rsi']
-                sma20 = latest['sma20']
-                
-                if pd.isna(rsi) or pd.isna(sma20):
-                    continue
-                
-                if rsi <= cfg['buy_rsi_max'] and price <= sma20 * 0.99:
-                    reason = f"Value buy: {symbol} oversold with RSI {rsi:.1f} and price below 20-day mean"
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'buy',
-                        'price': price,
-                        'reason': reason,
-                        'confidence': min(1.0, max(0.0, (cfg['buy_rsi_max'] - rsi) / 20 + 0.35))
-                    })
-                elif rsi >= cfg['sell_rsi_min']:
-                    reason = f"Value sell: {symbol} RSI {rsi:.1f} >= {cfg['sell_rsi_min']}"
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'sell',
-                        'price': price,
-                        'reason': reason,
-                        'confidence': min(1.0, 0.6 + (rsi - cfg['sell_rsi_min']) / 20)
-                    })
-            except Exception as e:
-                logger.warning(f"Error calculating value signals for {symbol}: {e}")
-                continue
-        
-        return signals
+        """Value & Dividends signals (see strategies.live.ValueDividendsStrategy)."""
+        return self.run_live_strategy('value_dividends', data)
     
     def volatility_breakout_signals(self, data: Dict[str, pd.DataFrame]) -> List[Dict]:
+        """Volatility Breakout entry signals (see strategies.live.LiveVolatilityBreakoutStrategy)."""
+        return self.run_live_strategy('volatility_breakout', data)
+    
+    
+    def check_exits(self, positions: Dict[int, Dict[str, Dict]]) -> Dict[int, List[Dict]]:
         """
-        Refined breakout logic:
-        Trigger sooner on valid expansion, but use tighter exits and fewer simultaneous names.
-        """
-        signals = []
-        cfg = next(s for s in self.strategies.values() if s['type'] == 'volatility_breakout')
+        Exit signals for several strategies' open positions in one pass.
         
-        for symbol, df in data.items():
-            if len(df) < 20:
-                continue
-            
-            try:
-                df['atr'] = ta.volatility.AverageTrueRange(df['high'], df['low'], df['close'], window=14).average_true_range()
-                df['avg_volume'] = df['volume'].rolling(window=20).mean()
-                df['sma20'] = ta.trend.SMAIndicator(df['close'], window=20).sma_indicator()
-                
-                latest = df.iloc[-1]
-                previous = df.iloc[-2]
-                
-                price = latest['close']
-                yesterday_high = previous['high']
-                atr = latest['atr']
-                volume = latest['volume']
-                avg_volume = latest['avg_volume']
-                sma20 = latest['sma20']
-                
-                if any(pd.isna(v) for v in [atr, avg_volume, sma20]):
-                    continue
-                
-                breakout_threshold = yesterday_high + (cfg['breakout_atr_multiple'] * atr)
-                volume_threshold = cfg['volume_multiple'] * avg_volume
-                
-                if price > breakout_threshold and volume > volume_threshold and price > sma20:
-                    reason = (
-                        f"Volatility buy: {symbol} cleared breakout ${breakout_threshold:.2f}, volume {volume:,.0f} > {volume_threshold:,.0f}, "
-                        f"trend above SMA20"
-                    )
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'buy',
-                        'price': price,
-                        'reason': reason,
-                        'confidence': min(1.0, 0.45 + (price / breakout_threshold - 1) * 12)
-                    })
-            except Exception as e:
-                logger.warning(f"Error calculating breakout signals for {symbol}: {e}")
-                continue
+        Bars (and, when publishing, quotes) are read once for the union of
+        held symbols, and the exit rules are evaluated for every position
+        together (see exits.ExitEngine).
         
-        return signals
-    
-    def check_volatility_breakout_exits(self, strategy_id: int, positions: Dict[str, Dict]) -> List[Dict]:
-        """Check tighter exit conditions for volatility breakout positions."""
-        signals = []
-        cfg = next(s for s in self.strategies.values() if s['type'] == 'volatility_breakout')
+        Args:
+            positions: strategy_id -> open positions (as from get_strategy_state)
         
-        if not positions:
-            return signals
+        Returns:
+            strategy_id -> sell signals
+        """
+        symbols = sorted({symbol for held in positions.values() for symbol in held})
+        if not symbols:
+            return {strategy_id: [] for strategy_id in positions}
         
-        symbols = list(positions.keys())
         data = self.get_historical_data(symbols, days=30)
-        
-        for symbol in symbols:
-            if symbol not in data:
-                continue
-            
-            try:
-                df = data[symbol]
-                if len(df) < 15:
-                    continue
-                
-                df['atr'] = ta.volatility.AverageTrueRange(df['high'], df['low'], df['close'], window=14).average_true_range()
-                df['ema10'] = ta.trend.EMAIndicator(df['close'], window=10).ema_indicator()
-                
-                latest = df.iloc[-1]
-                price = latest['close']
-                atr = latest['atr']
-                ema10 = latest['ema10']
-                
-                if pd.isna(atr) or pd.isna(ema10):
-                    continue
-                
-                position = positions[symbol]
-                entry_price = position['avg_cost_basis']
-                opened_at = position.get('last_buy_time') or position.get('updated_at')
-                days_held = (pd.Timestamp.now(tz='UTC') - pd.Timestamp(opened_at, tz='UTC')).days if opened_at else 0
-                stop_loss_price = entry_price - (cfg['stop_atr_multiple'] * atr)
-                profit_take_price = entry_price + (cfg['profit_take_atr_multiple'] * atr)
-                
-                if price < stop_loss_price:
-                    reason = f"Volatility exit: {symbol} ${price:.2f} < stop ${stop_loss_price:.2f}"
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'sell',
-                        'price': price,
-                        'reason': reason,
-                        'confidence': 0.92
-                    })
-                elif price >= profit_take_price:
-                    reason = f"Volatility exit: {symbol} hit profit target ${profit_take_price:.2f}"
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'sell',
-                        'price': price,
-                        'reason': reason,
-                        'confidence': 0.86
-                    })
-                elif price < ema10:
-                    reason = f"Volatility exit: {symbol} lost short-term trend, price ${price:.2f} < EMA10 ${ema10:.2f}"
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'sell',
-                        'price': price,
-                        'reason': reason,
-                        'confidence': 0.8
-                    })
-                elif days_held >= cfg['max_hold_days']:
-                    reason = f"Volatility exit: {symbol} max hold period ({cfg['max_hold_days']} days) reached"
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'sell', 
-                        'price': price,
-                        'reason': reason,
-                        'confidence': 0.78
-                    })
-            except Exception as e:
-                logger.warning(f"Error checking volatility exit for {symbol}: {e}")
-                continue
-        
-        return signals
+        prices = self.get_latest_prices(symbols) if self.publish else None
+        return self.exit_engine.evaluate(positions, data, self.alpaca.now(), prices)
+    
+    def check_volatility_breakout_exits(self, strategy_id: int, positions: Dict[str, Dict]) -> List[Dict]:
+        """Check tighter exit conditions for volatility breakout positions."""
+        return self.check_exits({strategy_id: positions})[strategy_id]
     
     def check_value_dividend_exits(self, strategy_id: int, positions: Dict[str, Dict]) -> List[Dict]:
         """Check exit conditions for value dividend positions."""
-        signals = []
-        cfg = next(s for s in self.strategies.values() if s['type'] == 'value_dividends')
-        
-        if not positions:
-            return signals
-        
-        symbols = list(positions.keys())
-        data = self.get_historical_data(symbols, days=30)
-        
-        for symbol in symbols:
-            if symbol not in data:
-                continue
-            
-            try:
-                position = positions[symbol]
-                entry_price = position['avg_cost_basis']
-                
-                df = data[symbol]
-                df['rsi'] = ta.momentum.RSIIndicator(df['close'], window=14).rsi()
-                latest = df.iloc[-1]
-                current_price = latest['close']
-                rsi = latest['rsi']
-                profit_pct = (current_price - entry_price) / entry_price
-                loss_pct = (current_price - entry_price) / entry_price
-                
-                if profit_pct >= cfg['profit_take_pct']:
-                    reason = f"Value exit: {symbol} up {profit_pct * 100:.1f}% from entry"
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'sell',
-                        'price': current_price,
-                        'reason': reason,
-                        'confidence': 0.82
-                    })
-                elif loss_pct <= -cfg['stop_loss_pct']:
-                    reason = f"Value exit: {symbol} down {abs(loss_pct) * 100:.1f}% from entry"
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'sell',
-                        'price': current_price,
-                        'reason': reason,
-                        'confidence': 0.88
-                    })
-                elif not pd.isna(rsi) and rsi >= cfg['sell_rsi_min']:
-                    reason = f"Value exit: {symbol} RSI {rsi:.1f} reached exit zone"
-                    signals.append({
-                        'symbol': symbol,
-                        'action': 'sell',
-                        'price': current_price,
-                        'reason': reason,
-                        'confidence': 0.76
-                    })
-            except Exception as e:
-                logger.warning(f"Error checking value exit for {symbol}: {e}")
-                continue
-        
-        return signals
+        return self.check_exits({strategy_id: positions})[strategy_id]
+    
+    def _exit_signals(self, strategy_id: int, positions: Dict[str, Dict]) -> List[Dict]:
+        """A strategy's exits from this run's batched evaluation, or evaluated on their own."""
+        if self.cycle_exits is not None and strategy_id in self.cycle_exits:
+            return self.cycle_exits[strategy_id]
+        return self.check_exits({strategy_id: positions})[strategy_id]
     
     def execute_strategy(self, strategy_id: int) -> Dict[str, Any]:
         """Execute a single strategy."""
@@ -848,104 +639,119 @@ class StrategyExecutor:
         
         strategy = self.strategies[strategy_id]
         logger.info(f"Executing strategy: {strategy['name']}")
+        stage_label = strategy['type']
         
         try:
             # Get current positions and available cash (no-margin enforcement)
-            positions, available_cash = self.get_strategy_state(strategy_id)
+            with metrics.stage('positions', 'strategy', stage_label):
+                positions, available_cash = self.get_strategy_state(strategy_id)
             logger.info(f"Strategy {strategy['name']}: available_cash=${available_cash:.2f}")
             
             # Get historical data for the universe
-            data = self.get_historical_data(strategy['universe'], days=60)
+            with metrics.stage('data', 'strategy', stage_label):
+                data = self.get_historical_data(strategy['universe'], days=60)
             if not data:
                 logger.warning(f"No data available for strategy {strategy_id}")
                 return {'success': False, 'error': 'No market data available'}
             
             # Generate signals based on strategy type
-            signals = []
-            if strategy['type'] == 'momentum_hunter':
-                signals = self.momentum_hunter_signals(data)
-            elif strategy['type'] == 'mean_reversion':
-                signals = self.mean_reversion_signals(data)
-            elif strategy['type'] == 'sector_rotator':
-                signals = self.sector_rotator_signals(data)
-            elif strategy['type'] == 'value_dividends':
-                signals = self.value_dividends_signals(data)
-                # Also check exit conditions for existing positions
-                signals.extend(self.check_value_dividend_exits(strategy_id, positions))
-            elif strategy['type'] == 'volatility_breakout':
-                signals = self.volatility_breakout_signals(data)
-                # Also check exit conditions for existing positions
-                signals.extend(self.check_volatility_breakout_exits(strategy_id, positions))
+            with metrics.stage('signals', 'strategy', stage_label):
+                signals = []
+                if strategy['type'] == 'momentum_hunter':
+                    signals = self.momentum_hunter_signals(data)
+                elif strategy['type'] == 'mean_reversion':
+                    signals = self.mean_reversion_signals(data)
+                elif strategy['type'] == 'sector_rotator':
+                    signals = self.sector_rotator_signals(data)
+                elif strategy['type'] == 'value_dividends':
+                    signals = self.value_dividends_signals(data)
+                    # Also check exit conditions for existing positions
+                    signals.extend(self._exit_signals(strategy_id, positions))
+                elif strategy['type'] == 'volatility_breakout':
+                    signals = self.volatility_breakout_signals(data)
+                    # Also check exit conditions for existing positions
+                    signals.extend(self._exit_signals(strategy_id, positions))
+            metrics.counter(
+                'trading_signals_total', 'Signals generated', ['executor', 'strategy']
+            ).inc(len(signals), executor='strategy', strategy=stage_label)
+            
+            if self.journal is not None:
+                self.journal.record(signals, source='strategy_executor', strategy=strategy['name'],
+                                    timestamp=self.alpaca.now())
+                self.journal.flush()
             
             # Execute trades
             executed_trades = 0
-            for signal in signals:
-                symbol = signal['symbol']
-                action = signal['action']
-                price = signal['price']
-                reason = signal['reason']
+            with metrics.stage('risk', 'strategy', stage_label):
+                for signal in signals:
+                    symbol = signal['symbol']
+                    action = signal['action']
+                    price = signal['price']
+                    reason = signal['reason']
                 
-                # Position sizing logic for real Alpaca orders
-                if action == 'buy':
-                    if symbol in positions:
-                        logger.info(f"Already holding {symbol}, skipping buy signal")
-                        continue
+                    # Position sizing logic for real Alpaca orders
+                    if action == 'buy':
+                        if symbol in positions:
+                            logger.info(f"Already holding {symbol}, skipping buy signal")
+                            continue
 
-                    if len(positions) >= strategy['max_positions']:
-                        logger.info(f"Max positions ({strategy['max_positions']}) reached, skipping {symbol}")
-                        continue
+                        if len(positions) >= strategy['max_positions']:
+                            logger.info(f"Max positions ({strategy['max_positions']}) reached, skipping {symbol}")
+                            continue
 
-                    # ── No-margin enforcement ──────────────────────────────────
-                    # available_cash is computed from the full order history above,
-                    # so realized gains from previous sells are included correctly.
-                    if available_cash <= 0:
-                        logger.info(f"{strategy['name']}: no cash left (${available_cash:.2f}), skipping {symbol}")
-                        continue
+                        # ── No-margin enforcement ──────────────────────────────────
+                        # available_cash is computed from the full order history above,
+                        # so realized gains from previous sells are included correctly.
+                        if available_cash <= 0:
+                            logger.info(f"{strategy['name']}: no cash left (${available_cash:.2f}), skipping {symbol}")
+                            continue
 
-                    # Target equal-weight allocation: capital / max_positions
-                    # (e.g. $20K / 6 positions = $3,333 each, not a flat 25%)
-                    # This ensures ALL positions filled = exactly 100% invested,
-                    # never more. Cap to available_cash as final safety.
-                    target_size = strategy['initial_capital'] / strategy['max_positions']
-                    max_position_value = min(target_size, available_cash)
-                    quantity = max(1, int(max_position_value / price))
+                        # Target equal-weight allocation: capital / max_positions
+                        # (e.g. $20K / 6 positions = $3,333 each, not a flat 25%)
+                        # This ensures ALL positions filled = exactly 100% invested,
+                        # never more. Cap to available_cash as final safety.
+                        target_size = strategy['initial_capital'] / strategy['max_positions']
+                        max_position_value = min(target_size, available_cash)
+                        quantity = max(1, int(max_position_value / price))
 
-                    # Final whole-share guard — never exceed available cash
-                    if quantity * price > available_cash:
-                        quantity = int(available_cash / price)
-                    if quantity <= 0:
-                        logger.info(f"{strategy['name']}: insufficient cash for {symbol} @ ${price:.2f}, skipping")
-                        continue
-                    # ──────────────────────────────────────────────────────────
+                        # Final whole-share guard — never exceed available cash
+                        if quantity * price > available_cash:
+                            quantity = int(available_cash / price)
+                        if quantity <= 0:
+                            logger.info(f"{strategy['name']}: insufficient cash for {symbol} @ ${price:.2f}, skipping")
+                            continue
+                        # ──────────────────────────────────────────────────────────
 
-                    success, order_result = self.place_real_order(strategy_id, symbol, 'buy', quantity, price, reason)
-                    if success:
-                        positions[symbol] = {'quantity': quantity, 'avg_cost_basis': price}
-                        available_cash -= quantity * price  # keep running cash in sync
-                        executed_trades += 1
+                        success, order_result = self.submit_order(strategy_id, symbol, 'buy', quantity, price, reason)
+                        if success:
+                            positions[symbol] = {'quantity': quantity, 'avg_cost_basis': price}
+                            available_cash -= quantity * price  # keep running cash in sync
+                            executed_trades += 1
                 
-                elif action == 'sell':
-                    if symbol not in positions:
-                        logger.info(f"No position in {symbol}, skipping sell signal")
-                        continue
+                    elif action == 'sell':
+                        if symbol not in positions:
+                            logger.info(f"No position in {symbol}, skipping sell signal")
+                            continue
                     
-                    quantity = int(positions[symbol]['quantity'])
-                    if quantity <= 0:
-                        continue
+                        quantity = int(positions[symbol]['quantity'])
+                        if quantity <= 0:
+                            continue
                     
-                    success, order_result = self.place_real_order(strategy_id, symbol, 'sell', quantity, price, reason)
-                    if success:
-                        del positions[symbol]
-                        executed_trades += 1
+                        success, order_result = self.submit_order(strategy_id, symbol, 'sell', quantity, price, reason)
+                        if success:
+                            del positions[symbol]
+                            executed_trades += 1
             
-            # Update position prices
-            if positions:
-                latest_prices = self.get_latest_prices(list(positions.keys()))
-                if latest_prices:
-                    self.update_prices_via_api(strategy_id, latest_prices)
-            
-            # Take snapshot
-            self.take_snapshot_via_api(strategy_id)
+            if self.publish:
+                with metrics.stage('snapshot', 'strategy', stage_label):
+                    # Update position prices
+                    if positions:
+                        latest_prices = self.get_latest_prices(list(positions.keys()))
+                        if latest_prices:
+                            self.update_prices_via_api(strategy_id, latest_prices)
+                    
+                    # Take snapshot
+                    self.take_snapshot_via_api(strategy_id)
             
             logger.info(f"Strategy {strategy['name']} executed: {executed_trades} trades, {len(positions)} positions")
             
@@ -961,25 +767,173 @@ class StrategyExecutor:
             logger.error(f"Error executing strategy {strategy_id}: {e}")
             return {'success': False, 'error': str(e)}
     
+    def prefetch_market_data(self) -> Optional[CycleMarketData]:
+        """
+        Fetch the bars and quotes every strategy will read this run, concurrently.
+        
+        Covers each universe (60 days of daily bars, which also covers the
+        30-day exit checks) plus open positions, so execute_strategy() reads
+        from memory instead of issuing its own requests.
+        """
+        if not config.MARKET_DATA_PREFETCH:
+            return None
+        
+        cycle_data = CycleMarketData(
+            lambda symbols, timeframe, days: fetch_alpaca_bars(self.alpaca, symbols, timeframe, days),
+            self.quote_cache.get,
+            now=self.alpaca.now()
+        )
+        for strategy_id, strategy in self.strategies.items():
+            positions, _ = self.ledger.get_state(
+                strategy_id, strategy['slug'], strategy['initial_capital'], sync=False
+            )
+            symbols = list(strategy['universe']) + list(positions)
+            cycle_data.request_bars(symbols, '1Day', 60)
+            if self.publish:
+                cycle_data.request_quotes(symbols)
+        
+        try:
+            cycle_data.prefetch()
+        except Exception as e:
+            logger.error(f"Market data prefetch failed, fetching per strategy: {e}")
+            return None
+        
+        self.cycle_data = cycle_data
+        return cycle_data
+    
+    def save_indicator_state(self) -> None:
+        """Persist the indicator state advanced this run (no-op without a state store)."""
+        if self.indicator_state is None:
+            return
+        try:
+            self.indicator_state.save()
+        except Exception as e:
+            logger.warning(f"Could not save indicator state: {e}")
+    
+    def check_all_exits(self) -> Optional[Dict[int, List[Dict]]]:
+        """
+        Exits for every engine-evaluated strategy's open positions, in one pass.
+        
+        Returns None when the positions or bars cannot be read, leaving each
+        strategy to evaluate its own exits.
+        """
+        try:
+            strategies = {strategy_id: self.strategies[strategy_id] for strategy_id in self.exit_engine.rules}
+            self.ledger.sync_all({
+                strategy_id: (strategy['slug'], strategy['initial_capital'])
+                for strategy_id, strategy in strategies.items()
+            })
+            positions = {}
+            for strategy_id, strategy in strategies.items():
+                positions[strategy_id], _ = self.ledger.get_state(
+                    strategy_id, strategy['slug'], strategy['initial_capital'], sync=False
+                )
+            return self.check_exits(positions)
+        except Exception as e:
+            logger.error(f"Batched exit check failed, checking per strategy: {e}")
+            return None
+    
+    def execute_isolated(self) -> Dict[int, StrategyOutcome]:
+        """
+        Execute every strategy side by side, each on its own thread.
+
+        A strategy that fails or is still running its budget
+        (config.STRATEGY_TIMEOUT, or its STRATEGY_TIMEOUTS entry) after it
+        started is reported and skipped instead of delaying the others.
+        With a netter running, the finished strategies' orders are queued
+        with it afterwards, in strategy order, so the cycle nets the same
+        orders as a sequential run; the orders of a strategy that was skipped
+        or failed are dropped.
+
+        Returns:
+            strategy_id -> StrategyOutcome (value: execute_strategy's result)
+        """
+        if self.netter is not None:
+            self._held_orders = {strategy_id: [] for strategy_id in self.strategies}
+        try:
+            outcomes = run_isolated(
+                {strategy_id: partial(self.execute_strategy, strategy_id) for strategy_id in self.strategies},
+                timeout=config.STRATEGY_TIMEOUT, timeouts=config.STRATEGY_TIMEOUTS,
+                max_workers=config.STRATEGY_MAX_WORKERS
+            )
+        finally:
+            held, self._held_orders = self._held_orders or {}, None
+
+        for strategy_id, outcome in outcomes.items():
+            if outcome.status == 'timed_out':
+                metrics.counter(
+                    'trading_strategy_timeouts_total', 'Strategies skipped for overrunning their budget',
+                    ['executor', 'strategy']
+                ).inc(executor='strategy', strategy=self.strategies[strategy_id]['type'])
+            if not (outcome.success and outcome.value.get('success')):
+                continue
+            for symbol, side, qty, price, reason, signal_at in held.get(strategy_id, []):
+                self.netter.add(strategy_id, symbol, side, qty, price, reason, signal_at=signal_at)
+        return outcomes
+    
     def run_all_strategies(self) -> Dict[str, Any]:
-        """Execute all 5 strategies."""
+        """Execute all 5 strategies (one cycle, timed into the telemetry registry)."""
+        with metrics.stage('cycle', 'strategy'):
+            result = self._run_all_strategies()
+        metrics.cache_hit_ratio('quotes', self.quote_cache.get_stats()['hit_rate'])
+        metrics.cache_hit_ratio('features', self.features.get_stats()['hit_rate'])
+        if self.publish:
+            metrics.export()
+        return result
+    
+    def _run_all_strategies(self) -> Dict[str, Any]:
         logger.info("Starting execution of all 5 trading strategies")
         
         results = {}
         total_trades = 0
         
-        for strategy_id in self.strategies.keys():
-            result = self.execute_strategy(strategy_id)
-            results[f"strategy_{strategy_id}"] = result
-            if result.get('success'):
-                total_trades += result.get('trades_executed', 0)
+        with metrics.stage('prefetch', 'strategy'):
+            self.prefetch_market_data()
+        self.netter = self.order_netter()
+        netting = None
+        try:
+            with metrics.stage('exits', 'strategy'):
+                self.cycle_exits = self.check_all_exits()
+            for strategy_id, outcome in self.execute_isolated().items():
+                result = outcome.value if outcome.success else {
+                    'success': False, 'error': outcome.error, 'timed_out': outcome.status == 'timed_out'
+                }
+                results[f"strategy_{strategy_id}"] = result
+                if result.get('success'):
+                    total_trades += result.get('trades_executed', 0)
+            
+            if self.netter is not None:
+                # Net the cycle's orders across strategies and send the residuals concurrently
+                with metrics.stage('orders', 'strategy'):
+                    orders = self.netter.submit()
+                for order in orders:
+                    if not order.success:
+                        result = results.get(f"strategy_{order.strategy_id}", {})
+                        if 'trades_executed' in result:
+                            result['trades_executed'] -= 1
+                        total_trades -= 1
+                netting = self.netter.get_stats()
+                logger.info(f"Order netting: {netting['intended']} orders, {netting['crossed_shares']} shares "
+                            f"crossed internally, {netting['submitted']} sent to the broker")
+                latency = self.order_manager.get_stats()['signal_to_fill']
+                if latency['max'] is not None:
+                    logger.info(f"Signal to fill: median {latency['median']:.2f}s, max {latency['max']:.2f}s")
+        finally:
+            self.cycle_data = None
+            self.cycle_exits = None
+            self.netter = None
+            self._held_orders = None
+            self.save_indicator_state()
         
         logger.info(f"All strategies executed. Total trades: {total_trades}")
+        quote_stats = self.quote_cache.get_stats()
+        logger.info(f"Quote cache: {quote_stats['requests']} requests, hit rate {quote_stats['hit_rate']:.0%}")
         
         return {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self.alpaca.now().isoformat(),
             'total_trades': total_trades,
-            'strategies': results
+            'strategies': results,
+            'netting': netting
         }
     
     def initialize_strategies(self) -> Dict[str, Any]:
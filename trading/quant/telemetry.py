@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Telemetry — hot-path counters and latency histograms in Prometheus text format.
+
+Both executors time each stage of a cycle into ``trading_stage_seconds``
+(labelled by executor, stage and strategy): market-clock check, positions,
+prefetch, universe selection, data fetch, signal generation, risk checks,
+order submission and snapshot write, plus the whole cycle. An exception
+escaping a stage counts in ``trading_stage_errors_total``. AlpacaClient
+counts every HTTP request by endpoint and status
+(``alpaca_requests_total``) and times it (``alpaca_request_seconds``), so
+API error rates are the non-2xx share of that counter. Cache hit ratios
+(quotes, features, universes) are set as gauges at the end of each cycle.
+
+The stdlib-only registry renders the text exposition format. It is
+served on a local ``/metrics`` endpoint (config.METRICS_PORT) and/or
+rewritten atomically to a textfile for node_exporter's textfile collector
+after every cycle (config.METRICS_TEXTFILE).
+
+Usage:
+    python3 telemetry.py                                    # stage budget from config.METRICS_TEXTFILE
+    python3 telemetry.py --source http://127.0.0.1:9108/metrics
+    python3 telemetry.py --source data/metrics.prom --raw   # the exposition text itself
+"""
+
+import argparse
+import math
+import os
+import re
+import sys
+import threading
+import time
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Histogram buckets (seconds) spanning single requests to a whole 5-minute cycle
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Tuple[str, str] = None) -> str:
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class _Metric:
+    """A named metric family with fixed label names."""
+
+    kind = ''
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """(metric name, rendered labels, value) for every series."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.help)}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield self.name, _labels(self.labelnames, key), value
+
+
+class Gauge(_Metric):
+    """Latest value per label set."""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels) -> Optional[float]:
+        with self._lock:
+            return self._values.get(self._key(labels))
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield self.name, _labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    """Bucketed observations (cumulative buckets, sum and count) per label set."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = None):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        self._series: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def totals(self) -> Dict[Tuple[str, ...], Tuple[int, float]]:
+        """(count, sum) per label set."""
+        with self._lock:
+            return {key: (series['count'], series['sum']) for key, series in self._series.items()}
+
+    def samples(self):
+        with self._lock:
+            series = sorted((key, dict(s, buckets=list(s['buckets']))) for key, s in self._series.items())
+        for key, s in series:
+            for bound, count in zip(self.buckets, s['buckets']):
+                yield f"{self.name}_bucket", _labels(self.labelnames, key, ('le', _format_value(bound))), count
+            yield f"{self.name}_bucket", _labels(self.labelnames, key, ('le', '+Inf')), s['count']
+            yield f"{self.name}_sum", _labels(self.labelnames, key), s['sum']
+            yield f"{self.name}_count", _labels(self.labelnames, key), s['count']
+
+
+class Registry:
+    """Metric families by name, rendered together in the text exposition format."""
+
+    def __init__(self, clock=time.perf_counter):
+        """
+        Args:
+            clock: Seconds for stage timings (default: time.perf_counter)
+        """
+        self.clock = clock
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a different {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """The counter called ``name``, registered on first use."""
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """The gauge called ``name``, registered on first use."""
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = None) -> Histogram:
+        """The histogram called ``name``, registered on first use."""
+        return self._get(Histogram, name, help, labelnames, buckets=buckets)
+
+    @contextmanager
+    def stage(self, stage: str, executor: str, strategy: str = '') -> Iterator[None]:
+        """Time a cycle stage; an exception escaping it is counted and re-raised."""
+        started = self.clock()
+        try:
+            yield
+        except Exception:
+            self.counter(
+                'trading_stage_errors_total', 'Exceptions escaping a cycle stage',
+                ['executor', 'stage', 'strategy']
+            ).inc(executor=executor, stage=stage, strategy=strategy)
+            raise
+        finally:
+            self.histogram(
+                'trading_stage_seconds', 'Seconds spent in each stage of an execution cycle',
+                ['executor', 'stage', 'strategy']
+            ).observe(self.clock() - started, executor=executor, stage=stage, strategy=strategy)
+
+    def cache_hit_ratio(self, cache: str, ratio: float) -> None:
+        """Record a cache's hit ratio (hits over lookups, 0-1)."""
+        self.gauge('trading_cache_hit_ratio', 'Cache hits over lookups', ['cache']).set(ratio, cache=cache)
+
+    def stage_budget(self) -> List[Dict[str, Any]]:
+        """Calls and seconds per executor and stage (all strategies together), most time first."""
+        histogram = self._metrics.get('trading_stage_seconds')
+        if histogram is None:
+            return []
+        budget = defaultdict(lambda: [0, 0.0])
+        for (executor, stage, _), (count, seconds) in histogram.totals().items():
+            budget[(executor, stage)][0] += count
+            budget[(executor, stage)][1] += seconds
+        return _budget_rows(budget)
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = [line for metric in metrics for line in metric.render()]
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def write_textfile(self, path: str) -> None:
+        """Replace ``path`` with the current metrics (atomically, for the textfile collector)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as f:
+            f.write(self.render())
+        os.replace(temporary, path)
+
+    def export(self, path: str = None) -> bool:
+        """
+        Write the textfile at ``path`` (default: config.METRICS_TEXTFILE; nothing
+        when unset). Failures are logged, never raised into the cycle.
+        """
+        path = path or config.METRICS_TEXTFILE
+        if not path:
+            return False
+        try:
+            self.write_textfile(path)
+            return True
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {path}: {e}")
+            return False
+
+    def serve(self, port: int = None, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """Serve GET /metrics on a background thread (port default: config.METRICS_PORT)."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                content = registry.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                logger.debug(f"metrics: {format % args}")
+
+        server = ThreadingHTTPServer((host, config.METRICS_PORT if port is None else port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+        logger.info(f"Serving metrics at http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+def _budget_rows(budget: Dict[Tuple[str, str], List]) -> List[Dict[str, Any]]:
+    rows = [
+        {'executor': executor, 'stage': stage, 'calls': count, 'seconds': round(seconds, 3),
+         'mean_seconds': round(seconds / count, 4) if count else None}
+        for (executor, stage), (count, seconds) in budget.items()
+    ]
+    return sorted(rows, key=lambda row: row['seconds'], reverse=True)
+
+
+_SAMPLE = re.compile(r'^trading_stage_seconds_(sum|count)\{([^}]*)\}\s+(\S+)$')
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_stage_budget(text: str) -> List[Dict[str, Any]]:
+    """stage_budget() rows from exposition text (a scrape or a textfile)."""
+    budget = defaultdict(lambda: [0, 0.0])
+    for line in text.splitlines():
+        match = _SAMPLE.match(line)
+        if not match:
+            continue
+        labels = dict(_LABEL.findall(match.group(2)))
+        key = (labels.get('executor', ''), labels.get('stage', ''))
+        budget[key][0 if match.group(1) == 'count' else 1] += float(match.group(3))
+    return _budget_rows({key: [int(count), seconds] for key, (count, seconds) in budget.items()})
+
+
+# Global registry instance
+metrics = Registry()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Where the execution cycle spends its time')
+    parser.add_argument('--source', default=None,
+                        help='Metrics URL or textfile (default: config.METRICS_TEXTFILE)')
+    parser.add_argument('--raw', action='store_true', help='Print the exposition text')
+    args = parser.parse_args()
+
+    source = args.source or config.METRICS_TEXTFILE
+    if not source:
+        parser.error('no --source and METRICS_TEXTFILE is not set')
+    if source.startswith(('http://', 'https://')):
+        import requests
+        response = requests.get(source, timeout=10)
+        response.raise_for_status()
+        text = response.text
+    else:
+        with open(source) as f:
+            text = f.read()
+
+    if args.raw:
+        print(text, end='')
+        return
+    print(f"{'executor':<10} {'stage':<12} {'calls':>8} {'seconds':>10} {'mean':>9}")
+    for row in parse_stage_budget(text):
+        mean = '' if row['mean_seconds'] is None else f"{row['mean_seconds']:.4f}"
+        print(f"{row['executor']:<10} {row['stage']:<12} {row['calls']:>8} {row['seconds']:>10.3f} {mean:>9}")
+
+
+if __name__ == '__main__':
+    main()
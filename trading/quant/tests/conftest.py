@@ -0,0 +1,64 @@
+"""Shared test helpers."""
+
+from typing import Dict, List, Tuple
+
+import pandas as pd
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_store import BarStore
+
+
+def synthetic_dates(periods: int, start: str = '2024-01-01', tz: str = 'America/New_York') -> pd.DatetimeIndex:
+    """Weekday bar stamps at midnight in ``tz`` (New York, like Alpaca), as UTC."""
+    return pd.date_range(start, periods=periods, freq='B').tz_localize(tz).tz_convert('UTC')
+
+
+def synthetic_store(
+    symbols: List[str],
+    periods: int = 120,
+    seed: int = 0,
+    tz: str = 'America/New_York',
+    start: str = '2024-01-01',
+    path: str = ':memory:',
+    base: float = 50.0,
+    drift: float = 0.0005,
+    volatility: float = 0.02,
+    spread: float = 0.01,
+    volume_range: Tuple[float, float] = (1000000, 5000000),
+    drifts: Dict[str, float] = None,
+    volumes: Dict[str, float] = None
+) -> BarStore:
+    """
+    Bar store of random-walk daily bars.
+
+    Each symbol draws its closes, then (unless it has a fixed entry in
+    ``volumes``) its volumes, from one RandomState, so a given seed always
+    produces the same bars.
+
+    Args:
+        drifts: Per-symbol drift overriding ``drift``
+        volumes: Per-symbol constant volume instead of a draw from ``volume_range``
+    """
+    rng = np.random.RandomState(seed)
+    dates = synthetic_dates(periods, start, tz)
+    drifts = drifts or {}
+    volumes = volumes or {}
+    store = BarStore(str(path))
+    for symbol in symbols:
+        close = base * np.cumprod(1 + rng.normal(drifts.get(symbol, drift), volatility, periods))
+        if symbol in volumes:
+            volume = np.full(periods, float(volumes[symbol]))
+        else:
+            volume = rng.randint(*volume_range, periods).astype(float)
+        store.write_frame(symbol, pd.DataFrame({
+            'open': close,
+            'high': close * (1 + spread),
+            'low': close * (1 - spread),
+            'close': close,
+            'volume': volume,
+        }, index=dates))
+    return store
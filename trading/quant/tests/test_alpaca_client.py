@@ -0,0 +1,136 @@
+"""Tests for the AlpacaClient HTTP layer: pagination, rate limiting and retries."""
+
+import json
+import pytest
+import requests
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import alpaca_client
+from alpaca_client import AlpacaClient, TokenBucket
+
+
+def _response(status, body=None, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode() if body is not None else b''
+    response.headers.update(headers or {})
+    return response
+
+
+class _ScriptedSession:
+    """Session that replays queued responses (or exceptions) and records requests."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        result = self.responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def _client(responses):
+    return AlpacaClient(session=_ScriptedSession(responses), rate_limiter=TokenBucket(10000))
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Skip backoff sleeps."""
+    monkeypatch.setattr(alpaca_client.time, 'sleep', lambda seconds: None)
+
+
+class TestRetries:
+    """Idempotent calls retry; order placement only when it was not processed."""
+
+    def test_get_retries_server_errors(self):
+        """Test a GET survives a 503 and a dropped connection."""
+        client = _client([
+            _response(503),
+            requests.exceptions.ConnectionError('reset'),
+            _response(200, {'cash': '100'})
+        ])
+
+        assert client.get_account() == {'cash': '100'}
+        assert client.stats['retries'] == 2
+        assert 'APCA-API-KEY-ID' in client.session.calls[0][2]['headers']
+
+    def test_post_not_retried_after_server_error(self):
+        """Test an order that may have been accepted is never resubmitted."""
+        client = _client([_response(500), _response(200, {'id': 'dup'})])
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.place_order('AAPL', 1, 'buy', client_order_id='mh-AAPL-1')
+        assert len(client.session.calls) == 1
+
+    def test_post_retried_after_rate_limit(self):
+        """Test a 429 is retried for any method, honouring Retry-After."""
+        client = _client([_response(429, headers={'Retry-After': '0'}), _response(200, {'id': 'o1'})])
+
+        assert client.place_order('AAPL', 1, 'buy')['id'] == 'o1'
+        assert len(client.session.calls) == 2
+
+    def test_gives_up_after_max_retries(self):
+        """Test retries stop at ALPACA_MAX_RETRIES."""
+        client = _client([_response(503)] * 5)
+        client.max_retries = 4
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get_clock()
+        assert len(client.session.calls) == 5
+
+
+class TestPagination:
+    """List endpoints return complete results."""
+
+    def test_bars_follow_next_page_token(self):
+        """Test multi-symbol bars are merged across pages."""
+        client = _client([
+            _response(200, {'bars': {'AAA': [{'t': 1}, {'t': 2}]}, 'next_page_token': 'p2'}),
+            _response(200, {'bars': {'AAA': [{'t': 3}], 'BBB': [{'t': 1}]}, 'next_page_token': 'p3'}),
+            _response(200, {'bars': None, 'next_page_token': None}),
+        ])
+
+        result = client.get_historical_bars(['AAA', 'BBB'], limit=2)
+
+        assert [bar['t'] for bar in result['bars']['AAA']] == [1, 2, 3]
+        assert len(result['bars']['BBB']) == 1
+        assert result['next_page_token'] is None
+        assert client.session.calls[1][2]['params']['page_token'] == 'p2'
+
+    def test_orders_above_page_limit(self):
+        """Test get_orders with limit > 500 walks pages newest first."""
+        def order(i):
+            return {'id': str(i), 'submitted_at': f'2024-01-01T00:{i // 60:02d}:{i % 60:02d}Z'}
+
+        newest_first = [order(i) for i in range(699, -1, -1)]
+        client = _client([
+            _response(200, newest_first[:500]),
+            _response(200, newest_first[499:999]),
+        ])
+
+        orders = client.get_orders(limit=600)
+
+        assert [o['id'] for o in orders] == [str(i) for i in range(699, 99, -1)]
+        assert client.session.calls[1][2]['params']['until'].startswith('2024-01-01T00:03:20')
+
+
+class TestTokenBucket:
+    """Tests for the rate limiter."""
+
+    def test_waits_once_burst_is_spent(self, monkeypatch):
+        """Test requests beyond the burst wait for the refill rate."""
+        clock = [0.0]
+        monkeypatch.setattr(alpaca_client.time, 'monotonic', lambda: clock[0])
+        bucket = TokenBucket(rate=120, per=60.0, capacity=2)
+
+        waits = [bucket.acquire() for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.5)
+        assert waits[3] == pytest.approx(1.0)
@@ -0,0 +1,88 @@
+"""Tests for the equity snapshot store."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from equity_store import EquitySnapshotStore
+
+
+def _entry(when, value, trades=None):
+    entry = {'timestamp': when.isoformat(), 'snapshots': {'momentum-hunter': {'value': value}}}
+    if trades:
+        entry['trades'] = trades
+    return entry
+
+
+class TestEquitySnapshotStore:
+    """Tests for appending, range queries and tiered retention."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.store = EquitySnapshotStore(':memory:', raw_days=1, hourly_days=3)
+        self.start = datetime(2026, 3, 2, 14, 0, tzinfo=timezone.utc)
+
+    def test_append_and_range_query(self):
+        """Test snapshots come back in order and filtered by time range."""
+        for i in range(12):
+            self.store.append(_entry(self.start + timedelta(minutes=5 * i), 100 + i))
+
+        assert [e['snapshots']['momentum-hunter']['value'] for e in self.store.query()] == list(range(100, 112))
+        window = self.store.query(self.start + timedelta(minutes=10), self.start + timedelta(minutes=20))
+        assert [e['snapshots']['momentum-hunter']['value'] for e in window] == [102, 103, 104]
+        assert self.store.query(limit=2)[-1] == self.store.latest()
+        assert self.store.latest()['snapshots']['momentum-hunter']['value'] == 111
+
+    def test_old_snapshots_downsampled(self):
+        """Test raw snapshots age into hourly then daily, keeping each bucket's last value and all trades."""
+        for i in range(24):  # two hours of 5-minute snapshots, a trade in the first hour
+            trades = [{'symbol': 'AAPL', 'side': 'buy'}] if i == 3 else None
+            self.store.append(_entry(self.start + timedelta(minutes=5 * i), 100 + i, trades))
+
+        self.store.compact(self.start + timedelta(days=1, hours=3))
+        hourly = self.store.query()
+        assert self.store.get_info()['1h']['snapshots'] == 2
+        assert [e['snapshots']['momentum-hunter']['value'] for e in hourly] == [111, 123]
+        assert hourly[0]['trades'] == [{'symbol': 'AAPL', 'side': 'buy'}]
+
+        self.store.compact(self.start + timedelta(days=4, hours=3))
+        daily = self.store.query()
+        assert list(self.store.get_info()) == ['1d']
+        assert len(daily) == 1
+        assert daily[0]['snapshots']['momentum-hunter']['value'] == 123
+        assert daily[0]['trades'] == [{'symbol': 'AAPL', 'side': 'buy'}]
+
+    def test_recent_snapshots_stay_raw(self):
+        """Test appending compacts only what has aged out, leaving the open bucket raw."""
+        self.store.append(_entry(self.start, 100))
+        self.store.append(_entry(self.start + timedelta(minutes=5), 101))
+        self.store.append(_entry(self.start + timedelta(days=1, minutes=2), 102))
+
+        info = self.store.get_info()
+        assert info['raw']['snapshots'] == 3
+
+        self.store.append(_entry(self.start + timedelta(days=1, hours=1), 103))
+        info = self.store.get_info()
+        assert info['1h']['snapshots'] == 1
+        assert info['raw']['snapshots'] == 2
+
+    def test_import_legacy_json(self, tmp_path):
+        """Test a legacy equity_snapshots.json list is imported."""
+        path = tmp_path / 'equity_snapshots.json'
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        path.write_text(json.dumps([_entry(now - timedelta(minutes=5 * i), i) for i in range(3)]))
+
+        assert self.store.import_json(str(path)) == 3
+        assert [e['snapshots']['momentum-hunter']['value'] for e in self.store.query()] == [2, 1, 0]
+
+    def test_survives_reopen(self, tmp_path):
+        """Test snapshots written to a file database are there after reopening."""
+        path = str(tmp_path / 'equity.db')
+        store = EquitySnapshotStore(path)
+        store.append(_entry(self.start, 100))
+        store.close()
+
+        assert EquitySnapshotStore(path).latest()['snapshots']['momentum-hunter']['value'] == 100
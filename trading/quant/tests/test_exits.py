@@ -0,0 +1,174 @@
+"""Tests for the batched exit engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exits import ExitEngine, ExitRules, exit_rules
+from utils.features import FeatureCache
+
+NOW = pd.Timestamp('2024-02-12 20:00', tz='UTC')
+
+# Closes with an RSI near 50 (a flat series has no losses, so RSI 100)
+CHOPPY = [100.0, 101.0] * 15
+
+
+def _bars(close, spread=1.0):
+    close = np.asarray(close, dtype=float)
+    dates = pd.date_range(end='2024-02-12', periods=len(close), freq='B').tz_localize('UTC')
+    return pd.DataFrame({
+        'open': close, 'high': close + spread, 'low': close - spread, 'close': close, 'volume': 1e6
+    }, index=dates)
+
+
+def _position(entry, opened='2024-02-10T15:00:00Z'):
+    return {'quantity': 10, 'avg_cost_basis': entry, 'last_buy_time': opened}
+
+
+VOLATILITY = ExitRules('Volatility exit', stop_atr_multiple=0.8, profit_take_atr_multiple=1.8,
+                       trend_ema=10, max_hold_days=3)
+VALUE = ExitRules('Value exit', profit_take_pct=0.08, stop_loss_pct=0.06, exit_rsi_min=67)
+
+
+class TestExitEngine:
+    """Tests for vectorized exit rules across strategies."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.features = FeatureCache()
+        self.engine = ExitEngine({4: VALUE, 5: VOLATILITY}, self.features)
+
+    def test_volatility_rules(self):
+        """Test stop, profit target, trend and max-hold exits (ATR is 2 on these bars)."""
+        flat = _bars([100.0] * 30)
+        data = {'STOP': flat, 'TAKE': flat, 'HOLD': flat, 'KEEP': flat,
+                'TREND': _bars([100.0] * 29 + [98.5])}
+        positions = {5: {
+            'STOP': _position(102.0),
+            'TAKE': _position(96.0),
+            'TREND': _position(99.0),
+            'HOLD': _position(100.0, opened='2024-02-08T15:00:00Z'),
+            'KEEP': _position(100.0),
+        }}
+
+        exits = self.engine.evaluate(positions, data, NOW)[5]
+        reasons = {signal['symbol']: signal['reason'] for signal in exits}
+        assert reasons['STOP'].startswith('Volatility exit: STOP $100.00 < stop $')
+        assert reasons['TAKE'].startswith('Volatility exit: TAKE hit profit target $')
+        assert 'lost short-term trend' in reasons['TREND']
+        assert reasons['HOLD'] == 'Volatility exit: HOLD max hold period (3 days) reached'
+        assert 'KEEP' not in reasons
+        assert {signal['action'] for signal in exits} == {'sell'}
+        assert [signal['confidence'] for signal in exits] == [0.92, 0.86, 0.8, 0.78]
+
+    def test_value_rules(self):
+        """Test percentage stop and target, and the RSI exit."""
+        data = {
+            'UP': _bars(CHOPPY),
+            'DOWN': _bars(CHOPPY),
+            'HOT': _bars(np.linspace(90, 100, 30)),
+            'KEEP': _bars(CHOPPY),
+        }
+        positions = {4: {
+            'UP': _position(93.0), 'DOWN': _position(108.0), 'HOT': _position(99.0), 'KEEP': _position(100.0)
+        }}
+
+        reasons = {s['symbol']: s['reason'] for s in self.engine.evaluate(positions, data, NOW)[4]}
+        assert reasons == {
+            'UP': 'Value exit: UP up 8.6% from entry',
+            'DOWN': 'Value exit: DOWN down 6.5% from entry',
+            'HOT': 'Value exit: HOT RSI 100.0 reached exit zone',
+        }
+
+    def test_quotes_override_last_close(self):
+        """Test a current quote price is used instead of the last close."""
+        data = {'AAPL': _bars(CHOPPY)}
+        positions = {4: {'AAPL': _position(100.0)}}
+
+        assert self.engine.evaluate(positions, data, NOW)[4] == []
+        exits = self.engine.evaluate(positions, data, NOW, prices={'AAPL': 90.0})[4]
+        assert exits[0]['price'] == 90.0
+
+    def test_shared_symbol_features_computed_once(self):
+        """Test a symbol held by two strategies is looked up once per indicator."""
+        data = {'TSLA': _bars(CHOPPY)}
+        positions = {4: {'TSLA': _position(100.0)}, 5: {'TSLA': _position(100.0)}, 1: {'TSLA': _position(50.0)}}
+
+        exits = self.engine.evaluate(positions, data, NOW)
+        assert exits == {4: [], 5: [], 1: []}
+        assert self.features.get_stats()['misses'] == 3  # ATR, RSI, EMA10
+
+    def test_short_history_not_evaluated(self):
+        """Test positions whose ATR is not available yet are skipped."""
+        data = {'NEW': _bars([100.0] * 10)}
+        assert self.engine.evaluate({5: {'NEW': _position(150.0)}}, data, NOW) == {5: []}
+
+    def test_trailing_stop(self):
+        """Test the ATR trailing stop trails the highest close since entry."""
+        engine = ExitEngine({5: ExitRules('Volatility exit', trailing_atr_multiple=1.5)}, self.features)
+        close = [100.0] * 25 + [104.0, 110.0, 108.0, 107.0, 105.0]
+        data = {'RUN': _bars(close)}
+
+        entered_before_peak = {'RUN': _position(100.0, opened='2024-02-05T15:00:00Z')}
+        exits = engine.evaluate({5: entered_before_peak}, data, NOW)[5]
+        assert exits[0]['confidence'] == 0.9
+        assert 'trailing stop' in exits[0]['reason']
+
+        entered_after_peak = {'RUN': _position(107.0, opened='2024-02-09T15:00:00Z')}
+        assert engine.evaluate({5: entered_after_peak}, data, NOW)[5] == []
+
+
+    def test_volatility_breakout_config_trails(self):
+        """Test the volatility-breakout config turns on the ATR trailing stop; value has none."""
+        from bar_store import BarStore
+        from replay import ReplayAlpacaClient
+        from strategy_executor import StrategyExecutor
+
+        strategies = StrategyExecutor(client=ReplayAlpacaClient(BarStore(':memory:')), publish=False).strategies
+        engine = ExitEngine({4: exit_rules(strategies[4]), 5: exit_rules(strategies[5])}, self.features)
+        data = {'RUN': _bars([100.0] * 25 + [104.0, 110.0, 108.0, 107.0, 105.0])}
+        position = {'RUN': _position(100.0, opened='2024-02-05T15:00:00Z')}
+
+        exits = engine.evaluate({4: position, 5: position}, data, NOW)
+        assert exits[4] == []
+        assert 'trailing stop' in exits[5][0]['reason']
+
+
+class TestExecutorExits:
+    """The executor evaluates every strategy's exits from one bars fetch."""
+
+    def test_one_fetch_for_all_strategies(self):
+        """Test exits for two strategies read bars for the union of held symbols once."""
+        from bar_store import BarStore
+        from replay import ReplayAlpacaClient
+        from strategy_executor import StrategyExecutor
+
+        dates = pd.date_range('2024-01-01', periods=30, freq='B').tz_localize('UTC')
+        store = BarStore(':memory:')
+        for symbol in ('KO', 'TSLA'):
+            close = np.array([100.0, 101.0] * 15)
+            store.write_frame(symbol, pd.DataFrame({
+                'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 1e6
+            }, index=dates))
+        client = ReplayAlpacaClient(store)
+        client.set_time(dates[-1] + pd.Timedelta(hours=15))
+        client.place_order('KO', 10, 'buy', client_order_id='vd-KO-1')
+        client.place_order('TSLA', 10, 'buy', client_order_id='vb-TSLA-1')
+        client.set_time(dates[-1] + pd.Timedelta(days=4, hours=15))
+
+        executor = StrategyExecutor(client=client, publish=False)
+        fetches = []
+        get_historical_data = executor.get_historical_data
+        executor.get_historical_data = lambda symbols, days=60: fetches.append(sorted(symbols)) or \
+            get_historical_data(symbols, days)
+
+        exits = executor.check_all_exits()
+        assert fetches == [['KO', 'TSLA']]
+        assert exits[4] == []
+        assert [signal['reason'] for signal in exits[5]] == [
+            'Volatility exit: TSLA max hold period (3 days) reached'
+        ]
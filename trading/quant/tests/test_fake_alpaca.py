@@ -0,0 +1,136 @@
+"""Tests for the fake Alpaca server and the executor load test."""
+
+import time
+
+import pytest
+import requests
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alpaca_client import TokenBucket
+from fake_alpaca import (
+    FakeAlpacaClient, FakeAlpacaServer, load_test_trading_executor, synthetic_store, synthetic_symbols
+)
+from replay import ReplayAlpacaClient
+
+NOW = '2026-03-02T15:00:00Z'  # 10:00 ET, Monday
+
+
+def _broker(symbols=('SPY', 'AAA', 'BBB')):
+    broker = ReplayAlpacaClient(synthetic_store(list(symbols), NOW, sessions=30, intraday_sessions=2))
+    broker.set_time(NOW)
+    return broker
+
+
+class TestFakeAlpacaServer:
+    """Tests for the HTTP stand-in, through AlpacaClient's real request path."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.broker = _broker()
+        self.server = FakeAlpacaServer(self.broker).start()
+        self.client = FakeAlpacaClient(self.server, rate_limiter=TokenBucket(10000))
+        self.client.max_retries = 0
+
+    def teardown_method(self):
+        self.server.stop()
+
+    def test_market_data_matches_broker(self):
+        """Test bars (across pages), quotes and the clock are the broker's, over HTTP."""
+        paged = self.client.get_historical_bars(['AAA', 'BBB'], '5Min', start='2026-02-27', end='2026-03-02', limit=50)
+        direct = self.broker.get_historical_bars(['AAA', 'BBB'], '5Min', start='2026-02-27', end='2026-03-02')
+
+        assert paged == direct
+        assert len(paged['bars']['AAA']) == 78 + 6  # Friday's session and Monday's bars closed by 10:00
+        assert self.client.get_latest_quotes(['AAA']) == self.broker.get_latest_quotes(['AAA'])
+        assert self.client.is_market_open()
+        assert self.client.now() == self.broker.now()
+
+    def test_orders_and_account(self):
+        """Test orders fill on the broker and show in orders, positions and the account."""
+        order = self.client.place_order('AAA', 10, 'buy', client_order_id='mh-AAA-1')
+
+        assert order['status'] == 'filled'
+        assert self.client.get_order(order['id'])['client_order_id'] == 'mh-AAA-1'
+        assert [o['id'] for o in self.client.get_orders(status='closed')] == [order['id']]
+        assert self.client.get_orders(status='open') == []
+        assert float(self.client.get_position('AAA')['qty']) == 10
+        assert self.client.get_position('BBB') is None
+        assert float(self.client.get_account()['cash']) == pytest.approx(
+            100000 - 10 * float(order['filled_avg_price'])
+        )
+
+        with pytest.raises(requests.exceptions.HTTPError) as error:
+            self.client.place_order('AAA', 1, 'buy', client_order_id='mh-AAA-1')
+        assert error.value.response.status_code == 422
+
+    def test_fill_delay(self):
+        """Test orders are reported accepted, unfilled, until the fill delay has passed."""
+        self.server.fill_delay = 0.2
+        order = self.client.place_order('AAA', 5, 'buy')
+
+        assert (order['status'], order['filled_qty']) == ('accepted', '0')
+        assert [o['id'] for o in self.client.get_orders(status='open')] == [order['id']]
+
+        time.sleep(0.25)
+        assert self.client.get_order(order['id'])['status'] == 'filled'
+        assert self.client.get_orders(status='open') == []
+
+    def test_injected_errors(self):
+        """Test injected 503s and 429s are answered without processing the request."""
+        self.server.error_rate = 1.0
+        with pytest.raises(requests.exceptions.RequestException):
+            self.client.place_order('AAA', 5, 'buy')
+
+        self.server.error_rate, self.server.throttle_rate = 0.0, 1.0
+        with pytest.raises(requests.exceptions.RequestException):
+            self.client.get_account()
+
+        assert self.broker.orders == []
+        stats = self.server.get_stats()
+        assert (stats['injected_errors'], stats['throttled']) == (1, 1)
+        assert stats['endpoints'] == {'GET /v2/account': 1, 'POST /v2/orders': 1}
+
+    def test_rate_limit_and_retry(self):
+        """Test requests over the server's limit get 429, and throttled requests are retried."""
+        self.server.rate_limit = 2
+        self.client.get_clock()
+        self.client.get_clock()
+        with pytest.raises(requests.exceptions.RequestException):
+            self.client.get_clock()
+        assert self.server.get_stats()['throttled'] == 1
+
+        self.server.rate_limit = None
+        self.server.throttle_rate = 0.5
+        self.client.max_retries = 20
+        self.client._backoff = lambda attempt, response=None: 0.0
+        assert self.client.get_account()['status'] == 'ACTIVE'
+
+    def test_latency(self):
+        """Test the configured latency is added to each response."""
+        self.server.latency = 0.05
+        started = time.perf_counter()
+        self.client.get_clock()
+        assert time.perf_counter() - started >= 0.05
+
+
+class TestLoadTest:
+    """The load test drives TradingExecutor cycles against the fake server."""
+
+    def test_cycles_run_every_strategy(self):
+        """Test every copied strategy runs each cycle and throughput is reported."""
+        pytest.importorskip('yfinance')
+
+        result = load_test_trading_executor(strategies=12, symbols=60, cycles=2, rate_limit=100000)
+
+        assert result['strategies'] == 12
+        assert [cycle['strategies_run'] for cycle in result['cycles']] == [12, 12]
+        assert all(cycle['requests'] > 0 for cycle in result['cycles'])
+        assert result['strategies_per_second'] > 0
+        assert result['server']['requests'] == result['client']['requests']
+
+    def test_synthetic_symbols(self):
+        """Test the synthetic universe starts with the sector benchmark."""
+        assert synthetic_symbols(3) == ['SPY', 'T001', 'T002']
@@ -0,0 +1,132 @@
+"""Tests for the persistent incremental indicator state."""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicator_state import IndicatorStateStore, bar_interval
+from utils.features import FeatureCache
+from utils.indicators import (
+    calculate_atr, calculate_bollinger_bands, calculate_ema, calculate_macd,
+    calculate_rsi, calculate_sma
+)
+
+FEATURES = {
+    ('ema', 20): lambda d: calculate_ema(d['close'], 20),
+    ('rsi', 14): lambda d: calculate_rsi(d['close'], 14),
+    ('macd', 12, 26, 9): lambda d: calculate_macd(d['close'], 12, 26, 9),
+    ('atr', 14): lambda d: calculate_atr(d['high'], d['low'], d['close'], 14),
+    ('sma', 20): lambda d: calculate_sma(d['close'], 20),
+    ('bollinger', 20, 2): lambda d: calculate_bollinger_bands(d['close'], 20, 2),
+    ('rolling_std', 'close', 20): lambda d: d['close'].rolling(window=20).std(),
+    ('rolling_mean', 'volume', 20): lambda d: d['volume'].rolling(window=20).mean(),
+}
+
+
+def _make_bars(periods=200, seed=3):
+    """Synthetic 5-minute OHLCV bars."""
+    rng = np.random.RandomState(seed)
+    index = pd.date_range('2024-03-04 14:30', periods=periods, freq='5min', tz='UTC')
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.003, periods))
+    return pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.001, periods)),
+        'high': close * 1.002,
+        'low': close * 0.998,
+        'close': close,
+        'volume': rng.randint(10000, 50000, periods).astype(float)
+    }, index=index)
+
+
+def _latest(value, rows=2):
+    """Last ``rows`` values of a Series or dict of Series, as one array."""
+    if isinstance(value, dict):
+        return np.concatenate([value[name].values[-rows:] for name in sorted(value)])
+    return value.values[-rows:]
+
+
+class TestIndicatorStateStore:
+    """Tests for advancing, persisting and rebuilding indicator state."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.bars = _make_bars()
+        self.store = IndicatorStateStore(':memory:')
+
+    def test_incremental_matches_full_recompute(self):
+        """Test advancing bar by bar gives the full-history values of every feature."""
+        for end in range(60, 120):
+            data = self.bars.iloc[:end]
+            for key, compute in FEATURES.items():
+                served = self.store.get('AAA', data, key, compute)
+                np.testing.assert_allclose(_latest(served), _latest(compute(data)), rtol=1e-9)
+
+        assert self.store.stats['rebuilt'] == len(FEATURES)
+        assert self.store.stats['advanced'] == 59 * len(FEATURES)
+
+    def test_state_survives_restart(self, tmp_path):
+        """Test a new store on the same file advances the saved state instead of rebuilding."""
+        path = str(tmp_path / 'state.db')
+        store = IndicatorStateStore(path)
+        store.get('AAA', self.bars.iloc[:100], ('rsi', 14), FEATURES[('rsi', 14)])
+        assert store.save() == 1
+        store.close()
+
+        restarted = IndicatorStateStore(path)
+        data = self.bars.iloc[:103]
+        served = restarted.get('AAA', data, ('rsi', 14), FEATURES[('rsi', 14)])
+
+        assert restarted.stats == {'advanced': 1, 'rebuilt': 0, 'corrected': 0}
+        np.testing.assert_allclose(_latest(served), _latest(calculate_rsi(data['close'], 14)), rtol=1e-9)
+        assert served.iloc[:-restarted.tail - 1].isna().all()
+
+    def test_corrected_bar_triggers_rebuild(self):
+        """Test a revised committed bar rebuilds from the corrected history."""
+        self.store.get('AAA', self.bars.iloc[:100], ('ema', 20), FEATURES[('ema', 20)])
+        corrected = self.bars.iloc[:101].copy()
+        corrected.iloc[98, corrected.columns.get_loc('close')] *= 1.01
+
+        served = self.store.get('AAA', corrected, ('ema', 20), FEATURES[('ema', 20)])
+
+        assert self.store.stats['corrected'] == 1
+        assert self.store.stats['rebuilt'] == 2
+        pd.testing.assert_series_equal(served, calculate_ema(corrected['close'], 20))
+
+    def test_forming_bar_is_not_committed(self):
+        """Test the newest bar is evaluated provisionally, so its later revision is no correction."""
+        data = self.bars.iloc[:100].copy()
+        self.store.get('AAA', data, ('atr', 14), FEATURES[('atr', 14)])
+        data.iloc[-1, data.columns.get_loc('high')] *= 1.01
+
+        served = self.store.get('AAA', data, ('atr', 14), FEATURES[('atr', 14)])
+
+        assert self.store.stats['corrected'] == 0
+        assert served.iloc[-1] == pytest.approx(FEATURES[('atr', 14)](data).iloc[-1], rel=1e-9)
+
+    def test_intervals_are_kept_apart(self):
+        """Test daily and 5-minute bars of one symbol keep separate state."""
+        daily = self.bars.copy()
+        daily.index = pd.date_range('2024-01-02 05:00', periods=len(daily), freq='D', tz='UTC')
+
+        for end in (100, 101):
+            self.store.get('AAA', self.bars.iloc[:end], ('sma', 20), FEATURES[('sma', 20)])
+            self.store.get('AAA', daily.iloc[:end], ('sma', 20), FEATURES[('sma', 20)])
+
+        assert bar_interval(self.bars.index) == '5Min'
+        assert bar_interval(daily.index) == '1Day'
+        assert self.store.stats['rebuilt'] == 2 and self.store.stats['advanced'] == 2
+
+    def test_feature_cache_uses_state(self):
+        """Test FeatureCache routes supported features through the state store."""
+        features = FeatureCache(state=self.store)
+        features.macd('AAA', self.bars.iloc[:100])
+        macd = features.macd('AAA', self.bars.iloc[:101])
+        momentum = features.get('AAA', self.bars.iloc[:101], ('momentum', 10),
+                                lambda d: d['close'].pct_change(10))
+
+        assert self.store.stats['advanced'] == 1
+        np.testing.assert_allclose(_latest(macd), _latest(calculate_macd(self.bars['close'].iloc[:101])), rtol=1e-9)
+        assert momentum.notna().sum() == 91
@@ -0,0 +1,258 @@
+"""Tests for isolated, time-budgeted strategy execution."""
+
+import threading
+import time
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from isolation import RiskView, cancelled, run_isolated
+from replay import ReplayAlpacaClient
+
+
+def _signal(symbol, action='buy', price=100.0):
+    return {'symbol': symbol, 'action': action, 'price': price, 'reason': 'test', 'confidence': 0.8}
+
+
+class TestRunIsolated:
+    """Tests for running tasks side by side within a budget."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.release = threading.Event()
+
+    def teardown_method(self):
+        self.release.set()
+
+    def test_outcomes(self):
+        """Test results, errors and overruns are reported per task, in task order."""
+        def fail():
+            raise RuntimeError('no data')
+
+        started = time.perf_counter()
+        outcomes = run_isolated({
+            'slow': lambda: self.release.wait(5),
+            'ok': lambda: 42,
+            'fail': fail
+        }, timeout=0.2)
+
+        assert time.perf_counter() - started < 2
+        assert list(outcomes) == ['slow', 'ok', 'fail']
+        assert [outcome.status for outcome in outcomes.values()] == ['timed_out', 'ok', 'error']
+        assert outcomes['ok'].value == 42 and outcomes['ok'].success
+        assert outcomes['fail'].error == 'no data'
+        assert outcomes['slow'].seconds >= 0.2
+
+    def test_overrunning_task_flagged(self):
+        """Test cancelled() turns true on a task's thread once it is skipped."""
+        seen = []
+
+        def slow():
+            self.release.wait(5)
+            seen.append(cancelled())
+
+        run_isolated({'slow': slow, 'fast': lambda: seen.append(cancelled())}, timeout=0.2)
+        self.release.set()
+        for _ in range(50):
+            if len(seen) == 2:
+                break
+            time.sleep(0.02)
+
+        assert seen == [False, True]
+        assert not cancelled()
+
+    def test_queued_tasks_get_their_own_budget(self):
+        """Test a task waiting for a worker starts its budget when it runs, once a hung task is skipped."""
+        outcomes = run_isolated({
+            'slow': lambda: self.release.wait(5),
+            'queued': lambda: time.sleep(0.15) or 'ran'
+        }, timeout=0.2, max_workers=1)
+
+        assert outcomes['slow'].status == 'timed_out'
+        assert outcomes['queued'].value == 'ran'
+        assert outcomes['queued'].seconds < 0.2
+
+    def test_budget_per_task(self):
+        """Test a task's own budget overrides the default."""
+        outcomes = run_isolated({
+            'patient': lambda: time.sleep(0.3) or 'done',
+            'hung': lambda: self.release.wait(5)
+        }, timeout=0.1, timeouts={'patient': 2})
+
+        assert outcomes['patient'].value == 'done'
+        assert outcomes['hung'].status == 'timed_out' and outcomes['hung'].seconds < 1
+
+    def test_unlimited(self):
+        """Test no budget waits for every task."""
+        outcomes = run_isolated({1: lambda: time.sleep(0.05) or 'done', 2: lambda: 'done'}, timeout=0)
+        assert [outcome.value for outcome in outcomes.values()] == ['done', 'done']
+
+
+class TestRiskView:
+    """Tests for the positions strategies claim while running at once."""
+
+    def test_concurrent_claims(self):
+        """Test only one of several concurrent buys of a symbol is granted."""
+        view = RiskView({'MSFT': {'quantity': 5}})
+        barrier = threading.Barrier(8)
+        granted = []
+
+        def buy():
+            barrier.wait()
+            granted.append(view.open('AAPL', {'quantity': 10}))
+
+        threads = [threading.Thread(target=buy) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert granted.count(True) == 1
+        assert view.close('MSFT') == {'quantity': 5}
+        assert view.close('MSFT') is None
+        assert sorted(view.positions()) == ['AAPL'] and len(view) == 1
+
+    def test_release_rolls_back_claims(self):
+        """Test releasing a strategy gives back its claims, keeps others' and refuses its later ones."""
+        view = RiskView({'MSFT': {'quantity': 5}, 'VZ': {'quantity': 3}})
+        assert view.open('AAPL', {'quantity': 10}, owner=1)
+        assert view.close('MSFT', owner=1) == {'quantity': 5}
+        assert view.open('TSLA', {'quantity': 1}, owner=2)
+        assert view.close('VZ', owner=1) == {'quantity': 3}
+        view.open('VZ', {'quantity': 7})  # bought back by someone else
+
+        assert view.release(1) == 2
+        assert view.positions() == {'MSFT': {'quantity': 5}, 'VZ': {'quantity': 7}, 'TSLA': {'quantity': 1}}
+        assert not view.open('NVDA', {'quantity': 1}, owner=1)
+        assert view.close('TSLA', owner=1) is None
+
+
+class TestStrategyExecutorIsolation:
+    """A slow StrategyExecutor strategy is skipped without holding up the cycle."""
+
+    def test_slow_strategy_skipped(self, monkeypatch):
+        """Test an overrunning strategy is reported and its late orders dropped."""
+        from strategy_executor import StrategyExecutor
+        from tests.conftest import synthetic_store
+
+        monkeypatch.setattr(config, 'STRATEGY_TIMEOUT', 0.5)
+        client = ReplayAlpacaClient(synthetic_store(['AAPL', 'MSFT', 'XLK', 'VZ', 'TSLA'], periods=80))
+        client.set_time('2024-04-15T19:45:00Z')
+        executor = StrategyExecutor(client=client, publish=False)
+        release = threading.Event()
+        late = threading.Event()
+
+        def run_live_strategy(strategy_type, data):
+            if strategy_type == 'mean_reversion':
+                release.wait(5)
+                late.set()
+                return [_signal('MSFT')]
+            if strategy_type == 'momentum_hunter':
+                return [_signal('AAPL')]
+            return []
+        executor.run_live_strategy = run_live_strategy
+
+        started = time.perf_counter()
+        try:
+            result = executor.run_all_strategies()
+        finally:
+            release.set()
+        late.wait(5)
+        time.sleep(0.1)
+
+        assert time.perf_counter() - started < 5
+        assert result['strategies']['strategy_2']['timed_out']
+        assert result['strategies']['strategy_1']['trades_executed'] == 1
+        assert [order['client_order_id'].split('-')[:2] for order in client.orders] == [['mh', 'AAPL']]
+
+
+    def test_failed_strategy_orders_dropped(self):
+        """Test orders queued by a strategy that then fails or raises are not sent."""
+        from strategy_executor import StrategyExecutor
+        from tests.conftest import synthetic_store
+
+        client = ReplayAlpacaClient(synthetic_store(['AAPL', 'MSFT', 'XLK', 'VZ', 'TSLA'], periods=80))
+        client.set_time('2024-04-15T19:45:00Z')
+        executor = StrategyExecutor(client=client, publish=False)
+        executor.run_live_strategy = lambda strategy_type, data: {
+            'momentum_hunter': [_signal('AAPL')], 'mean_reversion': [_signal('MSFT')],
+            'value_dividends': [_signal('VZ')]
+        }.get(strategy_type, [])
+        execute_strategy = executor.execute_strategy
+
+        def failing_execute_strategy(strategy_id):
+            result = execute_strategy(strategy_id)
+            if strategy_id == 2:
+                return {'success': False, 'error': 'ledger write failed'}
+            if strategy_id == 4:
+                raise RuntimeError('snapshot failed')
+            return result
+        executor.execute_strategy = failing_execute_strategy
+
+        result = executor.run_all_strategies()
+
+        assert result['strategies']['strategy_2'] == {'success': False, 'error': 'ledger write failed'}
+        assert not result['strategies']['strategy_4']['success']
+        assert result['total_trades'] == 1
+        assert [order['client_order_id'].split('-')[:2] for order in client.orders] == [['mh', 'AAPL']]
+
+
+class TestTradingExecutorIsolation:
+    """TradingExecutor strategies run side by side against shared positions."""
+
+    def test_slow_strategy_skipped(self, monkeypatch):
+        """Test a hung strategy is skipped with its claims released, and a symbol two strategies buy is bought once."""
+        pytest.importorskip('yfinance')
+        scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts')
+        sys.path.insert(0, os.path.abspath(scripts_dir))
+        from execute_trades import TradingExecutor
+        from fake_alpaca import synthetic_store
+
+        monkeypatch.setattr(config, 'STRATEGY_TIMEOUT', 3)
+        now = '2026-03-02T15:00:00Z'  # Monday 10:00 ET: strategies 2, 3 and 4 are due
+        symbols = set()
+        for universe in TradingExecutor(publish=False).base_universes.values():
+            symbols.update(universe)
+        client = ReplayAlpacaClient(synthetic_store(sorted(symbols), now, sessions=60, intraday_sessions=5))
+        client.set_time(now)
+        executor = TradingExecutor(client=client, publish=False, data_source='alpaca')
+        release = threading.Event()
+
+        def generate_strategy_signals(strategy_id, strategy_name, universe, data):
+            if strategy_name == 'mean-reversion':
+                return [_signal('JPM'), _signal('KO')]
+            return [_signal('XLK'), _signal(universe[0], price=50.0)]
+        executor.generate_strategy_signals = generate_strategy_signals
+
+        calculate_position_size = executor.calculate_position_size
+
+        sized = []
+
+        def hang_on_second_buy(price, strategy_id):
+            # Mean reversion claims JPM, then hangs before claiming KO
+            if strategy_id == 2:
+                sized.append(price)
+                if len(sized) == 2:
+                    release.wait(10)
+            return calculate_position_size(price, strategy_id)
+        executor.calculate_position_size = hang_on_second_buy
+
+        try:
+            result = executor.run_strategy_execution()
+        finally:
+            release.set()
+        time.sleep(0.1)
+
+        results = result['strategy_results']
+        assert results['strategy_2']['timed_out'] and not results['strategy_2']['success']
+        assert results['strategy_1']['skipped'] and results['strategy_5']['skipped']
+        bought = [trade['symbol'] for trade in result['executed_trades']]
+        assert bought.count('XLK') == 1 and 'JPM' not in bought
+        assert result['final_position_count'] == len(bought)
+        assert sorted(order['symbol'] for order in client.orders) == sorted(bought)
+        assert result['trades_executed'] == results['strategy_3']['trades_executed'] + \
+            results['strategy_4']['trades_executed']
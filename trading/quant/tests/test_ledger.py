@@ -0,0 +1,250 @@
+"""Tests for the incremental position ledger."""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ledger import PositionLedger
+from replay import ReplayAlpacaClient
+from tests.conftest import synthetic_dates, synthetic_store
+
+SYMBOLS = ['AAA', 'BBB', 'CCC']
+
+
+def _make_client(periods=60, seed=3):
+    """Replay client over synthetic daily bars with no intraday range."""
+    store = synthetic_store(SYMBOLS, periods, seed, tz='UTC', base=40.0, drift=0.0, spread=0.0,
+                            volumes={symbol: 1e6 for symbol in SYMBOLS})
+    return ReplayAlpacaClient(store, initial_cash=1e6, slippage=0.001), synthetic_dates(periods, tz='UTC')
+
+
+def _trade(client, dates, start, end, seed=0):
+    """Place a deterministic mix of buys and sells for two strategies."""
+    rng = np.random.RandomState(seed)
+    for i, date in enumerate(dates[start:end], start=start):
+        client.set_time(date + pd.Timedelta(hours=15))
+        for slug in ('mh', 'mr'):
+            symbol = SYMBOLS[rng.randint(len(SYMBOLS))]
+            held = sum(float(o['filled_qty']) * (1 if o['side'] == 'buy' else -1)
+                       for o in client.orders
+                       if o['symbol'] == symbol and o['client_order_id'].startswith(f'{slug}-'))
+            side = 'sell' if held > 0 and rng.rand() < 0.4 else 'buy'
+            qty = max(1, int(held * 0.5)) if side == 'sell' else int(rng.randint(1, 20))
+            client.place_order(symbol, qty, side, client_order_id=f'{slug}-{symbol}-{i}')
+
+
+def _full_replay(client, slug, initial_capital):
+    """Positions and cash from replaying every filled order, as the executor used to."""
+    orders = sorted(
+        (o for o in client.orders if o['client_order_id'].startswith(f'{slug}-')),
+        key=lambda o: o['filled_at']
+    )
+    raw, cash = {}, initial_capital
+    for order in orders:
+        qty, price = float(order['filled_qty']), float(order['filled_avg_price'])
+        pos = raw.setdefault(order['symbol'], {'quantity': 0.0, 'total_cost': 0.0})
+        if order['side'] == 'buy':
+            pos['quantity'] += qty
+            pos['total_cost'] += qty * price
+            cash -= qty * price
+        else:
+            if pos['quantity'] > 0:
+                pos['total_cost'] -= (qty / pos['quantity']) * pos['total_cost']
+            pos['quantity'] -= qty
+            cash += qty * price
+    positions = {
+        symbol: pos['total_cost'] / pos['quantity']
+        for symbol, pos in raw.items() if pos['quantity'] > 0.001
+    }
+    return positions, cash
+
+
+class TestPositionLedger:
+    """The ledger must match a full replay while only reading new fills."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.client, self.dates = _make_client()
+
+    def test_incremental_matches_full_replay(self, tmp_path):
+        """Test syncing after every session gives the full-replay state, across restarts."""
+        db_path = str(tmp_path / 'trading.db')
+        for start in range(0, 60, 10):
+            _trade(self.client, self.dates, start, start + 10, seed=start)
+            ledger = PositionLedger(self.client, db_path)  # a fresh process each time
+            ledger.sync(1, 'mh', 20000)
+            ledger.close()
+
+        ledger = PositionLedger(self.client, db_path)
+        positions, cash = ledger.get_state(1, 'mh', 20000, sync=False)
+        expected_positions, expected_cash = _full_replay(self.client, 'mh', 20000)
+
+        assert cash == pytest.approx(expected_cash)
+        assert {s: p['avg_cost_basis'] for s, p in positions.items()} == pytest.approx(expected_positions)
+        assert ledger.get_info()[1]['fills'] == sum(
+            o['client_order_id'].startswith('mh-') for o in self.client.orders
+        )
+
+    def test_sync_reads_only_new_orders(self):
+        """Test a sync asks for orders after the high-water mark and applies each fill once."""
+        ledger = PositionLedger(self.client, ':memory:')
+        _trade(self.client, self.dates, 0, 30)
+        ledger.sync(2, 'mr', 20000)
+
+        requested = []
+        orders_page = self.client._orders_page
+        self.client._orders_page = lambda *args: requested.append(args) or orders_page(*args)
+
+        _trade(self.client, self.dates, 30, 32, seed=7)
+        applied = ledger.sync(2, 'mr', 20000)
+
+        status, limit, after, until, direction = requested[0]
+        assert applied == 2
+        assert after is not None
+        assert len(orders_page(*requested[0])) < 10
+        assert ledger.sync(2, 'mr', 20000) == 0
+        assert ledger.get_state(2, 'mr', 20000)[1] == pytest.approx(_full_replay(self.client, 'mr', 20000)[1])
+
+    def test_idle_strategy_reads_only_new_orders(self):
+        """Test a strategy without fills still syncs incrementally, alone and with others."""
+        ledger = PositionLedger(self.client, ':memory:')
+        _trade(self.client, self.dates, 0, 30)
+        ledger.sync_all({1: ('mh', 20000), 3: ('idle', 20000)})
+
+        calls = []
+        iter_orders = self.client.iter_orders
+        self.client.iter_orders = lambda **kwargs: calls.append(kwargs) or list(iter_orders(**kwargs))
+        _trade(self.client, self.dates, 30, 32, seed=7)
+
+        assert ledger.sync(3, 'idle', 20000) == 0
+        assert ledger.sync_all({1: ('mh', 20000), 3: ('idle', 20000)}) == {1: 2, 3: 0}
+        assert all(call['after'] is not None for call in calls)
+        assert all(len(list(iter_orders(**call))) <= 8 for call in calls)
+        assert ledger.get_info()[3]['last_fill_at'] is None
+
+    def test_iter_orders_paginates(self):
+        """Test iter_orders walks past a single page, oldest first, without duplicates."""
+        _trade(self.client, self.dates, 0, 20)
+
+        orders = list(self.client.iter_orders(status='closed', page_size=7))
+
+        assert len(orders) == len(self.client.orders) == 40
+        assert [o['id'] for o in orders] == [o['id'] for o in self.client.orders]
+
+    def test_sync_all_uses_one_order_query(self):
+        """Test syncing every strategy at once reads the orders once and matches per-strategy syncs."""
+        _trade(self.client, self.dates, 0, 20)
+        single = PositionLedger(self.client, ':memory:')
+        for strategy_id, slug in ((1, 'mh'), (2, 'mr')):
+            single.sync(strategy_id, slug, 20000)
+
+        ledger = PositionLedger(self.client, ':memory:')
+        calls = []
+        iter_orders = self.client.iter_orders
+        self.client.iter_orders = lambda **kwargs: calls.append(kwargs) or iter_orders(**kwargs)
+
+        assert ledger.sync_all({1: ('mh', 20000), 2: ('mr', 20000)}) == {1: 20, 2: 20}
+        assert len(calls) == 1
+        for strategy_id, slug in ((1, 'mh'), (2, 'mr')):
+            assert ledger.get_state(strategy_id, slug, 20000, sync=False) == \
+                single.get_state(strategy_id, slug, 20000, sync=False)
+
+
+class TestStrategyEquity:
+    """Per-strategy equity from the ledger, marked with one quote request."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        from strategy_executor import StrategyExecutor
+        self.client, self.dates = _make_client()
+        self.executor = StrategyExecutor(client=self.client, publish=False)
+
+    def test_equity_is_cash_plus_marked_positions(self):
+        """Test each strategy's value is its own cash plus its positions at the quote midpoint."""
+        _trade(self.client, self.dates, 0, 20)
+        quote_calls = []
+        get_latest_quotes = self.client.get_latest_quotes
+        self.client.get_latest_quotes = lambda symbols: quote_calls.append(symbols) or get_latest_quotes(symbols)
+
+        equity = self.executor.get_strategy_equity()
+
+        assert len(quote_calls) == 1
+        for strategy_id, slug in ((1, 'mh'), (2, 'mr')):
+            positions, cash = _full_replay(self.client, slug, 20000)
+            held = {
+                symbol: sum(float(o['filled_qty']) * (1 if o['side'] == 'buy' else -1)
+                            for o in self.client.orders
+                            if o['symbol'] == symbol and o['client_order_id'].startswith(f'{slug}-'))
+                for symbol in positions
+            }
+            marked = sum(qty * self.client.last_price(symbol) for symbol, qty in held.items())
+            assert equity[strategy_id]['cash'] == pytest.approx(cash)
+            assert equity[strategy_id]['value'] == pytest.approx(cash + marked)
+        assert equity[1]['value'] != equity[2]['value']
+        assert equity[3] == {'value': 20000, 'cash': 20000, 'positions_value': 0.0,
+                             'unrealized_pl': 0.0, 'positions': 0}
+
+    def test_unchanged_ledgers_not_reread(self):
+        """Test only strategies with new fills are re-read on the next snapshot."""
+        _trade(self.client, self.dates, 0, 10)
+        self.executor.get_strategy_equity()
+
+        reads = []
+        get_state = self.executor.ledger.get_state
+        self.executor.ledger.get_state = lambda strategy_id, *args, **kwargs: \
+            reads.append(strategy_id) or get_state(strategy_id, *args, **kwargs)
+
+        self.executor.get_strategy_equity()
+        assert reads == []
+
+        self.client.set_time(self.dates[10] + pd.Timedelta(hours=15))
+        self.client.place_order('AAA', 5, 'buy', client_order_id='mr-AAA-x')
+        self.executor.get_strategy_equity()
+        assert reads == [2]
+
+    def test_fills_applied_elsewhere_invalidate(self, tmp_path):
+        """Test fills applied by another sync, netting or another process before the snapshot are picked up."""
+        from strategy_executor import StrategyExecutor
+        path = str(tmp_path / 'ledger.db')
+        executor = StrategyExecutor(client=self.client, publish=False, ledger=PositionLedger(self.client, path))
+        _trade(self.client, self.dates, 0, 10)
+        before = executor.get_strategy_equity()
+
+        self.client.set_time(self.dates[10] + pd.Timedelta(hours=15))
+        self.client.place_order('AAA', 5, 'buy', client_order_id='mr-AAA-x')
+        self.client.place_order('BBB', 5, 'buy', client_order_id='mh-BBB-x')
+        executor.get_strategy_state(2)
+        PositionLedger(self.client, path).sync(1, 'mh', 20000)
+        executor.ledger.record_internal_fills(3, 'sr', 20000, [{
+            'id': 'sr-cross-1', 'client_order_id': 'sr-cross-1', 'symbol': 'CCC', 'side': 'buy',
+            'filled_qty': 3, 'filled_avg_price': 40.0, 'filled_at': self.client.now().isoformat()
+        }])
+
+        equity = executor.get_strategy_equity()
+
+        fresh = StrategyExecutor(client=self.client, publish=False, ledger=PositionLedger(self.client, path))
+        assert equity == fresh.get_strategy_equity()
+        assert all(equity[strategy_id]['cash'] < before[strategy_id]['cash'] for strategy_id in (1, 2, 3))
+
+    def test_executor_snapshot_attributes_equity(self):
+        """Test TradingExecutor records each strategy's own equity instead of an equal split."""
+        pytest.importorskip('yfinance')
+        scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts')
+        sys.path.insert(0, os.path.abspath(scripts_dir))
+        from execute_trades import TradingExecutor
+        from equity_store import EquitySnapshotStore
+
+        _trade(self.client, self.dates, 0, 10)
+        store = EquitySnapshotStore(':memory:')
+        executor = TradingExecutor(client=self.client, publish=False, data_source='alpaca', snapshot_store=store)
+
+        assert executor.record_equity_snapshot()
+        equity = executor.strategy_executor.get_strategy_equity()
+        snapshots = store.latest()['snapshots']
+        assert snapshots['momentum-hunter']['value'] == round(equity[1]['value'], 2)
+        assert snapshots['mean-reversion']['cash'] == round(equity[2]['cash'], 2)
+        assert snapshots['sector-rotator']['value'] == 20000
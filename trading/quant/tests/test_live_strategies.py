@@ -0,0 +1,235 @@
+"""Tests for the live strategies and the shared feature cache."""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.base import Strategy
+from strategies.live import (
+    LiveStrategy, MomentumHunterStrategy, LiveMeanReversionStrategy, SectorRotatorStrategy,
+    ValueDividendsStrategy, LiveVolatilityBreakoutStrategy
+)
+from strategies.registry import create_strategy
+from utils.features import FeatureCache
+from utils.indicators import calculate_rsi
+
+
+def _make_dataframe(n=160, seed=1, daily_vol=0.02, start='2023-01-02'):
+    """Build a synthetic OHLCV frame with occasional volume spikes."""
+    rng = np.random.RandomState(seed)
+    dates = pd.date_range(start, periods=n, freq='B')
+    close = 50 * np.cumprod(1 + rng.normal(0, daily_vol, n))
+    volume = rng.randint(1000000, 5000000, n).astype(float)
+    volume[rng.rand(n) < 0.1] *= 3
+    return pd.DataFrame({
+        'open': close,
+        'high': close * (1 + np.abs(rng.normal(0, 0.01, n))),
+        'low': close * (1 - np.abs(rng.normal(0, 0.01, n))),
+        'close': close,
+        'volume': volume,
+    }, index=dates)
+
+
+def _golden_bars(seed, n=90):
+    """Fixed OHLCV bars for the golden signals, with a volume spike on the last bar."""
+    rng = np.random.RandomState(seed)
+    dates = pd.date_range('2024-01-02', periods=n, freq='B')
+    close = np.round(50 * np.cumprod(1 + rng.normal(0.001, 0.025, n)), 4)
+    volume = rng.randint(1000000, 5000000, n).astype(float)
+    volume[-1] *= 2.5
+    return pd.DataFrame({
+        'open': close,
+        'high': np.round(close * (1 + np.abs(rng.normal(0, 0.01, n))), 4),
+        'low': np.round(close * (1 - np.abs(rng.normal(0, 0.01, n))), 4),
+        'close': close,
+        'volume': volume,
+    }, index=dates)
+
+
+# Output of the executor's per-symbol rules before they moved to strategies/live.py
+GOLDEN_SIGNALS = {
+    'momentum_hunter': [
+        ('AAPL', 'sell', 0.82, 'Momentum sell: price $54.05 < EMA20 $54.54; MACD histogram turned negative'),
+        ('JPM', 'buy', 1.0, 'Momentum buy: JPM trend confirmed, price $72.73 above EMA20 $67.43 and '
+                            'EMA50 $63.87, RSI 63.4, MACD histogram expanding'),
+        ('MSFT', 'sell', 0.82, 'Momentum sell: price $35.50 < EMA20 $38.80; RSI 26.8 <= 45'),
+        ('V', 'sell', 0.82, 'Momentum sell: price $69.04 < EMA20 $72.47; MACD histogram turned negative'),
+    ],
+    'mean_reversion': [
+        ('JPM', 'sell', 0.8, 'Mean reversion sell: Z-score recovered to 1.87; price $72.73 >= SMA20 $67.36'),
+        ('NVDA', 'sell', 0.8, 'Mean reversion sell: Z-score recovered to 0.02; price $52.74 >= SMA20 $52.70'),
+        ('TSLA', 'sell', 0.8, 'Mean reversion sell: Z-score recovered to 1.49; price $54.78 >= SMA20 $50.77'),
+    ],
+    'sector_rotator': [
+        ('XLE', 'buy', 0.95, 'Sector rotation buy: XLE leadership confirmed at 12.90% 20-day momentum'),
+        ('XLF', 'sell', 0.72, 'Sector rotation sell: XLF momentum -2.46% no longer strong enough'),
+        ('XLI', 'sell', 0.72, 'Sector rotation sell: XLI momentum 10.00% no longer strong enough'),
+        ('XLK', 'sell', 0.72, 'Sector rotation sell: XLK momentum -7.02% no longer strong enough'),
+        ('XLV', 'sell', 0.72, 'Sector rotation sell: XLV momentum -0.48% no longer strong enough'),
+        ('XLY', 'buy', 0.95, 'Sector rotation buy: XLY leadership confirmed at 16.77% 20-day momentum'),
+    ],
+    'value_dividends': [
+        ('MSFT', 'buy', 0.762064, 'Value buy: MSFT oversold with RSI 26.8 and price below 20-day mean'),
+        ('TSLA', 'sell', 0.602474, 'Value sell: TSLA RSI 67.0 >= 67'),
+    ],
+    'volatility_breakout': [
+        ('JPM', 'buy', 0.513919, 'Volatility buy: JPM cleared breakout $72.35, volume 10,232,718 > 4,679,365, '
+                                 'trend above SMA20'),
+    ],
+}
+
+
+# Loosened where the defaults rarely fire on synthetic data
+PER_SYMBOL_STRATEGIES = [
+    (MomentumHunterStrategy, None),
+    (LiveMeanReversionStrategy, None),
+    (ValueDividendsStrategy, None),
+    (LiveVolatilityBreakoutStrategy, {'breakout_atr_multiple': 0.2, 'volume_multiple': 1.2}),
+]
+
+
+class TestLiveSignalSeries:
+    """Vectorized series must match per-bar evaluation."""
+
+    @pytest.mark.parametrize('strategy_cls,config', PER_SYMBOL_STRATEGIES)
+    @pytest.mark.parametrize('seed', [1, 2])
+    def test_series_matches_per_bar(self, strategy_cls, config, seed):
+        """Test generate_signal_series equals replaying generate_signals bar by bar."""
+        strategy = strategy_cls(config, features=FeatureCache())
+        data = _make_dataframe(seed=seed, daily_vol=0.03)
+
+        series = strategy.generate_signal_series(data, symbol='TEST')
+        expected = Strategy.generate_signal_series(strategy, data, symbol='TEST')
+
+        assert (series['action'] == 'buy').any() or (series['action'] == 'sell').any()
+        pd.testing.assert_series_equal(series['action'], expected['action'])
+        np.testing.assert_allclose(series['confidence'], expected['confidence'])
+
+    def test_sector_series_matches_per_bar(self):
+        """Test universe series equals ranking each date's histories, including a late listing."""
+        strategy = SectorRotatorStrategy(features=FeatureCache())
+        market_data = {
+            f"X{i}": _make_dataframe(n=120, seed=10 + i) for i in range(5)
+        }
+        market_data['X4'] = market_data['X4'].iloc[40:]
+
+        series = strategy.generate_universe_signal_series(market_data)
+
+        for date in market_data['X0'].index[20:]:
+            histories = {
+                symbol: df[df.index <= date] for symbol, df in market_data.items()
+                if (df.index <= date).any()
+            }
+            signals = {s.symbol: s for s in strategy.generate_universe_signals(histories)}
+            for symbol in histories:
+                row = series[symbol].loc[date]
+                if symbol in signals:
+                    assert row['action'] == signals[symbol].action
+                    assert row['confidence'] == pytest.approx(signals[symbol].confidence)
+                else:
+                    assert row['action'] == 'hold'
+
+    def test_registered_with_executor_config(self):
+        """Test live strategies are available from the registry with config overrides."""
+        strategy = create_strategy('live_value_dividends', {'buy_rsi_max': 30, 'name': 'Value & Dividends'})
+
+        assert isinstance(strategy, ValueDividendsStrategy)
+        assert strategy.config['buy_rsi_max'] == 30
+        assert strategy.config['sell_rsi_min'] == 67
+        assert SectorRotatorStrategy.cross_sectional
+
+    def test_rules_are_abstract(self):
+        """Test a live strategy must implement its rules to be instantiated."""
+        with pytest.raises(TypeError):
+            LiveStrategy()
+
+    def test_bad_symbol_isolated(self):
+        """Test a symbol whose data raises is skipped without losing the others' signals."""
+        market_data = {f"X{i}": _make_dataframe(seed=i, daily_vol=0.03) for i in range(4)}
+        market_data['BAD'] = market_data['X0'].drop(columns=['close'])
+
+        for strategy_cls in (LiveMeanReversionStrategy, SectorRotatorStrategy):
+            strategy = strategy_cls(features=FeatureCache())
+            expected = strategy.generate_universe_signals({s: d for s, d in market_data.items() if s != 'BAD'})
+            signals = strategy.generate_universe_signals(market_data)
+            assert signals and [(s.symbol, s.action) for s in signals] == [(s.symbol, s.action) for s in expected]
+
+
+class TestExecutorGolden:
+    """StrategyExecutor signals on fixed bars are pinned to the pre-refactor rules."""
+
+    @pytest.mark.parametrize('strategy_type', sorted(GOLDEN_SIGNALS))
+    def test_golden_signals(self, strategy_type):
+        """Test signals, reasons and confidences match the recorded executor output."""
+        from bar_store import BarStore
+        from replay import ReplayAlpacaClient
+        from strategy_executor import StrategyExecutor
+
+        executor = StrategyExecutor(client=ReplayAlpacaClient(BarStore(':memory:')), publish=False)
+        if strategy_type == 'sector_rotator':
+            symbols, first_seed = ['XLK', 'XLF', 'XLE', 'XLV', 'XLI', 'XLY'], 330
+        else:
+            symbols, first_seed = ['AAPL', 'MSFT', 'NVDA', 'JPM', 'V', 'TSLA'], 230
+        data = {symbol: _golden_bars(first_seed + i) for i, symbol in enumerate(symbols)}
+
+        signals = getattr(executor, f"{strategy_type}_signals")(data)
+
+        actual = sorted((s['symbol'], s['action'], s['confidence'], s['reason']) for s in signals)
+        expected = GOLDEN_SIGNALS[strategy_type]
+        assert [row[:2] + row[3:] for row in actual] == [row[:2] + row[3:] for row in expected]
+        assert [row[2] for row in actual] == pytest.approx([row[2] for row in expected], abs=1e-6)
+
+
+class TestFeatureCache:
+    """Tests for the shared indicator cache."""
+
+    def test_hit_on_same_bars(self):
+        """Test a second request for the same bars is served from the cache."""
+        cache = FeatureCache()
+        data = _make_dataframe()
+
+        first = cache.rsi('TEST', data, 14)
+        second = cache.rsi('TEST', data, 14)
+
+        assert second is first
+        assert cache.get_stats()['hits'] == 1
+        pd.testing.assert_series_equal(first, calculate_rsi(data['close'], 14))
+
+    def test_new_bar_invalidates(self):
+        """Test appending a bar or changing the symbol computes a fresh value."""
+        cache = FeatureCache()
+        data = _make_dataframe()
+
+        cache.rsi('TEST', data.iloc[:-1], 14)
+        latest = cache.rsi('TEST', data, 14)
+        cache.rsi('OTHER', data, 14)
+
+        assert len(latest) == len(data)
+        assert cache.get_stats()['misses'] == 3
+
+    def test_revised_bar_invalidates(self):
+        """Test a correction to an earlier bar computes a fresh value."""
+        cache = FeatureCache()
+        data = _make_dataframe()
+        revised = data.copy()
+        revised.iloc[-3, revised.columns.get_loc('close')] *= 1.1
+
+        cache.rsi('TEST', data, 14)
+        latest = cache.rsi('TEST', revised, 14)
+
+        assert cache.get_stats()['misses'] == 2
+        pd.testing.assert_series_equal(latest, calculate_rsi(revised['close'], 14))
+
+    def test_lru_eviction(self):
+        """Test the cache never grows past max_entries."""
+        cache = FeatureCache(max_entries=2)
+        data = _make_dataframe()
+
+        for period in (5, 10, 20):
+            cache.sma('TEST', data, period)
+
+        assert cache.get_stats()['entries'] == 2
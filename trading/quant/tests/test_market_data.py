@@ -0,0 +1,167 @@
+"""Tests for the per-cycle concurrent market-data prefetch."""
+
+import threading
+import time
+
+import pytest
+import pandas as pd
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_data import CycleMarketData, MarketSnapshot, fetch_alpaca_bars
+from replay import ReplayAlpacaClient
+from tests.conftest import synthetic_store
+
+
+def _make_client(symbols, periods=120, seed=0):
+    """Replay client over synthetic daily bars stamped at midnight New York time."""
+    return ReplayAlpacaClient(synthetic_store(symbols, periods, seed), initial_cash=100000)
+
+
+class TestCycleMarketData:
+    """Tests for batching, concurrency and serving from memory."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _slow_fetch(self, symbols, timeframe, days):
+        with self.lock:
+            self.calls.append((tuple(symbols), timeframe, days))
+        time.sleep(0.2)
+        if 'BAD' in symbols:
+            raise ConnectionError('reset')
+        return {s: pd.DataFrame({'close': [1.0]}, index=pd.DatetimeIndex(['2024-03-01'])) for s in symbols}
+
+    def test_union_fetched_once_in_concurrent_batches(self):
+        """Test overlapping requests become one batched, concurrent fetch per timeframe."""
+        symbols = [f'S{i:02d}' for i in range(40)]
+        cycle_data = CycleMarketData(self._slow_fetch, now=pd.Timestamp('2024-03-01 15:00'),
+                                     batch_size=10, max_concurrency=8)
+        cycle_data.request_bars(symbols[:30], '1Day', 30)
+        cycle_data.request_bars(symbols[10:], '1Day', 60)
+        cycle_data.request_bars(symbols[:5], '5Min', 5)
+
+        started = time.monotonic()
+        stats = cycle_data.prefetch()
+        elapsed = time.monotonic() - started
+
+        assert stats['requests'] == len(self.calls) == 5
+        assert sorted(s for call in self.calls if call[1] == '1Day' for s in call[0]) == symbols
+        assert {call[2] for call in self.calls if call[1] == '1Day'} == {60}
+        assert elapsed < 0.6  # five 0.2s requests overlapped
+        assert set(cycle_data.get_bars(symbols, '1Day', 30)) == set(symbols)
+        assert cycle_data.get_bars(symbols[:6], '5Min', 5) is None
+        assert cycle_data.get_bars(symbols[:5], '1Day', 90) is None
+
+    def test_failed_batch_is_left_uncovered(self):
+        """Test a failed batch does not fail the stage and its symbols are not served."""
+        cycle_data = CycleMarketData(self._slow_fetch, batch_size=2)
+        cycle_data.request_bars(['AAA', 'BBB', 'CCC', 'DDD', 'BAD'], '1Day', 60)
+
+        stats = cycle_data.prefetch()  # batches: AAA+BAD, BBB+CCC, DDD
+
+        assert stats['failed'] == 1
+        assert set(cycle_data.get_bars(['BBB', 'CCC', 'DDD'], '1Day', 60)) == {'BBB', 'CCC', 'DDD'}
+        assert cycle_data.get_bars(['AAA', 'BBB'], '1Day', 60) is None
+
+    def test_served_bars_match_direct_fetch(self):
+        """Test a shorter lookback cut from the prefetched range equals fetching it directly."""
+        symbols = ['AAA', 'BBB', 'CCC', 'DDD']
+        client = _make_client(symbols)
+        client.set_time('2024-04-15T15:00:00Z')
+        cycle_data = CycleMarketData(lambda s, tf, d: fetch_alpaca_bars(client, s, tf, d),
+                                     now=client.now(), batch_size=1)
+        cycle_data.request_bars(symbols, '1Day', 60)
+        cycle_data.prefetch()
+
+        for days in (30, 60):
+            served = cycle_data.get_bars(symbols, '1Day', days)
+            direct = fetch_alpaca_bars(client, symbols, '1Day', days)
+            assert served.keys() == direct.keys()
+            for symbol in symbols:
+                pd.testing.assert_frame_equal(served[symbol], direct[symbol])
+
+
+class TestMarketSnapshot:
+    """Tests for the shared universe-selection snapshot."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.client = _make_client(['AAA', 'BBB', 'SPY'], seed=5)
+        self.client.set_time('2024-04-15T15:00:00Z')
+        self.frames = fetch_alpaca_bars(self.client, ['AAA', 'BBB', 'SPY'], '1Day', 60)
+        self.snapshot = MarketSnapshot(self.frames, now=self.client.now(),
+                                       cache_keys={'mean-reversion': 'mean-reversion_2024-04-15_15_0'})
+
+    def test_scores_match_each_lookback(self):
+        """Test scores are computed over the lookback's bars only, one row per symbol."""
+        recent = fetch_alpaca_bars(self.client, ['AAA'], '1Day', 30)['AAA']
+
+        scores = self.snapshot.scores(30)
+
+        assert list(scores.index) == ['AAA', 'BBB', 'SPY']
+        assert scores.at['AAA', 'bars'] == len(recent) < self.snapshot.scores(60).at['AAA', 'bars']
+        assert scores.at['AAA', 'momentum'] == pytest.approx(recent['close'].iloc[-1] / recent['close'].iloc[-20] - 1)
+        assert scores.at['AAA', 'avg_volume_20d'] == pytest.approx(recent['volume'].iloc[-21:-1].mean())
+        assert scores.at['AAA', 'prior_volume'] == recent['volume'].iloc[-2]
+        assert self.snapshot.scores(30) is scores
+
+    def test_symbol_missing_latest_bar_scored_on_its_own(self):
+        """Test a symbol without the newest bar is scored at its last bar, unless that is stale."""
+        frames = dict(self.frames, BBB=self.frames['BBB'].iloc[:-1])
+        alone = MarketSnapshot({'BBB': frames['BBB']}, now=self.client.now()).scores(60)
+
+        scores = MarketSnapshot(frames, now=self.client.now()).scores(60)
+
+        assert scores.loc['BBB', ['momentum', 'volume_trend', 'volatility', 'atr_pct', 'close']].notna().all()
+        pd.testing.assert_series_equal(scores.loc['BBB'], alone.loc['BBB'])
+        pd.testing.assert_series_equal(scores.loc['AAA'], self.snapshot.scores(60).loc['AAA'])
+
+        frames['BBB'] = self.frames['BBB'].iloc[:-(MarketSnapshot.STALE_BARS + 1)]
+        scores = MarketSnapshot(frames, now=self.client.now()).scores(60)
+        assert scores.loc['BBB', ['momentum', 'close', 'rsi']].isna().all()
+
+    def test_valid_only_within_cache_period(self):
+        """Test a strategy reuses the snapshot until its cache key changes."""
+        assert self.snapshot.is_valid_for('mean-reversion', 'mean-reversion_2024-04-15_15_0')
+        assert not self.snapshot.is_valid_for('mean-reversion', 'mean-reversion_2024-04-15_15_1')
+        assert not self.snapshot.is_valid_for('sector-rotator', 'sector-rotator_2024-15')
+
+
+class TestTradingExecutorPrefetch:
+    """Tests for the prefetch stage of TradingExecutor.run_strategy_execution."""
+
+    def test_selection_and_market_data_read_from_memory(self):
+        """Test a prefetched cycle issues no further requests and sees the same data."""
+        pytest.importorskip('yfinance')
+        scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts')
+        sys.path.insert(0, os.path.abspath(scripts_dir))
+        from execute_trades import TradingExecutor
+
+        symbols = sorted(set(['XLK', 'XLF', 'XLE', 'XLV', 'XLY', 'XLP', 'XLI', 'XLU', 'XLRE', 'SPY', 'QQQ',
+                              'JNJ', 'KO', 'PG', 'WMT', 'JPM', 'BAC', 'HD', 'MMM', 'VZ', 'T', 'XOM',
+                              'CVX', 'IBM', 'INTC', 'MRK']))
+        client = _make_client(symbols, seed=2)
+        client.set_time('2024-04-15T15:00:00Z')  # Monday 10:00 in the executor's ET
+        direct = TradingExecutor(client=client, publish=False, data_source='alpaca')
+        prefetched = TradingExecutor(client=client, publish=False, data_source='alpaca')
+
+        assert prefetched.prefetch_market_data([3, 4]).stats['failed'] == 0
+        requests = []
+        get_historical_bars = client.get_historical_bars
+        client.get_historical_bars = lambda *args, **kwargs: requests.append(kwargs) or \
+            get_historical_bars(*args, **kwargs)
+
+        served = {}
+        for name in ('sector-rotator', 'value-dividends'):
+            universe = prefetched.get_dynamic_universe(name)
+            served[name] = (universe, prefetched.get_market_data(universe, timeframe='1Day'))
+        assert not requests
+
+        for name, (universe, data) in served.items():
+            assert universe == direct.get_dynamic_universe(name)
+            pd.testing.assert_frame_equal(data, direct.get_market_data(universe, timeframe='1Day'))
@@ -0,0 +1,176 @@
+"""Tests for cross-strategy order netting."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bar_store import BarStore
+from ledger import PositionLedger
+from netting import OrderNetter
+from replay import ReplayAlpacaClient
+
+STRATEGIES = {
+    1: {'slug': 'mh', 'initial_capital': 20000},
+    2: {'slug': 'mr', 'initial_capital': 20000},
+    3: {'slug': 'vb', 'initial_capital': 20000},
+}
+
+
+def _make_client():
+    """Replay client over flat daily bars at $100."""
+    dates = pd.date_range('2024-01-01', periods=30, freq='B').tz_localize('UTC')
+    store = BarStore(':memory:')
+    for symbol in ('AAPL', 'MSFT'):
+        close = np.full(len(dates), 100.0)
+        store.write_frame(symbol, pd.DataFrame({
+            'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1e6
+        }, index=dates))
+    client = ReplayAlpacaClient(store)
+    client.set_time(dates[-1] + pd.Timedelta(hours=15))
+    return client
+
+
+class TestOrderNetter:
+    """Tests for crossing opposing orders and sending only residuals."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.client = _make_client()
+        self.ledger = PositionLedger(self.client, ':memory:')
+        # Mean Reversion holds 50 AAPL from an earlier cycle
+        self.client.place_order('AAPL', 50, 'buy', client_order_id='mr-AAPL-0')
+        self.ledger.sync(2, 'mr', 20000)
+        self.placed = []
+        self.netter = OrderNetter(STRATEGIES, self.ledger, self._place, clock=self.client.now,
+                                  prices=lambda symbols: {symbol: 101.0 for symbol in symbols})
+
+    def _place(self, orders):
+        for order in orders:
+            self.placed.append((order.strategy_id, order.symbol, order.side, order.residual))
+            slug = STRATEGIES[order.strategy_id]['slug']
+            order.order = self.client.place_order(order.symbol, order.residual, order.side,
+                                                  client_order_id=f'{slug}-{order.symbol}-{len(self.placed)}')
+
+    def test_offsetting_orders_crossed(self):
+        """Test a buy against a larger sell crosses internally and sends one residual."""
+        buy = self.netter.add(1, 'AAPL', 'buy', 30, 100.0)
+        sell = self.netter.add(2, 'AAPL', 'sell', 50, 100.0)
+        other = self.netter.add(1, 'MSFT', 'buy', 10, 100.0)
+        self.netter.submit()
+
+        assert (buy.crossed, sell.crossed, other.crossed) == (30, 30, 0)
+        assert self.placed == [(2, 'AAPL', 'sell', 20), (1, 'MSFT', 'buy', 10)]
+        assert buy.order is None and sell.order is not None
+        assert self.netter.get_stats() == {
+            'intended': 3, 'submitted': 2, 'failed': 0, 'crossed_shares': 30, 'orders_saved': 1
+        }
+        assert self.netter.orders == []
+
+    def test_crosses_recorded_in_ledgers(self):
+        """Test crossed legs are ledger fills at the quote midpoint, and broker fills still sync."""
+        self.netter.add(1, 'AAPL', 'buy', 30, 100.0)
+        self.netter.add(2, 'AAPL', 'sell', 50, 100.0)
+        self.netter.submit()
+
+        mh_positions, mh_cash = self.ledger.get_state(1, 'mh', 20000)
+        mr_positions, mr_cash = self.ledger.get_state(2, 'mr', 20000)
+        assert mh_positions['AAPL']['quantity'] == 30
+        assert mh_positions['AAPL']['avg_cost_basis'] == pytest.approx(101.0)
+        assert mh_cash == pytest.approx(20000 - 30 * 101.0)
+        assert 'AAPL' not in mr_positions
+        assert mr_cash == pytest.approx(20000 - 50 * 100.0 + 30 * 101.0 + 20 * 100.0)
+
+    def test_queue_order_matching(self):
+        """Test several buyers are matched against sellers in queue order."""
+        first = self.netter.add(1, 'AAPL', 'buy', 20, 100.0)
+        second = self.netter.add(3, 'AAPL', 'buy', 40, 100.0)
+        sell = self.netter.add(2, 'AAPL', 'sell', 50, 100.0)
+        self.netter.submit()
+
+        assert (first.crossed, second.crossed, sell.crossed) == (20, 30, 50)
+        assert self.placed == [(3, 'AAPL', 'buy', 10)]
+
+    def test_reference_price_without_quote(self):
+        """Test crosses use the orders' average reference price when there is no quote."""
+        netter = OrderNetter(STRATEGIES, self.ledger, self._place, clock=self.client.now,
+                             prices=lambda symbols: {})
+        netter.add(1, 'AAPL', 'buy', 10, 100.0)
+        netter.add(2, 'AAPL', 'sell', 10, 102.0)
+        netter.submit()
+
+        positions, _ = self.ledger.get_state(1, 'mh', 20000)
+        assert positions['AAPL']['avg_cost_basis'] == pytest.approx(101.0)
+
+    def test_unrecorded_crosses_sent_in_full(self):
+        """Test orders go to the broker unnetted when the crosses cannot be recorded."""
+        def fail(*args):
+            raise RuntimeError('ledger unavailable')
+        self.ledger.record_internal_fills = fail
+
+        buy = self.netter.add(1, 'AAPL', 'buy', 30, 100.0)
+        self.netter.add(2, 'AAPL', 'sell', 50, 100.0)
+        self.netter.submit()
+
+        assert buy.crossed == 0
+        assert self.placed == [(1, 'AAPL', 'buy', 30), (2, 'AAPL', 'sell', 50)]
+
+    def test_disabled_sends_in_full(self):
+        """Test a disabled netter still queues orders but sends them uncrossed."""
+        netter = OrderNetter(STRATEGIES, self.ledger, self._place, clock=self.client.now, enabled=False)
+        netter.add(1, 'AAPL', 'buy', 30, 100.0)
+        netter.add(2, 'AAPL', 'sell', 50, 100.0)
+        netter.submit()
+
+        assert self.placed == [(1, 'AAPL', 'buy', 30), (2, 'AAPL', 'sell', 50)]
+
+    def test_failed_residual_reported(self):
+        """Test an order the broker rejects is marked failed."""
+        netter = OrderNetter(STRATEGIES, self.ledger, lambda orders: None, clock=self.client.now)
+        order = netter.add(1, 'MSFT', 'buy', 10, 100.0)
+        netter.submit()
+
+        assert not order.success
+        assert netter.get_stats()['failed'] == 1
+
+    def test_rebuild_keeps_internal_fills(self):
+        """Test rebuilding a ledger from broker history replays its crossed fills too."""
+        self.netter.add(1, 'AAPL', 'buy', 30, 100.0)
+        self.netter.add(2, 'AAPL', 'sell', 50, 100.0)
+        self.netter.submit()
+        before = self.ledger.get_state(2, 'mr', 20000)
+
+        assert self.ledger.rebuild(2, 'mr', 20000) == 3
+        assert self.ledger.get_state(2, 'mr', 20000) == before
+
+
+class TestExecutorNetting:
+    """The executor queues a cycle's orders with its netter."""
+
+    def test_orders_queued_during_cycle(self):
+        """Test submit_order queues while a netter runs and places directly otherwise."""
+        from strategy_executor import StrategyExecutor
+
+        client = _make_client()
+        client.place_order('AAPL', 4, 'buy', client_order_id='mr-AAPL-0')
+        executor = StrategyExecutor(client=client, publish=False)
+        executor.netter = executor.order_netter()
+        executor.submit_order(1, 'AAPL', 'buy', 10, 100.0, 'entry')
+        executor.submit_order(2, 'AAPL', 'sell', 4, 100.0, 'exit')
+        assert len(client.orders) == 1
+
+        executor.netter.submit()
+        executor.netter = None
+        assert [(o['client_order_id'].split('-')[0], o['side'], float(o['qty'])) for o in client.orders[1:]] == [
+            ('mh', 'buy', 6.0)
+        ]
+        positions, _ = executor.ledger.get_state(1, 'mh', 20000)
+        assert positions['AAPL']['quantity'] == 10
+
+        assert executor.ledger.get_state(2, 'mr', 20000)[0] == {}
+
+        executor.submit_order(1, 'MSFT', 'buy', 1, 100.0, 'entry')
+        assert len(client.orders) == 3
@@ -0,0 +1,179 @@
+"""Tests for concurrent order submission and fill tracking."""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from order_manager import ManagedOrder, OrderManager, client_order_id
+
+NOW = datetime(2026, 3, 2, 15, 0, tzinfo=timezone.utc)
+
+
+class FakeBroker:
+    """Orders endpoint stand-in: orders stay 'new' until filled by the test."""
+
+    def __init__(self, delay=0.0, status='new'):
+        self.delay = delay
+        self.status = status
+        self.orders = {}
+        self.requests = {'place': 0, 'list': 0, 'get': 0}
+        self.fail_next = []  # 'before' (request lost) or 'after' (response lost) per placement
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def now(self):
+        return NOW
+
+    def place_order(self, symbol, qty, side, order_type='market', time_in_force='day', client_order_id=None):
+        with self._lock:
+            self.requests['place'] += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            failure = self.fail_next.pop(0) if self.fail_next else None
+        try:
+            time.sleep(self.delay)
+            if failure == 'before':
+                raise ConnectionError('connection reset')
+            with self._lock:
+                if client_order_id in {o['client_order_id'] for o in self.orders.values()}:
+                    raise ValueError('client_order_id must be unique')
+                order = {
+                    'id': f'order-{len(self.orders) + 1}', 'client_order_id': client_order_id,
+                    'symbol': symbol, 'side': side, 'qty': str(qty), 'status': self.status,
+                    'submitted_at': NOW.isoformat(), 'created_at': NOW.isoformat()
+                }
+                self.orders[order['id']] = order
+            if failure == 'after':
+                raise TimeoutError('read timed out')
+            return dict(order)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def get_orders(self, status='all', limit=100, after=None):
+        self.requests['list'] += 1
+        return [dict(o) for o in self.orders.values()]
+
+    def get_order(self, order_id):
+        self.requests['get'] += 1
+        return dict(self.orders[order_id])
+
+    def fill(self, status='filled'):
+        for order in self.orders.values():
+            order['status'] = status
+
+
+def _orders(count, side='buy'):
+    return [
+        ManagedOrder(1, f'SYM{i}', side, 10, client_order_id('mh', f'SYM{i}', side, NOW))
+        for i in range(count)
+    ]
+
+
+class TestOrderManager:
+    """Tests for bounded concurrency, idempotent retries and fill polling."""
+
+    def test_submission_concurrent_and_bounded(self):
+        """Test orders are placed in parallel, never more than max_workers at once."""
+        broker = FakeBroker(delay=0.05, status='filled')
+        manager = OrderManager(broker, max_workers=4)
+
+        started = time.monotonic()
+        orders = manager.submit(_orders(12))
+        elapsed = time.monotonic() - started
+
+        assert all(order.status == 'filled' for order in orders)
+        assert broker.max_in_flight == 4
+        assert elapsed < 12 * 0.05 / 2
+        assert manager.get_stats()['submitted'] == 12
+
+    def test_lost_response_not_placed_twice(self):
+        """Test an order accepted before its response was lost is found by id, not resent."""
+        broker = FakeBroker(status='filled')
+        broker.fail_next = ['after']
+        manager = OrderManager(broker)
+
+        order, = manager.submit(_orders(1))
+        assert order.error is None
+        assert order.order['id'] == 'order-1'
+        assert broker.requests['place'] == 1
+        assert len(broker.orders) == 1
+        assert manager.get_stats()['recovered'] == 1
+
+    def test_lost_request_retried(self):
+        """Test an order that never reached the broker is retried with the same id."""
+        broker = FakeBroker(status='filled')
+        broker.fail_next = ['before']
+        manager = OrderManager(broker)
+
+        order, = manager.submit(_orders(1))
+        assert order.error is None
+        assert broker.requests['place'] == 2
+        assert [o['client_order_id'] for o in broker.orders.values()] == [order.client_order_id]
+
+    def test_failed_submission(self):
+        """Test an order failing every attempt is reported failed."""
+        broker = FakeBroker()
+        broker.fail_next = ['before', 'before']
+        manager = OrderManager(broker)
+
+        order, = manager.submit(_orders(1))
+        assert order.status == 'failed'
+        assert order.error == 'connection reset'
+        assert manager.get_stats()['failed'] == 1
+
+    def test_fills_polled_with_backoff(self):
+        """Test one request per poll round for all open orders, with doubling waits."""
+        broker = FakeBroker()
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            if len(waits) == 3:
+                broker.fill()
+
+        manager = OrderManager(broker, poll_interval=0.5, poll_max_interval=1.5, fill_timeout=30, sleep=sleep)
+        orders = manager.execute(_orders(5))
+
+        assert waits == [0.5, 1.0, 1.5]
+        assert broker.requests['list'] == 3
+        assert broker.requests['get'] == 0
+        assert all(order.status == 'filled' and order.filled_at is not None for order in orders)
+
+    def test_rejected_and_open_orders(self):
+        """Test rejections become errors and unfilled orders are left open at the timeout."""
+        broker = FakeBroker()
+        now = [0.0]
+        manager = OrderManager(broker, poll_interval=1, poll_max_interval=1, fill_timeout=3,
+                               clock=lambda: now[0], sleep=lambda s: now.__setitem__(0, now[0] + s))
+        orders = manager.execute(_orders(2))
+        assert [order.status for order in orders] == ['new', 'new']
+        assert all(order.error is None for order in orders)
+
+        broker.fill('rejected')
+        manager.track(orders)
+        assert [order.error for order in orders] == ['order rejected', 'order rejected']
+
+    def test_latency(self):
+        """Test signal-to-submit-to-fill latency per order and in the stats."""
+        broker = FakeBroker()
+        now = [10.0]
+        manager = OrderManager(broker, poll_interval=2, fill_timeout=10,
+                               clock=lambda: now[0], sleep=lambda s: (now.__setitem__(0, now[0] + s), broker.fill()))
+        order = ManagedOrder(1, 'AAPL', 'buy', 5, client_order_id('mh', 'AAPL', 'buy', NOW), signal_at=9.5)
+
+        manager.execute([order])
+        assert order.latency() == {'signal_to_submit': 0.5, 'submit_to_fill': 2.0, 'signal_to_fill': 2.5}
+        assert manager.get_stats()['signal_to_fill'] == {'median': 2.5, 'max': 2.5}
+
+    def test_client_order_id(self):
+        """Test ids carry the strategy slug first and are stable within a cycle."""
+        assert client_order_id('mh', 'AAPL', 'buy', NOW) == f'mh-AAPL-{int(NOW.timestamp())}-buy'
+        assert client_order_id('mh', 'AAPL', 'buy', NOW) == client_order_id('mh', 'AAPL', 'buy', NOW)
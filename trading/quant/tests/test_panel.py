@@ -0,0 +1,189 @@
+"""Tests for panel indicators and cross-sectional ranking."""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.indicators import calculate_rsi, calculate_sma
+from utils.panel import (
+    build_panel, panel_atr, panel_rsi, panel_sma, panel_sma_rsi, panel_volume_trend,
+    rank_panel, membership_mask, rebalance_dates, backtest_rotation
+)
+from strategies.sector_rotation import SectorRotationStrategy
+from strategies.value_dividend import ValueDividendStrategy
+
+
+def _make_market_data(symbols, n=320, seed=11, late=None):
+    """Build per-symbol OHLCV frames; ``late`` maps symbol -> bars skipped at the start."""
+    rng = np.random.RandomState(seed)
+    dates = pd.date_range('2022-01-03', periods=n, freq='B')
+    late = late or {}
+    market_data = {}
+    for symbol in symbols:
+        close = 50 * np.cumprod(1 + rng.normal(0.0004, 0.012, n))
+        df = pd.DataFrame({
+            'open': close,
+            'high': close * 1.01,
+            'low': close * 0.99,
+            'close': close,
+            'volume': rng.randint(1000000, 5000000, n),
+        }, index=dates)
+        market_data[symbol] = df.iloc[late.get(symbol, 0):]
+    return market_data
+
+
+class TestPanelIndicators:
+    """Panel indicators must match the per-symbol versions."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.market_data = _make_market_data(['AAA', 'BBB', 'CCC'], late={'CCC': 90})
+        self.close = build_panel(self.market_data)
+
+    def test_build_panel_aligns_union_of_dates(self):
+        """Test late listings get leading NaNs on the shared index."""
+        assert list(self.close.columns) == ['AAA', 'BBB', 'CCC']
+        assert len(self.close) == 320
+        assert self.close['CCC'].iloc[:90].isna().all()
+        assert self.close['CCC'].iloc[90:].notna().all()
+
+    def test_rsi_matches_per_symbol(self):
+        """Test panel RSI equals calculate_rsi for every symbol, including late listings."""
+        rsi = panel_rsi(self.close, 14)
+        for symbol, df in self.market_data.items():
+            expected = calculate_rsi(df['close'], 14)
+            pd.testing.assert_series_equal(
+                rsi[symbol].loc[df.index], expected, check_names=False
+            )
+
+    def test_sma_matches_per_symbol(self):
+        """Test panel SMA equals calculate_sma for every symbol."""
+        sma = panel_sma(self.close, 50)
+        for symbol, df in self.market_data.items():
+            expected = calculate_sma(df['close'], 50)
+            pd.testing.assert_series_equal(
+                sma[symbol].loc[df.index], expected, check_names=False
+            )
+
+    def test_selection_indicators_match_per_symbol(self):
+        """Test simple-average RSI, ATR and volume trend equal their per-symbol loops."""
+        panels = {field: build_panel(self.market_data, field) for field in ('high', 'low', 'volume')}
+        rsi = panel_sma_rsi(self.close, 14)
+        atr = panel_atr(panels['high'], panels['low'], self.close, 14)
+        volume_trend = panel_volume_trend(panels['volume'], 5, 20)
+
+        for symbol, df in self.market_data.items():
+            delta = df['close'].diff()
+            gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+            assert rsi[symbol].iloc[-1] == pytest.approx(100 - 100 / (1 + gain.iloc[-1] / loss.iloc[-1]))
+
+            true_range = pd.concat([
+                df['high'] - df['low'],
+                (df['high'] - df['close'].shift(1)).abs(),
+                (df['low'] - df['close'].shift(1)).abs()
+            ], axis=1).max(axis=1)
+            pd.testing.assert_series_equal(
+                atr[symbol].loc[df.index], true_range.rolling(window=14).mean(), check_names=False
+            )
+
+            recent = df['volume'].iloc[-5:].mean()
+            historic = df['volume'].iloc[-20:-5].mean()
+            assert volume_trend[symbol].iloc[-1] == pytest.approx((recent - historic) / historic)
+
+
+class TestRankPanel:
+    """Tests for vectorized per-date ranking."""
+
+    def test_ranks_descending_with_nans(self):
+        """Test highest score ranks first and NaNs are left unranked."""
+        scores = pd.DataFrame(
+            [[0.1, 0.3, np.nan], [0.5, 0.2, 0.9]],
+            columns=['A', 'B', 'C']
+        )
+        ranks = rank_panel(scores)
+
+        assert ranks.loc[0].tolist()[:2] == [2.0, 1.0]
+        assert np.isnan(ranks.loc[0, 'C'])
+        assert ranks.loc[1].tolist() == [2.0, 3.0, 1.0]
+
+    def test_membership_excludes_symbols(self):
+        """Test point-in-time membership removes symbols outside their window."""
+        dates = pd.date_range('2024-01-01', periods=4, freq='D')
+        scores = pd.DataFrame({'A': [1.0] * 4, 'B': [2.0] * 4}, index=dates)
+        membership = membership_mask(dates, scores.columns, {
+            'A': [(None, None)],
+            'B': [('2024-01-03', None)],
+        })
+        ranks = rank_panel(scores, membership)
+
+        assert ranks['A'].tolist() == [1.0, 1.0, 2.0, 2.0]
+        assert ranks['B'].isna().tolist() == [True, True, False, False]
+        assert ranks['B'].iloc[-1] == 1.0
+
+    def test_rebalance_dates_are_last_bar_of_week(self):
+        """Test weekly rebalance dates fall on the last bar of each week."""
+        dates = pd.date_range('2024-01-01', '2024-01-19', freq='B').drop(pd.Timestamp('2024-01-12'))
+        schedule = rebalance_dates(dates, 'W')
+
+        assert list(schedule.strftime('%Y-%m-%d')) == ['2024-01-05', '2024-01-11', '2024-01-19']
+
+
+class TestStrategyPanels:
+    """Panel scores must agree with the per-symbol ranking methods."""
+
+    def test_sector_scores_match_rank_sectors(self):
+        """Test the last panel row reproduces rank_sectors."""
+        strategy = SectorRotationStrategy()
+        market_data = _make_market_data(strategy.config['universe'] + ['SPY'], seed=3)
+
+        scores = strategy.score_panel(market_data)
+        expected = strategy.rank_sectors(market_data)
+
+        assert 'SPY' not in scores.columns
+        last = scores.iloc[-1].dropna().sort_values(ascending=False, kind='stable')
+        assert list(last.index) == [symbol for symbol, _ in expected]
+        np.testing.assert_allclose(last.values, [score for _, score in expected])
+
+    def test_value_scores_match_rank_value_stocks(self):
+        """Test the last panel row reproduces rank_value_stocks."""
+        strategy = ValueDividendStrategy()
+        market_data = _make_market_data(strategy.config['universe'], seed=5)
+
+        scores = strategy.score_panel(market_data)
+        expected = dict(strategy.rank_value_stocks(market_data))
+
+        last = scores.iloc[-1]
+        for symbol, score in expected.items():
+            assert last[symbol] == pytest.approx(score)
+
+    def test_history_requirement_masks_early_dates(self):
+        """Test symbols are not scored before they have enough bars."""
+        strategy = SectorRotationStrategy()
+        market_data = _make_market_data(['XLK', 'XLF'], late={'XLF': 100})
+        scores = strategy.score_panel(market_data)
+        needed = strategy.config['lookback_period'] + 10
+
+        assert scores['XLK'].iloc[:needed - 1].isna().all()
+        assert scores['XLF'].iloc[:100 + needed - 1].isna().all()
+        assert scores['XLF'].iloc[100 + needed - 1:].notna().any()
+
+    def test_weekly_rotation_backtest(self):
+        """Test a weekly rotation only holds ranked symbols and compounds returns."""
+        strategy = SectorRotationStrategy()
+        market_data = _make_market_data(strategy.config['universe'], n=400, seed=9)
+        close = build_panel(market_data)
+
+        result = backtest_rotation(close, strategy.score_panel(close), top=3)
+
+        assert list(result.columns) == ['return', 'equity']
+        assert len(result) == len(close)
+        assert (result['return'].iloc[:strategy.config['lookback_period'] + 10] == 0).all()
+        assert result['return'].abs().sum() > 0
+        np.testing.assert_allclose(
+            result['equity'].iloc[-1], (1 + result['return']).prod()
+        )
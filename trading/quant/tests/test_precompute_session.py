@@ -0,0 +1,89 @@
+"""Tests for the overnight session precompute job."""
+
+import pytest
+import pandas as pd
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicator_state import IndicatorStateStore
+from replay import ReplayAlpacaClient
+from scanner import UniverseScanner
+from strategy_executor import StrategyExecutor
+from tests.conftest import synthetic_store
+
+
+class TestPrecomputeSession:
+    """Tests for preparing a session from the bar store."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        pytest.importorskip('yfinance')
+        scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts')
+        sys.path.insert(0, os.path.abspath(scripts_dir))
+        from execute_trades import TradingExecutor
+        import precompute_session
+        self.TradingExecutor = TradingExecutor
+        self.precompute = precompute_session
+
+        symbols = {'SPY'}
+        for universe in TradingExecutor(publish=False).base_universes.values():
+            symbols.update(universe)
+        for strategy in StrategyExecutor(publish=False).strategies.values():
+            symbols.update(strategy['universe'])
+        self.symbols = sorted(symbols)
+
+        sessions = 110  # 2024-01-01 to Friday 2024-05-31
+        self.source = ReplayAlpacaClient(synthetic_store(self.symbols, sessions, seed=4))
+        self.source.set_time('2024-05-31T22:30:00Z')  # Friday evening
+        self.store = synthetic_store(self.symbols[:10], sessions - 3, seed=9)  # partly stale
+        self.state = IndicatorStateStore(':memory:')
+
+    def test_session_prepared_from_store(self):
+        """Test bars are refreshed, universes stored by next-session key and state warmed."""
+        summary = self.precompute.precompute_session(
+            client=self.source, store=self.store, indicator_state=self.state
+        )
+
+        assert summary['session'] == '2024-06-03T13:30:00+00:00'
+        assert summary['bars']['failed'] == 0
+        assert self.store.symbols('1Day') == self.symbols
+        assert self.store.get_info()['AAPL:1Day']['last'] == '2024-05-31T04:00:00Z'
+        assert set(summary['universes']) == {
+            'momentum-hunter_2024-06-03', 'volatility-breakout_2024-06-03',
+            'sector-rotator_2024-23', 'value-dividends_2024-23'
+        }
+        assert summary['indicator_state'] > 0
+
+    def test_open_adopts_precomputed_work(self):
+        """Test the 09:45 run reuses the universes and only advances the indicator state."""
+        summary = self.precompute.precompute_session(
+            client=self.source, store=self.store, indicator_state=self.state
+        )
+        session_bar = pd.Timestamp('2024-06-03').tz_localize('America/New_York').tz_convert('UTC')
+        for symbol in self.symbols:
+            self.store.write_frame(symbol, pd.DataFrame(
+                {'open': 60.0, 'high': 61.0, 'low': 59.0, 'close': 60.5, 'volume': 1e6}, index=[session_bar]
+            ))
+        client = ReplayAlpacaClient(self.store)
+        client.set_time('2024-06-03T13:45:00Z')
+
+        executor = self.TradingExecutor(client=client, publish=False, data_source='alpaca',
+                                         scanner=UniverseScanner(self.store))
+        requests = []
+        get_historical_bars = client.get_historical_bars
+        client.get_historical_bars = lambda *args, **kwargs: requests.append(kwargs) or \
+            get_historical_bars(*args, **kwargs)
+
+        assert executor.load_precomputed_universes() == 4
+        assert executor.get_dynamic_universe('momentum-hunter') == \
+            summary['universes']['momentum-hunter_2024-06-03']
+        assert not requests
+
+        client.get_historical_bars = get_historical_bars
+        rebuilt = self.state.stats['rebuilt']
+        strategy_executor = StrategyExecutor(client=client, publish=False, indicator_state=self.state)
+        strategy_executor.run_all_strategies()
+        assert self.state.stats['advanced'] > 0
+        assert self.state.stats['rebuilt'] == rebuilt
@@ -0,0 +1,124 @@
+"""Tests for the latest-quote cache."""
+
+import threading
+import time
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quote_cache import QuoteCache, quote_price
+
+
+class FakeQuotes:
+    """Quote endpoint stand-in recording each request."""
+
+    def __init__(self, delay=0.0):
+        self.requests = []
+        self.delay = delay
+
+    def __call__(self, symbols):
+        self.requests.append(list(symbols))
+        time.sleep(self.delay)
+        return {symbol: {'bp': 99.0, 'ap': 101.0} for symbol in symbols if symbol != 'NOQUOTE'}
+
+
+class TestQuoteCache:
+    """Tests for TTL reuse, batched misses and shared on-disk quotes."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.now = 1000.0
+        self.fetch = FakeQuotes()
+        self.cache = QuoteCache(self.fetch, path=':memory:', ttl=10, clock=lambda: self.now)
+
+    def test_misses_fetched_in_one_request(self):
+        """Test uncached symbols are fetched together and cached ones are not refetched."""
+        assert set(self.cache.get(['AAPL', 'MSFT'])) == {'AAPL', 'MSFT'}
+        self.now += 5
+        quotes = self.cache.get(['AAPL', 'MSFT', 'NVDA', 'TSLA', 'NOQUOTE'])
+
+        assert set(quotes) == {'AAPL', 'MSFT', 'NVDA', 'TSLA'}
+        assert self.fetch.requests == [['AAPL', 'MSFT'], ['NVDA', 'TSLA', 'NOQUOTE']]
+        stats = self.cache.get_stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 5
+        assert stats['requests'] == 2
+        assert stats['hit_rate'] == pytest.approx(2 / 7)
+
+    def test_quotes_expire_after_ttl(self):
+        """Test a quote older than the TTL is fetched again."""
+        self.cache.get(['AAPL'])
+        self.now += 9.9
+        self.cache.get(['AAPL'])
+        self.now += 0.2
+        self.cache.get(['AAPL'])
+        assert self.fetch.requests == [['AAPL'], ['AAPL']]
+
+    def test_disk_cache_shared_between_processes(self, tmp_path):
+        """Test a second cache on the same file (another process) reuses fresh quotes."""
+        path = str(tmp_path / 'quotes.db')
+        executor = QuoteCache(self.fetch, path=path, ttl=10, clock=lambda: self.now)
+        executor.get(['AAPL', 'MSFT'])
+
+        report_fetch = FakeQuotes()
+        report = QuoteCache(report_fetch, path=path, ttl=10, clock=lambda: self.now)
+        self.now += 3
+        assert report.get_prices(['AAPL', 'MSFT']) == {'AAPL': 100.0, 'MSFT': 100.0}
+        assert report_fetch.requests == []
+        assert report.get_stats()['disk_hits'] == 2
+
+        self.now += 10
+        report.get(['AAPL'])
+        assert report_fetch.requests == [['AAPL']]
+
+    def test_concurrent_misses_coalesced(self):
+        """Test callers missing the same symbols at once share one request."""
+        fetch = FakeQuotes(delay=0.05)
+        cache = QuoteCache(fetch, path=':memory:', ttl=10)
+        threads = [threading.Thread(target=cache.get, args=(['AAPL', 'MSFT'],)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert fetch.requests == [['AAPL', 'MSFT']]
+
+    def test_quote_price(self):
+        """Test the midpoint, and a one-sided quote."""
+        assert quote_price({'bp': 99.0, 'ap': 101.0}) == 100.0
+        assert quote_price({'ap': 101.0}) == 101.0
+
+
+class TestExecutorQuotes:
+    """The executor's price reads in one cycle share one quote request."""
+
+    def test_equity_and_prices_share_request(self):
+        """Test get_latest_prices after get_strategy_equity is served from the cache."""
+        import numpy as np
+        import pandas as pd
+        from bar_store import BarStore
+        from replay import ReplayAlpacaClient
+        from strategy_executor import StrategyExecutor
+
+        dates = pd.date_range('2024-01-01', periods=30, freq='B').tz_localize('UTC')
+        store = BarStore(':memory:')
+        for symbol in ('AAPL', 'MSFT'):
+            close = np.linspace(100, 110, len(dates))
+            store.write_frame(symbol, pd.DataFrame({
+                'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1e6
+            }, index=dates))
+        client = ReplayAlpacaClient(store)
+        client.set_time(dates[-1] + pd.Timedelta(hours=15))
+        client.place_order('AAPL', 5, 'buy', client_order_id='mh-AAPL-1')
+        client.place_order('MSFT', 5, 'buy', client_order_id='vd-MSFT-1')
+
+        requests = []
+        get_latest_quotes = client.get_latest_quotes
+        client.get_latest_quotes = lambda symbols: requests.append(symbols) or get_latest_quotes(symbols)
+        executor = StrategyExecutor(client=client, publish=False)
+
+        executor.get_strategy_equity()
+        assert executor.get_latest_prices(['AAPL', 'MSFT']) == pytest.approx({'AAPL': 110.0, 'MSFT': 110.0})
+        assert requests == [['AAPL', 'MSFT']]
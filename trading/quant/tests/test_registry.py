@@ -0,0 +1,134 @@
+"""Tests for the strategy registry."""
+
+import pytest
+import subprocess
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies import registry
+from strategies.base import Strategy
+from strategies.momentum import MomentumStrategy
+
+QUANT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _FakeEntryPoint:
+    """Minimal stand-in for importlib.metadata.EntryPoint."""
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+
+class TestStrategyRegistry:
+    """Tests for strategy registration and lookup."""
+
+    def teardown_method(self):
+        """Remove strategies registered by a test."""
+        for name in ('custom_momentum', 'by_path', 'plugin_strategy'):
+            registry.unregister_strategy(name)
+
+    def test_builtin_strategies_registered(self):
+        """Test the five built-in strategies are available with metadata."""
+        names = registry.list_strategies()
+        for name in ('momentum', 'mean_reversion', 'sector_rotation',
+                     'value_dividend', 'volatility_breakout'):
+            assert name in names
+
+        spec = registry.get_spec('sector_rotation')
+        assert spec.display_name == 'Sector Rotator'
+        assert spec.portfolio == 'sector-rotator'
+        assert spec.universe_key is True
+        assert 'XLK' in spec.universe
+
+    def test_create_strategy(self):
+        """Test creating a strategy applies the config override."""
+        strategy = registry.create_strategy('momentum', {'buy_threshold': 2})
+
+        assert isinstance(strategy, MomentumStrategy)
+        assert strategy.config['buy_threshold'] == 2
+
+    def test_unknown_strategy_raises(self):
+        """Test unknown names raise KeyError listing available strategies."""
+        with pytest.raises(KeyError, match='momentum'):
+            registry.get_spec('does_not_exist')
+
+    def test_register_class_and_path(self):
+        """Test strategies can be registered by class or import path."""
+        registry.register_strategy('custom_momentum', MomentumStrategy, display_name='Custom')
+        registry.register_strategy('by_path', 'strategies.momentum:MomentumStrategy')
+
+        assert registry.get_spec('custom_momentum').loaded
+        assert registry.get_spec('custom_momentum').target == 'strategies.momentum:MomentumStrategy'
+        assert registry.get_spec('by_path').display_name == 'By Path'
+        assert registry.load_strategy('by_path') is MomentumStrategy
+
+    def test_bad_target_raises(self):
+        """Test targets without a class part are rejected on load."""
+        registry.register_strategy('by_path', 'strategies.momentum')
+
+        with pytest.raises(ValueError):
+            registry.load_strategy('by_path')
+
+    def test_entry_point_discovery(self, monkeypatch):
+        """Test entry points register lazily and do not override built-ins."""
+        monkeypatch.setattr(registry, 'entry_points', lambda group: [
+            _FakeEntryPoint('plugin_strategy', 'strategies.momentum:MomentumStrategy'),
+            _FakeEntryPoint('momentum', 'somewhere.else:Other'),
+        ])
+
+        added = registry.discover_entry_points()
+
+        assert added == ['plugin_strategy']
+        assert not registry.get_spec('plugin_strategy').loaded
+        assert registry.get_spec('momentum').target == 'strategies.momentum:MomentumStrategy'
+        assert issubclass(registry.load_strategy('plugin_strategy'), Strategy)
+
+    def test_registry_import_is_lazy(self):
+        """Test importing the registry does not import strategy modules."""
+        code = (
+            "import sys; import strategies.registry as r; "
+            "r.list_strategies(); "
+            "loaded = [m for m in ('strategies.momentum', 'strategies.value_dividend', 'ta') "
+            "if m in sys.modules]; "
+            "print(','.join(loaded))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=QUANT_DIR,
+            capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == ''
+
+    def test_main_import_is_lazy(self):
+        """Test importing the entry point does not import strategy modules or ta."""
+        code = (
+            "import sys; import main; "
+            "loaded = [m for m in ('strategies.momentum', 'utils.indicators', 'ta') "
+            "if m in sys.modules]; "
+            "print(','.join(loaded))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=QUANT_DIR,
+            capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == ''
+
+    def test_utils_lazy_exports(self):
+        """Test only the indicator functions load lazily, and unknown names do not import ta."""
+        code = (
+            "import sys; import utils; "
+            "missing = not hasattr(utils, 'nope') and not hasattr(utils, 'pd'); "
+            "lazy = 'ta' not in sys.modules; "
+            "found = callable(utils.calculate_rsi) and 'ta' in sys.modules; "
+            "print(missing, lazy, found)"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=QUANT_DIR,
+            capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == 'True True True'
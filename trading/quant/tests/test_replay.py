@@ -0,0 +1,128 @@
+"""Tests for the bar store and shadow replay client."""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replay import ReplayAlpacaClient, replay_strategy_executor, trading_sessions
+from tests.conftest import synthetic_store
+
+SECTORS = ['XLK', 'XLF', 'XLE', 'XLV', 'XLI', 'XLP', 'XLU', 'XLY', 'XLC', 'XLRE', 'XLB']
+
+
+class TestBarStore:
+    """Tests for the SQLite bar store."""
+
+    def test_roundtrip_alpaca_format(self, tmp_path):
+        """Test bars come back in Alpaca's format and date order."""
+        store = synthetic_store(['AAA'], periods=10, path=tmp_path / 'bars.db')
+
+        bars = store.get_bars('AAA', start='2024-01-03', end='2024-01-05T23:59:59Z')
+
+        assert [bar['t'] for bar in bars] == [
+            '2024-01-03T05:00:00Z', '2024-01-04T05:00:00Z', '2024-01-05T05:00:00Z'
+        ]
+        assert set(bars[0]) == {'t', 'o', 'h', 'l', 'c', 'v'}
+        assert store.symbols() == ['AAA']
+
+
+class TestReplayClient:
+    """Tests for the replay stand-in for AlpacaClient."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.store = synthetic_store(['AAA', 'BBB'], periods=30)
+        self.client = ReplayAlpacaClient(self.store, initial_cash=10000, slippage=0.001)
+
+    def test_no_bars_after_simulated_time(self):
+        """Test bars and quotes never come from after the replay clock."""
+        self.client.set_time('2024-01-10T15:00:00Z')  # 10:00 ET: the 2024-01-10 bar is in progress
+
+        bars = self.client.get_historical_bars(['AAA', 'BBB'], start='2024-01-01', end='2024-12-31')
+        frame = self.store.load_frame('AAA')
+
+        assert bars['bars']['AAA'][-1]['t'] == '2024-01-09T05:00:00Z'
+        assert len(bars['bars']['BBB']) == 7
+        assert self.client.get_latest_quote('AAA')['bp'] == pytest.approx(frame['o'].iloc[7])
+
+        self.client.set_time('2024-01-10T14:00:00Z')  # 09:00 ET: not open yet
+        assert self.client.last_price('AAA') == pytest.approx(frame['c'].iloc[6])
+
+        self.client.set_time('2024-01-10T21:00:00Z')  # 16:00 ET: closed
+        bars = self.client.get_historical_bars(['AAA'], start='2024-01-01', end='2024-12-31')
+        assert bars['bars']['AAA'][-1]['t'] == '2024-01-10T05:00:00Z'
+        assert self.client.last_price('AAA') == pytest.approx(frame['c'].iloc[7])
+
+    def test_intraday_bars_visible_once_closed(self):
+        """Test an intraday bar appears at its start plus the timeframe."""
+        index = pd.date_range('2024-01-10T14:30:00Z', periods=6, freq='5min')
+        self.store.write_frame('AAA', pd.DataFrame({
+            'open': np.arange(6) + 100.0, 'high': np.arange(6) + 101.0, 'low': np.arange(6) + 99.0,
+            'close': np.arange(6) + 100.5, 'volume': 1000.0
+        }, index=index), '5Min')
+        client = ReplayAlpacaClient(self.store, quote_timeframe='5Min')
+        client.set_time('2024-01-10T14:42:00Z')
+
+        bars = client.get_historical_bars(['AAA'], timeframe='5Min', start='2024-01-10', end='2024-01-10')
+
+        assert [bar['t'] for bar in bars['bars']['AAA']] == ['2024-01-10T14:30:00Z', '2024-01-10T14:35:00Z']
+        assert client.last_price('AAA') == 102.0
+
+    def test_bars_paginate_like_alpaca(self):
+        """Test a small page size returns the same bars across next_page_token pages."""
+        self.client.set_time('2024-02-09T21:00:00Z')  # After the last session's close
+
+        paged = self.client.get_historical_bars(['BBB', 'AAA'], start='2024-01-01', end='2024-12-31', limit=7)
+        single = self.client.get_historical_bars(['BBB', 'AAA'], start='2024-01-01', end='2024-12-31')
+
+        assert paged == single
+        assert len(single['bars']['AAA']) == len(single['bars']['BBB']) == 30
+
+    def test_fills_update_account_and_orders(self):
+        """Test market orders fill at the simulated price and appear in order history."""
+        self.client.set_time('2024-01-10T15:00:00Z')
+        price = self.client.last_price('AAA')
+
+        order = self.client.place_order('AAA', 10, 'buy', client_order_id='mh-AAA-1')
+        self.client.set_time('2024-01-11T15:00:00Z')
+        self.client.place_order('AAA', 4, 'sell', client_order_id='mh-AAA-2')
+
+        assert order['status'] == 'filled'
+        assert float(order['filled_avg_price']) == pytest.approx(price * 1.001)
+        assert [o['client_order_id'] for o in self.client.get_orders_by_client_prefix('mh')] == [
+            'mh-AAA-2', 'mh-AAA-1'
+        ]
+        assert float(self.client.get_position('AAA')['qty']) == 6
+        with pytest.raises(ValueError):
+            self.client.place_order('AAA', 1, 'buy', client_order_id='mh-AAA-1')
+
+    def test_clock_follows_session_hours(self):
+        """Test the clock is open only during regular weekday hours."""
+        self.client.set_time('2024-01-10T15:00:00Z')  # 10:00 ET Wednesday
+        assert self.client.is_market_open()
+
+        self.client.set_time('2024-01-13T15:00:00Z')  # Saturday
+        assert not self.client.is_market_open()
+
+
+class TestShadowReplay:
+    """Tests for replaying StrategyExecutor over stored bars."""
+
+    def test_sector_rotator_replay_matches_order_history(self, tmp_path):
+        """Test a replay trades and that strategy state equals the replayed fills."""
+        store = synthetic_store(SECTORS, periods=90, seed=4, path=tmp_path / 'bars.db')
+
+        result = replay_strategy_executor(store, '2024-02-15', '2024-05-03', strategy_ids=[3])
+
+        sessions = trading_sessions(store, '2024-02-15', '2024-05-03')
+        assert result['sessions'] == len(sessions)
+        assert result['orders'] > 0
+
+        summary = result['strategies'][3]
+        assert summary['name'] == 'Sector Rotator'
+        assert len(summary['positions']) <= 3
+        assert summary['cash'] >= 0
@@ -0,0 +1,170 @@
+"""Tests for the batch pre-trade risk check."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from signals.generator import SignalAggregator
+from strategies.base import Signal
+from utils.risk import RiskManager
+
+
+def _reference_check(manager, symbols, prices, confidence, quantities, sides, stop_pct, min_confidence):
+    """The documented rules applied one order at a time."""
+    count = len(prices)
+    pv = manager.portfolio_value
+    reasons = [''] * count
+    for i in range(count):
+        if not prices[i] > 0:
+            reasons[i] = 'invalid_price'
+        elif quantities[i] <= 0:
+            reasons[i] = 'zero_quantity'
+        elif not confidence[i] >= min_confidence:
+            reasons[i] = 'low_confidence'
+
+    allocation = manager._calculate_total_allocation() * pv
+    heat = manager.calculate_portfolio_heat() * pv
+    symbol_value = {symbol: abs(p['quantity']) * p['current_price'] for symbol, p in manager.positions.items()}
+    slots, opened, refused = len(manager.positions), set(), set()
+    for i in sorted(range(count), key=lambda i: (-confidence[i], i)):
+        if reasons[i] or sides[i] != 'buy':
+            continue
+        value = quantities[i] * prices[i]
+        symbol_value[symbols[i]] = symbol_value.get(symbols[i], 0.0) + value
+        if symbol_value[symbols[i]] > pv * config.MAX_POSITION_PCT:
+            reasons[i] = 'position_limit'
+            continue
+        allocation += value
+        heat += value * stop_pct[i]
+        new_symbol = symbols[i] not in manager.positions
+        if new_symbol and symbols[i] not in opened and symbols[i] not in refused:
+            slots += 1
+            if slots > config.MAX_POSITIONS:
+                refused.add(symbols[i])
+            else:
+                opened.add(symbols[i])
+        if allocation > pv * config.MAX_PORTFOLIO_PCT:
+            reasons[i] = 'portfolio_allocation'
+        elif heat > pv * config.MAX_PORTFOLIO_HEAT:
+            reasons[i] = 'portfolio_heat'
+        elif new_symbol and symbols[i] in refused:
+            reasons[i] = 'max_positions'
+    return reasons
+
+
+class TestCheckOrders:
+    """Tests for RiskManager.check_orders."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.manager = RiskManager(100000)
+
+    def test_sizes_match_single_order_sizing(self):
+        """Test batch sizing matches calculate_position_size, and bad prices get no shares."""
+        prices = [3.0, 17.5, 250.0, 1999.0, 30000.0]
+        expected = [self.manager.calculate_position_size('X', price) for price in prices]
+
+        assert self.manager.size_orders(prices + [0.0, np.nan]).tolist() == expected + [0, 0]
+
+    def test_single_orders_match_position_limits(self):
+        """Test an order alone is accepted exactly when check_position_limits accepts it."""
+        for i in range(9):
+            self.manager.update_position(f"H{i}", 80, 100.0)  # 9 positions, 72% allocated
+        cases = [('NEW', 10, 100.0), ('NEW', 300, 100.0), ('NEW', 90, 100.0), ('H1', 50, 100.0)]
+        for symbol, quantity, price in cases:
+            allowed, _ = self.manager.check_position_limits(symbol, quantity, price)
+            check = self.manager.check_orders([symbol], [price], [0.8], quantities=[quantity])
+            assert check.accepted[0] == allowed, (symbol, quantity, check.reasons[0])
+
+        self.manager.update_position('H9', 1, 100.0)
+        assert self.manager.check_orders(['NEW'], [100.0], [0.8], quantities=[10]).reasons[0] == 'max_positions'
+
+    def test_priority_by_confidence(self, monkeypatch):
+        """Test the highest-confidence orders get the slots, ties in input order."""
+        monkeypatch.setattr(config, 'MAX_POSITIONS', 2)
+        check = self.manager.check_orders(
+            ['A', 'B', 'C', 'D'], [100.0] * 4, [0.5, 0.9, 0.7, 0.7], quantities=[10] * 4
+        )
+
+        assert check.priority.tolist() == [1, 2, 3, 0]
+        assert check.quantities.tolist() == [0, 10, 10, 0]
+        assert check.reasons.tolist() == ['max_positions', '', '', 'max_positions']
+        assert check.counts() == {'accepted': 2, 'max_positions': 2}
+
+    def test_running_caps(self):
+        """Test allocation and heat are running totals a later, smaller order cannot squeeze under."""
+        allocation = self.manager.check_orders(['A', 'B', 'C', 'D', 'E', 'F'], [100.0] * 6,
+                                               [0.9, 0.9, 0.9, 0.9, 0.8, 0.7], quantities=[200] * 5 + [1])
+        assert allocation.reasons.tolist() == [''] * 4 + ['portfolio_allocation'] * 2
+
+        heat = self.manager.check_orders(['A', 'B', 'C', 'D', 'E'], [100.0] * 5, [0.9] * 5,
+                                         quantities=[150] * 5, stop_pct=0.1)
+        assert heat.reasons.tolist() == [''] * 4 + ['portfolio_heat']
+
+    def test_positions_and_sides(self):
+        """Test orders add up with the held position in a symbol, and sells are not limited."""
+        self.manager.update_position('AAPL', 100, 150.0)
+        check = self.manager.check_orders(
+            ['AAPL', 'AAPL', 'MSFT'], [200.0, 200.0, 500.0], [0.9, 0.8, 0.7],
+            quantities=[20, 20, 200], sides=['buy', 'buy', 'sell']
+        )
+
+        assert check.reasons.tolist() == ['', 'position_limit', '']
+        assert check.quantities.tolist() == [20, 0, 200]
+
+    def test_order_level_rejections(self):
+        """Test bad prices, empty sizes, low confidence and the daily loss limit."""
+        check = self.manager.check_orders(['A', 'B', 'C', 'D'], [0.0, 10.0, 10.0, 10.0], [0.9, 0.9, 0.1, 0.9],
+                                          quantities=[5, 0, 5, 5], min_confidence=0.3)
+        assert check.reasons.tolist() == ['invalid_price', 'zero_quantity', 'low_confidence', '']
+
+        self.manager.update_daily_pnl(-5000)
+        check = self.manager.check_orders(['A', 'B'], [10.0, 10.0], [0.9, 0.1], min_confidence=0.3)
+        assert check.reasons.tolist() == ['daily_loss', 'low_confidence']
+        assert check.quantities.tolist() == [0, 0]
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_matches_order_at_a_time_rules(self, seed):
+        """Test the vectorized pass agrees with the rules applied order by order."""
+        rng = np.random.RandomState(seed)
+        for i in range(6):
+            self.manager.update_position(f"S{i:02d}", int(rng.randint(10, 120)), float(rng.uniform(20, 150)))
+        count = 400
+        symbols = [f"S{i:02d}" for i in rng.randint(0, 40, count)]
+        prices = np.round(rng.uniform(5, 400, count), 2)
+        prices[rng.rand(count) < 0.02] = 0.0
+        confidence = np.round(rng.uniform(0, 1, count), 2)
+        quantities = rng.randint(0, 40, count)
+        sides = np.where(rng.rand(count) < 0.8, 'buy', 'sell')
+        stop_pct = rng.uniform(0.01, 0.08, count)
+
+        check = self.manager.check_orders(symbols, prices, confidence, quantities, sides, stop_pct, 0.2)
+
+        expected = _reference_check(self.manager, symbols, prices, confidence, quantities, sides, stop_pct, 0.2)
+        assert check.reasons.tolist() == expected
+        assert check.quantities.tolist() == [q if not r else 0 for q, r in zip(quantities, expected)]
+
+
+class TestAggregatorRiskFilters:
+    """SignalAggregator sizes and filters its signals through one batch check."""
+
+    def test_filters_and_sizes(self, monkeypatch):
+        """Test low-confidence and over-limit signals are dropped and the rest sized."""
+        monkeypatch.setattr(config, 'MAX_POSITIONS', 2)
+        aggregator = SignalAggregator(risk_manager=RiskManager(100000))
+        now = pd.Timestamp('2024-01-02')
+        signals = [
+            Signal(symbol='A', action='buy', confidence=0.6, price=100.0, reason='', timestamp=now),
+            Signal(symbol='B', action='buy', confidence=0.2, price=100.0, reason='', timestamp=now),
+            Signal(symbol='C', action='buy', confidence=0.9, price=40.0, reason='', timestamp=now),
+            Signal(symbol='D', action='buy', confidence=0.5, price=100.0, reason='', timestamp=now),
+        ]
+
+        filtered = aggregator._apply_risk_filters(signals)
+
+        assert [(s.symbol, s.quantity) for s in filtered] == [('C', 50), ('A', 20)]
@@ -0,0 +1,96 @@
+"""Tests for the full-market universe scanner."""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from scanner import UniverseScanner
+from tests.conftest import synthetic_store
+
+NOW = pd.Timestamp('2024-06-03T13:30:00Z')
+
+
+def _make_store(n_symbols=40, periods=150, seed=8):
+    """Bar store with random walks, one strong trend (TREND) and one illiquid trend (THIN)."""
+    symbols = [f'S{i:02d}' for i in range(n_symbols)] + ['TREND', 'THIN']
+    return synthetic_store(symbols, periods, seed, drift=0.0, volatility=0.015, volume_range=(1e6, 3e6),
+                           drifts={'TREND': 0.02, 'THIN': 0.02}, volumes={'THIN': 100.0})
+
+
+class TestUniverseScanner:
+    """Tests for scanning, ranking and the candidate cache."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.store = _make_store()
+        self.scanner = UniverseScanner(self.store)
+
+    def test_scan_ranks_liquid_candidates(self):
+        """Test the strongest liquid trend ranks first and illiquid symbols are dropped."""
+        result = self.scanner.scan(now=NOW, top=10)
+
+        assert result['symbols'] == 42
+        assert result['liquid'] == 41
+        assert result['candidates']['momentum'][0] == 'TREND'
+        assert 'THIN' not in sum(result['candidates'].values(), [])
+        assert self.scanner.get_candidates('momentum', limit=3) == result['candidates']['momentum'][:3]
+        assert len(self.scanner.get_candidates('atr_expansion')) == 10
+
+    def test_chunking_does_not_change_ranking(self, monkeypatch):
+        """Test scoring in small chunks ranks exactly like a single chunk."""
+        whole = self.scanner.scan(now=NOW)['candidates']
+        monkeypatch.setattr(config, 'SCANNER_CHUNK_SIZE', 7)
+
+        assert self.scanner.scan(now=NOW)['candidates'] == whole
+
+    def test_stale_scan_is_ignored(self):
+        """Test candidates older than max_age are not returned."""
+        self.scanner.scan(now=NOW)
+        max_age = pd.Timedelta(hours=24)
+
+        assert self.scanner.get_candidates('momentum', max_age=max_age, now=NOW + pd.Timedelta(hours=2))
+        assert self.scanner.get_candidates('momentum', max_age=max_age, now=NOW + pd.Timedelta(days=2)) == []
+
+    def test_precomputed_universes_by_cache_key(self):
+        """Test universes stored ahead of a session are returned for their cache key only."""
+        self.scanner.save_universes({'momentum-hunter_2024-06-03': ['TREND', 'S01']}, computed_at=NOW)
+
+        assert self.scanner.get_universe('momentum-hunter_2024-06-03') == ['TREND', 'S01']
+        assert self.scanner.get_universe('momentum-hunter_2024-06-04') is None
+
+    def test_load_panels_matches_load_frame(self):
+        """Test the bulk panel read returns each symbol's stored bars up to the end time."""
+        panels = self.store.load_panels(['S01', 'TREND', 'MISSING'], start='2024-03-01', end=NOW)
+        frame = self.store.load_frame('TREND')
+        frame = frame[(frame.index >= '2024-03-01') & (frame.index <= NOW)]
+
+        assert list(panels['close'].columns) == ['S01', 'TREND']
+        np.testing.assert_allclose(panels['close']['TREND'].values, frame['c'].values)
+        np.testing.assert_allclose(panels['volume']['TREND'].values, frame['v'].values)
+
+    def test_executor_selects_from_fresh_candidates(self):
+        """Test TradingExecutor replaces scanned base universes only while the scan is fresh."""
+        pytest.importorskip('yfinance')
+        scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts')
+        sys.path.insert(0, os.path.abspath(scripts_dir))
+        from execute_trades import TradingExecutor
+        from replay import ReplayAlpacaClient
+
+        client = ReplayAlpacaClient(self.store)
+        executor = TradingExecutor(client=client, publish=False, data_source='alpaca', scanner=self.scanner)
+        self.scanner.scan(now=NOW)
+
+        client.set_time(NOW + pd.Timedelta(minutes=15))
+        assert executor.get_base_universe('momentum-hunter') == \
+            self.scanner.get_candidates('momentum', limit=config.SCANNER_CANDIDATES)
+        assert executor.get_base_universe('sector-rotator') == executor.base_universes['sector-rotator']
+        assert set(executor.get_dynamic_universe('momentum-hunter')) <= \
+            set(executor.get_base_universe('momentum-hunter'))
+
+        client.set_time(NOW + pd.Timedelta(days=3))
+        assert executor.get_base_universe('momentum-hunter') == executor.base_universes['momentum-hunter']
@@ -0,0 +1,95 @@
+"""Tests for the market calendar and the strategy scheduler."""
+
+from datetime import date, datetime, timezone
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from market_calendar import MarketCalendar
+from scheduler import StrategyScheduler
+
+SCHEDULES = {
+    'momentum': {'execution_schedule': 'daily', 'execution_time': '09:45'},
+    'mean_reversion': {'execution_schedule': 'every_30min'},
+    'rotation': {'execution_schedule': 'weekly', 'execution_time': '10:00', 'execution_day': 'Monday'},
+    'runner': {'execution_schedule': 'every_5min'},
+}
+
+
+def _utc(text):
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc)
+
+
+class TestMarketCalendar:
+    """Tests for sessions from the calendar file."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.calendar = MarketCalendar()
+
+    def test_session_hours_follow_dst(self):
+        """Test the open is 13:30Z in summer and 14:30Z in winter."""
+        summer_open, _ = self.calendar.session(date(2026, 6, 1))
+        winter_open, _ = self.calendar.session(date(2026, 12, 1))
+        assert summer_open.astimezone(timezone.utc) == _utc('2026-06-01T13:30:00')
+        assert winter_open.astimezone(timezone.utc) == _utc('2026-12-01T14:30:00')
+
+    def test_holidays_and_early_closes(self):
+        """Test holidays have no session and early closes end at 13:00."""
+        assert self.calendar.session(date(2026, 11, 26)) is None
+        _, close = self.calendar.session(date(2026, 11, 27))
+        assert close.astimezone(timezone.utc) == _utc('2026-11-27T18:00:00')
+        assert not self.calendar.is_open(_utc('2026-11-27T19:00:00'))
+        assert self.calendar.is_open(_utc('2026-11-27T17:59:00'))
+
+    def test_next_session_skips_weekend_and_holiday(self):
+        """Test the next session after Friday's close of a holiday weekend."""
+        open_at, _ = self.calendar.next_session(_utc('2026-01-16T22:00:00'))
+        assert open_at.date() == date(2026, 1, 20)
+
+
+class TestStrategyScheduler:
+    """Tests for exact run times and due bookkeeping."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.scheduler = StrategyScheduler(SCHEDULES, interval_minutes=5, grace_minutes=5)
+
+    def test_daily_run_in_exchange_time(self):
+        """Test 09:45 New York is 13:45Z in summer and 14:45Z in winter."""
+        assert self.scheduler.next_run('momentum', _utc('2026-07-01T12:00:00')) == _utc('2026-07-01T13:45:00')
+        assert self.scheduler.next_run('momentum', _utc('2026-12-01T12:00:00')) == _utc('2026-12-01T14:45:00')
+
+    def test_intraday_runs_stop_at_early_close(self):
+        """Test every_30min runs from the open until a 13:00 early close."""
+        session = self.scheduler.calendar.session(date(2026, 11, 27))
+        runs = self.scheduler.run_times('mean_reversion', session)
+        assert runs[0].strftime('%H:%M') == '09:30'
+        assert runs[-1].strftime('%H:%M') == '12:30'
+        assert len(runs) == 7
+
+    def test_weekly_run_moves_off_holiday(self):
+        """Test a Monday run moves to Tuesday when Monday is a holiday."""
+        assert self.scheduler.next_run('rotation', _utc('2026-01-17T00:00:00')) == _utc('2026-01-20T15:00:00')
+        assert self.scheduler.next_run('rotation', _utc('2026-01-20T16:00:00')) == _utc('2026-01-26T15:00:00')
+
+    def test_due_fires_once(self):
+        """Test a run is due once, then moves on to the next run."""
+        assert self.scheduler.due(_utc('2026-07-01T13:44:00'), ['momentum']) == []
+        assert self.scheduler.is_due('momentum', _utc('2026-07-01T13:45:30'))
+        assert self.scheduler.due(_utc('2026-07-01T13:45:30'), ['momentum']) == ['momentum']
+        assert self.scheduler.due(_utc('2026-07-01T13:47:00'), ['momentum']) == []
+        assert self.scheduler.next_run('momentum', _utc('2026-07-01T13:47:00')) == _utc('2026-07-02T13:45:00')
+
+    def test_grace_window(self):
+        """Test a run missed by less than the grace still fires, an older one is skipped."""
+        late = StrategyScheduler(SCHEDULES, grace_minutes=5)
+        assert late.due(_utc('2026-07-01T13:49:00'), ['momentum']) == ['momentum']
+        missed = StrategyScheduler(SCHEDULES, grace_minutes=5)
+        assert missed.due(_utc('2026-07-01T13:51:00'), ['momentum']) == []
+        assert missed.next_run('momentum', _utc('2026-07-01T13:51:00')) == _utc('2026-07-02T13:45:00')
+
+    def test_no_runs_while_closed(self):
+        """Test the next event after the close is the next session's open."""
+        assert self.scheduler.next_event(_utc('2026-07-02T20:30:00')) == _utc('2026-07-06T13:30:00')
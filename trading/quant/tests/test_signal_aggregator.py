@@ -0,0 +1,154 @@
+"""Tests for concurrent strategy evaluation in SignalAggregator."""
+
+import time
+import pytest
+import pandas as pd
+import numpy as np
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signals.generator import SignalAggregator
+from strategies.base import Signal
+from strategies.momentum import MomentumStrategy
+from strategies.mean_reversion import MeanReversionStrategy
+
+SYMBOLS = [f"S{i:02d}" for i in range(12)]
+
+
+def _make_market_data(symbols, n=200, seed=1):
+    """Build per-symbol OHLCV frames."""
+    rng = np.random.RandomState(seed)
+    dates = pd.date_range('2023-01-02', periods=n, freq='B')
+    market_data = {}
+    for symbol in symbols:
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.025, n))
+        market_data[symbol] = pd.DataFrame({
+            'open': close,
+            'high': close * 1.01,
+            'low': close * 0.99,
+            'close': close,
+            'volume': rng.randint(1000000, 5000000, n),
+        }, index=dates)
+    return market_data
+
+
+class _SlowStrategy(MomentumStrategy):
+    """Momentum strategy that stalls on every symbol."""
+
+    def generate_signals(self, data, symbol=None):
+        time.sleep(0.2)
+        return super().generate_signals(data, symbol=symbol)
+
+
+class _FailingStrategy(MomentumStrategy):
+    """Momentum strategy that raises on one symbol."""
+
+    def generate_signals(self, data, symbol=None):
+        if symbol == 'S03':
+            raise RuntimeError("bad data")
+        return [Signal(symbol=symbol, action='buy', confidence=0.9, price=float(data['close'].iloc[-1]),
+                       reason='always', timestamp=data.index[-1])]
+
+
+def _aggregator(mode, **kwargs):
+    aggregator = SignalAggregator(execution_mode=mode, max_workers=4, **kwargs)
+    aggregator.update_universe(SYMBOLS)
+    aggregator.add_strategy('momentum', MomentumStrategy({'buy_threshold': 1, 'sell_threshold': -1}))
+    aggregator.add_strategy('mean_reversion', MeanReversionStrategy())
+    return aggregator
+
+
+def _describe(signals):
+    return [(s.symbol, s.action, round(s.confidence, 12), s.reason) for s in signals]
+
+
+class TestSignalAggregatorExecution:
+    """Pooled modes must match serial evaluation."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.data = _make_market_data(SYMBOLS)
+
+    @pytest.mark.parametrize('mode', ['thread', 'process'])
+    def test_pooled_matches_serial(self, mode):
+        """Test thread and process pools produce the serial result in the same order."""
+        expected = _aggregator('serial').generate_signals(self.data)
+        aggregator = _aggregator(mode)
+        result = aggregator.generate_signals(self.data)
+
+        assert len(expected) > 0
+        assert _describe(result) == _describe(expected)
+        stats = aggregator.get_timing_stats()
+        assert stats['mode'] == mode
+        assert stats['tasks'] == 2 * len(SYMBOLS)
+        assert stats['strategies']['momentum']['tasks'] == len(SYMBOLS)
+        assert all(t['status'] == 'ok' for t in stats['task_timings'])
+
+    def test_errors_are_isolated_per_task(self):
+        """Test one failing symbol does not drop the strategy's other signals."""
+        aggregator = SignalAggregator(execution_mode='thread', max_workers=4)
+        aggregator.update_universe(SYMBOLS)
+        aggregator.add_strategy('flaky', _FailingStrategy())
+
+        aggregator.generate_signals(self.data)
+        stats = aggregator.get_timing_stats()['strategies']['flaky']
+
+        assert stats['errors'] == 1
+        assert stats['signals'] == len(SYMBOLS) - 1
+
+    @pytest.mark.parametrize('mode', ['serial', 'thread'])
+    def test_time_budget_drops_slow_strategy(self, mode):
+        """Test a strategy over its budget is cut short while others complete."""
+        aggregator = _aggregator(mode, strategy_time_budget=0.5)
+        aggregator.add_strategy('slow', _SlowStrategy())
+
+        aggregator.generate_signals(self.data)
+        stats = aggregator.get_timing_stats()['strategies']
+
+        assert stats['slow']['timed_out'] > 0
+        assert stats['momentum']['timed_out'] == 0
+
+    @pytest.mark.parametrize('mode', ['serial', 'thread'])
+    def test_budget_per_strategy(self, mode):
+        """Test a named budget overrides the default for that strategy only."""
+        aggregator = _aggregator(mode, strategy_time_budgets={'slow': 0.3})
+        aggregator.add_strategy('slow', _SlowStrategy())
+
+        aggregator.generate_signals(self.data)
+        stats = aggregator.get_timing_stats()['strategies']
+
+        assert aggregator.time_budget('slow') == 0.3 and aggregator.time_budget('momentum') is None
+        assert 0 < stats['slow']['timed_out'] < len(SYMBOLS)
+        assert stats['momentum']['timed_out'] == 0
+
+    def test_queued_strategy_keeps_its_budget(self):
+        """Test a strategy's budget starts when its first task runs, not when the cycle starts."""
+        aggregator = SignalAggregator(execution_mode='thread', max_workers=1, strategy_time_budget=0.9)
+        aggregator.update_universe(SYMBOLS[:3])
+        aggregator.add_strategy('first', _SlowStrategy())
+        aggregator.add_strategy('second', _SlowStrategy())
+
+        aggregator.generate_signals(self.data)
+        stats = aggregator.get_timing_stats()
+
+        assert stats['wall_seconds'] >= 1.2
+        assert stats['strategies']['second']['timed_out'] == 0
+
+    def test_pool_kept_across_cycles(self):
+        """Test consecutive cycles reuse one worker pool until close()."""
+        aggregator = _aggregator('process')
+        aggregator.generate_signals(self.data)
+        pool = aggregator._pool
+
+        aggregator.generate_signals(self.data)
+
+        assert pool is not None and aggregator._pool is pool
+        aggregator.close()
+        assert aggregator._pool is None
+
+    def test_invalid_mode_raises(self):
+        """Test unknown execution modes are rejected."""
+        with pytest.raises(ValueError):
+            SignalAggregator(execution_mode='gpu')
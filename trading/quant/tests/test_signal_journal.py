@@ -0,0 +1,137 @@
+"""Tests for the append-only signal journal."""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from signals.generator import SignalAggregator
+from signals.journal import SignalJournal
+from strategies.base import Signal
+from strategies.momentum import MomentumStrategy
+
+
+def _signal(symbol, action='buy', confidence=0.8, price=100.0, reason='test'):
+    return Signal(symbol=symbol, action=action, confidence=confidence, price=price,
+                  reason=reason, timestamp=pd.Timestamp('2025-03-03'))
+
+
+class TestSignalJournal:
+    """Tests for recording, querying and compacting the journal."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.start = pd.Timestamp('2025-03-03 14:30', tz='UTC')
+
+    def test_roundtrip_and_time_range(self, tmp_path):
+        """Test signals come back with every field and only from the requested range."""
+        journal = SignalJournal(str(tmp_path))
+        for i in range(5):
+            signals = [_signal('AAPL', confidence=0.5 + i / 10, reason=f'cycle {i} – ü'),
+                       {'symbol': 'MSFT', 'action': 'sell', 'price': 300.0, 'reason': 'exit', 'confidence': 0.7}]
+            journal.record(signals, source='strategy_executor', strategy='Momentum Hunter',
+                           timestamp=self.start + pd.Timedelta(minutes=5 * i))
+            journal.flush()
+
+        df = journal.load(self.start + pd.Timedelta(minutes=5), self.start + pd.Timedelta(minutes=15))
+
+        assert len(df) == 6
+        assert df['timestamp'].is_monotonic_increasing
+        assert list(df['symbol'][:2]) == ['AAPL', 'MSFT']
+        assert df['reason'].iloc[0] == 'cycle 1 – ü'
+        assert df['confidence'].iloc[0] == pytest.approx(0.6)
+        assert set(df['strategy']) == {'Momentum Hunter'}
+        assert len(journal.segments(self.start + pd.Timedelta(minutes=5),
+                                    self.start + pd.Timedelta(minutes=15))) == 3
+
+        aapl = journal.load(symbols=['AAPL'], include_text=False)
+        assert len(aapl) == 5 and 'reason' not in aapl.columns
+
+    def test_replay_returns_signals(self, tmp_path):
+        """Test replay yields Signal objects with strategy and bar time."""
+        journal = SignalJournal(str(tmp_path))
+        signal = _signal('NVDA')
+        signal.reasoning = {'rsi': 61.2}
+        journal.record([signal], source='aggregator', strategy='momentum', timestamp=self.start)
+        journal.flush()
+
+        replayed = list(journal.replay())
+
+        assert len(replayed) == 1
+        assert replayed[0].symbol == 'NVDA'
+        assert replayed[0].action == 'buy'
+        assert replayed[0].strategy_name == 'momentum'
+        assert replayed[0].reasoning == {'rsi': 61.2}
+        assert replayed[0].timestamp == pd.Timestamp('2025-03-03', tz='UTC')
+        assert replayed[0].journal_timestamp == self.start
+
+    def test_compact_merges_completed_days(self, tmp_path):
+        """Test compaction leaves one segment per past day without changing the contents."""
+        journal = SignalJournal(str(tmp_path))
+        for i in range(4):
+            journal.record([_signal(f'S{i}')], source='aggregator',
+                           timestamp=self.start + pd.Timedelta(hours=i))
+            journal.flush()
+        journal.record([_signal('TODAY')], source='aggregator', timestamp=self.start + pd.Timedelta(days=1))
+        journal.flush()
+        before = journal.load()
+
+        removed = journal.compact(before=self.start + pd.Timedelta(days=1))
+
+        assert removed == 3
+        assert len(journal.segments()) == 2
+        assert len(os.listdir(tmp_path / 'segments')) == 2
+        pd.testing.assert_frame_equal(journal.load(), before)
+
+    def test_compact_keeps_concurrent_flush(self, tmp_path):
+        """Test a segment another writer flushes during compaction stays in the index."""
+        journal = SignalJournal(str(tmp_path))
+        for i in range(2):
+            journal.record([_signal(f'S{i}')], source='aggregator', timestamp=self.start + pd.Timedelta(hours=i))
+            journal.flush()
+        other = SignalJournal(str(tmp_path))
+        other.record([_signal('LIVE')], source='strategy_executor', timestamp=self.start + pd.Timedelta(days=1))
+        writer = threading.Thread(target=other.flush)
+        read_rows = journal._read_rows
+
+        def read_rows_while_flushing(segment_name):
+            if writer.ident is None:
+                writer.start()
+                writer.join(timeout=0.2)
+            return read_rows(segment_name)
+
+        journal._read_rows = read_rows_while_flushing
+        removed = journal.compact(before=self.start + pd.Timedelta(days=1))
+        writer.join()
+
+        assert removed == 1
+        assert len(journal.segments()) == 2
+        assert sorted(journal.load()['symbol']) == ['LIVE', 'S0', 'S1']
+
+    def test_aggregator_journals_raw_signals(self, tmp_path):
+        """Test SignalAggregator records each strategy's raw signals."""
+        rng = np.random.RandomState(1)
+        dates = pd.date_range('2023-01-02', periods=200, freq='B')
+        data = {}
+        for i in range(12):
+            close = 100 * np.cumprod(1 + rng.normal(0, 0.025, 200))
+            data[f'S{i:02d}'] = pd.DataFrame({'open': close, 'high': close * 1.01, 'low': close * 0.99,
+                                              'close': close, 'volume': rng.randint(1000000, 5000000, 200)},
+                                             index=dates)
+        journal = SignalJournal(str(tmp_path))
+        aggregator = SignalAggregator(journal=journal)
+        aggregator.update_universe(list(data))
+        aggregator.add_strategy('momentum', MomentumStrategy({'buy_threshold': 1, 'sell_threshold': -1}))
+
+        aggregator.generate_signals(data)
+
+        df = journal.load()
+        raw = aggregator.get_timing_stats()['strategies']['momentum']['signals']
+        assert raw > 0
+        assert len(df) == raw
+        assert set(df['source']) <= {'aggregator'}
+        assert set(df['strategy']) <= {'momentum'}
@@ -0,0 +1,160 @@
+"""Tests for the telemetry registry and its Prometheus text output."""
+
+import pytest
+import requests
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alpaca_client import TokenBucket, endpoint_name
+from telemetry import Registry, metrics, parse_stage_budget
+
+
+class TestRegistry:
+    """Tests for counters, gauges, histograms and the exposition format."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.now = [0.0]
+        self.registry = Registry(clock=lambda: self.now[0])
+
+    def test_render_text_format(self):
+        """Test each metric type renders HELP, TYPE and its samples."""
+        self.registry.counter('requests_total', 'Requests', ['status']).inc(status='200')
+        self.registry.counter('requests_total', 'Requests', ['status']).inc(2, status='503')
+        self.registry.gauge('hit_ratio', 'Hits over lookups', ['cache']).set(0.75, cache='quotes')
+        histogram = self.registry.histogram('latency_seconds', 'Latency', buckets=[0.1, 1])
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+
+        assert self.registry.render() == '\n'.join([
+            '# HELP hit_ratio Hits over lookups',
+            '# TYPE hit_ratio gauge',
+            'hit_ratio{cache="quotes"} 0.75',
+            '# HELP latency_seconds Latency',
+            '# TYPE latency_seconds histogram',
+            'latency_seconds_bucket{le="0.1"} 1',
+            'latency_seconds_bucket{le="1"} 2',
+            'latency_seconds_bucket{le="+Inf"} 2',
+            'latency_seconds_sum 0.55',
+            'latency_seconds_count 2',
+            '# HELP requests_total Requests',
+            '# TYPE requests_total counter',
+            'requests_total{status="200"} 1',
+            'requests_total{status="503"} 2',
+        ]) + '\n'
+
+    def test_label_values_escaped(self):
+        """Test quotes, backslashes and newlines in label values are escaped."""
+        self.registry.counter('c', 'C', ['name']).inc(name='a"b\\c\nd')
+        assert 'c{name="a\\"b\\\\c\\nd"} 1' in self.registry.render()
+
+    def test_labels_and_types_checked(self):
+        """Test wrong label names and a name reused for another type are errors."""
+        counter = self.registry.counter('c', 'C', ['stage'])
+        with pytest.raises(ValueError):
+            counter.inc(step='x')
+        with pytest.raises(ValueError):
+            self.registry.gauge('c', 'C', ['stage'])
+        assert self.registry.counter('c', 'C', ['stage']) is counter
+
+    def test_stage_timing_and_errors(self):
+        """Test stages are timed, and exceptions counted and re-raised."""
+        with self.registry.stage('data', 'trading', 'momentum-hunter'):
+            self.now[0] += 2.0
+        with pytest.raises(RuntimeError):
+            with self.registry.stage('orders', 'trading'):
+                self.now[0] += 0.5
+                raise RuntimeError('broker down')
+
+        assert self.registry.counter(
+            'trading_stage_errors_total', '', ['executor', 'stage', 'strategy']
+        ).value(executor='trading', stage='orders', strategy='') == 1
+        assert self.registry.stage_budget() == [
+            {'executor': 'trading', 'stage': 'data', 'calls': 1, 'seconds': 2.0, 'mean_seconds': 2.0},
+            {'executor': 'trading', 'stage': 'orders', 'calls': 1, 'seconds': 0.5, 'mean_seconds': 0.5},
+        ]
+
+    def test_textfile_roundtrip(self, tmp_path):
+        """Test the textfile is written whole and its stage budget reads back."""
+        for strategy in ('mean-reversion', 'momentum-hunter'):
+            with self.registry.stage('signals', 'trading', strategy):
+                self.now[0] += 1.5
+        path = tmp_path / 'metrics' / 'executor.prom'
+
+        assert self.registry.export(str(path))
+        text = path.read_text()
+        assert text == self.registry.render()
+        assert parse_stage_budget(text) == self.registry.stage_budget() == [
+            {'executor': 'trading', 'stage': 'signals', 'calls': 2, 'seconds': 3.0, 'mean_seconds': 1.5}
+        ]
+        assert os.listdir(path.parent) == ['executor.prom']
+
+    def test_metrics_endpoint(self):
+        """Test /metrics serves the registry and other paths are 404."""
+        self.registry.counter('up_total', 'Up').inc()
+        server = self.registry.serve(port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            response = requests.get(f"{url}/metrics", timeout=5)
+            assert response.status_code == 200
+            assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            assert 'up_total 1' in response.text
+            assert requests.get(f"{url}/other", timeout=5).status_code == 404
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestInstrumentation:
+    """The Alpaca client and the executors report into the global registry."""
+
+    def test_endpoint_names(self):
+        """Test ids and symbols in request paths become placeholders."""
+        assert endpoint_name('https://paper-api.alpaca.markets/v2/orders/abc-123') == 'orders/{id}'
+        assert endpoint_name('https://paper-api.alpaca.markets/v2/positions/AAPL') == 'positions/{symbol}'
+        assert endpoint_name('https://data.alpaca.markets/v2/stocks/quotes/latest') == 'stocks/quotes/latest'
+
+    def test_api_requests_counted_by_status(self):
+        """Test every HTTP attempt is counted with its status, so error rates can be derived."""
+        from fake_alpaca import FakeAlpacaClient, FakeAlpacaServer, synthetic_store
+        from replay import ReplayAlpacaClient
+
+        broker = ReplayAlpacaClient(synthetic_store(['AAA'], '2026-03-02', sessions=5, intraday_sessions=1))
+        broker.set_time('2026-03-02T15:00:00Z')
+        requests_total = metrics.counter('alpaca_requests_total', '', ['method', 'endpoint', 'status'])
+        before = {status: requests_total.value(method='GET', endpoint='account', status=status)
+                  for status in ('200', '503')}
+
+        with FakeAlpacaServer(broker, error_rate=1.0) as server:
+            client = FakeAlpacaClient(server, rate_limiter=TokenBucket(10000))
+            client.max_retries = 1
+            client._backoff = lambda attempt, response=None: 0.0
+            with pytest.raises(requests.exceptions.RequestException):
+                client.get_account()
+            server.error_rate = 0.0
+            client.get_account()
+
+        assert requests_total.value(method='GET', endpoint='account', status='503') - before['503'] == 2
+        assert requests_total.value(method='GET', endpoint='account', status='200') - before['200'] == 1
+
+    def test_strategy_executor_cycle_stages(self):
+        """Test a StrategyExecutor run records its cycle stages and cache hit ratios."""
+        from strategy_executor import StrategyExecutor
+        from tests.conftest import synthetic_store
+        from replay import ReplayAlpacaClient
+
+        client = ReplayAlpacaClient(synthetic_store(['AAPL', 'MSFT', 'XLK'], periods=80))
+        client.set_time('2024-04-15T19:45:00Z')
+        executor = StrategyExecutor(client=client, publish=False)
+        stage_seconds = metrics.histogram('trading_stage_seconds', '', ['executor', 'stage', 'strategy'])
+        before = stage_seconds.totals()
+
+        executor.run_all_strategies()
+
+        after = stage_seconds.totals()
+        ran = {key for key in after if after[key][0] > before.get(key, (0, 0.0))[0]}
+        assert {('strategy', stage, '') for stage in ('cycle', 'prefetch', 'exits', 'orders')} <= ran
+        assert ('strategy', 'signals', 'momentum_hunter') in ran
+        assert metrics.gauge('trading_cache_hit_ratio', '', ['cache']).value(cache='quotes') is not None
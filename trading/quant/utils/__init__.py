@@ -1,9 +1,44 @@
-"""Utilities package."""
+"""Utilities package.
 
-from .indicators import *
-from .risk import RiskManager, risk_manager
+The indicator functions are imported on first attribute access, so that
+importing the package (or ``utils.risk``) does not pull in ``ta``.
+"""
+
+import importlib
+
+from .risk import OrderBatchCheck, RiskManager, risk_manager
 
 __all__ = [
+    'OrderBatchCheck',
     'RiskManager',
     'risk_manager'
-]
\ No newline at end of file
+]
+
+# Indicator functions re-exported from ``utils.indicators`` on first access
+_LAZY = frozenset({
+    'calculate_sma',
+    'calculate_ema',
+    'calculate_rsi',
+    'calculate_macd',
+    'calculate_bollinger_bands',
+    'calculate_atr',
+    'calculate_vwap',
+    'calculate_stochastic',
+    'calculate_williams_r',
+    'calculate_cci',
+    'calculate_momentum',
+    'calculate_rate_of_change',
+    'calculate_money_flow_index',
+    'calculate_adx',
+    'calculate_parabolic_sar',
+    'normalize_indicator',
+    'smooth_indicator',
+})
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module('.indicators', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
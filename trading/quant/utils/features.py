@@ -0,0 +1,179 @@
+"""Shared indicator cache.
+
+Strategies and executors ask the cache for indicator columns instead of
+computing them directly. Results are keyed by symbol, indicator and
+parameters, plus a fingerprint of the bars they were computed from, so the
+same RSI for the same bars is computed once per process no matter how many
+strategies use it, and a new or revised bar invalidates it automatically.
+
+A cache given a state store (indicator_state.IndicatorStateStore) advances
+persisted indicator state on a miss instead of recomputing the full history.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indicators import (
+    calculate_atr, calculate_bollinger_bands, calculate_ema, calculate_macd,
+    calculate_rsi, calculate_sma
+)
+
+
+def bars_fingerprint(data: pd.DataFrame) -> Tuple:
+    """
+    Identity for a bar history: length, first/last timestamp and a hash of the bar values.
+
+    The values are hashed in full, so a correction to any earlier bar (a split
+    adjustment, a late trade revising a past bar) invalidates cached features,
+    not just a new or changed last bar. Hashing the raw bytes of an all-numeric
+    frame costs about as much as reading its last row did.
+    """
+    if len(data) == 0:
+        return (0,)
+
+    try:
+        values = data.to_numpy(dtype=float)
+    except (TypeError, ValueError):
+        values = data[[c for c in ('open', 'high', 'low', 'close', 'volume') if c in data.columns]].to_numpy(dtype=float)
+    return (len(data), data.index[0], data.index[-1], hash(np.ascontiguousarray(values).tobytes()))
+
+
+class FeatureCache:
+    """LRU cache of indicator series keyed by symbol, feature and bar fingerprint."""
+
+    def __init__(self, max_entries: int = 4096, state=None):
+        """
+        Args:
+            max_entries: LRU capacity
+            state: Optional IndicatorStateStore consulted on a miss for the
+                features it can advance incrementally
+        """
+        self.max_entries = max_entries
+        self.state = state
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        symbol: Optional[str],
+        data: pd.DataFrame,
+        key: Hashable,
+        compute: Callable[[pd.DataFrame], Any]
+    ) -> Any:
+        """
+        Return a cached feature, computing it on a miss.
+
+        Args:
+            symbol: Symbol the bars belong to (None disables caching)
+            data: OHLCV bars the feature is computed from
+            key: Hashable feature name and parameters, e.g. ('rsi', 14)
+            compute: Function of ``data`` producing the feature
+
+        Returns:
+            The feature value (usually a Series aligned with ``data``)
+        """
+        if symbol is None:
+            return compute(data)
+
+        cache_key = (symbol, key, bars_fingerprint(data))
+        with self._lock:
+            if cache_key in self._entries:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return self._entries[cache_key]
+            self.misses += 1
+
+        if self.state is not None and self.state.supports(key):
+            value = self.state.get(symbol, data, key, compute)
+        else:
+            value = compute(data)
+
+        with self._lock:
+            self._entries[cache_key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def put(self, symbol: str, data: pd.DataFrame, key: Hashable, value: Any) -> None:
+        """Store a precomputed feature for the given bars."""
+        with self._lock:
+            self._entries[(symbol, key, bars_fingerprint(data))] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # Named indicators -------------------------------------------------------
+
+    def rsi(self, symbol: str, data: pd.DataFrame, period: int = 14) -> pd.Series:
+        """Wilder RSI of close."""
+        return self.get(symbol, data, ('rsi', period),
+                        lambda d: calculate_rsi(d['close'], period=period))
+
+    def ema(self, symbol: str, data: pd.DataFrame, period: int) -> pd.Series:
+        """Exponential moving average of close."""
+        return self.get(symbol, data, ('ema', period),
+                        lambda d: calculate_ema(d['close'], period=period))
+
+    def sma(self, symbol: str, data: pd.DataFrame, period: int) -> pd.Series:
+        """Simple moving average of close."""
+        return self.get(symbol, data, ('sma', period),
+                        lambda d: calculate_sma(d['close'], period=period))
+
+    def macd(
+        self, symbol: str, data: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9
+    ) -> Dict[str, pd.Series]:
+        """MACD line, signal and histogram of close."""
+        return self.get(symbol, data, ('macd', fast, slow, signal),
+                        lambda d: calculate_macd(d['close'], fast=fast, slow=slow, signal=signal))
+
+    def bollinger(
+        self, symbol: str, data: pd.DataFrame, period: int = 20, std_dev: float = 2.0
+    ) -> Dict[str, pd.Series]:
+        """Bollinger upper/middle/lower bands of close."""
+        return self.get(symbol, data, ('bollinger', period, std_dev),
+                        lambda d: calculate_bollinger_bands(d['close'], period=period, std_dev=std_dev))
+
+    def atr(self, symbol: str, data: pd.DataFrame, period: int = 14) -> pd.Series:
+        """Wilder average true range."""
+        return self.get(symbol, data, ('atr', period),
+                        lambda d: calculate_atr(d['high'], d['low'], d['close'], period=period))
+
+    def rolling_mean(self, symbol: str, data: pd.DataFrame, column: str, period: int) -> pd.Series:
+        """Rolling mean of any column."""
+        return self.get(symbol, data, ('rolling_mean', column, period),
+                        lambda d: d[column].rolling(window=period).mean())
+
+    def rolling_std(self, symbol: str, data: pd.DataFrame, column: str, period: int) -> pd.Series:
+        """Rolling sample standard deviation of any column."""
+        return self.get(symbol, data, ('rolling_std', column, period),
+                        lambda d: d[column].rolling(window=period).std())
+
+    # Housekeeping -----------------------------------------------------------
+
+    def clear(self) -> None:
+        """Drop all cached features and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counts and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Global feature cache instance
+feature_cache = FeatureCache()
@@ -0,0 +1,220 @@
+"""Panel (dates x symbols) indicators and cross-sectional ranking.
+
+Every function here works on a wide DataFrame with one column per symbol and
+one row per bar, so a whole universe is scored for every date in a single pass
+instead of looping over symbols. Indicators match their per-symbol versions in
+``utils.indicators`` for symbols that start trading late (leading NaNs);
+interior gaps propagate as NaN.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def build_panel(market_data: Dict[str, pd.DataFrame], field: str = 'close') -> pd.DataFrame:
+    """
+    Stack one OHLCV column from each symbol into a dates x symbols panel.
+
+    Args:
+        market_data: Dictionary mapping symbol -> OHLCV DataFrame
+        field: Column to extract (default: 'close')
+
+    Returns:
+        DataFrame indexed by the union of all dates, one column per symbol
+    """
+    columns = {
+        symbol: data[field]
+        for symbol, data in market_data.items()
+        if data is not None and field in data.columns
+    }
+    if not columns:
+        return pd.DataFrame()
+
+    return pd.DataFrame(columns).sort_index().astype(float)
+
+
+def bars_seen(panel: pd.DataFrame) -> pd.DataFrame:
+    """Number of non-missing bars each symbol has accumulated at every date."""
+    return panel.notna().cumsum()
+
+
+def panel_sma(panel: pd.DataFrame, period: int) -> pd.DataFrame:
+    """Simple moving average of every column."""
+    return panel.rolling(window=period, min_periods=period).mean()
+
+
+def panel_momentum(panel: pd.DataFrame, period: int) -> pd.DataFrame:
+    """Price momentum (return over ``period`` bars) of every column."""
+    return panel / panel.shift(period) - 1
+
+
+def panel_volatility(panel: pd.DataFrame, period: int) -> pd.DataFrame:
+    """Rolling standard deviation of bar-to-bar returns of every column."""
+    return panel.pct_change(fill_method=None).rolling(period).std()
+
+
+def panel_rsi(panel: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    """Wilder RSI of every column, matching ``ta.momentum.rsi``."""
+    diff = panel.diff(1)
+    listed = panel.notna()
+    up = diff.where(diff > 0, 0.0).where(listed)
+    down = (-diff.where(diff < 0, 0.0)).where(listed)
+
+    ema_up = up.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
+    ema_down = down.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
+
+    rsi = 100 - (100 / (1 + ema_up / ema_down))
+    return rsi.mask(ema_down == 0, 100.0)
+
+
+def panel_sma_rsi(panel: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    """RSI from simple moving averages of gains and losses (Cutler's RSI) of every column."""
+    diff = panel.diff(1)
+    listed = panel.notna()
+    up = diff.where(diff > 0, 0.0).where(listed)
+    down = (-diff.where(diff < 0, 0.0)).where(listed)
+
+    rs = up.rolling(window=period).mean() / down.rolling(window=period).mean()
+    return 100 - (100 / (1 + rs))
+
+
+def panel_atr(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    """Average true range (simple moving average) of every column."""
+    prev_close = close.shift(1)
+    true_range = np.fmax(
+        np.fmax(high - low, (high - prev_close).abs()),
+        (low - prev_close).abs()
+    )
+    return true_range.rolling(window=period).mean()
+
+
+def panel_volume_trend(volume: pd.DataFrame, recent: int = 5, period: int = 20) -> pd.DataFrame:
+    """Mean volume of the last ``recent`` bars relative to the ``period - recent`` bars before them."""
+    recent_volume = volume.rolling(window=recent).mean()
+    historic_volume = volume.shift(recent).rolling(window=period - recent).mean()
+    return (recent_volume - historic_volume) / historic_volume
+
+
+def membership_mask(
+    index: pd.Index,
+    columns: Iterable[str],
+    intervals: Dict[str, Iterable[Tuple[Optional[str], Optional[str]]]]
+) -> pd.DataFrame:
+    """
+    Build a point-in-time universe membership mask.
+
+    Args:
+        index: Dates of the panel
+        columns: Symbols of the panel
+        intervals: Dictionary mapping symbol -> list of (start, end) dates during
+            which the symbol was in the universe. ``None`` leaves a side open.
+            Symbols without an entry are never members.
+
+    Returns:
+        Boolean DataFrame shaped like the panel
+    """
+    mask = pd.DataFrame(False, index=index, columns=list(columns))
+
+    for symbol, spans in intervals.items():
+        if symbol not in mask.columns:
+            continue
+        for start, end in spans:
+            inside = np.ones(len(index), dtype=bool)
+            if start is not None:
+                inside &= index >= pd.Timestamp(start)
+            if end is not None:
+                inside &= index <= pd.Timestamp(end)
+            mask.loc[inside, symbol] = True
+
+    return mask
+
+
+def rank_panel(
+    scores: pd.DataFrame,
+    membership: Optional[pd.DataFrame] = None,
+    ascending: bool = False
+) -> pd.DataFrame:
+    """
+    Rank symbols against each other on every date.
+
+    Args:
+        scores: Dates x symbols score panel
+        membership: Optional boolean panel; symbols outside the universe on a
+            date are not ranked on that date
+        ascending: Rank lowest score first instead of highest
+
+    Returns:
+        Panel of 1-based ranks (1 = best), NaN where the symbol is not ranked.
+        Ties keep column order.
+    """
+    values = scores.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    if membership is not None:
+        aligned = membership.reindex(index=scores.index, columns=scores.columns, fill_value=False)
+        valid &= aligned.to_numpy(dtype=bool)
+
+    keys = values if ascending else -values
+    keys = np.where(valid, keys, np.inf)
+    order = np.argsort(keys, axis=1, kind='stable')
+
+    ranks = np.empty(values.shape, dtype=float)
+    rows = np.arange(values.shape[0])[:, None]
+    ranks[rows, order] = np.arange(1, values.shape[1] + 1, dtype=float)
+    ranks[~valid] = np.nan
+
+    return pd.DataFrame(ranks, index=scores.index, columns=scores.columns)
+
+
+def top_n(ranks: pd.DataFrame, n: int) -> pd.DataFrame:
+    """Boolean panel marking the ``n`` best-ranked symbols on each date."""
+    return ranks <= n
+
+
+def rebalance_dates(index: pd.DatetimeIndex, freq: str = 'W') -> pd.DatetimeIndex:
+    """Last available bar of every calendar period (e.g. each week)."""
+    periods = index.to_period(freq)
+    last = pd.Series(index, index=index).groupby(periods).transform('max')
+    return index[index == last.values]
+
+
+def backtest_rotation(
+    close: pd.DataFrame,
+    scores: pd.DataFrame,
+    top: int,
+    freq: str = 'W',
+    membership: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Equal-weight rotation into the ``top`` best-scored symbols.
+
+    Holdings are chosen at the last bar of each ``freq`` period using scores
+    known at that bar, entered on the next bar and held until the following
+    rebalance.
+
+    Args:
+        close: Dates x symbols close panel
+        scores: Score panel aligned with ``close``
+        top: Number of symbols to hold
+        freq: Rebalance frequency as a pandas period alias (default: weekly)
+        membership: Optional point-in-time universe mask
+
+    Returns:
+        DataFrame with daily 'return' and cumulative 'equity' (starting at 1.0)
+    """
+    ranks = rank_panel(scores, membership)
+    picks = top_n(ranks, top).astype(float)
+
+    schedule = rebalance_dates(close.index, freq)
+    picks.loc[~picks.index.isin(schedule)] = np.nan
+    weights = picks.ffill().fillna(0.0)
+    counts = weights.sum(axis=1).replace(0, np.nan)
+    weights = weights.div(counts, axis=0).fillna(0.0).shift(1).fillna(0.0)
+
+    returns = close.pct_change(fill_method=None).fillna(0.0)
+    daily = (weights * returns).sum(axis=1)
+
+    return pd.DataFrame({
+        'return': daily,
+        'equity': (1 + daily).cumprod()
+    })
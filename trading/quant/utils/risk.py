@@ -2,12 +2,37 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple, Optional
 import logging
 import config
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class OrderBatchCheck:
+    """
+    Outcome of RiskManager.check_orders(), aligned with the candidate orders.
+    
+    quantities: accepted shares per order (0 when rejected)
+    reasons: '' for an accepted order, otherwise the constraint that rejected it
+    priority: order indices in the order they were considered
+    """
+    quantities: np.ndarray
+    reasons: np.ndarray
+    priority: np.ndarray
+    
+    @property
+    def accepted(self) -> np.ndarray:
+        return self.reasons == ''
+    
+    def counts(self) -> Dict[str, int]:
+        """Orders accepted, and rejected per reason."""
+        reasons, counts = np.unique(self.reasons.astype(str), return_counts=True)
+        return {str(reason) or 'accepted': int(count) for reason, count in zip(reasons, counts)}
+
+
 class RiskManager:
     """Portfolio risk management system."""
     
@@ -142,6 +167,123 @@ class RiskManager:
         
         return True, "Position limits OK"
     
+    def size_orders(self, prices, risk_pct: float = 0.02) -> np.ndarray:
+        """
+        Fixed-fractional sizes for many prices at once, as calculate_position_size()
+        sizes one: capped at the maximum position size, at least 1 share.
+        Prices that are not positive get 0 shares.
+        """
+        prices = np.asarray(prices, dtype=float)
+        valid = np.isfinite(prices) & (prices > 0)
+        safe_prices = np.where(valid, prices, 1.0)
+        shares = np.floor(self.portfolio_value * risk_pct / safe_prices)
+        max_shares = np.floor(self.portfolio_value * config.MAX_POSITION_PCT / safe_prices)
+        return np.where(valid, np.maximum(np.minimum(shares, max_shares), 1), 0).astype(np.int64)
+    
+    def check_orders(
+        self,
+        symbols: Sequence[str],
+        prices,
+        confidence,
+        quantities=None,
+        sides: Optional[Sequence[str]] = None,
+        stop_pct=None,
+        min_confidence: float = 0.0
+    ) -> OrderBatchCheck:
+        """
+        Pre-trade check of a cycle's candidate orders in one vectorized pass.
+        
+        Orders are considered by confidence, highest first (ties keep their
+        input order). Buys are held to the limits of check_position_limits()
+        -- position size (with the position already held and earlier orders
+        in the symbol), portfolio allocation and number of positions -- and
+        to the portfolio heat cap, config.MAX_PORTFOLIO_HEAT. The caps are
+        running totals in priority order: once one is exceeded, every later
+        order it applies to is rejected too, so a lower-confidence order
+        never takes room a higher-confidence one was refused. Sells reduce
+        exposure and are not held to the limits. Once the daily loss limit
+        is reached, every order is rejected.
+        
+        Args:
+            symbols: Symbol per order
+            prices: Price per order
+            confidence: Signal confidence per order
+            quantities: Shares per order (default: size_orders(prices))
+            sides: 'buy' or 'sell' per order (default: all buys)
+            stop_pct: Stop distance per order, or one for all, that the
+                order's heat is measured with (default: config.STOP_LOSS_PCT)
+            min_confidence: Orders below this confidence are rejected
+        
+        Returns:
+            OrderBatchCheck; the reasons are 'invalid_price', 'zero_quantity',
+            'low_confidence', 'daily_loss', 'position_limit',
+            'portfolio_allocation', 'portfolio_heat' and 'max_positions'
+        """
+        symbols = np.asarray(symbols, dtype=str)
+        prices = np.asarray(prices, dtype=float)
+        confidence = np.asarray(confidence, dtype=float)
+        count = len(prices)
+        quantities = self.size_orders(prices) if quantities is None else np.asarray(quantities, dtype=np.int64)
+        buys = np.ones(count, dtype=bool) if sides is None else np.asarray(sides, dtype=str) == 'buy'
+        if stop_pct is None:
+            stop_pct = config.STOP_LOSS_PCT
+        stop_pct = np.broadcast_to(np.asarray(stop_pct, dtype=float), (count,))
+        
+        priority = np.lexsort((np.arange(count), -confidence))
+        reasons = np.full(count, '', dtype=object)
+        
+        # Checks of each order on its own
+        valid = np.isfinite(prices) & (prices > 0)
+        reasons[~valid] = 'invalid_price'
+        reasons[(reasons == '') & (quantities <= 0)] = 'zero_quantity'
+        reasons[(reasons == '') & ~(confidence >= min_confidence)] = 'low_confidence'
+        can_trade, _ = self.check_daily_loss_limit()
+        if not can_trade:
+            reasons[reasons == ''] = 'daily_loss'
+        
+        # The caps, as running totals over the remaining buys in priority order
+        names, codes = np.unique(symbols, return_inverse=True)
+        held = np.array([name in self.positions for name in names], dtype=bool)
+        held_value = np.array([
+            abs(self.positions[name]['quantity']) * self.positions[name]['current_price'] if name in self.positions else 0.0
+            for name in names
+        ])
+        codes = codes[priority]
+        candidates = buys[priority] & (reasons[priority] == '')
+        value = np.where(candidates, quantities[priority] * np.where(valid, prices, 0.0)[priority], 0.0)
+        
+        symbol_value = held_value[codes] + pd.Series(value).groupby(codes).cumsum().to_numpy()
+        over_position = candidates & (symbol_value > self.portfolio_value * config.MAX_POSITION_PCT)
+        standing = candidates & ~over_position
+        value = np.where(standing, value, 0.0)
+        
+        allocation = self._calculate_total_allocation() + np.cumsum(value) / self.portfolio_value
+        over_allocation = standing & (allocation > config.MAX_PORTFOLIO_PCT)
+        heat = self.calculate_portfolio_heat() + np.cumsum(value * stop_pct[priority]) / self.portfolio_value
+        over_heat = standing & (heat > config.MAX_PORTFOLIO_HEAT)
+        
+        # A symbol not held takes a position slot at its first standing order;
+        # when that order is refused one, the symbol's later orders are too
+        new_symbol = standing & ~held[codes]
+        first = np.zeros(count, dtype=bool)
+        standing_at = np.flatnonzero(standing)
+        first[standing_at[np.unique(codes[standing_at], return_index=True)[1]]] = True
+        opens = first & new_symbol
+        refused = np.zeros(len(names), dtype=bool)
+        refused[codes[opens & (len(self.positions) + np.cumsum(opens) > config.MAX_POSITIONS)]] = True
+        over_positions = new_symbol & refused[codes]
+        
+        ranked = np.select(
+            [over_position, over_allocation, over_heat, over_positions],
+            ['position_limit', 'portfolio_allocation', 'portfolio_heat', 'max_positions'],
+            default=''
+        )
+        rejected = ranked != ''
+        reasons[priority[rejected]] = ranked[rejected]
+        
+        accepted = reasons == ''
+        return OrderBatchCheck(np.where(accepted, quantities, 0), reasons, priority)
+    
     def check_daily_loss_limit(self) -> Tuple[bool, str]:
         """Check if daily loss limit is reached."""
         if self.daily_pnl < -self.daily_loss_limit:
@@ -11,12 +11,14 @@ Key Features:
 - Dynamic universe selection based on market conditions
 - Equity snapshot recording every 5 minutes
 - Risk management and portfolio tracking
+- Strategies run side by side, each within a time budget (a slow one is skipped)
 
 Usage:
     python execute_trades.py              # Execute trades
     python execute_trades.py --dry-run    # Simulate without executing
     python execute_trades.py --status     # Check strategy status
     python execute_trades.py --verbose    # Detailed logging
+    python execute_trades.py --loop       # Stay up, waking at each scheduled run
 """
 
 import sys
@@ -25,11 +27,13 @@ import json
 import logging
 import argparse
 import sqlite3
-import requests
+import threading
+import time
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from functools import partial
+from typing import Dict, List, Optional, Any, Tuple
 import yfinance as yf
 
 # Add the quant directory to Python path
@@ -39,6 +43,12 @@ sys.path.insert(0, os.path.abspath(quant_dir))
 try:
     from strategy_executor import StrategyExecutor
     from alpaca_client import client as alpaca_client
+    from market_data import CycleMarketData, MarketSnapshot, fetch_alpaca_bars
+    from scanner import UniverseScanner
+    from equity_store import EquitySnapshotStore
+    from scheduler import StrategyScheduler
+    from telemetry import metrics
+    from isolation import RiskView, cancelled, run_isolated
     import config
 except ImportError as e:
     print(f"Error importing quant modules: {e}")
@@ -60,18 +70,65 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Longest lookback (days of daily bars) read by the _select_* universe methods
+SELECTION_LOOKBACK_DAYS = 60
+
+# Lookback get_market_data() reads per strategy timeframe
+MARKET_DATA_DAYS = {'5Min': 5, '1Day': 60}
+
+# Scanner ranking (scanner.SCANS) that replaces a strategy's base universe
+SCANNED_UNIVERSES = {
+    'momentum-hunter': 'momentum',
+    'mean-reversion': 'mean_reversion',
+    'volatility-breakout': 'atr_expansion'
+}
+
 
 class TradingExecutor:
     """Enhanced trading execution orchestrator with 5-minute granularity and dynamic universe selection."""
     
-    def __init__(self, dry_run: bool = False, verbose: bool = False):
+    def __init__(
+        self,
+        dry_run: bool = False,
+        verbose: bool = False,
+        client=None,
+        publish: bool = True,
+        data_source: str = 'yfinance',
+        journal=None,
+        scanner: Optional[UniverseScanner] = None,
+        snapshot_store: Optional[EquitySnapshotStore] = None
+    ):
+        """
+        Args:
+            dry_run: Log orders instead of placing them
+            verbose: Enable debug logging
+            client: Alpaca client (defaults to the live client; replay passes a ReplayAlpacaClient)
+            publish: Write equity snapshots and publish to the dashboard API
+            data_source: 'yfinance' or 'alpaca' (bars from ``client``)
+            journal: Signal journal (defaults to the global journal when publishing
+                and config.SIGNAL_JOURNAL_ENABLED)
+            scanner: Universe scanner whose fresh candidates replace the base
+                universes (defaults to the bar-store scanner when publishing and
+                config.SCANNER_ENABLED)
+            snapshot_store: Equity snapshot history (defaults to the store at
+                config.EQUITY_SNAPSHOT_DB_PATH when publishing)
+        """
         self.dry_run = dry_run
         self.verbose = verbose
         if verbose:
             logging.getLogger().setLevel(logging.DEBUG)
             
-        self.strategy_executor = StrategyExecutor()
-        self.alpaca = alpaca_client
+        self.alpaca = client or alpaca_client
+        self.publish = publish
+        self.data_source = data_source
+        self.strategy_executor = StrategyExecutor(client=self.alpaca, publish=publish, journal=journal)
+        self.journal = self.strategy_executor.journal
+        # Queue each cycle's orders, net them across strategies and send them
+        # concurrently (live orders only; dry runs log each order)
+        self.batch_orders = not dry_run
+        if scanner is None and publish and config.SCANNER_ENABLED:
+            scanner = UniverseScanner()
+        self.scanner = scanner
         
         # Base strategy universes for dynamic selection
         self.base_universes = {
@@ -132,74 +189,49 @@ class TradingExecutor:
             }
         }
         
+        # Exact run times of each schedule from the market calendar
+        self.scheduler = StrategyScheduler(self.strategy_config)
+        
         # Cache for dynamic universe selections (to avoid recalculating every 5 minutes)
         self.universe_cache = {}
+        self.universe_stats = {'hits': 0, 'misses': 0}
+        # Strategies run concurrently: each universe and the market snapshot
+        # are selected once, by the first strategy to need them
+        self._universe_lock = threading.Lock()
+        self._selection_locks: Dict[str, threading.Lock] = {}
+        self._snapshot_lock = threading.Lock()
+        
+        # Bars prefetched for the current cycle (see prefetch_market_data)
+        self.cycle_data: Optional[CycleMarketData] = None
+        
+        # Shared market snapshot for universe selection (see get_market_snapshot)
+        self.market_snapshot: Optional[MarketSnapshot] = None
         
         # Risk management parameters
         self.max_position_size = 2000  # $2,000 per trade (2% of $100K)
         self.max_positions_per_strategy = 5
         self.max_portfolio_allocation = 0.20  # 20% max allocation to one stock
         
-        # Equity snapshots file
-        self.snapshots_file = os.path.join(
-            os.path.dirname(__file__), '..', 'data', 'equity_snapshots.json'
-        )
+        # Equity snapshot history (append-only, downsampled with age)
+        if snapshot_store is None and publish:
+            snapshot_store = EquitySnapshotStore()
+            legacy_file = os.path.join(os.path.dirname(__file__), '..', 'data', 'equity_snapshots.json')
+            if snapshot_store.latest() is None and os.path.exists(legacy_file):
+                logger.info(f"Importing {snapshot_store.import_json(legacy_file)} legacy equity snapshots")
+        self.snapshot_store = snapshot_store
 
     def should_execute_strategy(self, strategy_id: int) -> bool:
-        """Determine if a strategy should execute based on current time and schedule."""
-        now = datetime.now()
-        ny_time = now - timedelta(hours=5)  # Convert to ET (approximate)
-        config = self.strategy_config[strategy_id]
-        
-        schedule = config['execution_schedule']
-        
-        if schedule == 'daily':
-            # Execute once per day at specified time
-            execution_time = config.get('execution_time', '09:45')
-            hour, minute = map(int, execution_time.split(':'))
-            
-            # Check if we're within 5 minutes of execution time
-            target_time = ny_time.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            time_diff = abs((ny_time - target_time).total_seconds())
-            
-            should_execute = time_diff <= 300  # Within 5 minutes
-            if self.verbose:
-                logger.debug(f"Strategy {strategy_id} daily check: target={target_time}, current={ny_time}, diff={time_diff}s, execute={should_execute}")
-            return should_execute
-            
-        elif schedule == 'every_30min':
-            # Execute every 30 minutes (at :00, :30)
-            return ny_time.minute % 30 == 0
-            
-        elif schedule == 'weekly':
-            # Execute weekly on specified day at specified time
-            execution_day = config.get('execution_day', 'Monday')
-            execution_time = config.get('execution_time', '10:00')
-            
-            day_mapping = {
-                'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
-                'Friday': 4, 'Saturday': 5, 'Sunday': 6
-            }
-            
-            target_weekday = day_mapping.get(execution_day, 0)
-            hour, minute = map(int, execution_time.split(':'))
-            
-            # Check if today is the right day and time
-            is_right_day = ny_time.weekday() == target_weekday
-            target_time = ny_time.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            time_diff = abs((ny_time - target_time).total_seconds())
-            is_right_time = time_diff <= 300  # Within 5 minutes
-            
-            should_execute = is_right_day and is_right_time
-            if self.verbose:
-                logger.debug(f"Strategy {strategy_id} weekly check: day={ny_time.strftime('%A')} (target={execution_day}), time={ny_time.time()} (target={execution_time}), execute={should_execute}")
-            return should_execute
-            
-        return True  # Default: always execute
+        """Determine if a strategy's scheduled run has come (without consuming it)."""
+        now = self.alpaca.now()
+        should_execute = self.scheduler.is_due(strategy_id, now)
+        if self.verbose:
+            next_run = self.scheduler.next_run(strategy_id, now)
+            logger.debug(f"Strategy {strategy_id} schedule check: execute={should_execute}, next run={next_run.isoformat()}")
+        return should_execute
 
     def get_cache_key(self, strategy_name: str) -> str:
         """Generate cache key for universe selection."""
-        now = datetime.now()
+        now = self.alpaca.now()
         
         if strategy_name in ['momentum-hunter', 'volatility-breakout']:
             # Cache for the whole day (scanned once at 9:45am)
@@ -216,15 +248,25 @@ class TradingExecutor:
         return f"{strategy_name}_{now.strftime('%Y-%m-%d_%H')}"
 
     def get_dynamic_universe(self, strategy_name: str) -> List[str]:
-        """Get dynamically selected universe for a strategy."""
+        """Get dynamically selected universe for a strategy (strategies running at once wait for one selection)."""
         cache_key = self.get_cache_key(strategy_name)
-        
+        with self._universe_lock:
+            selection_lock = self._selection_locks.setdefault(cache_key, threading.Lock())
+        with selection_lock:
+            return self._select_universe(strategy_name, cache_key)
+    
+    def _select_universe(self, strategy_name: str, cache_key: str) -> List[str]:
+        """The universe cached for ``cache_key``, selected now on a miss."""
         # Check cache first
         if cache_key in self.universe_cache:
+            with self._universe_lock:
+                self.universe_stats['hits'] += 1
             if self.verbose:
                 logger.debug(f"Using cached universe for {strategy_name}: {self.universe_cache[cache_key]}")
             return self.universe_cache[cache_key]
         
+        with self._universe_lock:
+            self.universe_stats['misses'] += 1
         logger.info(f"Calculating dynamic universe for {strategy_name}")
         
         try:
@@ -240,7 +282,7 @@ class TradingExecutor:
                 universe = self._select_volatility_breakout_universe()
             else:
                 # Fallback to base universe
-                universe = self.base_universes.get(strategy_name, [])
+                universe = self.get_base_universe(strategy_name)
             
             # Cache the result
             self.universe_cache[cache_key] = universe
@@ -250,51 +292,106 @@ class TradingExecutor:
         except Exception as e:
             logger.error(f"Error calculating dynamic universe for {strategy_name}: {e}")
             # Fallback to base universe
-            fallback = self.base_universes.get(strategy_name, [])
+            fallback = self.get_base_universe(strategy_name)
             self.universe_cache[cache_key] = fallback
             return fallback
 
+    def load_precomputed_universes(self) -> int:
+        """
+        Adopt universes selected ahead of the session (scripts/precompute_session.py)
+        for the current cache periods, so they are neither downloaded for nor
+        recomputed at the open. Returns the number adopted.
+        """
+        if self.scanner is None:
+            return 0
+        
+        adopted = 0
+        for strategy_name in self.base_universes:
+            cache_key = self.get_cache_key(strategy_name)
+            if cache_key in self.universe_cache:
+                continue
+            universe = self.scanner.get_universe(cache_key)
+            if universe:
+                self.universe_cache[cache_key] = universe
+                adopted += 1
+                logger.info(f"Using precomputed universe for {strategy_name}: {universe}")
+        return adopted
+
+    def get_base_universe(self, strategy_name: str) -> List[str]:
+        """
+        Candidates a strategy's dynamic universe is selected from: the latest
+        scanner ranking when one is fresh, otherwise the hard-coded list.
+        """
+        kind = SCANNED_UNIVERSES.get(strategy_name)
+        if self.scanner is not None and kind:
+            candidates = self.scanner.get_candidates(
+                kind,
+                limit=config.SCANNER_CANDIDATES,
+                max_age=timedelta(hours=config.SCANNER_MAX_AGE_HOURS),
+                now=self.alpaca.now()
+            )
+            if candidates:
+                return candidates
+        return self.base_universes.get(strategy_name, [])
+
+    def _snapshot_symbols(self) -> List[str]:
+        """Union of every strategy's base universe (and SPY, the sector benchmark)."""
+        symbols = {'SPY'}
+        for strategy_name in self.base_universes:
+            symbols.update(self.get_base_universe(strategy_name))
+        return sorted(symbols)
+    
+    def _snapshot_is_valid(self, strategy_name: str, symbols: List[str]) -> bool:
+        """True when the current snapshot covers ``symbols`` within the strategy's cache period."""
+        snapshot = self.market_snapshot
+        return (
+            snapshot is not None
+            and snapshot.is_valid_for(strategy_name, self.get_cache_key(strategy_name))
+            and set(symbols) <= set(snapshot.universe)
+        )
+    
+    def get_market_snapshot(self, strategy_name: str) -> MarketSnapshot:
+        """
+        Market snapshot the universe selectors score from.
+        
+        One download covers the union of all base universes; it is reused by
+        every selector whose cache period (get_cache_key) has not rolled over
+        since the snapshot was taken.
+        """
+        with self._snapshot_lock:
+            symbols = self._snapshot_symbols()
+            if self._snapshot_is_valid(strategy_name, symbols):
+                return self.market_snapshot
+            
+            data = self._download(symbols, period=f'{SELECTION_LOOKBACK_DAYS}d')
+            self.market_snapshot = MarketSnapshot(
+                self._split_market_data(symbols, data) if not data.empty else {},
+                now=self.alpaca.now(),
+                cache_keys={name: self.get_cache_key(name) for name in self.base_universes},
+                universe=symbols
+            )
+            return self.market_snapshot
+
     def _select_momentum_hunter_universe(self) -> List[str]:
         """Select top 6 symbols by 20-day momentum score."""
-        base_universe = self.base_universes['momentum-hunter']
+        base_universe = self.get_base_universe('momentum-hunter')
         
         try:
-            # Get 30 days of data for momentum calculation
-            data = yf.download(base_universe, period='30d', progress=False)
-            if 'Close' not in data.columns:
+            # 30 days of data for momentum calculation
+            snapshot = self.get_market_snapshot('momentum-hunter')
+            table = snapshot.scores(30).reindex(base_universe)
+            if table.empty:
                 return base_universe[:6]  # Fallback
             
-            scores = {}
-            for symbol in base_universe:
-                try:
-                    if isinstance(data['Close'], pd.DataFrame):
-                        prices = data['Close'][symbol].dropna()
-                        volumes = data['Volume'][symbol].dropna() if 'Volume' in data.columns else None
-                    else:
-                        prices = data['Close'].dropna()
-                        volumes = data['Volume'].dropna() if 'Volume' in data.columns else None
-                    
-                    if len(prices) < 20:
-                        continue
-                    
-                    # Calculate 20-day price momentum
-                    price_momentum = (prices.iloc[-1] - prices.iloc[-20]) / prices.iloc[-20]
-                    
-                    # Calculate volume trend if available
-                    volume_trend = 0
-                    if volumes is not None and len(volumes) >= 20:
-                        recent_vol = volumes.iloc[-5:].mean()
-                        historic_vol = volumes.iloc[-20:-5].mean()
-                        if historic_vol > 0:
-                            volume_trend = (recent_vol - historic_vol) / historic_vol
-                    
-                    # Combined momentum score
-                    momentum_score = price_momentum + (0.3 * volume_trend)
-                    scores[symbol] = momentum_score
-                    
-                except Exception as e:
-                    logger.warning(f"Error calculating momentum for {symbol}: {e}")
-                    continue
+            table = table[table['bars'] >= 20]
+            
+            # Volume trend counts only with 20 days of volume and a non-zero base
+            volume_trend = table['volume_trend'].where(
+                (table['volume_bars'] >= 20) & np.isfinite(table['volume_trend']), 0
+            )
+            
+            # Combined momentum score
+            scores = (table['momentum'] + 0.3 * volume_trend).dropna().to_dict()
             
             # Select top 6 by momentum score
             if scores:
@@ -311,39 +408,20 @@ class TradingExecutor:
 
     def _select_mean_reversion_universe(self) -> List[str]:
         """Select top 5 symbols with RSI < 35 or RSI > 68."""
-        base_universe = self.base_universes['mean-reversion']
+        base_universe = self.get_base_universe('mean-reversion')
         
         try:
-            # Get 50 days of data for RSI calculation
-            data = yf.download(base_universe, period='50d', progress=False)
-            if 'Close' not in data.columns:
+            # 50 days of data for RSI calculation
+            snapshot = self.get_market_snapshot('mean-reversion')
+            table = snapshot.scores(50).reindex(base_universe)
+            if table.empty:
                 return base_universe[:5]  # Fallback
             
-            candidates = []
-            for symbol in base_universe:
-                try:
-                    if isinstance(data['Close'], pd.DataFrame):
-                        prices = data['Close'][symbol].dropna()
-                    else:
-                        prices = data['Close'].dropna()
-                    
-                    if len(prices) < 30:
-                        continue
-                    
-                    # Calculate RSI
-                    rsi = self._calculate_rsi(prices, period=14)
-                    if pd.isna(rsi):
-                        continue
-                    
-                    # Filter for mean reversion opportunities
-                    if rsi < 35 or rsi > 68:
-                        # Calculate deviation magnitude (furthest from mean)
-                        deviation = abs(rsi - 50)
-                        candidates.append((symbol, deviation, rsi))
-                        
-                except Exception as e:
-                    logger.warning(f"Error calculating RSI for {symbol}: {e}")
-                    continue
+            rsi = table.loc[table['bars'] >= 30, 'rsi']
+            
+            # Filter for mean reversion opportunities, furthest from the mean first
+            rsi = rsi[(rsi < 35) | (rsi > 68)]
+            candidates = [(symbol, abs(value - 50), value) for symbol, value in rsi.items()]
             
             # Select top 5 by deviation magnitude
             if candidates:
@@ -360,51 +438,24 @@ class TradingExecutor:
 
     def _select_sector_rotator_universe(self) -> List[str]:
         """Select top 4 sectors by relative momentum vs SPY."""
-        base_universe = self.base_universes['sector-rotator']
+        base_universe = self.get_base_universe('sector-rotator')
         
         try:
-            # Get 60 days of data
-            symbols_with_spy = base_universe + ['SPY'] if 'SPY' not in base_universe else base_universe
-            data = yf.download(symbols_with_spy, period='60d', progress=False)
-            if 'Close' not in data.columns:
+            # 60 days of data
+            snapshot = self.get_market_snapshot('sector-rotator')
+            table = snapshot.scores(60)
+            if table.empty:
                 return base_universe[:4]  # Fallback
             
-            scores = {}
-            spy_returns = None
+            # SPY returns for comparison
+            spy_returns = 0
+            if 'SPY' in table.index and table.at['SPY', 'bars'] >= 20 and not pd.isna(table.at['SPY', 'momentum']):
+                spy_returns = table.at['SPY', 'momentum']
             
-            # Calculate SPY returns for comparison
-            try:
-                if isinstance(data['Close'], pd.DataFrame):
-                    spy_prices = data['Close']['SPY'].dropna()
-                else:
-                    spy_prices = data['Close'].dropna()
-                
-                if len(spy_prices) >= 20:
-                    spy_returns = (spy_prices.iloc[-1] - spy_prices.iloc[-20]) / spy_prices.iloc[-20]
-            except:
-                spy_returns = 0  # Fallback
-            
-            for symbol in base_universe:
-                if symbol == 'SPY':
-                    continue  # Skip SPY itself for sector selection
-                    
-                try:
-                    if isinstance(data['Close'], pd.DataFrame):
-                        prices = data['Close'][symbol].dropna()
-                    else:
-                        prices = data['Close'].dropna()
-                    
-                    if len(prices) < 20:
-                        continue
-                    
-                    # Calculate relative momentum vs SPY
-                    sector_returns = (prices.iloc[-1] - prices.iloc[-20]) / prices.iloc[-20]
-                    relative_momentum = sector_returns - (spy_returns if spy_returns is not None else 0)
-                    scores[symbol] = relative_momentum
-                    
-                except Exception as e:
-                    logger.warning(f"Error calculating sector momentum for {symbol}: {e}")
-                    continue
+            # Relative momentum vs SPY, skipping SPY itself
+            sectors = table.reindex([symbol for symbol in base_universe if symbol != 'SPY'])
+            sectors = sectors[sectors['bars'] >= 20]
+            scores = (sectors['momentum'] - spy_returns).dropna().to_dict()
             
             # Select top 4 sectors plus SPY and QQQ
             if scores:
@@ -425,62 +476,29 @@ class TradingExecutor:
 
     def _select_value_dividends_universe(self) -> List[str]:
         """Select top 7 symbols by value score (RSI < 45 + price below 50-day SMA + low volatility)."""
-        base_universe = self.base_universes['value-dividends']
+        base_universe = self.get_base_universe('value-dividends')
         
         try:
-            # Get 60 days of data
-            data = yf.download(base_universe, period='60d', progress=False)
-            if 'Close' not in data.columns:
+            # 60 days of data
+            snapshot = self.get_market_snapshot('value-dividends')
+            table = snapshot.scores(60).reindex(base_universe)
+            if table.empty:
                 return base_universe[:7]  # Fallback
             
-            scores = {}
-            for symbol in base_universe:
-                try:
-                    if isinstance(data['Close'], pd.DataFrame):
-                        prices = data['Close'][symbol].dropna()
-                    else:
-                        prices = data['Close'].dropna()
-                    
-                    if len(prices) < 50:
-                        continue
-                    
-                    # Calculate RSI
-                    rsi = self._calculate_rsi(prices, period=14)
-                    if pd.isna(rsi):
-                        continue
-                    
-                    # Calculate 50-day SMA
-                    sma_50 = prices.rolling(window=50).mean().iloc[-1]
-                    current_price = prices.iloc[-1]
-                    
-                    # Calculate volatility (20-day)
-                    returns = prices.pct_change().dropna()
-                    if len(returns) >= 20:
-                        volatility = returns.rolling(window=20).std().iloc[-1] * np.sqrt(252)  # Annualized
-                    else:
-                        volatility = returns.std() * np.sqrt(252)
-                    
-                    # Value score calculation
-                    value_score = 0
-                    
-                    # RSI component (higher score for lower RSI, up to 45)
-                    if rsi < 45:
-                        value_score += (45 - rsi) / 45  # Normalized to 0-1
-                    
-                    # Price below SMA component
-                    if current_price < sma_50:
-                        value_score += (sma_50 - current_price) / sma_50
-                    
-                    # Low volatility component (inverse volatility, capped)
-                    if volatility > 0:
-                        vol_score = max(0, 1 - (volatility / 0.5))  # Normalize around 50% annual vol
-                        value_score += vol_score * 0.5  # Weight volatility component
-                    
-                    scores[symbol] = value_score
-                    
-                except Exception as e:
-                    logger.warning(f"Error calculating value score for {symbol}: {e}")
-                    continue
+            table = table[table['bars'] >= 50].dropna(subset=['close', 'sma_50'])
+            rsi, price, sma_50 = table['rsi'], table['close'], table['sma_50']
+            volatility = table['volatility']
+            
+            # RSI component (higher score for lower RSI, up to 45), normalized to 0-1
+            rsi_score = ((45 - rsi) / 45).where(rsi < 45, 0)
+            
+            # Price below SMA component
+            sma_score = ((sma_50 - price) / sma_50).where(price < sma_50, 0)
+            
+            # Low volatility component (inverse volatility, capped around 50% annual vol)
+            vol_score = (1 - volatility / 0.5).clip(lower=0).where(volatility > 0, 0)
+            
+            scores = (rsi_score + sma_score + vol_score * 0.5).to_dict()
             
             # Select top 7 by value score
             if scores:
@@ -497,52 +515,22 @@ class TradingExecutor:
 
     def _select_volatility_breakout_universe(self) -> List[str]:
         """Select top 5 symbols with high volume and volatility."""
-        base_universe = self.base_universes['volatility-breakout']
+        base_universe = self.get_base_universe('volatility-breakout')
         
         try:
-            # Get 30 days of data
-            data = yf.download(base_universe, period='30d', progress=False)
-            if 'Close' not in data.columns or 'Volume' not in data.columns:
+            # 30 days of data
+            snapshot = self.get_market_snapshot('volatility-breakout')
+            table = snapshot.scores(30).reindex(base_universe)
+            if table.empty:
                 return base_universe[:5]  # Fallback
             
-            candidates = []
-            for symbol in base_universe:
-                try:
-                    if isinstance(data['Close'], pd.DataFrame):
-                        prices = data['Close'][symbol].dropna()
-                        volumes = data['Volume'][symbol].dropna()
-                    else:
-                        prices = data['Close'].dropna()
-                        volumes = data['Volume'].dropna()
-                    
-                    if len(prices) < 20 or len(volumes) < 20:
-                        continue
-                    
-                    # Check volume filter: yesterday's volume > 1.5x 20-day avg
-                    avg_volume_20d = volumes.iloc[-21:-1].mean()  # Exclude today
-                    yesterday_volume = volumes.iloc[-2]  # Yesterday
-                    
-                    if yesterday_volume <= avg_volume_20d * 1.5:
-                        continue  # Skip if volume not elevated
-                    
-                    # Calculate ATR percentage
-                    highs = data['High'][symbol].dropna() if isinstance(data['High'], pd.DataFrame) else data['High'].dropna()
-                    lows = data['Low'][symbol].dropna() if isinstance(data['Low'], pd.DataFrame) else data['Low'].dropna()
-                    
-                    if len(highs) >= 14 and len(lows) >= 14:
-                        tr1 = highs - lows
-                        tr2 = (highs - prices.shift(1)).abs()
-                        tr3 = (lows - prices.shift(1)).abs()
-                        
-                        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-                        atr = true_range.rolling(window=14).mean().iloc[-1]
-                        atr_percentage = (atr / prices.iloc[-1]) * 100
-                        
-                        candidates.append((symbol, atr_percentage))
-                    
-                except Exception as e:
-                    logger.warning(f"Error calculating volatility breakout score for {symbol}: {e}")
-                    continue
+            table = table[(table['bars'] >= 20) & (table['volume_bars'] >= 20)]
+            
+            # Volume filter: yesterday's volume > 1.5x 20-day avg
+            table = table[table['prior_volume'] > table['avg_volume_20d'] * 1.5]
+            
+            # Rank by ATR percentage
+            candidates = list(table['atr_pct'].dropna().items())
             
             # Select top 5 by ATR percentage
             if candidates:
@@ -557,17 +545,70 @@ class TradingExecutor:
             logger.error(f"Error in volatility breakout selection: {e}")
             return base_universe[:5]  # Fallback
 
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> float:
-        """Calculate RSI for a price series."""
+    def _download(self, symbols: List[str], period: str, interval: str = '1d') -> pd.DataFrame:
+        """
+        Download bars in yfinance's layout (columns: field x ticker).
+
+        Reads covered by this cycle's prefetch are served from memory. With
+        ``data_source='alpaca'`` the bars come from the Alpaca client instead
+        of yfinance, which is how shadow replay serves stored history.
+        """
+        timeframe = {'1d': '1Day', '5m': '5Min'}.get(interval, '1Day')
+        days = int(period.rstrip('d'))
+        
+        if self.cycle_data is not None:
+            frames = self.cycle_data.get_bars(symbols, timeframe, days)
+            if frames is not None:
+                return self._to_download_layout(frames)
+        
+        if self.data_source == 'yfinance':
+            return yf.download(symbols, period=period, interval=interval, progress=False)
+        return self._to_download_layout(fetch_alpaca_bars(self.alpaca, symbols, timeframe, days))
+    
+    def _to_download_layout(self, frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Per-symbol lowercase OHLCV frames in yfinance's download layout."""
+        if not frames:
+            return pd.DataFrame()
+        frames = {symbol: df.rename(columns=str.capitalize) for symbol, df in frames.items()}
+        return pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+    
+    def _fetch_bars(self, symbols: List[str], timeframe: str, days: int) -> Dict[str, pd.DataFrame]:
+        """One prefetch batch from the configured data source, as per-symbol frames."""
+        if self.data_source == 'yfinance':
+            interval = {'1Day': '1d', '5Min': '5m'}[timeframe]
+            data = yf.download(symbols, period=f'{days}d', interval=interval, progress=False)
+            return self._split_market_data(symbols, data)
+        return fetch_alpaca_bars(self.alpaca, symbols, timeframe, days)
+    
+    def prefetch_market_data(self, strategy_ids: List[int]) -> Optional[CycleMarketData]:
+        """
+        Fetch the bars every due strategy will read this cycle, concurrently.
+        
+        The market snapshot for universe selection and get_market_data() then
+        read from memory. The selected universe is a subset of the base
+        universe, so the base universe is fetched for market data.
+        """
+        if not config.MARKET_DATA_PREFETCH or not strategy_ids:
+            return None
+        
+        cycle_data = CycleMarketData(self._fetch_bars, now=self.alpaca.now())
+        snapshot_symbols = self._snapshot_symbols()
+        for strategy_id in strategy_ids:
+            strategy = self.strategy_config[strategy_id]
+            base_universe = self.get_base_universe(strategy['name'])
+            if self.get_cache_key(strategy['name']) not in self.universe_cache and \
+                    not self._snapshot_is_valid(strategy['name'], snapshot_symbols):
+                cycle_data.request_bars(snapshot_symbols, '1Day', SELECTION_LOOKBACK_DAYS)
+            cycle_data.request_bars(base_universe, strategy['timeframe'], MARKET_DATA_DAYS[strategy['timeframe']])
+        
         try:
-            delta = prices.diff()
-            gain = delta.where(delta > 0, 0).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi.iloc[-1] if not pd.isna(rsi.iloc[-1]) else 50.0
-        except:
-            return 50.0  # Fallback neutral RSI
+            cycle_data.prefetch()
+        except Exception as e:
+            logger.error(f"Market data prefetch failed, fetching per strategy: {e}")
+            return None
+        
+        self.cycle_data = cycle_data
+        return cycle_data
 
     def get_market_data(self, symbols: List[str], timeframe: str = '5Min', days: int = 60) -> Optional[pd.DataFrame]:
         """Get market data with specified timeframe."""
@@ -577,14 +618,14 @@ class TradingExecutor:
                 # Note: yfinance doesn't directly support 5Min intervals for all symbols
                 # For now, we'll use 1-minute data and resample, or use daily data
                 # In a real implementation, you'd use the Alpaca API for 5-minute bars
-                period = '5d'  # Get last 5 days for intraday
+                period = f"{MARKET_DATA_DAYS['5Min']}d"  # Get last 5 days for intraday
                 interval = '5m'
             else:
                 # Daily data
                 period = f'{days}d'
                 interval = '1d'
             
-            data = yf.download(symbols, period=period, interval=interval, progress=False)
+            data = self._download(symbols, period=period, interval=interval)
             
             if data.empty:
                 logger.warning(f"No data retrieved for symbols: {symbols}")
@@ -597,33 +638,25 @@ class TradingExecutor:
             return None
 
     def record_equity_snapshot(self, trades_executed: List[Dict[str, Any]] = None) -> bool:
-        """Record portfolio snapshots and trades to file."""
+        """Record portfolio snapshots and trades in the equity snapshot store."""
+        if self.snapshot_store is None:
+            return True
+        
         try:
-            timestamp = datetime.now().isoformat()
+            timestamp = self.alpaca.now().isoformat()
             
-            # Get current positions from Alpaca
-            positions = self.get_alpaca_positions()
-            account = self.alpaca.get_account()
+            # Each strategy's ledger cash plus its positions at current quotes
+            equity = self.strategy_executor.get_strategy_equity()
             
-            # Group positions by strategy (simplified - would need better tracking in real implementation)
             strategy_snapshots = {}
-            
             for strategy_id, config in self.strategy_config.items():
-                strategy_name = config['name']
-                strategy_positions = {}
-                strategy_cash = 0
-                strategy_value = 0
-                
-                # For now, we'll estimate strategy allocation
-                # In a real implementation, you'd track this properly
-                total_value = float(account.get('portfolio_value', 0))
-                strategy_value = total_value / len(self.strategy_config)  # Equal allocation estimate
-                
-                strategy_snapshots[strategy_name] = {
-                    'value': round(strategy_value, 2),
-                    'cash': round(float(account.get('cash', 0)) / len(self.strategy_config), 2),
-                    'positions_value': round(strategy_value - (float(account.get('cash', 0)) / len(self.strategy_config)), 2)
+                strategy_equity = equity[strategy_id]
+                strategy_snapshots[config['name']] = {
+                    'value': round(strategy_equity['value'], 2),
+                    'cash': round(strategy_equity['cash'], 2),
+                    'positions_value': round(strategy_equity['positions_value'], 2)
                 }
+            total_value = sum(strategy_equity['value'] for strategy_equity in equity.values())
             
             # Create snapshot entry
             snapshot_entry = {
@@ -635,27 +668,8 @@ class TradingExecutor:
             if trades_executed:
                 snapshot_entry['trades'] = trades_executed
             
-            # Load existing snapshots
-            snapshots = []
-            if os.path.exists(self.snapshots_file):
-                try:
-                    with open(self.snapshots_file, 'r') as f:
-                        snapshots = json.load(f)
-                        if not isinstance(snapshots, list):
-                            snapshots = []
-                except json.JSONDecodeError:
-                    snapshots = []
-            
-            # Append new snapshot
-            snapshots.append(snapshot_entry)
-            
-            # Keep only last 1000 snapshots (approximately 3.5 days at 5-min intervals)
-            if len(snapshots) > 1000:
-                snapshots = snapshots[-1000:]
-            
-            # Save back to file
-            with open(self.snapshots_file, 'w') as f:
-                json.dump(snapshots, f, indent=2)
+            # Append to the snapshot history
+            self.snapshot_store.append(snapshot_entry)
             
             logger.info(f"Equity snapshot recorded: {len(strategy_snapshots)} strategies, total value: ${total_value:.2f}")
             return True
@@ -665,30 +679,16 @@ class TradingExecutor:
             return False
 
     def check_market_status(self) -> bool:
-        """Check if the market is currently open using Alpaca API."""
-        try:
-            clock_url = f"{config.ALPACA_BASE_URL}/clock"
-            headers = config.get_api_headers()
-            response = requests.get(clock_url, headers=headers)
-            response.raise_for_status()
-            
-            clock_data = response.json()
-            is_open = clock_data.get('is_open', False)
-            next_open = clock_data.get('next_open', '')
-            next_close = clock_data.get('next_close', '')
-            
-            logger.info(f"Market status - Open: {is_open}")
-            if self.verbose:
-                if next_open:
-                    logger.debug(f"Next open: {next_open}")
-                if next_close:
-                    logger.debug(f"Next close: {next_close}")
-                
-            return is_open
+        """Check if the market is currently open using the market calendar (no API call)."""
+        now = self.alpaca.now()
+        is_open = self.scheduler.calendar.is_open(now)
+        
+        logger.info(f"Market status - Open: {is_open}")
+        if self.verbose:
+            open_at, close_at = self.scheduler.calendar.next_session(now)
+            logger.debug(f"Next session: {open_at.isoformat()} - {close_at.isoformat()}")
             
-        except Exception as e:
-            logger.error(f"Error checking market status: {e}")
-            return False
+        return is_open
     
     def get_alpaca_positions(self) -> Dict[str, Any]:
         """Get current positions from Alpaca paper account."""
@@ -738,7 +738,7 @@ class TradingExecutor:
         if self.dry_run:
             logger.info(f"DRY RUN - Would execute: {action} {quantity} {symbol} @ ${price:.2f} - {reason}")
             return {
-                'id': f'dry_run_{datetime.now().timestamp()}',
+                'id': f'dry_run_{self.alpaca.now().timestamp()}',
                 'symbol': symbol,
                 'side': action,
                 'qty': quantity,
@@ -747,29 +747,22 @@ class TradingExecutor:
             }
         
         try:
-            # Create client_order_id with strategy name and timestamp
-            strategy_name = self.strategy_config[strategy_id]['name']
-            timestamp = int(datetime.now().timestamp())
-            client_order_id = f"{strategy_name}_{action}_{symbol}_{timestamp}"
+            # Create client_order_id with the strategy's ledger slug and timestamp,
+            # so the fill is attributed to the strategy (ledger and dashboard)
+            strategy_slug = self.strategy_executor.strategies[strategy_id]['slug']
+            timestamp = int(self.alpaca.now().timestamp())
+            client_order_id = f"{strategy_slug}-{symbol}-{timestamp}"
             
             # Place the order
-            order_data = {
-                'symbol': symbol,
-                'qty': quantity,
-                'side': action,
-                'type': 'market',
-                'time_in_force': 'day',
-                'client_order_id': client_order_id
-            }
-            
-            order_url = f"{config.ALPACA_BASE_URL}/orders"
-            headers = config.get_api_headers()
-            
             logger.info(f"Placing order: {action} {quantity} {symbol} @ market (client_order_id: {client_order_id})")
-            response = requests.post(order_url, headers=headers, json=order_data)
-            response.raise_for_status()
-            
-            order = response.json()
+            order = self.alpaca.place_order(
+                symbol=symbol,
+                qty=quantity,
+                side=action,
+                order_type='market',
+                time_in_force='day',
+                client_order_id=client_order_id
+            )
             
             logger.info(f"Order placed successfully: {order.get('id')} - {action} {quantity} {symbol}")
             logger.info(f"Reason: {reason}")
@@ -781,15 +774,35 @@ class TradingExecutor:
             return None
 
     def run_strategy_execution(self) -> Dict[str, Any]:
+        """Run one cycle, timed into the telemetry registry, and export the metrics."""
+        with metrics.stage('cycle', 'trading'):
+            result = self._run_strategy_execution()
+        self.export_metrics()
+        return result
+
+    def export_metrics(self) -> None:
+        """Set the cycle's cache hit ratios and write the metrics textfile (when publishing)."""
+        lookups = self.universe_stats['hits'] + self.universe_stats['misses']
+        if lookups:
+            metrics.cache_hit_ratio('universe', self.universe_stats['hits'] / lookups)
+        metrics.cache_hit_ratio('quotes', self.strategy_executor.quote_cache.get_stats()['hit_rate'])
+        metrics.cache_hit_ratio('features', self.strategy_executor.features.get_stats()['hit_rate'])
+        if self.publish:
+            metrics.export()
+
+    def _run_strategy_execution(self) -> Dict[str, Any]:
         """Run strategies with 5-minute granularity and dynamic universe selection."""
         logger.info("="*60)
         logger.info("STARTING ENHANCED TRADING EXECUTION")
         logger.info("="*60)
         
         # Check market status first
-        if not self.check_market_status():
+        with metrics.stage('clock', 'trading'):
+            market_open = self.check_market_status()
+        if not market_open:
             logger.info("Market is closed. Recording snapshot and exiting gracefully.")
-            self.record_equity_snapshot()
+            with metrics.stage('snapshot', 'trading'):
+                self.record_equity_snapshot()
             return {
                 'success': True,
                 'message': 'Market is closed',
@@ -799,24 +812,41 @@ class TradingExecutor:
         
         logger.info("Market is OPEN - proceeding with strategy execution")
         
-        # Get current Alpaca positions for risk management
-        current_positions = self.get_alpaca_positions()
+        # Get current Alpaca positions for risk management, shared by the
+        # strategies while they run
+        with metrics.stage('positions', 'trading'):
+            current_positions = RiskView(self.get_alpaca_positions())
         logger.info(f"Current portfolio has {len(current_positions)} positions")
         
         total_trades = 0
         strategy_results = {}
         executed_trades = []
         
-        # Check each strategy for execution
-        for strategy_id in range(1, 6):
-            config = self.strategy_config[strategy_id]
-            strategy_name = config['name']
-            
-            logger.info(f"\n--- Checking Strategy {strategy_id} ({strategy_name}) ---")
+        # Orders are queued and netted across strategies, then sent together after the last one
+        netter = self.strategy_executor.order_netter() if self.batch_orders else None
+        netted_trades = []
+        
+        # Fetch every due strategy's market data in one concurrent stage
+        due_strategies = self.scheduler.due(self.alpaca.now(), self.strategy_config)
+        with metrics.stage('prefetch', 'trading'):
+            self.load_precomputed_universes()
+            self.prefetch_market_data(due_strategies)
+        
+        # Run the due strategies side by side, each within its time budget
+        outcomes = run_isolated(
+            {
+                strategy_id: partial(self.execute_strategy, strategy_id, current_positions)
+                for strategy_id in self.strategy_config if strategy_id in due_strategies
+            },
+            timeout=config.STRATEGY_TIMEOUT, timeouts=config.STRATEGY_TIMEOUTS,
+            max_workers=config.STRATEGY_MAX_WORKERS
+        )
+        
+        # Collect the results and queue the trades in strategy order
+        for strategy_id, strategy in self.strategy_config.items():
+            strategy_name = strategy['name']
             
-            # Check if this strategy should execute now
-            should_execute = self.should_execute_strategy(strategy_id)
-            if not should_execute:
+            if strategy_id not in outcomes:
                 if self.verbose:
                     logger.debug(f"Strategy {strategy_id} not scheduled to execute now")
                 strategy_results[f'strategy_{strategy_id}'] = {
@@ -827,125 +857,62 @@ class TradingExecutor:
                 }
                 continue
             
-            logger.info(f"Executing strategy {strategy_id} ({strategy_name})")
-            
-            try:
-                # Get dynamic universe for this strategy
-                universe = self.get_dynamic_universe(strategy_name)
-                
-                if not universe:
-                    logger.warning(f"Empty universe for strategy {strategy_id}")
-                    continue
-                
-                # Get market data with appropriate timeframe
-                timeframe = config['timeframe']
-                data = self.get_market_data(universe, timeframe=timeframe)
-                
-                if data is None or data.empty:
-                    logger.warning(f"No market data for strategy {strategy_id}")
-                    continue
-                
-                # Generate signals (simplified - in real implementation, use proper strategy logic)
-                signals = self.generate_strategy_signals(strategy_id, strategy_name, universe, data)
-                
-                logger.info(f"Generated {len(signals)} signals for {strategy_name}")
-                
-                strategy_trades = 0
-                
-                # Execute trades for signals
-                for signal in signals:
-                    symbol = signal['symbol']
-                    action = signal['action']
-                    price = signal['price']
-                    reason = signal['reason']
-                    confidence = signal.get('confidence', 0.7)
-                    
-                    logger.info(f"Processing signal: {action} {symbol} @ ${price:.2f} (confidence: {confidence:.3f})")
-                    
-                    # Risk management checks
-                    if action == 'buy':
-                        # Check if already holding this position
-                        if symbol in current_positions:
-                            if self.verbose:
-                                logger.debug(f"Already holding {symbol}, skipping buy signal")
-                            continue
-                        
-                        # Calculate position size
-                        quantity = self.calculate_position_size(price, strategy_id)
-                        
-                    elif action == 'sell':
-                        # Check if we have this position
-                        if symbol not in current_positions:
-                            if self.verbose:
-                                logger.debug(f"No position in {symbol}, skipping sell signal")
-                            continue
-                        
-                        # Use current position size
-                        quantity = int(current_positions[symbol]['quantity'])
-                    
-                    else:
-                        logger.warning(f"Unknown action: {action}")
-                        continue
-                    
-                    # Execute the trade on Alpaca
-                    order = self.execute_alpaca_trade(
-                        strategy_id, symbol, action, quantity, price, reason
-                    )
-                    
-                    if order:
-                        # Track the trade
-                        trade_record = {
-                            'strategy_id': strategy_id,
-                            'strategy_name': strategy_name,
-                            'symbol': symbol,
-                            'action': action,
-                            'quantity': quantity,
-                            'price': price,
-                            'reason': reason,
-                            'confidence': confidence,
-                            'order_id': order.get('id'),
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        executed_trades.append(trade_record)
-                        
-                        # Update our position tracking
-                        if action == 'buy':
-                            current_positions[symbol] = {
-                                'quantity': quantity,
-                                'avg_cost': price,
-                                'market_value': quantity * price,
-                                'unrealized_pl': 0
-                            }
-                        elif action == 'sell' and symbol in current_positions:
-                            del current_positions[symbol]
-                        
-                        strategy_trades += 1
-                        total_trades += 1
-                        
-                        logger.info(f"✓ Trade executed: {action} {quantity} {symbol} @ ${price:.2f}")
-                    else:
-                        logger.error(f"✗ Failed to execute trade: {action} {quantity} {symbol}")
-                
-                strategy_results[f'strategy_{strategy_id}'] = {
-                    'name': strategy_name,
-                    'universe_size': len(universe),
-                    'signals_generated': len(signals),
-                    'trades_executed': strategy_trades,
-                    'success': True
-                }
-                
-                logger.info(f"Strategy {strategy_id} complete: {strategy_trades} trades executed")
-                
-            except Exception as e:
-                logger.error(f"Error executing strategy {strategy_id}: {e}")
+            outcome = outcomes[strategy_id]
+            if not outcome.success:
+                # Its trades are dropped, so give back the positions it claimed
+                current_positions.release(strategy_id)
+                if outcome.status == 'timed_out':
+                    metrics.counter(
+                        'trading_strategy_timeouts_total', 'Strategies skipped for overrunning their budget',
+                        ['executor', 'strategy']
+                    ).inc(executor='trading', strategy=strategy_name)
                 strategy_results[f'strategy_{strategy_id}'] = {
                     'name': strategy_name,
                     'success': False,
-                    'error': str(e)
+                    'timed_out': outcome.status == 'timed_out',
+                    'error': outcome.error
                 }
+                continue
+            
+            result, trades = outcome.value
+            if result is not None:
+                strategy_results[f'strategy_{strategy_id}'] = result
+            for trade_record, signal_at in trades:
+                executed_trades.append(trade_record)
+                if netter is not None:
+                    intended = netter.add(
+                        strategy_id, trade_record['symbol'], trade_record['action'], trade_record['quantity'],
+                        trade_record['price'], trade_record['reason'], signal_at=signal_at
+                    )
+                    netted_trades.append((intended, trade_record))
+                total_trades += 1
+        
+        if netter is not None:
+            with metrics.stage('orders', 'trading'):
+                netter.submit()
+            for intended, trade_record in netted_trades:
+                if intended.success:
+                    trade_record['order_id'] = intended.order.get('id') if intended.order else None
+                    trade_record['crossed_quantity'] = intended.crossed
+                    trade_record['latency'] = intended.latency
+                    continue
+                executed_trades.remove(trade_record)
+                total_trades -= 1
+                result = strategy_results.get(f'strategy_{intended.strategy_id}', {})
+                if 'trades_executed' in result:
+                    result['trades_executed'] -= 1
+            netting = netter.get_stats()
+            logger.info(f"Order netting: {netting['intended']} orders, {netting['crossed_shares']} shares "
+                        f"crossed internally, {netting['submitted']} sent to the broker")
+        
+        self.cycle_data = None
+        self.strategy_executor.save_indicator_state()
+        if self.journal is not None:
+            self.journal.flush()
         
         # Record equity snapshot with executed trades
-        self.record_equity_snapshot(executed_trades)
+        with metrics.stage('snapshot', 'trading'):
+            self.record_equity_snapshot(executed_trades)
         
         # Final summary
         logger.info("\n" + "="*60)
@@ -965,7 +932,7 @@ class TradingExecutor:
         
         return {
             'success': True,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self.alpaca.now().isoformat(),
             'trades_executed': total_trades,
             'strategies_run': len([r for r in strategy_results.values() if r.get('success') and not r.get('skipped')]),
             'strategy_results': strategy_results,
@@ -973,89 +940,217 @@ class TradingExecutor:
             'final_position_count': len(current_positions)
         }
 
-    def generate_strategy_signals(
-        self, 
-        strategy_id: int, 
-        strategy_name: str, 
-        universe: List[str], 
-        data: pd.DataFrame
-    ) -> List[Dict[str, Any]]:
-        """Generate trading signals for a strategy (simplified implementation)."""
-        signals = []
+    def execute_strategy(self, strategy_id: int, positions: RiskView) -> Tuple[Optional[Dict[str, Any]], List[Tuple[Dict[str, Any], float]]]:
+        """
+        Run one due strategy: select its universe, generate its signals and
+        claim its trades against the cycle's shared positions.
+        
+        Runs on its own thread (see run_isolated). Batched trades are returned
+        for the cycle to queue with its netter; otherwise (dry runs) each trade
+        is placed here.
+        
+        Returns:
+            (result, [(trade record, monotonic time of its signal)]); result is
+            None when the strategy had no universe or market data
+        """
+        strategy = self.strategy_config[strategy_id]
+        strategy_name = strategy['name']
+        trades = []
+        
+        logger.info(f"Executing strategy {strategy_id} ({strategy_name})")
         
         try:
-            # Get current prices
-            if isinstance(data.get('Close'), pd.DataFrame):
-                current_prices = data['Close'].iloc[-1]
-            else:
-                # Single symbol
-                current_prices = {universe[0]: data['Close'].iloc[-1]}
+            # Get dynamic universe for this strategy
+            with metrics.stage('universe', 'trading', strategy_name):
+                universe = self.get_dynamic_universe(strategy_name)
             
-            # Simple signal generation based on strategy type
-            for symbol in universe:
-                try:
-                    if symbol not in current_prices:
-                        continue
+            if not universe:
+                logger.warning(f"Empty universe for strategy {strategy_id}")
+                return None, trades
+            
+            # Get market data with appropriate timeframe
+            timeframe = strategy['timeframe']
+            with metrics.stage('data', 'trading', strategy_name):
+                data = self.get_market_data(universe, timeframe=timeframe)
+            
+            if data is None or data.empty:
+                logger.warning(f"No market data for strategy {strategy_id}")
+                return None, trades
+            
+            # Generate signals
+            with metrics.stage('signals', 'trading', strategy_name):
+                signals = self.generate_strategy_signals(strategy_id, strategy_name, universe, data)
+            metrics.counter(
+                'trading_signals_total', 'Signals generated', ['executor', 'strategy']
+            ).inc(len(signals), executor='trading', strategy=strategy_name)
+            
+            logger.info(f"Generated {len(signals)} signals for {strategy_name}")
+            if self.journal is not None:
+                self.journal.record(signals, source='trading_executor', strategy=strategy_name,
+                                    timestamp=self.alpaca.now())
+            
+            # Execute trades for signals
+            for signal in signals:
+                if cancelled():
+                    logger.warning(f"{strategy_name} overran its budget, dropping its remaining signals")
+                    break
+                
+                symbol = signal['symbol']
+                action = signal['action']
+                price = signal['price']
+                reason = signal['reason']
+                confidence = signal.get('confidence', 0.7)
+                signal_at = time.monotonic()
+                
+                logger.info(f"Processing signal: {action} {symbol} @ ${price:.2f} (confidence: {confidence:.3f})")
+                
+                # Risk management checks, claiming the position so strategies
+                # running at the same time cannot trade it too
+                with metrics.stage('risk', 'trading', strategy_name):
+                    if action == 'buy':
+                        # Calculate position size
+                        quantity = self.calculate_position_size(price, strategy_id)
+                        position = {
+                            'quantity': quantity,
+                            'avg_cost': price,
+                            'market_value': quantity * price,
+                            'unrealized_pl': 0
+                        }
                         
-                    price = current_prices[symbol]
-                    if pd.isna(price):
-                        continue
-                    
-                    # Generate a sample signal (in real implementation, use proper strategy logic)
-                    if strategy_name == 'momentum-hunter':
-                        # Simple momentum signal: buy if price > 20-day MA
-                        if isinstance(data['Close'], pd.DataFrame):
-                            prices = data['Close'][symbol].dropna()
-                        else:
-                            prices = data['Close'].dropna()
+                        # Skip if already holding this position
+                        if not positions.open(symbol, position, owner=strategy_id):
+                            if self.verbose:
+                                logger.debug(f"Already holding {symbol}, skipping buy signal")
+                            continue
                         
-                        if len(prices) >= 20:
-                            ma_20 = prices.rolling(window=20).mean().iloc[-1]
-                            if price > ma_20:
-                                signals.append({
-                                    'symbol': symbol,
-                                    'action': 'buy',
-                                    'price': price,
-                                    'confidence': 0.7,
-                                    'reason': f'Price ${price:.2f} above 20-day MA ${ma_20:.2f}'
-                                })
-                    
-                    elif strategy_name == 'mean-reversion':
-                        # Simple mean reversion: buy if RSI < 35, sell if RSI > 70
-                        if isinstance(data['Close'], pd.DataFrame):
-                            prices = data['Close'][symbol].dropna()
-                        else:
-                            prices = data['Close'].dropna()
+                    elif action == 'sell':
+                        # Check if we have this position, and use its size
+                        position = positions.close(symbol, owner=strategy_id)
+                        if position is None:
+                            if self.verbose:
+                                logger.debug(f"No position in {symbol}, skipping sell signal")
+                            continue
                         
-                        if len(prices) >= 30:
-                            rsi = self._calculate_rsi(prices)
-                            if rsi < 35:
-                                signals.append({
-                                    'symbol': symbol,
-                                    'action': 'buy',
-                                    'price': price,
-                                    'confidence': 0.75,
-                                    'reason': f'Oversold RSI: {rsi:.1f}'
-                                })
-                            elif rsi > 70:
-                                signals.append({
-                                    'symbol': symbol,
-                                    'action': 'sell',
-                                    'price': price,
-                                    'confidence': 0.75,
-                                    'reason': f'Overbought RSI: {rsi:.1f}'
-                                })
+                        quantity = int(position['quantity'])
                     
-                    # Add other strategy signal logic here...
+                    else:
+                        logger.warning(f"Unknown action: {action}")
+                        continue
+                
+                # Execute the trade on Alpaca (queued for netting by the cycle when batching)
+                if self.batch_orders:
+                    order = {'id': None}
+                else:
+                    with metrics.stage('orders', 'trading', strategy_name):
+                        order = self.execute_alpaca_trade(
+                            strategy_id, symbol, action, quantity, price, reason
+                        )
+                
+                if order:
+                    # Track the trade
+                    trades.append(({
+                        'strategy_id': strategy_id,
+                        'strategy_name': strategy_name,
+                        'symbol': symbol,
+                        'action': action,
+                        'quantity': quantity,
+                        'price': price,
+                        'reason': reason,
+                        'confidence': confidence,
+                        'order_id': order.get('id'),
+                        'timestamp': self.alpaca.now().isoformat()
+                    }, signal_at))
                     
-                except Exception as e:
-                    logger.warning(f"Error generating signal for {symbol}: {e}")
+                    logger.info(f"✓ Trade executed: {action} {quantity} {symbol} @ ${price:.2f}")
+                else:
+                    # Give the claimed position back
+                    if action == 'buy':
+                        positions.close(symbol)
+                    else:
+                        positions.open(symbol, position)
+                    logger.error(f"✗ Failed to execute trade: {action} {quantity} {symbol}")
+            
+            logger.info(f"Strategy {strategy_id} complete: {len(trades)} trades executed")
+            
+            return {
+                'name': strategy_name,
+                'universe_size': len(universe),
+                'signals_generated': len(signals),
+                'trades_executed': len(trades),
+                'success': True
+            }, trades
+            
+        except Exception as e:
+            logger.error(f"Error executing strategy {strategy_id}: {e}")
+            return {
+                'name': strategy_name,
+                'success': False,
+                'error': str(e)
+            }, trades
+
+    def _split_market_data(self, universe: List[str], data: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Split a yfinance download into per-symbol lowercase OHLCV frames."""
+        fields = {'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'}
+        frames = {}
+        
+        for symbol in universe:
+            if isinstance(data.get('Close'), pd.DataFrame):
+                if symbol not in data['Close'].columns:
+                    continue
+                df = pd.DataFrame({
+                    name: data[field][symbol] for field, name in fields.items() if field in data
+                })
+            else:
+                # Single symbol
+                if symbol != universe[0]:
                     continue
+                df = data[[field for field in fields if field in data]].rename(columns=fields)
             
+            df = df.dropna(subset=['close'])
+            if not df.empty:
+                frames[symbol] = df
+        
+        return frames
+
+    def generate_strategy_signals(
+        self, 
+        strategy_id: int, 
+        strategy_name: str, 
+        universe: List[str], 
+        data: pd.DataFrame
+    ) -> List[Dict[str, Any]]:
+        """Generate trading signals with the live strategy classes used by StrategyExecutor."""
+        try:
+            market_data = self._split_market_data(universe, data)
         except Exception as e:
-            logger.error(f"Error generating signals for {strategy_name}: {e}")
+            logger.error(f"Error preparing market data for {strategy_name}: {e}")
+            return []
+        
+        if not market_data:
+            return []
+        
+        return self.strategy_executor.run_live_strategy(strategy_name.replace('-', '_'), market_data)
+
+    def run_forever(self, max_sleep: float = 3600) -> None:
+        """
+        Run each cycle at the next scheduled strategy run, sleeping in between
+        (no polling and no clock requests while the market is closed).
         
-        return signals
+        Args:
+            max_sleep: Longest single sleep in seconds; the next run is
+                re-evaluated on waking
+        """
+        while True:
+            now = self.alpaca.now()
+            next_run = self.scheduler.next_event(now)
+            wait = (next_run - now).total_seconds()
+            if wait > 0:
+                logger.info(f"Next scheduled run at {next_run.isoformat()} ({wait / 60:.1f} min)")
+                time.sleep(min(wait, max_sleep))
+                continue
+            
+            result = self.run_strategy_execution()
+            logger.info(f"Cycle finished: {result.get('trades_executed', 0)} trades")
 
     def get_status(self) -> Dict[str, Any]:
         """Get comprehensive trading status."""
@@ -1068,7 +1163,7 @@ class TradingExecutor:
             positions = self.get_alpaca_positions()
             
             # Strategy execution status
-            now = datetime.now()
+            now = self.alpaca.now()
             execution_status = {}
             
             for strategy_id, config in self.strategy_config.items():
@@ -1116,6 +1211,8 @@ def main():
                        help='Enable verbose logging')
     parser.add_argument('--market-check', action='store_true',
                        help='Only check market status')
+    parser.add_argument('--loop', action='store_true',
+                       help='Keep running, sleeping until each scheduled strategy run')
     
     args = parser.parse_args()
     
@@ -1137,6 +1234,12 @@ def main():
         if args.verbose:
             logger.info("VERBOSE MODE ENABLED")
         
+        if args.loop:
+            if config.METRICS_PORT:
+                metrics.serve()
+            executor.run_forever()
+            return
+        
         result = executor.run_strategy_execution()
         print(json.dumps(result, indent=2))
 
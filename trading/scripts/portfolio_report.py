@@ -16,6 +16,9 @@ import requests
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'quant'))
+
+from quote_cache import quote_cache as shared_quote_cache
 
 # Database path - adjust for EC2 when deploying
 DB_PATH = os.getenv('DB_PATH', '/Users/moltbot/clawd/PersonalWebsite/trading/server/data/trading.db')
@@ -28,8 +31,9 @@ ALPACA_SECRET_KEY = os.getenv('ALPACA_SECRET_KEY', 'SECRET_PLACEHOLDER')
 ALPACA_BASE_URL = 'https://paper-api.alpaca.markets'
 
 class PortfolioReporter:
-    def __init__(self, db_path: str = DB_PATH):
+    def __init__(self, db_path: str = DB_PATH, quote_cache=None):
         self.db_path = db_path
+        self.quote_cache = quote_cache or shared_quote_cache
         self.alpaca_headers = {
             'APCA-API-KEY-ID': ALPACA_API_KEY,
             'APCA-API-SECRET-KEY': ALPACA_SECRET_KEY
@@ -40,24 +44,9 @@ class PortfolioReporter:
         prices = {}
         
         try:
-            # Alpaca v2 API endpoint for quotes
-            url = f"{ALPACA_BASE_URL}/v2/stocks/quotes/latest"
-            params = {'symbols': ','.join(symbols)}
-            
-            response = requests.get(url, headers=self.alpaca_headers, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                for symbol, quote_data in data.get('quotes', {}).items():
-                    if quote_data:
-                        # Use mid price (bid + ask) / 2
-                        bid = quote_data.get('bid_price', 0)
-                        ask = quote_data.get('ask_price', 0)
-                        if bid and ask:
-                            prices[symbol] = (bid + ask) / 2
-                        else:
-                            # Fallback to last trade price
-                            prices[symbol] = quote_data.get('ask_price', quote_data.get('bid_price', 0))
+            # Quotes the execution cycle fetched within the cache TTL are reused;
+            # the rest come from one latest-quotes request
+            prices = self.quote_cache.get_prices(symbols)
             
             # Fallback to bars if quotes fail
             if not prices:
@@ -252,6 +241,14 @@ class PortfolioReporter:
         """Generate comprehensive performance report."""
         strategies = self.get_strategy_portfolios()
         
+        # Quote every held symbol in one request; each strategy's valuation
+        # below is then served from the quote cache
+        held = sorted({
+            pos['symbol'] for strategy in strategies for pos in self.get_strategy_positions(strategy['id'])
+        })
+        if held:
+            self.get_current_prices(held)
+        
         if format_type == 'json':
             return self._generate_json_report(strategies)
         elif format_type == 'telegram':
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Overnight Session Precompute
+
+Moves the work of the 09:45 selection off the open. Run after the close (or
+before the premarket) to prepare the next session:
+
+1. Refresh daily bars in the bar store (recent days re-fetched, new symbols
+   back-filled), concurrently in batches.
+2. Scan the bar store for next-session candidates (scanner.py).
+3. Select the dynamic universes of every strategy whose selection lasts the
+   session (daily and weekly) as TradingExecutor would at 09:45, from bars
+   up to the last close, and store them by cache key. TradingExecutor adopts
+   them at the open instead of downloading and scoring a snapshot.
+4. Warm the persistent daily indicator state for the daily strategies, so
+   the first run of the session only applies the last close and the forming
+   bar.
+
+Selection sees the prior close, not the opening gap; the gap and the first
+intraday bars reach the strategies through their regular market data.
+
+Usage:
+    python precompute_session.py                       # next session per the market calendar
+    python precompute_session.py --session 2024-06-03
+    python precompute_session.py --symbols-file sp500.txt --skip-download
+
+    # PM2, weekdays after the close:
+    pm2 start precompute_session.py --interpreter python3 --cron "30 18 * * 1-5" --no-autorestart
+"""
+
+import sys
+import os
+import json
+import time
+import logging
+import argparse
+from datetime import date, datetime
+from typing import Dict, List, Optional, Any
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from execute_trades import TradingExecutor
+from strategy_executor import StrategyExecutor
+from alpaca_client import client as alpaca_client
+from bar_store import BarStore
+from indicator_state import IndicatorStateStore
+from market_calendar import MarketCalendar
+from market_data import CycleMarketData, fetch_alpaca_bars
+from replay import ReplayAlpacaClient
+from scanner import UniverseScanner
+import config
+
+logger = logging.getLogger(__name__)
+
+# Strategies whose dynamic universe is selected once for (at least) a session
+PRECOMPUTED_STRATEGIES = ['momentum-hunter', 'volatility-breakout', 'sector-rotator', 'value-dividends']
+
+# TradingExecutor strategies trading daily bars (their indicator state is warmed)
+DAILY_STRATEGIES = ['sector-rotator', 'value-dividends']
+
+# Minutes after the open the daily selection runs (execution_time 09:45)
+SELECTION_DELAY_MINUTES = 15
+
+
+def session_open_time(client, session: Optional[str] = None) -> pd.Timestamp:
+    """Open of ``session`` (YYYY-MM-DD) or of the next session after the client clock, in UTC."""
+    calendar = MarketCalendar()
+    if session:
+        sessions = calendar.sessions(date.fromisoformat(session), date.fromisoformat(session))
+        if not sessions:
+            raise ValueError(f"{session} is not a trading session")
+        open_at = sessions[0][0]
+    else:
+        now = client.now()
+        open_at, close_at = calendar.next_session(now)
+        if open_at <= now:  # in progress: the one after it
+            open_at = calendar.next_session(close_at)[0]
+    return pd.Timestamp(open_at).tz_convert('UTC')
+
+
+def refresh_bars(client, store: BarStore, symbols: List[str], now: datetime) -> Dict[str, int]:
+    """
+    Bring daily bars in the store up to ``now``.
+
+    Symbols with recent bars re-fetch the last PRECOMPUTE_REFRESH_DAYS (so
+    corrected bars are replaced); the rest fetch PRECOMPUTE_HISTORY_DAYS.
+
+    Returns:
+        {'symbols', 'written', 'failed'}
+    """
+    last_bars = {
+        key.split(':')[0]: pd.Timestamp(info['last'])
+        for key, info in store.get_info().items() if key.endswith(':1Day')
+    }
+    cutoff = pd.Timestamp(now) - pd.Timedelta(days=config.PRECOMPUTE_REFRESH_DAYS)
+    recent = [s for s in symbols if s in last_bars and last_bars[s] >= cutoff]
+    stale = [s for s in symbols if s not in recent]
+
+    written, failed = 0, 0
+    for group, days in ((recent, config.PRECOMPUTE_REFRESH_DAYS), (stale, config.PRECOMPUTE_HISTORY_DAYS)):
+        if not group:
+            continue
+        cycle_data = CycleMarketData(
+            lambda batch, timeframe, days: fetch_alpaca_bars(client, batch, timeframe, days), now=now
+        )
+        cycle_data.request_bars(group, '1Day', days)
+        cycle_data.prefetch()
+        for symbol in group:
+            frames = cycle_data.get_bars([symbol], '1Day', days)
+            if frames is None:
+                failed += 1
+            elif symbol in frames:
+                written += store.write_frame(symbol, frames[symbol])
+
+    return {'symbols': len(symbols), 'written': written, 'failed': failed}
+
+
+def precompute_universes(
+    executor: TradingExecutor,
+    replay: ReplayAlpacaClient,
+    selection_time: pd.Timestamp,
+    now: datetime
+) -> Dict[str, List[str]]:
+    """
+    Universes TradingExecutor would select at ``selection_time``, by cache key.
+
+    A strategy whose cache period has already started and has a stored
+    universe (a weekly universe mid-week) keeps it and is skipped.
+    """
+    replay.set_time(now)
+    current_keys = {name: executor.get_cache_key(name) for name in PRECOMPUTED_STRATEGIES}
+
+    replay.set_time(selection_time)
+    universes = {}
+    for strategy_name in PRECOMPUTED_STRATEGIES:
+        cache_key = executor.get_cache_key(strategy_name)
+        if cache_key == current_keys[strategy_name] and executor.scanner.get_universe(cache_key):
+            continue
+        universes[cache_key] = executor.get_dynamic_universe(strategy_name)
+    return universes
+
+
+def warm_indicator_state(
+    strategy_executor: StrategyExecutor,
+    replay: ReplayAlpacaClient,
+    daily_universes: Dict[str, List[str]]
+) -> int:
+    """
+    Run the daily live strategies over their universes so their indicator
+    state is committed through the last close. Signals are discarded.
+
+    Returns:
+        Indicator state rows saved
+    """
+    universes = {strategy['type']: strategy['universe'] for strategy in strategy_executor.strategies.values()}
+    for strategy_name, universe in daily_universes.items():
+        strategy_type = strategy_name.replace('-', '_')
+        universes[strategy_type] = sorted(set(universes.get(strategy_type, [])) | set(universe))
+
+    for strategy_type, universe in universes.items():
+        frames = fetch_alpaca_bars(replay, universe, '1Day', 60)
+        if frames:
+            strategy_executor.run_live_strategy(strategy_type, frames)
+
+    return strategy_executor.indicator_state.save()
+
+
+def precompute_session(
+    client=None,
+    store: BarStore = None,
+    session: Optional[str] = None,
+    symbols: Optional[List[str]] = None,
+    scanner: UniverseScanner = None,
+    indicator_state: IndicatorStateStore = None,
+    download: bool = True
+) -> Dict[str, Any]:
+    """
+    Prepare the next session: refresh bars, scan, select universes, warm state.
+
+    Args:
+        client: Alpaca client for the clock and bar downloads (default: live client)
+        store: Bar store (default: config.BAR_STORE_PATH)
+        session: Session date (YYYY-MM-DD; default: next session per the clock)
+        symbols: Scanner candidate set (default: every daily symbol in the bar store)
+        scanner: Scanner holding candidates and precomputed universes (default: on ``store``)
+        indicator_state: Indicator state to warm (default: config.INDICATOR_STATE_PATH)
+        download: Refresh bars before scanning
+
+    Returns:
+        Summary of each step
+    """
+    started = time.perf_counter()
+    client = client or alpaca_client
+    store = store or BarStore()
+    scanner = scanner or UniverseScanner(store)
+    now = client.now()
+    session_open = session_open_time(client, session)
+    selection_time = session_open + pd.Timedelta(minutes=SELECTION_DELAY_MINUTES)
+    logger.info(f"Precomputing session opening {session_open.isoformat()}")
+
+    # Replay over the store at 09:45 of the session: bars up to the last close.
+    # Frames load on first read, so the refresh below is visible to it.
+    replay = ReplayAlpacaClient(store)
+    replay.set_time(selection_time)
+    executor = TradingExecutor(client=replay, publish=False, data_source='alpaca', scanner=scanner)
+    strategy_executor = StrategyExecutor(
+        client=replay, publish=False, indicator_state=indicator_state or IndicatorStateStore()
+    )
+
+    summary: Dict[str, Any] = {'session': session_open.isoformat()}
+
+    if download:
+        tracked = set(symbols or store.symbols('1Day')) | {'SPY'}
+        for universe in executor.base_universes.values():
+            tracked.update(universe)
+        for strategy in strategy_executor.strategies.values():
+            tracked.update(strategy['universe'])
+        summary['bars'] = refresh_bars(client, store, sorted(tracked), now)
+
+    scan = scanner.scan(symbols, now=selection_time.to_pydatetime())
+    summary['scan'] = {'symbols': scan['symbols'], 'liquid': scan['liquid']}
+
+    universes = precompute_universes(executor, replay, selection_time, now)
+    scanner.save_universes(universes, computed_at=now)
+    summary['universes'] = universes
+
+    daily_universes = {}
+    for strategy_name in DAILY_STRATEGIES:
+        cache_key = executor.get_cache_key(strategy_name)
+        daily_universes[strategy_name] = universes.get(cache_key) or scanner.get_universe(cache_key) or []
+    summary['indicator_state'] = warm_indicator_state(strategy_executor, replay, daily_universes)
+
+    summary['seconds'] = round(time.perf_counter() - started, 3)
+    logger.info(f"Session precompute finished in {summary['seconds']:.1f}s")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Overnight precompute for the next session')
+    parser.add_argument('--session', help='Session date (YYYY-MM-DD; default: next session)')
+    parser.add_argument('--symbols-file', help='Scanner candidate set, one symbol per line (default: bar store)')
+    parser.add_argument('--skip-download', action='store_true', help='Use the bars already in the store')
+    args = parser.parse_args()
+
+    symbols = None
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols = [line.strip().upper() for line in f if line.strip()]
+
+    summary = precompute_session(session=args.session, symbols=symbols, download=not args.skip_download)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()